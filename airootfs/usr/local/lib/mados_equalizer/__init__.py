@@ -13,6 +13,7 @@ Features:
     - Internationalization support for 6 languages
     - Master volume control with mute toggle
     - Real-time audio output device detection
+    - Per-output-device EQ profiles that follow default-sink changes
 
 Package modules:
     - app: Main GTK3 application window and UI
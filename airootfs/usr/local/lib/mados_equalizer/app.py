@@ -19,7 +19,7 @@ import cairo
 import threading
 
 from . import __app_id__, __app_name__, __version__
-from .backend import AudioBackend
+from .backend import EQ_NODE_NAME, AudioBackend
 from .database import EqualizerStateDB
 from .presets import (
     PresetManager,
@@ -169,6 +169,7 @@ class EqualizerApp:
         self._updating_sliders = False
         self._updating_preset = False
         self._eq_apply_timeout_id = None  # Debounce timer for slider changes
+        self._state_flush_timeout_id = None  # Idle timer for batched DB writes
 
         # Initialize persistence, backend, and preset manager
         self.state_db = EqualizerStateDB()
@@ -179,6 +180,14 @@ class EqualizerApp:
         saved = self.state_db.load_state()
         self.language = saved.get("language") or detect_system_language()
 
+        # Preload every per-device profile so sink switches are a dict lookup.
+        # AudioBackend() detected the output device before the EQ took it over
+        self._device_profiles = self.state_db.load_device_profiles()
+        profile = self._device_profiles.get(self.backend.active_sink)
+        if profile:
+            saved["gains"] = profile["gains"]
+            saved["preset"] = profile["preset"] or saved.get("preset")
+
         # Apply Nord theme
         apply_theme()
 
@@ -193,6 +202,11 @@ class EqualizerApp:
         self._refresh_device_info()
         self._refresh_volume()
 
+        # Follow default-sink changes (speakers -> headphones, etc.)
+        self.backend.start_sink_monitor(
+            lambda sink, name: GLib.idle_add(self._on_output_device_changed, sink, name)
+        )
+
         # Show the window
         self.window.show_all()
 
@@ -653,6 +667,8 @@ class EqualizerApp:
         self._eq_apply_timeout_id = None
         gains = [s.get_value() for s in self.band_scales]
         self.state_db.save_gains(gains)
+        self._save_device_profile(gains, self.preset_combo.get_active_id())
+        self._schedule_state_flush()
         self.backend.apply_eq_async(
             gains=gains,
             callback=lambda ok, msg: GLib.idle_add(self._on_eq_applied, ok, msg),
@@ -688,12 +704,15 @@ class EqualizerApp:
         # Persist preset selection and gains
         self.state_db.save_preset(active_id)
         self.state_db.save_gains(preset["gains"])
+        self._save_device_profile(preset["gains"], active_id)
+        self._schedule_state_flush()
 
-    def _set_slider_values(self, gains):
+    def _set_slider_values(self, gains, apply=True):
         """Set all 8 band sliders to the given gain values.
 
         Args:
             gains: List of 8 gain values in dB.
+            apply: Whether to push the gains to the backend when enabled.
         """
         self._updating_sliders = True
         for i, gain in enumerate(gains):
@@ -703,7 +722,7 @@ class EqualizerApp:
         self._updating_sliders = False
 
         # Apply if EQ is enabled
-        if self.backend.enabled:
+        if apply and self.backend.enabled:
             self.backend.apply_eq_async(
                 gains=[float(g) for g in gains],
                 callback=lambda ok, msg: GLib.idle_add(self._on_eq_applied, ok, msg),
@@ -723,6 +742,7 @@ class EqualizerApp:
             self._update_enable_button(False)
             self._set_status(self._t("eq_disabled"))
             self.state_db.save_enabled(False)
+            self._schedule_state_flush()
         else:
             # Enable EQ with current slider values
             gains = [s.get_value() for s in self.band_scales]
@@ -732,6 +752,7 @@ class EqualizerApp:
                 self._update_enable_button(True)
                 self._set_status(self._t("eq_applied"))
                 self.state_db.save_enabled(True)
+                self._schedule_state_flush()
             else:
                 self._update_enable_button(False)
                 self._set_status(
@@ -860,6 +881,82 @@ class EqualizerApp:
         self.delete_button.set_sensitive(False)
         self.state_db.save_gains(flat_gains)
         self.state_db.save_preset("flat")
+        self._save_device_profile(flat_gains, "flat")
+        self._schedule_state_flush()
+
+    def _schedule_state_flush(self):
+        """Flush pending state to the database once the UI goes idle.
+
+        The state DB only updates its in-memory snapshot on save; this
+        (re)arms a 2 s inactivity timer so a burst of slider, preset and
+        toggle changes ends in a single SQLite transaction.
+        """
+        if self._state_flush_timeout_id is not None:
+            GLib.source_remove(self._state_flush_timeout_id)
+        self._state_flush_timeout_id = GLib.timeout_add_seconds(2, self._flush_state)
+
+    def _flush_state(self):
+        """Write pending state changes in one transaction.
+
+        Returns:
+            False to prevent the timeout from repeating.
+        """
+        self._state_flush_timeout_id = None
+        self.state_db.flush()
+        return False
+
+    def _save_device_profile(self, gains, preset_key):
+        """Remember the current curve as the profile of the active device.
+
+        Args:
+            gains: List of 8 gain values in dB.
+            preset_key: The selected preset key, if any.
+        """
+        sink = self.backend.active_sink
+        if not sink or sink.startswith(EQ_NODE_NAME):
+            return
+        gains = [float(g) for g in gains]
+        preset_key = preset_key if preset_key != "__separator__" else None
+        self._device_profiles[sink] = {"gains": gains, "preset": preset_key or None}
+        self.state_db.save_device_profile(sink, gains, preset_key)
+
+    def _on_output_device_changed(self, sink, device_name):
+        """Switch to the stored EQ profile when the default sink changes.
+
+        Called on the UI thread by the backend's sink monitor. The
+        profile comes from the in-memory cache loaded at startup, so the
+        switch is a single parameter update on the running filter-chain.
+
+        Args:
+            sink: The new default sink node name.
+            device_name: Display name of the new device.
+
+        Returns:
+            False to remove the idle source.
+        """
+        self.backend.set_output_device(sink, device_name)
+        self._update_device_label(device_name)
+
+        profile = self._device_profiles.get(sink)
+        if profile:
+            gains = profile["gains"]
+            self._set_slider_values(gains, apply=False)
+            preset_key = profile["preset"]
+            preset = self.preset_manager.get_preset(preset_key) if preset_key else None
+            if preset:
+                self._updating_preset = True
+                self.preset_combo.set_active_id(preset_key)
+                self._updating_preset = False
+                self.delete_button.set_sensitive(not preset.get("builtin", True))
+        else:
+            gains = [s.get_value() for s in self.band_scales]
+
+        def _switch():
+            ok, msg = self.backend.switch_output_device(sink, gains)
+            GLib.idle_add(self._on_eq_applied, ok, msg)
+
+        threading.Thread(target=_switch, daemon=True).start()
+        return False
 
     def _on_volume_changed(self, scale):
         """Handle master volume slider change.
@@ -908,11 +1005,32 @@ class EqualizerApp:
         """Refresh the displayed audio output device information."""
 
         def _detect():
-            device_name = self.backend.refresh_output_device()
-            GLib.idle_add(self._update_device_label, device_name)
+            sink, device_name = self.backend.detect_output_device()
+            GLib.idle_add(self._on_output_device_detected, sink, device_name)
 
         threading.Thread(target=_detect, daemon=True).start()
 
+    def _on_output_device_detected(self, sink, device_name):
+        """Store a detected output device on the UI thread.
+
+        A device other than the one the backend had, e.g. because the
+        detection at startup found none, is handled as a device change
+        so that its stored profile is applied.
+
+        Args:
+            sink: The detected sink node name, or '' if none was found.
+            device_name: Display name of the device.
+
+        Returns:
+            False to remove the idle source.
+        """
+        if sink and sink != self.backend.active_sink:
+            return self._on_output_device_changed(sink, device_name)
+        if sink:
+            self.backend.set_output_device(sink, device_name)
+        self._update_device_label(self.backend.get_output_device_name())
+        return False
+
     def _update_device_label(self, device_name):
         """Update the device label on the UI thread.
 
@@ -1002,9 +1120,15 @@ class EqualizerApp:
             GLib.source_remove(self._eq_apply_timeout_id)
             self._eq_apply_timeout_id = None
 
-        # Persist full state before closing
+        if self._state_flush_timeout_id is not None:
+            GLib.source_remove(self._state_flush_timeout_id)
+            self._state_flush_timeout_id = None
+
+        # Persist full state before closing (one transaction, including
+        # any changes still pending from the idle flush)
         gains = [s.get_value() for s in self.band_scales]
         preset_key = self.preset_combo.get_active_id() or ""
+        self._save_device_profile(gains, preset_key)
         self.state_db.save_state(
             gains=gains,
             enabled=self.backend.enabled,
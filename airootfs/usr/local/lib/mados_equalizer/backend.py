@@ -16,6 +16,8 @@ Architecture:
     3. Destroys any existing mados-eq node, then restarts filter-chain
     4. Detects active audio output devices via wpctl/pactl
     5. Manages master volume via wpctl (PipeWire) or pactl (PulseAudio)
+    6. Watches default-sink changes (pactl subscribe) and updates band
+       gains / playback target on the running node without a restart
 """
 
 import json
@@ -80,6 +82,7 @@ class AudioBackend:
         self._eq_process = None  # Subprocess running 'pipewire -c'
         self._last_error = ""  # Last error message from PipeWire
         self._original_default_sink_id = None  # ID of original default sink before EQ
+        self._sink_monitor = None  # 'pactl subscribe' subprocess
 
         # Detect available audio systems
         self.has_pipewire = self._check_command("pw-cli")
@@ -161,18 +164,67 @@ class AudioBackend:
             return -1, "", str(e)
 
     def _detect_output_device(self):
-        """Detect the currently active audio output device.
+        """Detect the active audio output device and store it.
 
-        Tries wpctl first (PipeWire), then falls back to pactl (PulseAudio).
-        Updates self.active_sink and self.active_sink_name.
+        Updates self.active_sink and self.active_sink_name.  Only call
+        this from the thread that owns the backend state; other threads
+        use :meth:`detect_output_device` and hand the result over.
         """
-        self.active_sink = ""
-        self.active_sink_name = ""
+        self.set_output_device(*self.detect_output_device())
+
+    def set_output_device(self, sink, name):
+        """Store the active hardware output device.
+
+        Args:
+            sink: The sink node name.
+            name: The display name of the device.
+        """
+        self.active_sink = sink
+        self.active_sink_name = name
+
+    def detect_output_device(self):
+        """Detect the hardware output device without changing any state.
+
+        While the EQ is enabled its capture node is the default sink;
+        the device reported then is the hardware sink behind it: the
+        default saved before the EQ took over, or else the sink the EQ
+        playback was last moved to.
+
+        Returns:
+            Tuple of (sink node name, display name); empty strings if
+            no device was found.
+        """
+        sink, name = self._query_output_device(DEFAULT_AUDIO_SINK)
+        if self._is_eq_node(sink) and self._original_default_sink_id is not None:
+            sink, name = self._query_output_device(str(self._original_default_sink_id))
+        if self._is_eq_node(sink):
+            sink, name = self.active_sink, self.active_sink_name
+        return sink, name
+
+    @staticmethod
+    def _is_eq_node(sink):
+        """Return True if *sink* names one of the EQ's own nodes."""
+        return sink.startswith(EQ_NODE_NAME) or sink == EQ_NODE_DESCRIPTION
+
+    def _query_output_device(self, target):
+        """Look up the name and description of an audio sink.
+
+        Tries wpctl first (PipeWire), then falls back to pactl (PulseAudio);
+        the fallbacks can only query the default sink.
+
+        Args:
+            target: A wpctl node ID, or DEFAULT_AUDIO_SINK.
+
+        Returns:
+            Tuple of (sink node name, display name), empty if not found.
+        """
+        sink = ""
+        name = ""
 
         # Try wpctl (PipeWire WirePlumber)
         if self.has_wpctl:
             try:
-                rc, stdout, _ = self._run_command(["wpctl", "inspect", DEFAULT_AUDIO_SINK])
+                rc, stdout, _ = self._run_command(["wpctl", "inspect", target])
                 if rc == 0 and stdout:
                     for line in stdout.splitlines():
                         line = line.strip()
@@ -180,20 +232,19 @@ class AudioBackend:
                             # Parse: node.name = "alsa_output..."
                             parts = line.split("=", 1)
                             if len(parts) == 2:
-                                name = parts[1].strip().strip('"').strip("'")
-                                self.active_sink = name
+                                sink = parts[1].strip().strip('"').strip("'")
                         if "node.description" in line and "=" in line:
                             parts = line.split("=", 1)
                             if len(parts) == 2:
                                 desc = parts[1].strip().strip('"').strip("'")
-                                self.active_sink_name = desc
-                    if self.active_sink:
-                        return
+                                name = desc
+                    if sink or target != DEFAULT_AUDIO_SINK:
+                        return sink, name
             except Exception:
                 pass
 
         # Try wpctl status as alternative
-        if self.has_wpctl:
+        if self.has_wpctl and target == DEFAULT_AUDIO_SINK:
             try:
                 rc, stdout, _ = self._run_command(["wpctl", "status"])
                 if rc == 0 and stdout:
@@ -215,33 +266,34 @@ class AudioBackend:
                                     # Remove volume info in brackets
                                     if "[" in sink_desc:
                                         sink_desc = sink_desc[: sink_desc.index("[")].strip()
-                                    self.active_sink_name = sink_desc
-                                    self.active_sink = sink_desc
-                                return
+                                    name = sink_desc
+                                    sink = sink_desc
+                                return sink, name
             except Exception:
                 pass
 
         # Fallback: try pactl
-        if self.has_pulseaudio:
+        if self.has_pulseaudio and target == DEFAULT_AUDIO_SINK:
             try:
                 rc, stdout, _ = self._run_command(["pactl", "get-default-sink"])
                 if rc == 0 and stdout.strip():
-                    self.active_sink = stdout.strip()
+                    sink = stdout.strip()
 
                 # Get description
                 rc2, stdout2, _ = self._run_command(["pactl", "list", "sinks", "short"])
                 if rc2 == 0 and stdout2:
                     for line in stdout2.splitlines():
-                        if self.active_sink in line:
+                        if sink in line:
                             parts = line.split("\t")
                             if len(parts) >= 2:
-                                self.active_sink_name = parts[1]
+                                name = parts[1]
                             break
 
-                if not self.active_sink_name:
-                    self.active_sink_name = self.active_sink
+                if not name:
+                    name = sink
             except Exception:
                 pass
+        return sink, name
 
     def get_output_device_name(self):
         """Get the display name of the active audio output device.
@@ -256,7 +308,7 @@ class AudioBackend:
         return ""
 
     def refresh_output_device(self):
-        """Re-detect the active output device.
+        """Re-detect the active output device on the calling thread.
 
         Returns:
             The updated device display name.
@@ -476,27 +528,30 @@ context.modules = [
         except Exception:
             return False
 
-    def _parse_eq_sink_from_objects(self, stdout):
+    def _parse_eq_sink_from_objects(self, stdout, node_name=None):
         """Parse ``pw-cli list-objects`` output and return the EQ sink node ID.
 
-        Returns the integer node ID whose ``node.name`` matches the
-        EQ capture name, or *None* if not found.
+        Returns the integer node ID whose ``node.name`` matches
+        *node_name* (the EQ capture name by default), or *None* if
+        not found.
         """
+        node_name = node_name or f"{EQ_NODE_NAME}-capture"
         current_id = None
         for line in stdout.splitlines():
             stripped = line.strip()
             if stripped.startswith("id "):
                 current_id = self._parse_id_from_line(stripped)
             elif current_id is not None and "node.name" in stripped:
-                if f'"{EQ_NODE_NAME}-capture"' in stripped:
+                if f'"{node_name}"' in stripped:
                     return current_id
         return None
 
-    def _find_eq_sink_node_id(self):
+    def _find_eq_sink_node_id(self, node_name=None):
         """Find the PipeWire node ID of the EQ capture sink.
 
         Searches the PipeWire object list for a node whose name matches
-        the EQ capture node name (mados-eq-capture).
+        the EQ capture node name (mados-eq-capture), or *node_name*
+        when given (e.g. the playback side of the filter-chain).
 
         Returns:
             The node ID as an integer, or None if not found.
@@ -509,10 +564,49 @@ context.modules = [
             if rc != 0 or not stdout:
                 return None
 
-            return self._parse_eq_sink_from_objects(stdout)
+            return self._parse_eq_sink_from_objects(stdout, node_name)
         except Exception:
             return None
 
+    def _eq_process_running(self):
+        """Return True if the filter-chain subprocess is alive."""
+        return self._eq_process is not None and self._eq_process.poll() is None
+
+    def _set_live_gains(self):
+        """Push the current gains to the running EQ node as a param update.
+
+        Uses ``pw-cli set-param <node> Props`` on the filter-chain
+        capture node so the bq_peaking controls change in place,
+        without restarting the filter-chain process.
+
+        Returns:
+            True if the parameters were updated.
+        """
+        node_id = self._find_eq_sink_node_id()
+        if node_id is None:
+            return False
+
+        params = " ".join(
+            f'"eq_band_{i + 1}:Gain" {float(gain)}' for i, gain in enumerate(self.gains)
+        )
+        rc, _, _ = self._run_command(
+            ["pw-cli", "set-param", str(node_id), "Props", f"{{ params = [ {params} ] }}"],
+            timeout=2,
+        )
+        return rc == 0
+
+    def _retarget_playback(self, sink):
+        """Move the EQ playback stream to *sink* via PipeWire metadata.
+
+        Returns:
+            True if the target.object metadata was set.
+        """
+        node_id = self._find_eq_sink_node_id(f"{EQ_NODE_NAME}-playback")
+        if node_id is None:
+            return False
+        rc, _, _ = self._run_command(["pw-metadata", str(node_id), "target.object", sink])
+        return rc == 0
+
     def _restore_default_sink(self):
         """Restore the original default audio sink after disabling EQ.
 
@@ -610,6 +704,10 @@ context.modules = [
                 # Try PulseAudio fallback
                 return self._apply_eq_pulseaudio()
 
+            # Fast path: the node is already running, only the gains changed
+            if self._eq_process_running() and self._set_live_gains():
+                return True, "eq_applied"
+
             # Save the current default sink before switching to EQ
             self._save_original_default_sink()
 
@@ -647,6 +745,117 @@ context.modules = [
         thread = threading.Thread(target=_apply, daemon=True)
         thread.start()
 
+    def switch_output_device(self, sink, gains):
+        """Switch to a new hardware output and its EQ profile.
+
+        When the filter-chain is running, the playback stream is moved
+        to *sink* and the gains are updated in place, so the switch
+        costs one parameter update instead of a process restart.  The
+        EQ capture node is made the default sink again, with *sink*
+        remembered as the device to restore on disable.
+
+        Args:
+            sink: The new hardware sink node name.
+            gains: List of 8 gain values in dB for this device.
+
+        Returns:
+            Tuple of (success: bool, message: str).
+        """
+        with self._apply_lock:
+            if len(gains) != 8:
+                return False, "Invalid number of gain values"
+            self.gains = [float(g) for g in gains]
+            self.active_sink = sink
+
+            if not self.enabled:
+                return True, "eq_disabled"
+
+            # The user picked a new hardware default: restore to it on disable
+            self._original_default_sink_id = None
+
+            if self.has_pipewire and self._eq_process_running():
+                if self._retarget_playback(sink) and self._set_live_gains():
+                    self._save_original_default_sink()
+                    self._set_default_sink_to_eq()
+                    return True, "eq_applied"
+                # Live update failed — fall back to a full restart
+                self._stop_eq_process()
+
+        return self.apply_eq()
+
+    # ----- default-sink change monitoring -----
+
+    @staticmethod
+    def _is_default_change_event(line):
+        """Return True if a ``pactl subscribe`` line may signal a new default sink.
+
+        Default sink changes are reported as server change events, e.g.
+        ``Event 'change' on server #42``.
+        """
+        return "'change'" in line and " on server" in line
+
+    def _query_default_sink_name(self):
+        """Return the node name of the current default sink, or ''."""
+        if self.has_pulseaudio:
+            rc, stdout, _ = self._run_command(["pactl", "get-default-sink"], timeout=2)
+            if rc == 0:
+                return stdout.strip()
+        return ""
+
+    def start_sink_monitor(self, callback):
+        """Watch for default-sink changes in a background thread.
+
+        Runs ``pactl subscribe`` (served by pipewire-pulse on PipeWire
+        systems).  When the default sink becomes a different hardware
+        device, output device info is re-detected and *callback* is
+        invoked as ``callback(sink, display_name)`` from the background
+        thread.  Changes to the EQ's own capture node are ignored.
+
+        Args:
+            callback: Callable receiving the new sink name and description.
+
+        Returns:
+            True if the monitor was started.
+        """
+        if self._sink_monitor is not None or not self.has_pulseaudio:
+            return False
+        try:
+            self._sink_monitor = subprocess.Popen(
+                ["pactl", "subscribe"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        except Exception as e:
+            print(f"Error starting sink monitor: {e}")
+            self._sink_monitor = None
+            return False
+
+        def _watch(proc):
+            for line in proc.stdout:
+                if not self._is_default_change_event(line):
+                    continue
+                sink = self._query_default_sink_name()
+                if not sink or self._is_eq_node(sink) or sink == self.active_sink:
+                    continue
+                _, name = self.detect_output_device()
+                callback(sink, name or sink)
+
+        threading.Thread(target=_watch, args=(self._sink_monitor,), daemon=True).start()
+        return True
+
+    def stop_sink_monitor(self):
+        """Stop the default-sink monitor subprocess if running."""
+        if self._sink_monitor is None:
+            return
+        try:
+            self._sink_monitor.terminate()
+            self._sink_monitor.wait(timeout=1)
+        except Exception:
+            pass
+        finally:
+            self._sink_monitor = None
+
     def enable_eq(self):
         """Enable the equalizer and apply current settings.
 
@@ -915,9 +1124,10 @@ context.modules = [
     def cleanup(self):
         """Clean up resources when the application is closing.
 
-        Restores the original default audio sink, stops the filter-chain
-        subprocess, and removes config files.
+        Stops the sink monitor, restores the original default audio sink,
+        stops the filter-chain subprocess, and removes config files.
         """
+        self.stop_sink_monitor()
         self._restore_default_sink()
         self._stop_eq_process()
         try:
@@ -4,11 +4,19 @@ madOS Audio Equalizer - SQLite State Persistence
 
 Persists equalizer session state using SQLite so that gain values,
 enabled state, selected preset, and language preference survive
-across application restarts.
+across application restarts.  Per-output-device EQ profiles are
+stored alongside, keyed by the PipeWire/PulseAudio sink node name.
+
+Writes are coalesced: the setters only update an in-memory snapshot
+and mark it dirty, and :meth:`EqualizerStateDB.flush` commits every
+pending change in a single transaction.  The application flushes on
+idle and when the window closes, so a slider drag costs one commit
+instead of one per debounced change.
 
 Database location: ``~/.local/share/mados-equalizer/state.db``
 """
 
+import json
 import os
 import sqlite3
 from contextlib import contextmanager
@@ -22,14 +30,30 @@ DEFAULT_DB_DIR = os.path.join(
 DEFAULT_DB_PATH = os.path.join(DEFAULT_DB_DIR, "state.db")
 
 # Schema version — bump when altering tables
-_SCHEMA_VERSION = 1
+_SCHEMA_VERSION = 2
+
+_UPSERT_SESSION = (
+    "INSERT INTO session (key, value) VALUES (?, ?) "
+    "ON CONFLICT(key) DO UPDATE SET value = excluded.value"
+)
+
+_UPSERT_PROFILE = (
+    "INSERT INTO device_profiles (sink, gains, preset) VALUES (?, ?, ?) "
+    "ON CONFLICT(sink) DO UPDATE SET gains = excluded.gains, preset = excluded.preset"
+)
 
 
 class EqualizerStateDB:
     """SQLite-backed state persistence for the equalizer.
 
     Stores session state as key-value pairs and band gains as a
-    separate table for efficient per-band updates.
+    separate table for efficient per-band updates.  Per-device
+    profiles (gains + preset) live in the ``device_profiles`` table.
+
+    All tables are read once on open into an in-memory snapshot.
+    Loads are served from the snapshot, saves mark it dirty, and
+    :meth:`flush` (also called by :meth:`close`) writes the dirty
+    parts back in one transaction.
 
     Args:
         db_path: Path to the SQLite database file.
@@ -41,8 +65,22 @@ class EqualizerStateDB:
         os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
         self._conn = sqlite3.connect(self._db_path, timeout=5)
         self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL only fsyncs at checkpoints; a crash may lose the
+        # last flush but never corrupts the database.
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._closed = False
         self._create_tables()
 
+        # In-memory snapshot, read once
+        self._session = dict(self._conn.execute("SELECT key, value FROM session").fetchall())
+        self._gains = self._read_gains()
+        self._profiles = self._read_device_profiles()
+
+        # Pending changes awaiting flush()
+        self._dirty_session = set()
+        self._dirty_gains = False
+        self._dirty_profiles = set()
+
     @contextmanager
     def _transaction(self):
         """Context manager for a database transaction."""
@@ -66,12 +104,49 @@ class EqualizerStateDB:
                     band  INTEGER PRIMARY KEY,
                     gain  REAL NOT NULL DEFAULT 0.0
                 );
+
+                CREATE TABLE IF NOT EXISTS device_profiles (
+                    sink    TEXT PRIMARY KEY,
+                    gains   TEXT NOT NULL,
+                    preset  TEXT
+                );
             """)
 
+    def _read_gains(self):
+        """Read the band_gains table.
+
+        Returns:
+            List of 8 float gain values, or None if no saved state.
+        """
+        cur = self._conn.execute("SELECT band, gain FROM band_gains ORDER BY band")
+        rows = cur.fetchall()
+        if len(rows) != 8:
+            return None
+        return [row[1] for row in rows]
+
+    def _read_device_profiles(self):
+        """Read the device_profiles table.
+
+        Returns:
+            Dictionary mapping sink name to ``{"gains": [...], "preset": str|None}``.
+            Rows with malformed gain data are skipped.
+        """
+        profiles = {}
+        cur = self._conn.execute("SELECT sink, gains, preset FROM device_profiles")
+        for sink, gains_json, preset in cur.fetchall():
+            try:
+                gains = [float(g) for g in json.loads(gains_json)]
+            except (TypeError, ValueError):
+                continue
+            if len(gains) != 8:
+                continue
+            profiles[sink] = {"gains": gains, "preset": preset or None}
+        return profiles
+
     # ----- session key-value helpers -----
 
     def _get_session(self, key, default=None):
-        """Retrieve a session value by key.
+        """Retrieve a session value by key from the in-memory snapshot.
 
         Args:
             key: The session key.
@@ -80,23 +155,65 @@ class EqualizerStateDB:
         Returns:
             The stored value as a string, or *default*.
         """
-        cur = self._conn.execute("SELECT value FROM session WHERE key = ?", (key,))
-        row = cur.fetchone()
-        return row[0] if row else default
+        return self._session.get(key, default)
 
     def _set_session(self, key, value):
-        """Store a session key-value pair (upsert).
+        """Store a session key-value pair, pending the next flush.
 
         Args:
             key: The session key.
             value: The value to store (will be converted to string).
         """
+        value = str(value)
+        if self._session.get(key) == value:
+            return
+        self._session[key] = value
+        self._dirty_session.add(key)
+
+    # ----- flushing -----
+
+    @property
+    def has_pending_changes(self):
+        """True if the in-memory snapshot has unflushed changes."""
+        return bool(self._dirty_session or self._dirty_gains or self._dirty_profiles)
+
+    def flush(self):
+        """Write all pending changes in a single transaction.
+
+        Returns:
+            True if anything was written.
+        """
+        if self._closed or not self.has_pending_changes:
+            return False
+
         with self._transaction():
-            self._conn.execute(
-                "INSERT INTO session (key, value) VALUES (?, ?) "
-                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
-                (key, str(value)),
-            )
+            if self._dirty_gains and self._gains is not None:
+                self._conn.execute("DELETE FROM band_gains")
+                self._conn.executemany(
+                    "INSERT INTO band_gains (band, gain) VALUES (?, ?)",
+                    list(enumerate(self._gains)),
+                )
+
+            if self._dirty_session:
+                self._conn.executemany(
+                    _UPSERT_SESSION,
+                    [(key, self._session[key]) for key in self._dirty_session],
+                )
+
+            for sink in self._dirty_profiles:
+                profile = self._profiles.get(sink)
+                if profile is None:
+                    self._conn.execute("DELETE FROM device_profiles WHERE sink = ?", (sink,))
+                else:
+                    self._conn.execute(
+                        _UPSERT_PROFILE,
+                        (sink, json.dumps(profile["gains"]), profile["preset"] or ""),
+                    )
+
+        self._dirty_session.clear()
+        self._dirty_gains = False
+        self._dirty_profiles.clear()
+        return True
 
     # ----- public API -----
 
@@ -108,12 +225,11 @@ class EqualizerStateDB:
         """
         if not isinstance(gains, (list, tuple)) or len(gains) != 8:
             return
-        with self._transaction():
-            self._conn.execute("DELETE FROM band_gains")
-            self._conn.executemany(
-                "INSERT INTO band_gains (band, gain) VALUES (?, ?)",
-                [(i, float(g)) for i, g in enumerate(gains)],
-            )
+        gains = [float(g) for g in gains]
+        if gains == self._gains:
+            return
+        self._gains = gains
+        self._dirty_gains = True
 
     def load_gains(self):
         """Load the persisted 8-band gain values.
@@ -121,11 +237,7 @@ class EqualizerStateDB:
         Returns:
             List of 8 float gain values, or None if no saved state.
         """
-        cur = self._conn.execute("SELECT band, gain FROM band_gains ORDER BY band")
-        rows = cur.fetchall()
-        if len(rows) != 8:
-            return None
-        return [row[1] for row in rows]
+        return list(self._gains) if self._gains is not None else None
 
     def save_enabled(self, enabled):
         """Persist the EQ enabled/disabled state.
@@ -181,32 +293,60 @@ class EqualizerStateDB:
     def save_state(self, gains, enabled, preset_key, language):
         """Persist the full equalizer state in a single transaction.
 
+        Any other pending changes are written in the same transaction.
+
         Args:
             gains: List of 8 float gain values in dB.
             enabled: Whether the EQ is active.
             preset_key: The active preset key.
             language: The UI language code.
         """
-        with self._transaction():
-            # Gains
-            if isinstance(gains, (list, tuple)) and len(gains) == 8:
-                self._conn.execute("DELETE FROM band_gains")
-                self._conn.executemany(
-                    "INSERT INTO band_gains (band, gain) VALUES (?, ?)",
-                    [(i, float(g)) for i, g in enumerate(gains)],
-                )
+        self.save_gains(gains)
+        self.save_enabled(enabled)
+        self.save_preset(preset_key)
+        self.save_language(language)
+        self.flush()
 
-            # Session values
-            for key, value in [
-                ("enabled", "1" if enabled else "0"),
-                ("preset", preset_key or ""),
-                ("language", language or ""),
-            ]:
-                self._conn.execute(
-                    "INSERT INTO session (key, value) VALUES (?, ?) "
-                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
-                    (key, str(value)),
-                )
+    # ----- per-device profiles -----
+
+    def save_device_profile(self, sink, gains, preset_key=None):
+        """Persist the EQ profile for one output device.
+
+        Args:
+            sink: The sink node name (e.g. 'alsa_output.usb-...').
+            gains: List of 8 float gain values in dB.
+            preset_key: The preset active on this device, if any.
+        """
+        if not sink or not isinstance(gains, (list, tuple)) or len(gains) != 8:
+            return
+        profile = {"gains": [float(g) for g in gains], "preset": preset_key or None}
+        if self._profiles.get(sink) == profile:
+            return
+        self._profiles[sink] = profile
+        self._dirty_profiles.add(sink)
+
+    def load_device_profiles(self):
+        """Return every stored device profile.
+
+        Intended to be called once at startup so that switching
+        devices later is a dictionary lookup.
+
+        Returns:
+            Dictionary mapping sink name to ``{"gains": [...], "preset": str|None}``.
+        """
+        return {
+            sink: {"gains": list(p["gains"]), "preset": p["preset"]}
+            for sink, p in self._profiles.items()
+        }
+
+    def delete_device_profile(self, sink):
+        """Remove the stored profile for an output device.
+
+        Args:
+            sink: The sink node name.
+        """
+        if self._profiles.pop(sink, None) is not None:
+            self._dirty_profiles.add(sink)
 
     def load_state(self):
         """Load the full persisted equalizer state.
@@ -223,8 +363,16 @@ class EqualizerStateDB:
         }
 
     def close(self):
-        """Close the database connection."""
+        """Flush pending changes and close the database connection."""
+        if self._closed:
+            return
         try:
-            self._conn.close()
-        except Exception:
-            pass
+            self.flush()
+        except sqlite3.Error as e:
+            print(f"Error flushing equalizer state: {e}")
+        finally:
+            self._closed = True
+            try:
+                self._conn.close()
+            except Exception:
+                pass
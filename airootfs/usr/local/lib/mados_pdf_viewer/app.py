@@ -17,6 +17,10 @@ gi.require_version("Poppler", "0.18")
 from gi.repository import Gtk, Gdk, GdkPixbuf, GLib, Poppler
 
 from .renderer import PDFDocument, PageRenderer
+from .layout import PageLayout
+from .pagecache import PageSurfaceCache, PAGE_CACHE_RADIUS, zoom_bucket
+from .renderworker import PageRenderWorker, PREFETCH_AHEAD, PREFETCH_BEHIND
+from .tiles import is_tiled, tile_rect, visible_tiles
 from .annotations import (
     TextAnnotation,
     SignaturePlacement,
@@ -34,6 +38,7 @@ from .theme import apply_theme, hex_to_rgb_float
 MIN_ZOOM = 0.1
 MAX_ZOOM = 5.0
 ZOOM_STEP = 0.15
+ZOOM_SETTLE_MS = 150  # zoom must be stable this long before pages re-render
 PAGE_GAP = 12  # pixels between pages in continuous view
 
 
@@ -84,8 +89,16 @@ class PDFViewerApp:
         self._resizing_signature = None
         self._has_unsaved_changes = False
 
-        # Page surface cache: {page_index: cairo.ImageSurface}
-        self._page_cache = {}
+        # Rendered pages, LRU within a byte budget, keyed by (page, zoom)
+        self._page_cache = PageSurfaceCache()
+        # Page positions at the current zoom, rebuilt when the zoom changes
+        self._layout = None
+        # Background page rendering, and the scroll direction for prefetch
+        self._render_worker = None
+        self._last_scroll_y = 0.0
+        self._scrolling_down = True
+        # Timer that ends a zoom gesture; renders wait while it is pending
+        self._zoom_settle_id = None
 
         # ── Apply theme ───────────────────────────────────────────────────
         apply_theme()
@@ -284,11 +297,13 @@ class PDFViewerApp:
         self.signatures.clear()
         self.form_manager = FormFieldManager(self.pdf_doc)
         self._page_cache.clear()
+        self._layout = None
         self._has_unsaved_changes = False
         self.mode = InteractionMode.NORMAL
 
         # Update renderer
         self.renderer = PageRenderer(self.pdf_doc)
+        self._start_render_worker()
 
         # Update UI
         self._update_page_controls()
@@ -534,25 +549,43 @@ class PDFViewerApp:
         if self.pdf_doc.document is None:
             return
 
-        # Calculate the Y offset of the target page
-        y_offset = 0
-        for i in range(page_index):
-            _, ph = self.pdf_doc.get_page_size(i)
-            y_offset += int(math.ceil(ph * self.zoom)) + PAGE_GAP
-
+        # Top of the target page, with the gap above it in view
+        _, y, _, _ = self._get_page_layout().rect(page_index)
         vadj = self.scrolled.get_vadjustment()
-        vadj.set_value(y_offset)
+        vadj.set_value(y - PAGE_GAP // 2)
 
     def _set_zoom(self, new_zoom):
         """Set zoom level and refresh the canvas."""
         new_zoom = max(MIN_ZOOM, min(MAX_ZOOM, new_zoom))
+        if new_zoom != self.zoom:
+            self._defer_sharp_render()
         self.zoom = new_zoom
         self.fit_mode = None
-        self._page_cache.clear()
         self._update_canvas_size()
         self._update_zoom_label()
         self.canvas.queue_draw()
 
+    def _defer_sharp_render(self):
+        """
+        Hold page rendering back until the zoom stops changing.
+
+        During a zoom gesture pages are drawn by scaling the surfaces
+        already rendered, and renders for the zoom being left are dropped.
+        Pages are rendered at the new zoom once it has been stable for
+        ZOOM_SETTLE_MS.
+        """
+        if self._render_worker is not None:
+            self._render_worker.cancel()
+        if self._zoom_settle_id is not None:
+            GLib.source_remove(self._zoom_settle_id)
+        self._zoom_settle_id = GLib.timeout_add(ZOOM_SETTLE_MS, self._on_zoom_settled)
+
+    def _on_zoom_settled(self):
+        """Redraw once the zoom is stable, which requests sharp renders."""
+        self._zoom_settle_id = None
+        self.canvas.queue_draw()
+        return False
+
     def _on_zoom_in(self, widget):
         self._set_zoom(self.zoom + ZOOM_STEP)
 
@@ -575,7 +608,6 @@ class PDFViewerApp:
 
         self.zoom = view_w / pw
         self.fit_mode = "width"
-        self._page_cache.clear()
         self._update_canvas_size()
         self._update_zoom_label()
         self.canvas.queue_draw()
@@ -600,7 +632,6 @@ class PDFViewerApp:
         scale_h = view_h / ph
         self.zoom = min(scale_w, scale_h)
         self.fit_mode = "page"
-        self._page_cache.clear()
         self._update_canvas_size()
         self._update_zoom_label()
         self.canvas.queue_draw()
@@ -627,45 +658,22 @@ class PDFViewerApp:
             self.canvas.set_size_request(100, 100)
             return
 
-        total_h = 0
-        max_w = 0
-        for i in range(self.pdf_doc.n_pages):
-            pw, ph = self.pdf_doc.get_page_size(i)
-            sw = int(math.ceil(pw * self.zoom))
-            sh = int(math.ceil(ph * self.zoom))
-            max_w = max(max_w, sw)
-            total_h += sh + PAGE_GAP
-
-        self.canvas.set_size_request(max_w, total_h)
+        layout = self._get_page_layout()
+        self.canvas.set_size_request(layout.width, layout.height)
 
     def _get_page_layout(self):
         """
-        Compute the vertical layout of all pages.
+        Return the vertical layout of all pages at the current zoom.
+
+        The layout is built from the page sizes read on load and reused
+        until the zoom or the document changes.
 
         Returns:
-            List of (page_index, x, y, width, height) tuples in display coords.
+            A PageLayout, empty when no document is open.
         """
-        if self.pdf_doc.document is None:
-            return []
-
-        layout = []
-        # Find the maximum page width for centering
-        max_w = 0
-        page_dims = []
-        for i in range(self.pdf_doc.n_pages):
-            pw, ph = self.pdf_doc.get_page_size(i)
-            sw = int(math.ceil(pw * self.zoom))
-            sh = int(math.ceil(ph * self.zoom))
-            page_dims.append((sw, sh))
-            max_w = max(max_w, sw)
-
-        y_pos = PAGE_GAP // 2
-        for i, (sw, sh) in enumerate(page_dims):
-            x_pos = max((max_w - sw) // 2, 0)
-            layout.append((i, x_pos, y_pos, sw, sh))
-            y_pos += sh + PAGE_GAP
-
-        return layout
+        if self._layout is None or self._layout.zoom != self.zoom:
+            self._layout = PageLayout(self.pdf_doc.page_sizes, self.zoom, PAGE_GAP)
+        return self._layout
 
     def _on_canvas_draw(self, widget, ctx):
         """
@@ -705,31 +713,32 @@ class PDFViewerApp:
         hadj = self.scrolled.get_hadjustment()
         vis_y = vadj.get_value()
         vis_h = vadj.get_page_size()
-        _ = hadj.get_value()
-        _ = hadj.get_page_size()
+        vis_x = hadj.get_value()
+        vis_w = hadj.get_page_size()
 
         layout = self._get_page_layout()
+        visible = layout.visible(vis_y - 50, vis_y + vis_h + 50)
+        missing = []
 
-        for page_idx, x, y, w, h in layout:
-            # Skip pages that are not visible
-            if y + h < vis_y - 50 or y > vis_y + vis_h + 50:
-                continue
+        for page_idx in visible:
+            x, y, w, h = layout.rect(page_idx)
 
             # Drop shadow
             ctx.set_source_rgba(0, 0, 0, 0.3)
             ctx.rectangle(x + 3, y + 3, w, h)
             ctx.fill()
 
-            # Render page
-            surface = self._get_page_surface(page_idx)
-            if surface is not None:
-                ctx.set_source_surface(surface, x, y)
-                ctx.paint()
+            # Render page; at high zoom only the tiles in the viewport
+            if is_tiled(w, h):
+                viewport = (vis_x - x, vis_y - y, vis_x + vis_w - x, vis_y + vis_h - y)
+                self._paint_page_tiles(ctx, page_idx, x, y, w, h, viewport, missing)
             else:
-                # Fallback: white rectangle
-                ctx.set_source_rgb(1, 1, 1)
-                ctx.rectangle(x, y, w, h)
-                ctx.fill()
+                surface = self._page_cache.get(page_idx, self.zoom)
+                if surface is not None:
+                    self._paint_page_surface(ctx, surface, x, y, w, h)
+                else:
+                    missing.append((page_idx, None))
+                    self._paint_page_stand_in(ctx, page_idx, x, y, w, h)
 
             # Draw annotations
             ctx.save()
@@ -761,43 +770,184 @@ class PDFViewerApp:
 
             ctx.restore()
 
+        # Drop pages far from the viewport
+        if visible:
+            self._page_cache.retain(visible[0] - PAGE_CACHE_RADIUS, visible[-1] + PAGE_CACHE_RADIUS)
+            if self._zoom_settle_id is None:
+                self._request_renders(missing, visible[0], visible[-1], vis_y, layout)
+
         # Update current page based on scroll position
         self._update_current_page_from_scroll(layout, vis_y, vis_h)
 
-    def _get_page_surface(self, page_index):
+    def _request_renders(self, missing, first_visible, last_visible, vis_y, layout):
         """
-        Get a cached rendered surface for the page, or render and cache it.
+        Queue page renders on the render worker.
+
+        Visible pages come first, then the pages just past the viewport in
+        the scroll direction, then those just behind it.  The queue is
+        replaced, which drops pages that scrolled out of view.  Tiled
+        pages are not prefetched: only their tiles in view are rendered.
+
+        Args:
+            missing: ``(page_index, tile)`` jobs in view that are not
+                     rendered at the current zoom.
+            first_visible: First visible page index.
+            last_visible: Last visible page index.
+            vis_y: Current vertical scroll offset.
+            layout: Page layout from :meth:`_get_page_layout`.
+        """
+        if self._render_worker is None:
+            return
+        if vis_y != self._last_scroll_y:
+            self._scrolling_down = vis_y > self._last_scroll_y
+            self._last_scroll_y = vis_y
+
+        below = range(last_visible + 1, last_visible + 1 + PREFETCH_AHEAD)
+        above = range(first_visible - 1, first_visible - 1 - PREFETCH_AHEAD, -1)
+        ahead, behind = (below, above) if self._scrolling_down else (above, below)
+
+        wanted = list(missing)
+        for page_idx in list(ahead) + list(behind)[:PREFETCH_BEHIND]:
+            if not 0 <= page_idx < len(layout):
+                continue
+            _, _, w, h = layout.rect(page_idx)
+            if not is_tiled(w, h) and self._page_cache.get(page_idx, self.zoom) is None:
+                wanted.append((page_idx, None))
+        self._render_worker.schedule(wanted, self.zoom)
+
+    def _on_page_rendered(self, page_index, tile, zoom, surface):
+        """
+        Store a page rendered by the worker and redraw if it is current.
 
         Args:
             page_index: 0-based page number.
+            tile: ``(column, row)`` of a tile, or None for the whole page.
+            zoom: Zoom factor the page was rendered at.
+            surface: cairo.ImageSurface.
+        """
+        self._page_cache.put(page_index, zoom, surface, tile=tile)
+        if zoom_bucket(zoom) == zoom_bucket(self.zoom):
+            self.canvas.queue_draw()
 
-        Returns:
-            cairo.ImageSurface or None.
+    def _start_render_worker(self):
+        """Replace the render worker with one for the open document."""
+        self._stop_render_worker()
+        self._render_worker = PageRenderWorker(self.pdf_doc.filepath, self._on_page_rendered)
+
+    def _stop_render_worker(self):
+        """Stop the render worker, if any."""
+        if self._render_worker is not None:
+            self._render_worker.shutdown()
+            self._render_worker = None
+
+    def _paint_page_tiles(self, ctx, page_index, x, y, w, h, viewport, missing):
         """
-        if page_index in self._page_cache:
-            return self._page_cache[page_index]
+        Paint the tiles of a page that fall in the viewport.
+
+        Tiles not rendered yet are added to *missing*; the page's stand-in
+        shows through where they are.
 
-        surface = self.renderer.render_page(page_index, self.zoom)
+        Args:
+            ctx: Cairo context of the canvas.
+            page_index: 0-based page number.
+            x, y, w, h: Page rectangle on the canvas.
+            viewport: ``(left, top, right, bottom)`` relative to the page.
+            missing: List the missing ``(page_index, tile)`` jobs are added to.
+        """
+        tiles = visible_tiles(w, h, *viewport)
+        surfaces = [self._page_cache.get(page_index, self.zoom, tile=tile) for tile in tiles]
+        if any(surface is None for surface in surfaces):
+            self._paint_page_stand_in(ctx, page_index, x, y, w, h)
+            self._paint_scaled_tiles(ctx, page_index, x, y, viewport)
+
+        for tile, surface in zip(tiles, surfaces):
+            if surface is None:
+                missing.append((page_index, tile))
+                continue
+            tx, ty, tw, th = tile_rect(tile, w, h)
+            ctx.set_source_surface(surface, x + tx, y + ty)
+            ctx.rectangle(x + tx, y + ty, tw, th)
+            ctx.fill()
+
+    def _paint_scaled_tiles(self, ctx, page_index, x, y, viewport):
+        """
+        Paint the tiles of a page rendered at the nearest other zoom.
+
+        Used while zooming at high zoom: the tiles in view are scaled to
+        the current zoom, which is sharper than the whole-page stand-in.
+
+        Args:
+            ctx: Cairo context of the canvas.
+            page_index: 0-based page number.
+            x, y: Page origin on the canvas.
+            viewport: ``(left, top, right, bottom)`` relative to the page.
+        """
+        old_zoom = self._page_cache.nearest_tile_zoom(page_index, self.zoom)
+        if old_zoom is None:
+            return
+        pw, ph = self.pdf_doc.get_page_size(page_index)
+        old_w, old_h = int(math.ceil(pw * old_zoom)), int(math.ceil(ph * old_zoom))
+        ratio = self.zoom / old_zoom
+        old_viewport = [edge / ratio for edge in viewport]
+
+        ctx.save()
+        ctx.translate(x, y)
+        ctx.scale(ratio, ratio)
+        for tile in visible_tiles(old_w, old_h, *old_viewport):
+            surface = self._page_cache.get(page_index, old_zoom, tile=tile)
+            if surface is None:
+                continue
+            tx, ty, tw, th = tile_rect(tile, old_w, old_h)
+            ctx.set_source_surface(surface, tx, ty)
+            ctx.rectangle(tx, ty, tw, th)
+            ctx.fill()
+        ctx.restore()
+
+    def _paint_page_stand_in(self, ctx, page_index, x, y, w, h):
+        """
+        Paint a page that is not rendered at the current zoom.
+
+        The page rendered at the nearest other zoom is scaled into place;
+        without one, a white rectangle is drawn.
+
+        Args:
+            ctx: Cairo context of the canvas.
+            page_index: 0-based page number.
+            x, y, w, h: Page rectangle on the canvas.
+        """
+        surface = self._page_cache.nearest(page_index, self.zoom)
         if surface is not None:
-            self._page_cache[page_index] = surface
-        return surface
+            self._paint_page_surface(ctx, surface, x, y, w, h)
+        else:
+            ctx.set_source_rgb(1, 1, 1)
+            ctx.rectangle(x, y, w, h)
+            ctx.fill()
+
+    def _paint_page_surface(self, ctx, surface, x, y, w, h):
+        """
+        Paint a rendered page into its layout rectangle.
+
+        The surface is scaled to the rectangle, so a page rendered at a
+        slightly different zoom (the same cache bucket) still fits.
+
+        Args:
+            ctx: cairo.Context of the canvas.
+            surface: cairo.ImageSurface of the page.
+            x, y, w, h: Page rectangle in canvas coordinates.
+        """
+        ctx.save()
+        ctx.translate(x, y)
+        ctx.scale(w / surface.get_width(), h / surface.get_height())
+        ctx.set_source_surface(surface, 0, 0)
+        ctx.paint()
+        ctx.restore()
 
     def _update_current_page_from_scroll(self, layout, vis_y, vis_h):
         """Determine which page is most visible and update current_page."""
-        if not layout:
+        best_page = layout.nearest_page(vis_y + vis_h / 2)
+        if best_page is None:
             return
 
-        mid_y = vis_y + vis_h / 2
-        best_page = 0
-        best_dist = float("inf")
-
-        for page_idx, x, y, w, h in layout:
-            page_mid = y + h / 2
-            dist = abs(page_mid - mid_y)
-            if dist < best_dist:
-                best_dist = dist
-                best_page = page_idx
-
         if best_page != self.current_page:
             self.current_page = best_page
             self._update_page_controls()
@@ -813,10 +963,11 @@ class PDFViewerApp:
         Returns (page_index, lx, ly) or (None, 0, 0) if outside any page.
         """
         layout = self._get_page_layout()
-        for page_idx, px, py, pw, ph in layout:
-            if px <= cx <= px + pw and py <= cy <= py + ph:
-                return (page_idx, cx - px, cy - py)
-        return (None, 0, 0)
+        page_idx = layout.page_at(cx, cy)
+        if page_idx is None:
+            return (None, 0, 0)
+        px, py, _, _ = layout.rect(page_idx)
+        return (page_idx, cx - px, cy - py)
 
     def _on_canvas_button_press(self, widget, event):
         """Handle mouse button press on the canvas."""
@@ -1178,15 +1329,18 @@ class PDFViewerApp:
 
             if response == Gtk.ResponseType.YES:
                 self._on_save(None)
+                self._stop_render_worker()
                 Gtk.main_quit()
                 return False
             elif response == Gtk.ResponseType.NO:
+                self._stop_render_worker()
                 Gtk.main_quit()
                 return False
             else:
                 # Cancel close
                 return True
 
+        self._stop_render_worker()
         Gtk.main_quit()
         return False
 
@@ -0,0 +1,115 @@
+"""
+madOS PDF Viewer - Page Layout
+
+Positions of the pages of a document stacked vertically in the continuous
+view.  Offsets are computed once per zoom from page sizes read at load
+time, and pages are looked up by position with a binary search, so a draw
+or a click costs O(log n) however long the document is.
+
+Provides:
+  - PageLayout: page rectangles at one zoom, with position lookups.
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+
+class PageLayout:
+    """
+    Page rectangles of a document at one zoom.
+
+    Pages are stacked top to bottom with *gap* pixels between them (half
+    a gap above the first page and below the last) and centred on the
+    widest page.
+
+    Attributes:
+        zoom: Zoom factor the layout was computed for.
+        width: Canvas width needed, i.e. the widest page.
+        height: Canvas height needed.
+    """
+
+    def __init__(self, page_sizes, zoom, gap):
+        """
+        Args:
+            page_sizes: (width, height) in points of every page.
+            zoom: Zoom factor (1.0 = 100%).
+            gap: Pixels between pages.
+        """
+        self.zoom = zoom
+        self._widths = [int(math.ceil(pw * zoom)) for pw, _ in page_sizes]
+        self._heights = [int(math.ceil(ph * zoom)) for _, ph in page_sizes]
+        self.width = max(self._widths, default=0)
+        self.height = sum(self._heights) + gap * len(self._heights)
+        # Page i spans _tops[i] .. _bottoms[i]; both lists are increasing
+        self._tops = list(accumulate((h + gap for h in self._heights), initial=gap // 2))[:-1]
+        self._bottoms = [top + h for top, h in zip(self._tops, self._heights)]
+        self._middles = [top + h / 2 for top, h in zip(self._tops, self._heights)]
+
+    def __len__(self):
+        return len(self._heights)
+
+    def rect(self, page_index):
+        """
+        Return the rectangle of a page.
+
+        Args:
+            page_index: 0-based page number.
+
+        Returns:
+            ``(x, y, width, height)`` in canvas pixels.
+        """
+        w = self._widths[page_index]
+        return (max((self.width - w) // 2, 0), self._tops[page_index], w, self._heights[page_index])
+
+    def visible(self, top, bottom):
+        """
+        Return the pages that overlap the band ``top..bottom``.
+
+        Args:
+            top: Upper edge of the band in canvas pixels.
+            bottom: Lower edge of the band in canvas pixels.
+
+        Returns:
+            A range of page indices, empty if no page overlaps.
+        """
+        first = bisect_left(self._bottoms, top)
+        last = bisect_right(self._tops, bottom)
+        return range(first, max(first, last))
+
+    def page_at(self, x, y):
+        """
+        Return the page under a canvas point.
+
+        Args:
+            x, y: Canvas coordinates.
+
+        Returns:
+            The page index, or None between or beside pages.
+        """
+        index = bisect_right(self._tops, y) - 1
+        if index < 0 or y > self._bottoms[index]:
+            return None
+        px, _, w, _ = self.rect(index)
+        if not px <= x <= px + w:
+            return None
+        return index
+
+    def nearest_page(self, y):
+        """
+        Return the page whose middle is closest to *y*.
+
+        Args:
+            y: Canvas y coordinate, normally the middle of the viewport.
+
+        Returns:
+            The page index (the earlier page on a tie), or None if empty.
+        """
+        if not self._middles:
+            return None
+        index = bisect_left(self._middles, y)
+        if index == len(self._middles):
+            return index - 1
+        if index > 0 and y - self._middles[index - 1] <= self._middles[index] - y:
+            return index - 1
+        return index
@@ -0,0 +1,177 @@
+"""
+madOS PDF Viewer - Page Surface Cache
+
+Keeps rendered pages in memory within a fixed byte budget, so memory use
+does not grow with the length of the document or the zoom level.
+
+Provides:
+  - zoom_bucket: quantizes a zoom factor into a cache key component.
+  - PageSurfaceCache: LRU of cairo surfaces keyed by (page, zoom bucket, tile).
+"""
+
+import math
+from collections import OrderedDict
+
+# ── Defaults ──────────────────────────────────────────────────────────────────
+
+# Memory budget for rendered page surfaces (bytes)
+PAGE_CACHE_BYTES = 256 * 1024 * 1024
+
+# Zoom buckets per 1.0 of zoom; 0.1% steps keep a page within a pixel
+ZOOM_BUCKETS = 1000
+
+# Pages kept around the visible ones when far pages are evicted
+PAGE_CACHE_RADIUS = 8
+
+
+def zoom_bucket(zoom):
+    """
+    Return the cache bucket of a zoom factor.
+
+    Args:
+        zoom: Zoom factor (1.0 = 100%).
+
+    Returns:
+        An int; zooms that differ by less than a bucket share it.
+    """
+    return int(round(zoom * ZOOM_BUCKETS))
+
+
+def surface_bytes(surface):
+    """Return the memory held by a cairo ImageSurface's pixels."""
+    return surface.get_stride() * surface.get_height()
+
+
+class PageSurfaceCache:
+    """
+    Byte-budgeted LRU of rendered page surfaces.
+
+    Entries are keyed by (page index, zoom bucket, tile), so surfaces
+    rendered at an earlier zoom stay available to be scaled for display
+    while the page is rendered at the new one.  The tile is None for a
+    whole page, or the ``(column, row)`` of a tile at high zoom.
+
+    Attributes:
+        budget: Maximum bytes of cached surfaces.
+    """
+
+    def __init__(self, budget=PAGE_CACHE_BYTES):
+        self.budget = budget
+        self._entries = OrderedDict()  # (page, bucket, tile) -> surface, LRU first
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def bytes_used(self):
+        """Total size of the cached surfaces."""
+        return self._bytes
+
+    def get(self, page_index, zoom, tile=None):
+        """
+        Return the surface of a page rendered at *zoom*, or None.
+
+        Args:
+            page_index: 0-based page number.
+            zoom: Zoom factor.
+            tile: ``(column, row)`` of a tile, or None for the whole page.
+        """
+        key = (page_index, zoom_bucket(zoom), tile)
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+        return surface
+
+    def put(self, page_index, zoom, surface, tile=None):
+        """
+        Store a rendered page, evicting the least recently used pages.
+
+        The new surface is always kept, even if it alone exceeds the
+        budget, so the visible page can be drawn.
+
+        Args:
+            page_index: 0-based page number.
+            zoom: Zoom factor the surface was rendered at.
+            surface: cairo.ImageSurface.
+            tile: ``(column, row)`` of a tile, or None for the whole page.
+        """
+        key = (page_index, zoom_bucket(zoom), tile)
+        self._remove(key)
+        self._entries[key] = surface
+        self._bytes += surface_bytes(surface)
+        while self._bytes > self.budget and len(self._entries) > 1:
+            self._remove(next(iter(self._entries)))
+
+    def nearest(self, page_index, zoom):
+        """
+        Return the cached whole-page surface closest to *zoom*.
+
+        Meant as a stand-in, scaled for display, while the page is not
+        available at *zoom*.  Surfaces rendered at a higher zoom win ties,
+        as scaling them down stays sharp.
+
+        Args:
+            page_index: 0-based page number.
+            zoom: Wanted zoom factor.
+
+        Returns:
+            A cairo.ImageSurface, or None if the page is not cached.
+        """
+        bucket = self._nearest_bucket(page_index, zoom, tiled=False)
+        if bucket is None:
+            return None
+        return self._entries[(page_index, bucket, None)]
+
+    def nearest_tile_zoom(self, page_index, zoom):
+        """
+        Return the zoom closest to *zoom* at which a page has cached tiles.
+
+        The tiles can then be fetched with :meth:`get` and scaled while
+        the page is not rendered at *zoom*.
+
+        Args:
+            page_index: 0-based page number.
+            zoom: Wanted zoom factor.
+
+        Returns:
+            A zoom factor, or None if no tiles of the page are cached.
+        """
+        bucket = self._nearest_bucket(page_index, zoom, tiled=True)
+        if bucket is None:
+            return None
+        return bucket / ZOOM_BUCKETS
+
+    def _nearest_bucket(self, page_index, zoom, tiled):
+        """Return the cached zoom bucket of a page closest to *zoom*."""
+        wanted = zoom_bucket(zoom)
+        best, best_key = None, None
+        for page, bucket, tile in self._entries:
+            if page != page_index or (tile is not None) != tiled or bucket <= 0:
+                continue
+            # Distance in zoom ratio, so 50% -> 100% equals 100% -> 200%
+            key = (abs(math.log(bucket / max(wanted, 1))), -bucket)
+            if best_key is None or key < best_key:
+                best, best_key = bucket, key
+        return best
+
+    def retain(self, first_page, last_page):
+        """
+        Evict the pages outside ``first_page..last_page`` (inclusive).
+
+        Args:
+            first_page: First page index to keep.
+            last_page: Last page index to keep.
+        """
+        for key in [k for k in self._entries if not first_page <= k[0] <= last_page]:
+            self._remove(key)
+
+    def clear(self):
+        """Drop all surfaces."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key):
+        surface = self._entries.pop(key, None)
+        if surface is not None:
+            self._bytes -= surface_bytes(surface)
@@ -6,7 +6,8 @@ and cairo for compositing annotations on top of rendered pages.
 
 Provides:
   - PDFDocument: loads a PDF, exposes pages, metadata, form fields.
-  - PageRenderer: renders a single page at a given scale to a cairo surface.
+  - PageRenderer: renders a single page, or one tile of it, at a given
+    scale to a cairo surface.
 """
 
 import os
@@ -19,6 +20,8 @@ gi.require_version("Poppler", "0.18")
 gi.require_version("Gtk", "3.0")
 from gi.repository import Poppler, GLib
 
+from .tiles import TILE_SIZE, tile_rect
+
 
 class PDFDocument:
     """
@@ -29,6 +32,7 @@ class PDFDocument:
         filepath:   The filesystem path of the loaded document.
         document:   The underlying Poppler.Document.
         n_pages:    Number of pages in the document.
+        page_sizes: (width, height) in points of every page, read on load.
     """
 
     def __init__(self):
@@ -36,6 +40,7 @@ class PDFDocument:
         self.filepath = None
         self.document = None
         self.n_pages = 0
+        self.page_sizes = []
 
     def load(self, filepath):
         """
@@ -62,6 +67,8 @@ class PDFDocument:
         self.filepath = filepath
         self.document = doc
         self.n_pages = doc.get_n_pages()
+        # Read once: layout and hit-testing need every page's size
+        self.page_sizes = [doc.get_page(i).get_size() for i in range(self.n_pages)]
 
     def get_page(self, index):
         """
@@ -87,10 +94,9 @@ class PDFDocument:
         Returns:
             Tuple (width, height) in points, or (0, 0) if invalid.
         """
-        page = self.get_page(index)
-        if page is None:
+        if index < 0 or index >= len(self.page_sizes):
             return (0.0, 0.0)
-        return page.get_size()
+        return self.page_sizes[index]
 
     def get_form_fields(self, index):
         """
@@ -189,6 +195,50 @@ class PageRenderer:
 
         return surface
 
+    def render_tile(self, page_index, scale, tile, tile_size=TILE_SIZE):
+        """
+        Render one tile of a page to a cairo ImageSurface.
+
+        The context is translated to the tile and clipped to it, so the
+        surface is never larger than a tile however far the page is zoomed.
+
+        Args:
+            page_index: 0-based page number.
+            scale: Zoom factor (1.0 = 100%).
+            tile: ``(column, row)`` of the tile, see :mod:`tiles`.
+            tile_size: Tile edge in device pixels.
+
+        Returns:
+            A cairo.ImageSurface with the rendered tile, or None.
+        """
+        page = self.pdf_doc.get_page(page_index)
+        if page is None:
+            return None
+
+        pw, ph = page.get_size()
+        page_w = int(math.ceil(pw * scale))
+        page_h = int(math.ceil(ph * scale))
+        x, y, tile_w, tile_h = tile_rect(tile, page_w, page_h, tile_size)
+        if tile_w <= 0 or tile_h <= 0:
+            return None
+
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, tile_w, tile_h)
+        ctx = cairo.Context(surface)
+
+        # White background
+        ctx.set_source_rgb(1.0, 1.0, 1.0)
+        ctx.rectangle(0, 0, tile_w, tile_h)
+        ctx.fill()
+
+        # Clip to the tile, so Poppler skips what lies outside it
+        ctx.rectangle(0, 0, tile_w, tile_h)
+        ctx.clip()
+        ctx.translate(-x, -y)
+        ctx.scale(scale, scale)
+        page.render(ctx)
+
+        return surface
+
     def render_page_with_annotations(
         self, page_index, scale, annotations, signatures, form_data, highlight_fields
     ):
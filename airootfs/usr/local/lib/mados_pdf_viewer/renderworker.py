@@ -0,0 +1,161 @@
+"""
+madOS PDF Viewer - Background Page Rendering
+
+Renders pages off the GTK main loop, so scrolling into complex pages
+(scans, vector maps) never waits for Poppler.
+
+Provides:
+  - open_renderer: opens a private PageRenderer for a PDF file.
+  - PageRenderWorker: a render thread with a prioritized page queue.
+
+The worker opens its own Poppler.Document: a document is not safe to use
+from two threads, and the main thread keeps querying page sizes and form
+fields of its own copy.
+"""
+
+import threading
+
+import gi
+
+gi.require_version("Gtk", "3.0")
+from gi.repository import GLib
+
+from .pagecache import zoom_bucket
+from .renderer import PDFDocument, PageRenderer
+
+# Pages past the viewport rendered ahead in the scroll direction
+PREFETCH_AHEAD = 2
+
+# Pages rendered behind the viewport, after those ahead
+PREFETCH_BEHIND = 1
+
+
+def open_renderer(filepath):
+    """
+    Open a PDF for rendering on the calling thread.
+
+    Args:
+        filepath: Path to the PDF file.
+
+    Returns:
+        A PageRenderer over a newly loaded PDFDocument.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        RuntimeError: If Poppler cannot parse the file.
+    """
+    doc = PDFDocument()
+    doc.load(filepath)
+    return PageRenderer(doc)
+
+
+class PageRenderWorker:
+    """
+    Renders pages of one document on a background thread.
+
+    The queue holds the pages, or page tiles, wanted now, highest
+    priority first.  Each call to :meth:`schedule` replaces it, so pages
+    that scrolled out of view are dropped before they are rendered.  A
+    page already being rendered is finished and still delivered, unless
+    :meth:`cancel` was called since, e.g. because the zoom changed.
+
+    Attributes:
+        on_rendered: Called on the main loop as
+                     ``on_rendered(page_index, tile, zoom, surface)``.
+    """
+
+    def __init__(self, filepath, on_rendered, renderer_factory=open_renderer):
+        """
+        Args:
+            filepath: Path to the PDF file.
+            on_rendered: Completion callback, see :attr:`on_rendered`.
+            renderer_factory: Callable ``renderer_factory(filepath)``
+                              returning an object with ``render_page``.
+        """
+        self.on_rendered = on_rendered
+        self._filepath = filepath
+        self._renderer_factory = renderer_factory
+        self._cond = threading.Condition()
+        self._queue = []  # [(page_index, tile, zoom)], highest priority first
+        self._running = None  # (page_index, zoom bucket, tile) being rendered
+        self._failed = set()  # (page_index, zoom bucket, tile) that did not render
+        self._generation = 0  # bumped by cancel(); older results are dropped
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="pdf-render", daemon=True)
+        self._thread.start()
+
+    def schedule(self, jobs, zoom):
+        """
+        Replace the queue with *jobs* rendered at *zoom*.
+
+        Args:
+            jobs: ``(page_index, tile)`` pairs in priority order; the tile
+                  is None for a whole page, or its ``(column, row)``.
+            zoom: Zoom factor to render at.
+        """
+        bucket = zoom_bucket(zoom)
+        with self._cond:
+            self._queue = [
+                (page, tile, zoom)
+                for page, tile in jobs
+                if (page, bucket, tile) != self._running
+                and (page, bucket, tile) not in self._failed
+            ]
+            self._cond.notify()
+
+    def pending(self):
+        """Return the queued ``(page_index, tile, zoom)`` requests in order."""
+        with self._cond:
+            return list(self._queue)
+
+    def cancel(self):
+        """Drop the queue and the result of the page being rendered."""
+        with self._cond:
+            self._queue = []
+            self._running = None
+            self._generation += 1
+
+    def shutdown(self):
+        """Stop the thread after the page being rendered; drop the queue."""
+        with self._cond:
+            self._closed = True
+            self._queue = []
+            self._cond.notify()
+
+    def _run(self):
+        """Worker thread: render queued pages until shut down."""
+        try:
+            renderer = self._renderer_factory(self._filepath)
+        except Exception as exc:
+            print(f"Cannot open {self._filepath} for rendering: {exc}")
+            return
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                page, tile, zoom = self._queue.pop(0)
+                key = (page, zoom_bucket(zoom), tile)
+                generation = self._generation
+                self._running = key
+            try:
+                if tile is None:
+                    surface = renderer.render_page(page, zoom)
+                else:
+                    surface = renderer.render_tile(page, zoom, tile)
+            except Exception as exc:
+                print(f"Error rendering page {page + 1}: {exc}")
+                surface = None
+            with self._cond:
+                if surface is None:
+                    self._failed.add(key)
+                self._running = None
+            if surface is not None:
+                GLib.idle_add(self._deliver, generation, page, tile, zoom, surface)
+
+    def _deliver(self, generation, page, tile, zoom, surface):
+        """Main-loop handler: pass a current rendered page on."""
+        if not self._closed and generation == self._generation:
+            self.on_rendered(page, tile, zoom, surface)
+        return False
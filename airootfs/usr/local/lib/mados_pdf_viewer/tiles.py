@@ -0,0 +1,71 @@
+"""
+madOS PDF Viewer - Page Tiles
+
+Geometry of the fixed-size tiles a page is split into at high zoom, so
+that only the part of a page in the viewport is rendered and memory use
+follows the screen size rather than the zoomed page size.
+
+Tiles are addressed by ``(column, row)`` in device pixels of the page
+at the current zoom; the last column and row may be narrower.
+"""
+
+import math
+
+# Tile edge in device pixels
+TILE_SIZE = 512
+
+# Pages larger than this at the current zoom are rendered as tiles
+# (2048 x 2048 is a 16 MiB ARGB32 surface)
+TILED_PAGE_PIXELS = 2048 * 2048
+
+
+def is_tiled(width, height):
+    """
+    Return True if a page of *width* x *height* device pixels is tiled.
+
+    Args:
+        width: Page width at the current zoom.
+        height: Page height at the current zoom.
+    """
+    return width * height > TILED_PAGE_PIXELS
+
+
+def tile_rect(tile, width, height, tile_size=TILE_SIZE):
+    """
+    Return the rectangle a tile covers on its page.
+
+    Args:
+        tile: ``(column, row)`` of the tile.
+        width: Page width in device pixels.
+        height: Page height in device pixels.
+        tile_size: Tile edge in device pixels.
+
+    Returns:
+        ``(x, y, w, h)`` in device pixels relative to the page origin.
+    """
+    column, row = tile
+    x, y = column * tile_size, row * tile_size
+    return x, y, min(tile_size, width - x), min(tile_size, height - y)
+
+
+def visible_tiles(width, height, left, top, right, bottom, tile_size=TILE_SIZE):
+    """
+    Return the tiles of a page that overlap a rectangle.
+
+    Args:
+        width: Page width in device pixels.
+        height: Page height in device pixels.
+        left, top, right, bottom: Rectangle relative to the page origin,
+                                  normally the viewport.
+        tile_size: Tile edge in device pixels.
+
+    Returns:
+        List of ``(column, row)`` tuples, row by row.
+    """
+    left, top = max(left, 0), max(top, 0)
+    right, bottom = min(right, width), min(bottom, height)
+    if right <= left or bottom <= top:
+        return []
+    columns = range(int(left // tile_size), int(math.ceil(right / tile_size)))
+    rows = range(int(top // tile_size), int(math.ceil(bottom / tile_size)))
+    return [(column, row) for row in rows for column in columns]
@@ -10,7 +10,23 @@ Modules:
     app         - Main application window and toolbar
     canvas      - Image display canvas with zoom, pan, and drawing overlay
     tools       - Drawing and editing tools (paint, text, blur, pixelate, eraser)
+    effects     - Tiled, cached rendering of blur/pixelate strokes
+    pyramid     - Cached cairo surface mipmaps for fast pan and zoom
+    animation   - Animated GIF/WebP playback with a bounded frame cache
     navigator   - File navigation within directories
+    thumbnails  - Freedesktop-compliant thumbnail cache with background generation
+    thumbview   - Virtualized thumbnail grid and filmstrip
+    imagecache  - Byte-budgeted decoded image cache and background prefetcher
+    saver       - Background, atomic save pipeline with progress reporting
+    exif        - Header-only EXIF reader (date taken, orientation, camera)
+    metadata    - SQLite metadata cache and background indexer
+    similarity  - Perceptual hashes and BK-tree search for similar photos
+    duplicates  - Dialog listing similar photos for bulk deletion
+    slideshow   - Full-screen slideshow with decode-ahead and crossfades
+    wallpaper   - Per-output, cover-cropped wallpaper copies
+    batch       - Multi-process batch resize and format conversion
+    histogram   - Sampled RGB/luma histogram and exposure statistics
+    batch_dialog - Dialog setting up and tracking a batch export
     video_player - GStreamer-based video playback
     translations - Internationalization for 6 languages
     theme       - Nord color theme CSS for GTK3
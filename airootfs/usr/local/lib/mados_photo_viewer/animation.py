@@ -0,0 +1,192 @@
+"""
+madOS Photo Viewer - Animated Images
+======================================
+
+Plays animated GIF files (and animated WebP when the WebP pixbuf loader
+is installed) on the image canvas.
+
+    - GdkPixbuf's animation iterator decides which frame is due.  It is
+      advanced on a virtual clock fed from the canvas frame clock, so
+      the animation only moves while the canvas is on screen and
+      resumes where it stopped instead of skipping ahead.
+    - The iterator composites every frame into a pixbuf that it reuses,
+      so frames are identified by a fingerprint of their pixels.  Each
+      distinct frame is converted to a :class:`~.pyramid.RenderPyramid`
+      once and kept while the frames fit in the cache budget; frames
+      past the budget are converted when shown and then dropped.
+"""
+
+import os
+
+import gi
+
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import GdkPixbuf, GLib
+
+from .pyramid import RenderPyramid
+
+# Extensions whose files may hold more than one frame
+ANIMATED_EXTENSIONS = frozenset({".gif", ".webp"})
+
+# Memory budget for the converted frames of one animation (bytes)
+ANIMATION_CACHE_BYTES = 96 * 1024 * 1024
+
+# Shortest frame delay honoured; 0 ms GIF delays mean "as fast as possible"
+MIN_FRAME_DELAY_MS = 20
+
+# Largest clock step between two ticks, so a stalled frame clock does not
+# make the animation jump
+MAX_STEP_US = 100_000
+
+
+def is_animation_candidate(filepath):
+    """Return True if *filepath* has an extension that can be animated."""
+    return os.path.splitext(filepath)[1].lower() in ANIMATED_EXTENSIONS
+
+
+def load_animation(filepath):
+    """Load *filepath* as an animation.
+
+    Meant to run on a worker thread, as GdkPixbuf reads every frame.
+
+    Args:
+        filepath: Path to the image file.
+
+    Returns:
+        The GdkPixbuf.PixbufAnimation, or None if the file has a single
+        frame or cannot be read.
+    """
+    try:
+        animation = GdkPixbuf.PixbufAnimation.new_from_file(filepath)
+    except Exception as e:
+        print(f"Error loading animation: {e}")
+        return None
+    if animation.is_static_image():
+        return None
+    return animation
+
+
+def frame_fingerprint(pixbuf):
+    """Return a key identifying the pixels of a frame."""
+    data = pixbuf.read_pixel_bytes().get_data()
+    return (pixbuf.get_width(), pixbuf.get_height(), hash(data))
+
+
+def _timeval(us):
+    """Return a GLib.TimeVal for a time in microseconds."""
+    tv = GLib.TimeVal()
+    tv.tv_sec = us // 1_000_000
+    tv.tv_usec = us % 1_000_000
+    return tv
+
+
+class FrameCache:
+    """Converted frames of one animation, admitted until a byte budget.
+
+    Frames are never evicted: once the budget is reached, further frames
+    are simply not stored.  An animation that loops through more frames
+    than fit would evict every frame before it comes round again under
+    LRU, whereas this way the frames that fit always hit.
+
+    Args:
+        budget: Maximum bytes of stored surfaces.
+    """
+
+    def __init__(self, budget=ANIMATION_CACHE_BYTES):
+        self.budget = budget
+        self._frames = {}  # fingerprint -> RenderPyramid
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._frames)
+
+    @property
+    def bytes_used(self):
+        """Total size of the stored surfaces."""
+        return self._bytes
+
+    def get(self, key):
+        """Return the stored frame for *key*, or None."""
+        return self._frames.get(key)
+
+    def put(self, key, pyramid):
+        """Store *pyramid* if it fits in the budget.
+
+        Returns:
+            True if the frame was stored.
+        """
+        size = pyramid.width * pyramid.height * 4
+        if self._bytes + size > self.budget:
+            return False
+        self._frames[key] = pyramid
+        self._bytes += size
+        return True
+
+    def clear(self):
+        """Drop all frames."""
+        self._frames.clear()
+        self._bytes = 0
+
+
+class AnimationPlayer:
+    """Steps a PixbufAnimation on a virtual clock.
+
+    Attributes:
+        pyramid: :class:`~.pyramid.RenderPyramid` of the current frame.
+
+    Args:
+        animation: The GdkPixbuf.PixbufAnimation.
+        cache: :class:`FrameCache` for converted frames.
+        make_pyramid: Callable converting a pixbuf to a pyramid.
+    """
+
+    def __init__(self, animation, cache=None, make_pyramid=RenderPyramid):
+        self._cache = cache if cache is not None else FrameCache()
+        self._make_pyramid = make_pyramid
+        self._clock_us = 0
+        self._iter = animation.get_iter(_timeval(0))
+        self._due_us = self._next_due()
+        self.pyramid = self._current_pyramid()
+
+    @property
+    def finished(self):
+        """True once a non-looping animation has shown its last frame."""
+        return self._due_us is None
+
+    def advance(self, elapsed_us):
+        """Move the clock forward by the time since the last call.
+
+        Args:
+            elapsed_us: Microseconds since the previous call.
+
+        Returns:
+            True if a new frame is now current.
+        """
+        if self._due_us is None:
+            return False
+        self._clock_us += max(0, min(elapsed_us, MAX_STEP_US))
+        if self._clock_us < self._due_us:
+            return False
+        self._iter.advance(_timeval(self._clock_us))
+        self._due_us = self._next_due()
+        pyramid = self._current_pyramid()
+        changed = pyramid is not self.pyramid
+        self.pyramid = pyramid
+        return changed
+
+    def _next_due(self):
+        """Return the clock time the current frame ends, or None."""
+        delay = self._iter.get_delay_time()
+        if delay < 0:
+            return None
+        return self._clock_us + max(delay, MIN_FRAME_DELAY_MS) * 1000
+
+    def _current_pyramid(self):
+        """Return the current frame, converting it if not cached."""
+        pixbuf = self._iter.get_pixbuf()
+        key = frame_fingerprint(pixbuf)
+        pyramid = self._cache.get(key)
+        if pyramid is None:
+            pyramid = self._make_pyramid(pixbuf)
+            self._cache.put(key, pyramid)
+        return pyramid
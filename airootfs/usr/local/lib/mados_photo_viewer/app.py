@@ -7,7 +7,12 @@ The primary application window that integrates all components:
     - Contextual edit options bar (color + size, shown when editing)
     - Central canvas for image display and editing
     - Video player that replaces the canvas for video files
+    - Thumbnail filmstrip and full thumbnail grid for the current folder
     - Status bar with file info, position, and zoom level
+    - Side panel with the EXIF metadata of the current image, and
+      sorting by date taken, both served by the metadata index
+    - Finder for duplicate and near-duplicate photos in the folder
+    - Full-screen slideshow with crossfades between decoded-ahead slides
     - Keyboard shortcuts for all major actions
     - Language selection for i18n
 
@@ -33,10 +38,13 @@ from .tools import (
     TOOL_BLUR,
     TOOL_PIXELATE,
     TOOL_ERASER,
-    compose_edits_onto_pixbuf,
 )
+from .saver import ImageSaver, DEFAULT_JPEG_QUALITY, DEFAULT_PNG_COMPRESSION
 from .navigator import (
+    DirectoryWatcher,
     FileNavigator,
+    date_sort_key,
+    sort_key,
     is_image_file,
     is_video_file,
     IMAGE_EXTENSIONS,
@@ -44,9 +52,26 @@ from .navigator import (
     ALL_EXTENSIONS,
 )
 from .video_player import VideoPlayer, GST_AVAILABLE
+from .thumbnails import ThumbnailCache
+from .imagecache import ImageLoader
+from .metadata import MetadataIndexer, open_cache
+from .similarity import SimilarityScanner, open_index
+from .duplicates import SimilarPhotosDialog
+from .batch import BatchExporter
+from .batch_dialog import BatchExportDialog
+from .slideshow import SlideshowView
+from .wallpaper import WallpaperPreparer, query_outputs, sway_quote
+from .histogram import HistogramView, HistogramWorker, NUMPY_AVAILABLE
+from .thumbview import ThumbnailView, MODE_GRID, MODE_FILMSTRIP
 from .translations import get_text, detect_system_language, DEFAULT_LANGUAGE
 from .theme import apply_theme, NORD
 
+# Number of images decoded ahead in the navigation direction
+PREFETCH_AHEAD = 2
+
+# Rows of the metadata side panel (translation keys)
+INFO_FIELDS = ("date_taken", "camera", "dimensions", "file_size")
+
 
 class PhotoViewerApp(Gtk.Window):
     """Main application window for the madOS Photo Viewer."""
@@ -65,7 +90,23 @@ class PhotoViewerApp(Gtk.Window):
         # State
         self._language = detect_system_language()
         self._navigator = FileNavigator()
+        self._dir_watcher = None  # Keeps the navigator listing current
         self._current_mode = "image"  # 'image' or 'video'
+        self._thumb_cache = ThumbnailCache()
+        self._thumb_names = None  # Listing currently shown in thumbnail views
+        self._image_loader = ImageLoader()
+        self._nav_direction = 1  # +1 forward, -1 backward
+        self._saver = ImageSaver()
+        self._quit_after_save = False
+        self._jpeg_quality = DEFAULT_JPEG_QUALITY
+        self._png_compression = DEFAULT_PNG_COMPRESSION
+        self._metadata = MetadataIndexer(open_cache())
+        self._metadata.on_updated = self._on_metadata_updated
+        self._similarity = None  # Created on first use
+        self._exporter = None  # Created on first use
+        self._histogram = HistogramWorker()
+        self._histogram_key = None  # (filepath, edit version) last requested
+        self._wallpapers = WallpaperPreparer()
 
         # Window properties
         self.set_default_size(900, 700)
@@ -88,8 +129,12 @@ class PhotoViewerApp(Gtk.Window):
         # Show everything
         self.show_all()
 
-        # Hide edit options bar by default
+        # Hide edit options bar and filmstrip by default
         self._edit_options_bar.set_visible(False)
+        self._filmstrip.set_visible(False)
+
+        # First-tier decodes are sized to the screen
+        self._image_loader.preview_size = self._screen_size()
 
         # Open initial file if provided
         if initial_file and os.path.isfile(initial_file):
@@ -122,12 +167,34 @@ class PhotoViewerApp(Gtk.Window):
         toolbar.insert(btn, -1)
         return btn
 
+    def _add_toggle_button(self, toolbar, icon_name, tooltip_key, callback):
+        """Add an icon toggle button to the toolbar with a translated tooltip.
+
+        Args:
+            toolbar: The Gtk.Toolbar to add the button to.
+            icon_name: GTK icon name string.
+            tooltip_key: Translation key for the tooltip.
+            callback: Toggled callback function.
+
+        Returns:
+            The created Gtk.ToggleToolButton.
+        """
+        btn = Gtk.ToggleToolButton()
+        btn.set_icon_name(icon_name)
+        btn.set_tooltip_text(self._t(tooltip_key))
+        btn.set_label(self._t(tooltip_key))
+        btn.set_is_important(True)
+        btn.connect("toggled", callback)
+        toolbar.insert(btn, -1)
+        return btn
+
     def _build_toolbar(self):
         """Build the single icon toolbar with all controls."""
         toolbar = Gtk.Toolbar()
         toolbar.set_style(Gtk.ToolbarStyle.ICONS)
         toolbar.set_icon_size(Gtk.IconSize.SMALL_TOOLBAR)
         self._main_box.pack_start(toolbar, False, False, 0)
+        self._toolbar = toolbar
 
         # ── File operations ───────────────────────────────────────────
         self._add_tool_button(toolbar, "document-open", "open", lambda w: self._on_open())
@@ -144,6 +211,25 @@ class PhotoViewerApp(Gtk.Window):
             toolbar, "go-next", "next_image", lambda w: self._on_next()
         )
 
+        self._btn_grid = self._add_toggle_button(
+            toolbar, "view-grid-symbolic", "thumbnails", self._on_grid_toggled
+        )
+        self._btn_sort_date = self._add_toggle_button(
+            toolbar, "x-office-calendar-symbolic", "sort_by_date", self._on_sort_toggled
+        )
+        self._btn_info = self._add_toggle_button(
+            toolbar, "dialog-information-symbolic", "file_info", self._on_info_toggled
+        )
+        self._btn_similar = self._add_tool_button(
+            toolbar, "edit-find-symbolic", "similar_photos", lambda w: self._on_find_similar()
+        )
+        self._btn_slideshow = self._add_tool_button(
+            toolbar, "media-playback-start-symbolic", "slideshow", lambda w: self._on_slideshow()
+        )
+        self._btn_batch = self._add_tool_button(
+            toolbar, "document-export-symbolic", "batch_export", lambda w: self._on_batch_export()
+        )
+
         toolbar.insert(Gtk.SeparatorToolItem(), -1)
 
         # ── Zoom ──────────────────────────────────────────────────────
@@ -252,6 +338,7 @@ class PhotoViewerApp(Gtk.Window):
         # Image canvas
         self._canvas = ImageCanvas()
         self._canvas.on_edits_changed = self._on_edits_changed
+        self._canvas.on_full_resolution_needed = self._on_full_resolution_needed
         # Wrap in a frame for a subtle border
         canvas_frame = Gtk.Frame()
         canvas_frame.set_shadow_type(Gtk.ShadowType.NONE)
@@ -262,8 +349,71 @@ class PhotoViewerApp(Gtk.Window):
         self._video_player = VideoPlayer()
         self._content_stack.add_named(self._video_player, "video")
 
+        # Thumbnail grid for the whole folder
+        self._thumb_grid = ThumbnailView(self._thumb_cache, MODE_GRID)
+        self._thumb_grid.on_activate = self._on_thumbnail_activated
+        self._content_stack.add_named(self._thumb_grid, "grid")
+
+        # Full-screen slideshow
+        self._slideshow = SlideshowView(self._navigator)
+        self._slideshow.on_advanced = self._update_title
+        self._slideshow.on_stopped = self._stop_slideshow
+        self._content_stack.add_named(self._slideshow, "slideshow")
+
         self._content_stack.set_visible_child_name("image")
-        self._main_box.pack_start(self._content_stack, True, True, 0)
+
+        # Viewer with the metadata panel beside it
+        content_row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=0)
+        content_row.pack_start(self._content_stack, True, True, 0)
+        content_row.pack_start(self._build_info_panel(), False, False, 0)
+        self._main_box.pack_start(content_row, True, True, 0)
+
+        # Filmstrip below the viewer
+        self._filmstrip = ThumbnailView(self._thumb_cache, MODE_FILMSTRIP)
+        self._filmstrip.on_activate = self._on_thumbnail_activated
+        self._main_box.pack_start(self._filmstrip, False, False, 0)
+
+    def _build_info_panel(self):
+        """Build the (initially hidden) metadata panel.
+
+        Returns:
+            The panel widget.
+        """
+        panel = Gtk.Grid()
+        panel.set_column_spacing(8)
+        panel.set_row_spacing(4)
+        panel.get_style_context().add_class("info-panel")
+        panel.set_no_show_all(True)
+
+        self._info_labels = {}
+        for row, key in enumerate(INFO_FIELDS):
+            name = Gtk.Label(label=self._t(key))
+            name.set_xalign(1)
+            name.get_style_context().add_class("dim-label")
+            value = Gtk.Label(label="")
+            value.set_xalign(0)
+            value.set_selectable(True)
+            value.set_max_width_chars(24)
+            value.set_line_wrap(True)
+            panel.attach(name, 0, row, 1, 1)
+            panel.attach(value, 1, row, 1, 1)
+            name.show()
+            value.show()
+            self._info_labels[key] = (name, value)
+
+        self._histogram_view = HistogramView()
+        self._histogram_stats = Gtk.Label(label="")
+        self._histogram_stats.set_xalign(0)
+        self._histogram_stats.set_line_wrap(True)
+        self._histogram_stats.get_style_context().add_class("dim-label")
+        panel.attach(self._histogram_view, 0, len(INFO_FIELDS), 2, 1)
+        panel.attach(self._histogram_stats, 0, len(INFO_FIELDS) + 1, 2, 1)
+        if NUMPY_AVAILABLE:
+            self._histogram_view.show()
+            self._histogram_stats.show()
+
+        self._info_panel = panel
+        return panel
 
     def _build_status_bar(self):
         """Build the status bar at the bottom of the window."""
@@ -275,6 +425,11 @@ class PhotoViewerApp(Gtk.Window):
         self._status_filename.set_ellipsize(3)  # PANGO_ELLIPSIZE_END
         status.pack_start(self._status_filename, True, True, 4)
 
+        self._save_progress = Gtk.ProgressBar()
+        self._save_progress.set_valign(Gtk.Align.CENTER)
+        self._save_progress.set_no_show_all(True)
+        status.pack_start(self._save_progress, False, False, 4)
+
         self._status_index = Gtk.Label(label="")
         self._status_index.set_xalign(1)
         status.pack_start(self._status_index, False, False, 4)
@@ -362,8 +517,14 @@ class PhotoViewerApp(Gtk.Window):
             self._show_error(f"File not found: {filepath}")
             return
 
-        # Load directory listing
-        self._navigator.load_directory(filepath)
+        # Load directory listing; a watched listing of the same directory
+        # is already current and only needs repositioning
+        directory = os.path.dirname(filepath)
+        watched = self._dir_watcher is not None and self._dir_watcher.directory == directory
+        if not (watched and self._navigator.go_to_file(filepath)):
+            self._navigator.load_directory(filepath)
+        self._watch_directory(self._navigator.directory)
+        self._index_metadata()
 
         if is_video_file(filepath):
             self._show_video(filepath)
@@ -375,6 +536,51 @@ class PhotoViewerApp(Gtk.Window):
 
         self._update_ui_state()
 
+    def _watch_directory(self, directory):
+        """Watch *directory* for new, deleted and renamed files."""
+        if self._dir_watcher is not None:
+            if self._dir_watcher.directory == directory:
+                return
+            self._dir_watcher.stop()
+            self._dir_watcher = None
+        watcher = DirectoryWatcher(directory, self._on_directory_changed)
+        if watcher.start():
+            self._dir_watcher = watcher
+
+    def _on_directory_changed(self, added, removed):
+        """Merge directory changes into the listing and refresh the UI."""
+        for name in removed:
+            self._image_loader.invalidate(os.path.join(self._navigator.directory, name))
+        changed = self._navigator.apply_changes(added, removed)
+        # After apply_changes, which bisects with the old sort data.
+        # Files replaced in place show up as added, so re-read those too.
+        self._metadata.forget(removed)
+        self._metadata.index(self._navigator.directory, added)
+        if changed:
+            self._update_ui_state()
+
+    def _index_metadata(self):
+        """Index the metadata of a newly opened directory."""
+        directory = self._navigator.directory
+        if directory is None or directory == self._metadata.directory:
+            return
+        self._metadata.index(directory, self._navigator.filenames)
+        # Cached dates are available now, before the indexer has run
+        if self._btn_sort_date.get_active():
+            self._navigator.resort()
+
+    def _on_metadata_updated(self, names):
+        """Re-sort and refresh after the indexer read new metadata.
+
+        Args:
+            names: Names whose metadata changed.
+        """
+        resorted = self._btn_sort_date.get_active() and self._navigator.resort()
+        if resorted:
+            self._update_ui_state()
+        elif self._navigator.current_filename in names:
+            self._update_info_panel()
+
     def _show_image(self, filepath):
         """Switch to image mode and load the given image.
 
@@ -384,11 +590,77 @@ class PhotoViewerApp(Gtk.Window):
         # Stop any video playback
         self._video_player.stop()
         self._current_mode = "image"
+        self._btn_grid.set_active(False)
         self._content_stack.set_visible_child_name("image")
 
-        success = self._canvas.load_image(filepath)
-        if not success:
+        image = self._image_loader.load(filepath, self._on_image_decoded)
+        if image is not None:
+            self._canvas.set_image(filepath, image.pixbuf, image.width, image.height)
+        else:
+            self._canvas.show_loading(filepath, self._thumb_cache.lookup(filepath))
+        self._prefetch_neighbours()
+
+    def _on_image_decoded(self, filepath, image):
+        """Show a background-decoded image if it is still the one wanted.
+
+        Args:
+            filepath: Path of the decoded image.
+            image: The DecodedImage, or None on failure.
+        """
+        if self._current_mode != "image" or self._canvas.get_filepath() != filepath:
+            return
+        if self._canvas.has_image():
+            return
+        if image is None:
+            self._canvas.clear_image()
             self._show_error(f"Could not load image: {os.path.basename(filepath)}")
+        else:
+            self._canvas.set_image(filepath, image.pixbuf, image.width, image.height)
+        self._update_ui_state()
+
+    def _on_full_resolution_needed(self, filepath):
+        """Decode the full-resolution image when the canvas asks for it.
+
+        Args:
+            filepath: Path of the image shown on the canvas.
+        """
+        image = self._image_loader.load(filepath, self._on_full_image_decoded, full=True)
+        if image is not None:
+            self._canvas.upgrade_image(filepath, image.pixbuf)
+
+    def _on_full_image_decoded(self, filepath, image):
+        """Swap the full-resolution decode into the canvas.
+
+        Args:
+            filepath: Path of the decoded image.
+            image: The DecodedImage, or None on failure.
+        """
+        if image is not None:
+            self._canvas.upgrade_image(filepath, image.pixbuf)
+
+    def _screen_size(self):
+        """Return the pixel size of the monitor showing the window.
+
+        Returns:
+            Tuple (width, height) in device pixels.
+        """
+        display = Gdk.Display.get_default()
+        window = self.get_window()
+        monitor = display.get_monitor_at_window(window) if window else None
+        if monitor is None:
+            monitor = display.get_primary_monitor() or display.get_monitor(0)
+        geometry = monitor.get_geometry()
+        scale = monitor.get_scale_factor()
+        return (geometry.width * scale, geometry.height * scale)
+
+    def _prefetch_neighbours(self):
+        """Decode the next images in the current navigation direction."""
+        paths = []
+        for step in range(1, PREFETCH_AHEAD + 1):
+            path = self._navigator.peek(step * self._nav_direction)
+            if path and is_image_file(path) and path not in paths:
+                paths.append(path)
+        self._image_loader.prefetch(paths)
 
     def _show_video(self, filepath):
         """Switch to video mode and load the given video.
@@ -401,6 +673,7 @@ class PhotoViewerApp(Gtk.Window):
             return
 
         self._current_mode = "video"
+        self._btn_grid.set_active(False)
         self._content_stack.set_visible_child_name("video")
         # Hide editing options for video mode
         self._edit_options_bar.set_visible(False)
@@ -441,6 +714,7 @@ class PhotoViewerApp(Gtk.Window):
             Gtk.ResponseType.OK,
         )
         dialog.set_do_overwrite_confirmation(True)
+        dialog.set_extra_widget(self._build_save_options())
 
         # Suggest current filename
         current = self._canvas.get_filepath()
@@ -473,15 +747,37 @@ class PhotoViewerApp(Gtk.Window):
 
         response = dialog.run()
         if response == Gtk.ResponseType.OK:
+            self._jpeg_quality = self._spin_jpeg_quality.get_value_as_int()
+            self._png_compression = self._spin_png_compression.get_value_as_int()
             filepath = dialog.get_filename()
             if filepath:
                 self._save_to_file(filepath)
         dialog.destroy()
 
+    def _build_save_options(self):
+        """Build the JPEG quality / PNG compression controls for Save As."""
+        box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
+
+        box.pack_start(Gtk.Label(label=self._t("jpeg_quality")), False, False, 0)
+        self._spin_jpeg_quality = Gtk.SpinButton.new_with_range(1, 100, 1)
+        self._spin_jpeg_quality.set_value(self._jpeg_quality)
+        box.pack_start(self._spin_jpeg_quality, False, False, 0)
+
+        box.pack_start(Gtk.Label(label=self._t("png_compression")), False, False, 8)
+        self._spin_png_compression = Gtk.SpinButton.new_with_range(0, 9, 1)
+        self._spin_png_compression.set_value(self._png_compression)
+        box.pack_start(self._spin_png_compression, False, False, 0)
+
+        box.show_all()
+        return box
+
     def _save_to_file(self, filepath):
-        """Compose edits and save the result to a file.
+        """Compose edits and save the result to a file in the background.
 
-        Determines the output format from the file extension.
+        The format follows the file extension.  The edit history and the
+        effect tiles are snapshotted so editing can continue while the
+        worker composes, encodes and atomically writes the file.  Saves
+        queue behind a running one, so none is dropped.
 
         Args:
             filepath: Destination file path.
@@ -490,34 +786,52 @@ class PhotoViewerApp(Gtk.Window):
         if pixbuf is None:
             return
 
-        # Compose all edits onto the pixbuf
-        result = compose_edits_onto_pixbuf(pixbuf, self._canvas.history)
-
-        # Determine format from extension
-        _, ext = os.path.splitext(filepath)
-        ext = ext.lower()
+        source_path = None
+        effects = self._canvas.get_effect_layer()
+        if self._canvas.is_reduced:
+            # Decode the full-resolution image on the save worker; the
+            # effect tiles belong to the reduced decode and are rebuilt
+            source_path, pixbuf, effects = self._canvas.get_filepath(), None, None
+        self._save_progress.set_fraction(0.0)
+        self._save_progress.set_text(self._t("saving"))
+        self._save_progress.set_show_text(True)
+        self._save_progress.show()
+        self._saver.save(
+            filepath,
+            pixbuf,
+            self._canvas.history.snapshot(),
+            effects.snapshot() if effects is not None else None,
+            on_progress=self._on_save_progress,
+            on_done=self._on_save_done,
+            jpeg_quality=self._jpeg_quality,
+            png_compression=self._png_compression,
+            source_path=source_path,
+        )
 
-        format_map = {
-            ".png": "png",
-            ".jpg": "jpeg",
-            ".jpeg": "jpeg",
-            ".bmp": "bmp",
-            ".tiff": "tiff",
-            ".tif": "tiff",
-        }
+    def _on_save_progress(self, stage, fraction):
+        """Advance the status bar progress indicator."""
+        self._save_progress.set_fraction(fraction)
+        return False
 
-        fmt = format_map.get(ext, "png")
+    def _on_save_done(self, filepath, error):
+        """Report the outcome of a background save.
 
-        try:
-            if fmt == "jpeg":
-                result.savev(filepath, fmt, ["quality"], ["95"])
-            else:
-                result.savev(filepath, fmt, [], [])
-            self._status_filename.set_text(
-                f"{self._t('success')}: {self._t('save')} -> {os.path.basename(filepath)}"
-            )
-        except GLib.Error as e:
-            self._show_error(f"Save failed: {e.message}")
+        When closing waits for the save (see :meth:`_on_delete_event`),
+        quits after the last queued save succeeds, or stays open to show
+        the error.
+        """
+        if not self._saver.busy:
+            self._save_progress.hide()
+        if error is not None:
+            self._quit_after_save = False
+            self._show_error(f"Save failed: {error}")
+            return
+        self._image_loader.invalidate(filepath)
+        self._status_filename.set_text(
+            f"{self._t('success')}: {self._t('save')} -> {os.path.basename(filepath)}"
+        )
+        if self._quit_after_save and not self._saver.busy:
+            self._cleanup_and_quit()
 
     @staticmethod
     def _detect_compositor():
@@ -537,7 +851,10 @@ class PhotoViewerApp(Gtk.Window):
     def _on_set_wallpaper(self):
         """Set the current image as the desktop wallpaper.
 
-        Supports both Sway (via swaymsg) and Hyprland (via swaybg).
+        Supports both Sway (via swaymsg) and Hyprland (via swaybg).  The
+        image is first rendered at each output's resolution in the
+        background (see :mod:`.wallpaper`), and those copies are applied.
+        Edits are composed onto the image on the same worker, like saving.
         """
         if self._current_mode != "image":
             return
@@ -545,40 +862,80 @@ class PhotoViewerApp(Gtk.Window):
         filepath = self._canvas.get_filepath()
         if not filepath:
             return
+        filepath = os.path.abspath(filepath)
 
-        # If there are edits, save to a temp file first
+        edits = None
         if self._canvas.history.has_edits:
             pixbuf = self._canvas.get_pixbuf()
-            result = compose_edits_onto_pixbuf(pixbuf, self._canvas.history)
-            tmp_path = os.path.expanduser("~/.cache/mados-wallpaper.png")
-            os.makedirs(os.path.dirname(tmp_path), exist_ok=True)
-            try:
-                result.savev(tmp_path, "png", [], [])
-                filepath = tmp_path
-            except GLib.Error:
-                pass  # Fall through to use original file
-
-        filepath = os.path.abspath(filepath)
+            effects = self._canvas.get_effect_layer()
+            if self._canvas.is_reduced:
+                # Decode the full-resolution image on the worker; the
+                # effect tiles belong to the reduced decode and are rebuilt
+                pixbuf, effects = None, None
+            edits = (
+                pixbuf,
+                self._canvas.history.snapshot(),
+                effects.snapshot() if effects is not None else None,
+            )
 
         compositor = self._detect_compositor()
-        if compositor == "hyprland":
-            self._set_wallpaper_hyprland(filepath)
+        outputs = query_outputs(compositor)
+        if not outputs and edits is None:
+            self._apply_wallpaper(compositor, filepath, {}, None)
+            return
+        focused = next((o.name for o in outputs if o.focused), outputs[0].name if outputs else None)
+        self._status_filename.set_text(self._t("preparing_wallpaper"))
+        self._wallpapers.prepare(
+            filepath,
+            outputs,
+            lambda source, copies: self._apply_wallpaper(compositor, source, copies, focused),
+            edits,
+        )
+
+    def _apply_wallpaper(self, compositor, filepath, copies, focused):
+        """Show the wallpaper and record it.
+
+        Args:
+            compositor: 'sway' or 'hyprland'.
+            filepath: The source image, or None if it could not be
+                      prepared.
+            copies: Dict mapping output names to pre-scaled copies; empty
+                    to show *filepath* on all outputs.
+            focused: Name of the focused output, whose copy is registered
+                     for the current workspace.
+        """
+        if filepath is None:
+            self._show_error(self._t("wallpaper_error"))
+        elif compositor == "hyprland":
+            self._set_wallpaper_hyprland(filepath, copies, focused)
         else:
-            self._set_wallpaper_sway(filepath)
+            self._set_wallpaper_sway(filepath, copies, focused)
 
-    def _set_wallpaper_sway(self, filepath):
+    def _set_wallpaper_sway(self, filepath, copies=None, focused=None):
         """Set wallpaper on Sway using swaymsg."""
+        try:
+            if copies:
+                command = "; ".join(
+                    f"output {sway_quote(name)} bg {sway_quote(path)} fill"
+                    for name, path in copies.items()
+                )
+            else:
+                command = f"output * bg {sway_quote(filepath)} fill"
+        except ValueError:
+            self._show_error(self._t("wallpaper_error") + " (invalid file name)")
+            return
         try:
             result = subprocess.run(
-                ["swaymsg", "output", "*", "bg", filepath, "fill"],
+                ["swaymsg", command],
                 capture_output=True,
                 text=True,
                 timeout=5,
             )
             if result.returncode == 0:
                 self._status_filename.set_text(self._t("wallpaper_set"))
+                # The config keeps the original, as the cache may be cleared
                 self._update_sway_config(filepath)
-                self._update_wallpaper_db(filepath)
+                self._update_wallpaper_db((copies or {}).get(focused, filepath))
             else:
                 self._show_error(self._t("wallpaper_error") + f" ({result.stderr.strip()})")
         except FileNotFoundError:
@@ -586,8 +943,14 @@ class PhotoViewerApp(Gtk.Window):
         except subprocess.TimeoutExpired:
             self._show_error(self._t("wallpaper_error") + " (timeout)")
 
-    def _set_wallpaper_hyprland(self, filepath):
+    def _set_wallpaper_hyprland(self, filepath, copies=None, focused=None):
         """Set wallpaper on Hyprland by restarting swaybg."""
+        if copies:
+            args = []
+            for name, path in copies.items():
+                args += ["-o", name, "-i", path, "-m", "fill"]
+        else:
+            args = ["-i", filepath, "-m", "fill"]
         try:
             # Kill any existing swaybg process (ignore errors — it may not
             # be running yet, or pkill may be absent on minimal systems)
@@ -597,14 +960,14 @@ class PhotoViewerApp(Gtk.Window):
         try:
             # Start swaybg with the new wallpaper
             subprocess.Popen(
-                ["swaybg", "-i", filepath, "-m", "fill"],
+                ["swaybg", *args],
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
                 start_new_session=True,
             )
             self._status_filename.set_text(self._t("wallpaper_set"))
             self._update_hyprland_config(filepath)
-            self._update_wallpaper_db(filepath)
+            self._update_wallpaper_db((copies or {}).get(focused, filepath))
         except FileNotFoundError:
             self._show_error(self._t("wallpaper_error") + " (swaybg not found)")
         except subprocess.TimeoutExpired:
@@ -752,6 +1115,7 @@ class PhotoViewerApp(Gtk.Window):
         """Navigate to the previous file in the directory."""
         if self._check_unsaved_on_navigate():
             return
+        self._nav_direction = -1
         filepath = self._navigator.go_prev()
         if filepath:
             if is_video_file(filepath):
@@ -764,6 +1128,7 @@ class PhotoViewerApp(Gtk.Window):
         """Navigate to the next file in the directory."""
         if self._check_unsaved_on_navigate():
             return
+        self._nav_direction = 1
         filepath = self._navigator.go_next()
         if filepath:
             if is_video_file(filepath):
@@ -772,6 +1137,112 @@ class PhotoViewerApp(Gtk.Window):
                 self._show_image(filepath)
             self._update_ui_state()
 
+    def _on_thumbnail_activated(self, index):
+        """Open the file whose thumbnail was clicked.
+
+        Args:
+            index: 0-based position in the navigator listing.
+        """
+        if self._check_unsaved_on_navigate():
+            self._update_thumbnail_views()
+            return
+        self._nav_direction = 1 if index >= self._navigator.current_index - 1 else -1
+        filepath = self._navigator.go_to_index(index)
+        if filepath:
+            if is_video_file(filepath):
+                self._show_video(filepath)
+            else:
+                self._show_image(filepath)
+            self._update_ui_state()
+
+    def _on_grid_toggled(self, button):
+        """Show or hide the thumbnail grid."""
+        if button.get_active():
+            self._video_player.pause()
+            self._content_stack.set_visible_child_name("grid")
+        else:
+            self._content_stack.set_visible_child_name(self._current_mode)
+        self._update_thumbnail_views()
+
+    def _on_sort_toggled(self, button):
+        """Switch the listing between name order and date-taken order."""
+        if button.get_active():
+            self._navigator.set_sort_key(date_sort_key(self._metadata.date_taken))
+        else:
+            self._navigator.set_sort_key(sort_key)
+        self._update_ui_state()
+
+    def _on_info_toggled(self, button):
+        """Show or hide the metadata panel."""
+        self._info_panel.set_visible(button.get_active())
+        self._update_info_panel()
+
+    def _on_find_similar(self):
+        """Open the similar photos dialog for the current folder."""
+        directory = self._navigator.directory
+        if directory is None:
+            return
+        if self._similarity is None:
+            self._similarity = SimilarityScanner(open_index())
+        dialog = SimilarPhotosDialog(
+            self,
+            self._similarity,
+            self._thumb_cache,
+            directory,
+            self._navigator.filenames,
+            self._t,
+        )
+        dialog.on_deleted = self._on_similar_deleted
+        dialog.show_all()
+
+    def _on_similar_deleted(self, names):
+        """Drop trashed files from the listing without waiting for the watcher."""
+        current = self._navigator.current_file
+        self._on_directory_changed(set(), set(names))
+        if current != self._navigator.current_file and self._navigator.current_file:
+            self._open_file(self._navigator.current_file)
+
+    def _on_batch_export(self):
+        """Open the batch export dialog for the images of the current folder."""
+        directory = self._navigator.directory
+        if directory is None:
+            return
+        if self._exporter is None:
+            self._exporter = BatchExporter()
+        filepaths = [
+            os.path.join(directory, name)
+            for name in self._navigator.filenames
+            if is_image_file(name)
+        ]
+        BatchExportDialog(self, self._exporter, directory, filepaths, self._t).show_all()
+
+    def _on_slideshow(self):
+        """Play the images of the folder full screen, from the current file."""
+        if self._slideshow.running or self._check_unsaved_on_navigate():
+            return
+        if not any(is_image_file(name) for name in self._navigator.filenames):
+            return
+        self._video_player.stop()
+        self._btn_grid.set_active(False)
+        for widget in (self._toolbar, self._status_bar, self._filmstrip, self._info_panel):
+            widget.set_visible(False)
+        self._content_stack.set_visible_child_name("slideshow")
+        self.fullscreen()
+        self._slideshow.start(self._screen_size())
+
+    def _stop_slideshow(self):
+        """End the slideshow and show the last slide in the viewer."""
+        if not self._slideshow.running:
+            return
+        self._slideshow.stop()
+        self.unfullscreen()
+        self._toolbar.set_visible(True)
+        self._status_bar.set_visible(True)
+        self._info_panel.set_visible(self._btn_info.get_active())
+        if self._navigator.current_file:
+            self._show_image(self._navigator.current_file)
+        self._update_ui_state()
+
     def _check_unsaved_on_navigate(self):
         """If there are unsaved edits, prompt the user.
 
@@ -879,6 +1350,7 @@ class PhotoViewerApp(Gtk.Window):
     def _on_edits_changed(self):
         """Callback from canvas when edit history changes."""
         self._update_title()
+        self._update_histogram()
 
     # ==================================================================
     # LANGUAGE
@@ -914,6 +1386,14 @@ class PhotoViewerApp(Gtk.Window):
         for tool_id, tooltip_key in tool_tooltips.items():
             if tool_id in self._tool_buttons:
                 self._tool_buttons[tool_id].set_tooltip_text(self._t(tooltip_key))
+        self._btn_grid.set_tooltip_text(self._t("thumbnails"))
+        self._btn_sort_date.set_tooltip_text(self._t("sort_by_date"))
+        self._btn_info.set_tooltip_text(self._t("file_info"))
+        self._btn_similar.set_tooltip_text(self._t("similar_photos"))
+        self._btn_slideshow.set_tooltip_text(self._t("slideshow"))
+        self._btn_batch.set_tooltip_text(self._t("batch_export"))
+        for key, (name, _value) in self._info_labels.items():
+            name.set_text(self._t(key))
 
         # Update text entry placeholder
         self._text_entry.set_placeholder_text(self._t("text_placeholder"))
@@ -940,6 +1420,11 @@ class PhotoViewerApp(Gtk.Window):
         shift = state & Gdk.ModifierType.SHIFT_MASK
         key = event.keyval
 
+        if self._slideshow.running:
+            if key in (Gdk.KEY_Escape, Gdk.KEY_F5, Gdk.KEY_space):
+                self._stop_slideshow()
+            return True  # Other keys are ignored while playing
+
         # Ctrl shortcuts
         if ctrl and not shift:
             if key == Gdk.KEY_o:
@@ -985,6 +1470,15 @@ class PhotoViewerApp(Gtk.Window):
                 self._canvas.zoom_out()
                 self._update_zoom_label()
                 return True
+            elif key == Gdk.KEY_g:
+                self._btn_grid.set_active(not self._btn_grid.get_active())
+                return True
+            elif key == Gdk.KEY_i:
+                self._btn_info.set_active(not self._btn_info.get_active())
+                return True
+            elif key == Gdk.KEY_F5:
+                self._on_slideshow()
+                return True
             elif key == Gdk.KEY_space:
                 if self._current_mode == "video":
                     if self._video_player.is_playing:
@@ -1031,16 +1525,26 @@ class PhotoViewerApp(Gtk.Window):
 
             if response == Gtk.ResponseType.YES:
                 self._on_save()
-                self._cleanup_and_quit()
-                return False
+                return self._quit_when_saved()
             elif response == Gtk.ResponseType.NO:
-                self._cleanup_and_quit()
-                return False
+                return self._quit_when_saved()
             else:
                 return True  # Cancel close
         else:
-            self._cleanup_and_quit()
-            return False
+            return self._quit_when_saved()
+
+    def _quit_when_saved(self):
+        """Quit now, or once queued saves finish so a failure is shown.
+
+        Returns:
+            The delete-event result: True keeps the window open while
+            :meth:`_on_save_done` waits for the saves.
+        """
+        if self._saver.busy:
+            self._quit_after_save = True
+            return True
+        self._cleanup_and_quit()
+        return False
 
     def _on_quit(self):
         """Trigger window close via the delete-event path."""
@@ -1050,6 +1554,20 @@ class PhotoViewerApp(Gtk.Window):
     def _cleanup_and_quit(self):
         """Clean up resources and quit the GTK main loop."""
         self._video_player.cleanup()
+        self._canvas.cleanup()
+        self._slideshow.shutdown()
+        self._thumb_cache.shutdown()
+        self._image_loader.shutdown()
+        self._metadata.shutdown()
+        if self._similarity is not None:
+            self._similarity.shutdown()
+        if self._exporter is not None:
+            self._exporter.shutdown()
+        self._histogram.shutdown()
+        if self._dir_watcher is not None:
+            self._dir_watcher.stop()
+        self._wallpapers.shutdown()
+        self._saver.shutdown(wait=True)  # Let a running save finish
         Gtk.main_quit()
 
     # ==================================================================
@@ -1062,6 +1580,8 @@ class PhotoViewerApp(Gtk.Window):
         self._update_status_bar()
         self._update_zoom_label()
         self._update_nav_buttons()
+        self._update_thumbnail_views()
+        self._update_info_panel()
 
     def _update_title(self):
         """Update the window title with the current filename and edit state."""
@@ -1087,10 +1607,9 @@ class PhotoViewerApp(Gtk.Window):
             self._status_index.set_text("")
 
         if self._current_mode == "image" and self._canvas.has_image():
-            pixbuf = self._canvas.get_pixbuf()
-            if pixbuf:
-                w = pixbuf.get_width()
-                h = pixbuf.get_height()
+            size = self._canvas.get_image_size()
+            if size:
+                w, h = size
                 self._status_dimensions.set_text(f"{w} x {h}")
             else:
                 self._status_dimensions.set_text("")
@@ -1099,6 +1618,59 @@ class PhotoViewerApp(Gtk.Window):
 
         self._update_zoom_label()
 
+    def _update_info_panel(self):
+        """Fill the metadata panel for the current file, if it is shown."""
+        if not self._info_panel.get_visible():
+            return
+        values = dict.fromkeys(INFO_FIELDS, "")
+        filepath = self._navigator.current_file
+        if filepath:
+            meta = self._metadata.get(self._navigator.current_filename)
+            unknown = self._t("unknown")
+            size = self._canvas.get_image_size() if self._current_mode == "image" else None
+            if size is None and meta is not None:
+                size = meta.display_size
+            values["date_taken"] = (meta and meta.date_taken) or unknown
+            values["camera"] = (meta and meta.camera) or unknown
+            values["dimensions"] = f"{size[0]} x {size[1]}" if size else unknown
+            try:
+                values["file_size"] = GLib.format_size(os.path.getsize(filepath))
+            except OSError:
+                values["file_size"] = unknown
+        for key, (_name, value) in self._info_labels.items():
+            value.set_text(values[key])
+        self._update_histogram()
+
+    def _update_histogram(self):
+        """Recompute the histogram if the image or its edits changed."""
+        if not NUMPY_AVAILABLE or not self._info_panel.get_visible():
+            return
+        pixbuf = self._canvas.get_pixbuf() if self._current_mode == "image" else None
+        key = (self._canvas.get_filepath(), self._canvas.history.version) if pixbuf else None
+        if key == self._histogram_key:
+            return
+        self._histogram_key = key
+        if pixbuf is None:
+            self._histogram.cancel()
+            self._on_histogram_ready(None)
+            return
+        image_width = self._canvas.get_image_size()[0]
+        self._histogram.request(
+            pixbuf, self._on_histogram_ready, self._canvas.history, image_width
+        )
+
+    def _on_histogram_ready(self, histogram):
+        """Show a computed histogram and its exposure statistics."""
+        self._histogram_view.set_histogram(histogram)
+        if histogram is None:
+            self._histogram_stats.set_text("")
+            return
+        self._histogram_stats.set_text(
+            f"{self._t('mean_luma')}: {histogram.mean:.0f}\n"
+            f"{self._t('clipped_shadows')}: {histogram.shadows:.1%}\n"
+            f"{self._t('clipped_highlights')}: {histogram.highlights:.1%}"
+        )
+
     def _update_zoom_label(self):
         """Update the zoom percentage display."""
         if self._current_mode == "image":
@@ -1109,6 +1681,22 @@ class PhotoViewerApp(Gtk.Window):
             self._zoom_label.set_text("")
             self._status_zoom.set_text("")
 
+    def _update_thumbnail_views(self):
+        """Sync the filmstrip and grid with the navigator listing."""
+        names = self._navigator.filenames
+        selected = self._navigator.current_index - 1
+        for view in (self._filmstrip, self._thumb_grid):
+            if names is not self._thumb_names:
+                view.set_files(self._navigator.directory, names, selected)
+            else:
+                view.set_selected(selected)
+        self._thumb_names = names
+
+        grid_shown = self._btn_grid.get_active()
+        self._filmstrip.set_visible(
+            len(names) > 1 and not grid_shown and not self._slideshow.running
+        )
+
     def _update_nav_buttons(self):
         """Enable/disable navigation buttons based on file count."""
         has_nav = self._navigator.total_count > 1
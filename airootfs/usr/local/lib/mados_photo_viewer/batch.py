@@ -0,0 +1,272 @@
+"""
+madOS Photo Viewer - Batch Export
+===================================
+
+Resizes and converts many photos in one go, e.g. to shrink phone photos
+before uploading them.
+
+    - Every file is one task on a process pool with a worker per CPU.
+      Decoding, scaling and encoding a photo share nothing with other
+      files, so throughput grows with the number of cores.
+    - Workers decode through :func:`.imagecache.decode_image` at the
+      target size, so the JPEG decoder skips most of the work via DCT
+      scaling.  The EXIF orientation is applied to the pixels.
+    - GdkPixbuf's encoders write no metadata, so exported files carry
+      none unless it is kept explicitly; for JPEG output the source's
+      Exif segment is then copied over with the orientation reset.
+    - Output names are fixed before any file is submitted, so sources
+      that map to the same name (``a.png`` and ``a.jpg`` exported as
+      JPEG) get numbered names instead of overwriting each other.
+    - Progress is reported on the GTK main loop as each file completes.
+      Cancelling drops the files not yet started.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import gi
+
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import GdkPixbuf, GLib
+
+from .exif import insert_exif_segment, read_exif_segment, reset_orientation
+from .imagecache import decode_image
+from .navigator import is_image_file
+from .saver import (
+    DEFAULT_PNG_COMPRESSION,
+    SAVE_FORMATS,
+    encoder_options,
+    write_atomic,
+)
+
+# Output format choices: GdkPixbuf saver type -> file extension
+EXPORT_FORMATS = {"jpeg": ".jpg", "png": ".png"}
+
+# Default longest edge of exported images (pixels)
+DEFAULT_MAX_EDGE = 2048
+
+# Default JPEG quality for exports; lower than for Save As, as exports
+# are meant to be small
+DEFAULT_EXPORT_QUALITY = 85
+
+
+class BatchOptions:
+    """What to do with each exported file.
+
+    Attributes:
+        output_dir: Directory the exported files are written to.
+        max_edge: Longest edge in pixels; 0 keeps the original size.
+        fmt: Saver type from :data:`EXPORT_FORMATS`, or None to keep the
+             source format where it can be written (JPEG otherwise).
+        jpeg_quality: JPEG quality, 0-100.
+        png_compression: zlib compression level for PNG, 0-9.
+        strip_metadata: False to copy the Exif data into JPEG output.
+    """
+
+    __slots__ = (
+        "output_dir",
+        "max_edge",
+        "fmt",
+        "jpeg_quality",
+        "png_compression",
+        "strip_metadata",
+    )
+
+    def __init__(
+        self,
+        output_dir,
+        max_edge=DEFAULT_MAX_EDGE,
+        fmt=None,
+        jpeg_quality=DEFAULT_EXPORT_QUALITY,
+        png_compression=DEFAULT_PNG_COMPRESSION,
+        strip_metadata=True,
+    ):
+        self.output_dir = output_dir
+        self.max_edge = max_edge
+        self.fmt = fmt
+        self.jpeg_quality = jpeg_quality
+        self.png_compression = png_compression
+        self.strip_metadata = strip_metadata
+
+    def format_for(self, filepath):
+        """Return the saver type to export *filepath* as."""
+        if self.fmt is not None:
+            return self.fmt
+        fmt = SAVE_FORMATS.get(os.path.splitext(filepath)[1].lower())
+        return fmt if fmt in EXPORT_FORMATS else "jpeg"
+
+    def output_path(self, filepath):
+        """Return where the export of *filepath* is written.
+
+        The source file is never overwritten: exporting into its own
+        folder with the same format adds an ``-export`` suffix.
+        """
+        base = os.path.splitext(os.path.basename(filepath))[0]
+        ext = EXPORT_FORMATS[self.format_for(filepath)]
+        path = os.path.join(self.output_dir, base + ext)
+        if os.path.abspath(path) == os.path.abspath(filepath):
+            path = os.path.join(self.output_dir, f"{base}-export{ext}")
+        return path
+
+    def output_paths(self, filepaths):
+        """Return unique output paths for exporting *filepaths* together.
+
+        Outputs that would collide with each other or with one of the
+        sources get a numbered suffix (``photo-1.jpg``).  Names are
+        compared ignoring case, as on the FAT file systems of USB sticks
+        and memory cards.
+
+        Returns:
+            Dict mapping each source path to its output path.
+        """
+        taken = {_name_key(p) for p in filepaths}
+        paths = {}
+        for filepath in filepaths:
+            path = self.output_path(filepath)
+            if _name_key(path) in taken:
+                stem, ext = os.path.splitext(path)
+                n = 1
+                while _name_key(f"{stem}-{n}{ext}") in taken:
+                    n += 1
+                path = f"{stem}-{n}{ext}"
+            taken.add(_name_key(path))
+            paths[filepath] = path
+        return paths
+
+
+def _name_key(path):
+    """Key under which two paths name the same file on any file system."""
+    return os.path.abspath(path).casefold()
+
+
+def _flatten(pixbuf):
+    """Composite a pixbuf with alpha onto white, for JPEG output."""
+    width, height = pixbuf.get_width(), pixbuf.get_height()
+    flat = GdkPixbuf.Pixbuf.new(GdkPixbuf.Colorspace.RGB, False, 8, width, height)
+    flat.fill(0xFFFFFFFF)
+    pixbuf.composite(
+        flat, 0, 0, width, height, 0, 0, 1.0, 1.0, GdkPixbuf.InterpType.NEAREST, 255
+    )
+    return flat
+
+
+def export_image(filepath, options, dest=None):
+    """Export one file (runs in a worker process).
+
+    Args:
+        filepath: Source image.
+        options: The :class:`BatchOptions`.
+        dest: Output path; defaults to ``options.output_path(filepath)``.
+
+    Returns:
+        The path written.
+
+    Raises:
+        OSError: If the source cannot be read or the output written.
+        GLib.Error: If the source cannot be decoded or encoded.
+    """
+    edge = options.max_edge
+    pixbuf = decode_image(filepath, (edge, edge) if edge > 0 else None).pixbuf
+    fmt = options.format_for(filepath)
+    if fmt == "jpeg" and pixbuf.get_has_alpha():
+        pixbuf = _flatten(pixbuf)
+    keys, values = encoder_options(fmt, options.jpeg_quality, options.png_compression)
+    _ok, data = pixbuf.save_to_bufferv(fmt, keys, values)
+    if fmt == "jpeg" and not options.strip_metadata:
+        payload = read_exif_segment(filepath)
+        if payload is not None:
+            data = insert_exif_segment(data, reset_orientation(payload))
+    if dest is None:
+        dest = options.output_path(filepath)
+    write_atomic(dest, data)
+    return dest
+
+
+def _process_pool(workers):
+    """Create the export pool; ``spawn`` avoids forking a GTK process."""
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+class BatchExporter:
+    """Runs :func:`export_image` over many files in worker processes.
+
+    Args:
+        workers: Export processes; defaults to the CPU count.
+        pool_factory: Callable ``pool_factory(workers)`` returning the
+                      executor that runs :func:`export_image`.
+    """
+
+    def __init__(self, workers=None, pool_factory=_process_pool):
+        self._workers = workers or os.cpu_count() or 1
+        self._pool_factory = pool_factory
+        self._driver = ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch")
+        self._generation = 0
+
+    def run(self, filepaths, options, on_progress=None, on_done=None):
+        """Export the images among *filepaths*.
+
+        An export already running is cancelled.
+
+        Args:
+            filepaths: Source paths; non-images are skipped.
+            options: The :class:`BatchOptions`.
+            on_progress: Called on the main loop as
+                         ``on_progress(done, total, filepath)`` after each file.
+            on_done: Called on the main loop as ``on_done(exported, failed)``
+                     with lists of source paths, unless cancelled.
+        """
+        self._generation += 1
+        paths = [p for p in filepaths if is_image_file(p)]
+        self._driver.submit(self._run, self._generation, paths, options, on_progress, on_done)
+
+    def cancel(self):
+        """Stop the running export; files already started still finish."""
+        self._generation += 1
+
+    def shutdown(self):
+        """Cancel exporting and stop the driver."""
+        self.cancel()
+        self._driver.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, generation, paths, options, on_progress, on_done):
+        """Driver thread: fan the files out and collect results."""
+        exported, failed = [], []
+        if paths:
+            try:
+                os.makedirs(options.output_dir, exist_ok=True)
+            except OSError as e:
+                print(f"Cannot create {options.output_dir}: {e}")
+                self._post(generation, on_done, [], list(paths))
+                return
+            dests = options.output_paths(paths)
+            with self._pool_factory(min(self._workers, len(paths))) as pool:
+                futures = {pool.submit(export_image, p, options, dests[p]): p for p in paths}
+                for future in as_completed(futures):
+                    if generation != self._generation:
+                        for f in futures:
+                            f.cancel()
+                        return
+                    path = futures[future]
+                    try:
+                        future.result()
+                        exported.append(path)
+                    except Exception as e:
+                        print(f"Cannot export {path}: {e}")
+                        failed.append(path)
+                    done = len(exported) + len(failed)
+                    self._post(generation, on_progress, done, len(paths), path)
+        self._post(generation, on_done, exported, failed)
+
+    def _post(self, generation, callback, *args):
+        """Call *callback* on the main loop unless cancelled meanwhile."""
+        if callback:
+            GLib.idle_add(self._deliver, generation, callback, args)
+
+    def _deliver(self, generation, callback, args):
+        """Main-loop handler for :meth:`_post`."""
+        if generation == self._generation:
+            callback(*args)
+        return False
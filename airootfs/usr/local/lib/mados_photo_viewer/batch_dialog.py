@@ -0,0 +1,146 @@
+"""
+madOS Photo Viewer - Batch Export Dialog
+==========================================
+
+Lets the user pick the size, format, quality and metadata handling for
+exporting a set of photos, then runs :class:`~.batch.BatchExporter` and
+shows its progress.  Closing the dialog cancels the export.
+"""
+
+import os
+
+import gi
+
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gtk
+
+from .batch import DEFAULT_EXPORT_QUALITY, DEFAULT_MAX_EDGE, EXPORT_FORMATS, BatchOptions
+
+# Response id of the "Export" button
+RESPONSE_EXPORT = 1
+
+# Name of the default output folder, created next to the photos
+DEFAULT_OUTPUT_NAME = "export"
+
+
+class BatchExportDialog(Gtk.Dialog):
+    """Exports a list of photos resized and converted.
+
+    Args:
+        parent: The transient-for window.
+        exporter: The :class:`~.batch.BatchExporter` to run.
+        directory: Folder holding the photos.
+        filepaths: Paths of the photos to export.
+        translate: Callable mapping translation keys to text.
+    """
+
+    def __init__(self, parent, exporter, directory, filepaths, translate):
+        super().__init__(title=translate("batch_export"), transient_for=parent)
+        self.set_default_size(420, -1)
+        self._exporter = exporter
+        self._filepaths = filepaths
+        self._t = translate
+
+        grid = Gtk.Grid(row_spacing=6, column_spacing=12)
+        grid.set_border_width(6)
+
+        self._max_edge = Gtk.SpinButton.new_with_range(0, 16384, 64)
+        self._max_edge.set_value(DEFAULT_MAX_EDGE)
+        self._max_edge.set_tooltip_text(self._t("max_edge_hint"))
+
+        self._format = Gtk.ComboBoxText()
+        self._format.append("", self._t("keep_format"))
+        for fmt in EXPORT_FORMATS:
+            self._format.append(fmt, fmt.upper())
+        self._format.set_active(0)
+
+        self._quality = Gtk.SpinButton.new_with_range(1, 100, 1)
+        self._quality.set_value(DEFAULT_EXPORT_QUALITY)
+
+        self._strip = Gtk.CheckButton(label=self._t("strip_metadata"))
+        self._strip.set_active(True)
+
+        self._folder = Gtk.FileChooserButton(
+            title=self._t("output_folder"), action=Gtk.FileChooserAction.SELECT_FOLDER
+        )
+        self._folder.set_current_folder(directory)
+        self._output_dir = os.path.join(directory, DEFAULT_OUTPUT_NAME)
+
+        rows = (
+            ("max_edge", self._max_edge),
+            ("format", self._format),
+            ("jpeg_quality", self._quality),
+            ("output_folder", self._folder),
+        )
+        for row, (key, widget) in enumerate(rows):
+            label = Gtk.Label(label=self._t(key))
+            label.set_xalign(0)
+            grid.attach(label, 0, row, 1, 1)
+            grid.attach(widget, 1, row, 1, 1)
+        grid.attach(self._strip, 0, len(rows), 2, 1)
+
+        self._status = Gtk.Label(label=f"{len(filepaths)} → {self._output_dir}")
+        self._status.set_xalign(0)
+        self._status.set_ellipsize(1)  # PANGO_ELLIPSIZE_START
+
+        self._progress = Gtk.ProgressBar()
+        self._progress.set_show_text(True)
+        self._progress.set_no_show_all(True)
+
+        box = self.get_content_area()
+        box.set_spacing(6)
+        box.pack_start(grid, False, False, 0)
+        box.pack_start(self._status, False, False, 0)
+        box.pack_start(self._progress, False, False, 0)
+
+        self._export_button = self.add_button(self._t("export"), RESPONSE_EXPORT)
+        self._export_button.get_style_context().add_class("suggested-action")
+        self._export_button.set_sensitive(bool(filepaths))
+        self.add_button(Gtk.STOCK_CLOSE, Gtk.ResponseType.CLOSE)
+        self._folder.connect("file-set", self._on_folder_set)
+        self.connect("response", self._on_response)
+
+    def _on_folder_set(self, button):
+        """Export into the folder the user picked."""
+        folder = button.get_filename()
+        if folder:
+            self._output_dir = folder
+            self._status.set_text(f"{len(self._filepaths)} → {folder}")
+
+    def options(self):
+        """Return the :class:`~.batch.BatchOptions` set in the dialog."""
+        return BatchOptions(
+            self._output_dir,
+            max_edge=self._max_edge.get_value_as_int(),
+            fmt=self._format.get_active_id() or None,
+            jpeg_quality=self._quality.get_value_as_int(),
+            strip_metadata=self._strip.get_active(),
+        )
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def _on_response(self, dialog, response):
+        if response == RESPONSE_EXPORT:
+            self._export_button.set_sensitive(False)
+            self._on_progress(0, len(self._filepaths), None)
+            self._progress.show()
+            self._exporter.run(self._filepaths, self.options(), self._on_progress, self._on_done)
+            return
+        self._exporter.cancel()
+        self.destroy()
+
+    def _on_progress(self, done, total, filepath):
+        """Show how many files are exported."""
+        self._progress.set_fraction(done / total if total else 1.0)
+        self._progress.set_text(f"{done} / {total}")
+
+    def _on_done(self, exported, failed):
+        """Report the result and allow exporting again."""
+        text = f"{self._t('exported')}: {len(exported)}"
+        if failed:
+            text += f" — {self._t('export_failed')}: {len(failed)}"
+        self._status.set_text(text)
+        self._progress.set_fraction(1.0)
+        self._export_button.set_sensitive(True)
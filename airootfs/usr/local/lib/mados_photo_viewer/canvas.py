@@ -3,19 +3,30 @@ madOS Photo Viewer - Image Canvas
 ===================================
 
 A GTK DrawingArea-based canvas that handles:
-    - Image rendering with zoom and pan
+    - Image rendering with zoom and pan from a cached surface pyramid
     - Fit-to-window and actual-size modes
     - Mouse-driven pan (drag when zoomed in)
     - Mouse-driven drawing overlay for editing tools
-    - Cairo-based compositing of edit strokes on top of the image
+    - Cairo-based compositing of edit strokes on top of the image, with
+      committed strokes cached in an overlay surface
+    - Live blur/pixelate results from the tiled effect layer
     - Scroll-wheel and keyboard zoom
+    - Playback of animated GIF/WebP files, advanced from the frame clock
+      while the canvas is mapped
 
 The canvas translates screen coordinates to image coordinates for tool
 operations, ensuring that drawing occurs at the correct pixel positions
 regardless of zoom/pan state.
+
+The displayed pixbuf may be a reduced decode of the file.  Image
+coordinates always refer to the full-resolution source, and the canvas
+asks for the full decode (``on_full_resolution_needed``) once the view
+would magnify the reduced pixels or an edit tool is selected.
 """
 
 import math
+from concurrent.futures import ThreadPoolExecutor
+
 import cairo
 
 import gi
@@ -37,13 +48,20 @@ from .tools import (
     BlurStroke,
     PixelateStroke,
     EditHistory,
+    stroke_bounds,
 )
+from .animation import AnimationPlayer, is_animation_candidate, load_animation
+from .effects import EffectLayer
+from .pyramid import RenderPyramid, raster_scale
 
 # Zoom limits
 ZOOM_MIN = 0.05
 ZOOM_MAX = 20.0
 ZOOM_STEP = 1.25  # Multiplicative step for zoom in/out
 
+# Edge length of one transparency checkerboard square (screen pixels)
+CHECK_SIZE = 12
+
 
 class ImageCanvas(Gtk.DrawingArea):
     """A drawing area that displays an image with zoom, pan, and editing overlays."""
@@ -53,8 +71,23 @@ class ImageCanvas(Gtk.DrawingArea):
         super().__init__()
 
         # Image data
-        self._pixbuf = None  # Original loaded GdkPixbuf
+        self._pixbuf = None  # Displayed GdkPixbuf (may be a reduced decode)
+        self._pyramid = None  # Cairo surfaces of _pixbuf, converted once
+        self._checker = None  # Repeating checkerboard pattern (lazy)
         self._filepath = None  # Path of the currently loaded image
+        self._preview = None  # Low-res stand-in shown while decoding
+        self._image_w = 0  # Full-resolution width of the source image
+        self._image_h = 0  # Full-resolution height of the source image
+        self._full_requested = False  # Full decode already asked for
+
+        # Animation playback
+        self._animation = None  # AnimationPlayer while a GIF/WebP plays
+        self._animation_future = None  # Pending load_animation() result
+        self._animation_tick_id = None
+        self._animation_last_us = None  # Frame time of the previous tick
+        self._animation_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="animation"
+        )
 
         # View state
         self._zoom = 1.0  # Current zoom factor
@@ -80,9 +113,18 @@ class ImageCanvas(Gtk.DrawingArea):
 
         # Edit history
         self.history = EditHistory()
+        # Committed paint/text strokes rasterized once per history version:
+        # (version, surface, bounds, scale)
+        self._overlay = None
+
+        # Live blur/pixelate tiles, rendered off the main thread
+        self._effect_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="effects")
+        self._effects = None
 
         # Callback for when edits change (so app can update UI)
         self.on_edits_changed = None
+        # Callback(filepath) when the reduced decode is no longer enough
+        self.on_full_resolution_needed = None
 
         # Enable events
         self.add_events(
@@ -100,6 +142,8 @@ class ImageCanvas(Gtk.DrawingArea):
         self.connect("motion-notify-event", self._on_motion)
         self.connect("scroll-event", self._on_scroll)
         self.connect("size-allocate", self._on_size_allocate)
+        self.connect("map", lambda w: self._start_animation_clock())
+        self.connect("unmap", lambda w: self._stop_animation_clock())
 
         # Style
         style = self.get_style_context()
@@ -109,35 +153,108 @@ class ImageCanvas(Gtk.DrawingArea):
     # Public API
     # ------------------------------------------------------------------
 
-    def load_image(self, filepath):
-        """Load an image file into the canvas.
+    def set_image(self, filepath, pixbuf, width=None, height=None):
+        """Display an already decoded image.
 
-        Supports all GdkPixbuf formats plus SVG via librsvg if available.
+        Resets the edit history and fits the image to the window.  Files
+        that may be animated are loaded as animations in the background
+        and start playing once loaded.
 
         Args:
-            filepath: Path to the image file.
+            filepath: Path the pixbuf was decoded from.
+            pixbuf: The decoded GdkPixbuf.
+            width: Full-resolution width if *pixbuf* is a reduced decode.
+            height: Full-resolution height if *pixbuf* is a reduced decode.
+        """
+        self._stop_animation()
+        self._pixbuf = pixbuf
+        self._pyramid = RenderPyramid(pixbuf)
+        self._filepath = filepath
+        self._preview = None
+        self._image_w = width or pixbuf.get_width()
+        self._image_h = height or pixbuf.get_height()
+        self._full_requested = False
+        self._reset_effects()
+        self.history.clear()
+        self._fit_mode = True
+        self._calculate_fit_zoom()
+        self.queue_draw()
+        if is_animation_candidate(filepath):
+            self._load_animation(filepath)
 
-        Returns:
-            True if loaded successfully, False on error.
+    def upgrade_image(self, filepath, pixbuf):
+        """Swap in a higher-resolution decode of the current image.
+
+        Zoom, pan, and edits are kept since they are expressed in
+        full-resolution image coordinates.
+
+        Args:
+            filepath: Path the pixbuf was decoded from.
+            pixbuf: The full-resolution GdkPixbuf.
         """
-        try:
-            pixbuf = GdkPixbuf.Pixbuf.new_from_file(filepath)
-            self._pixbuf = pixbuf
-            self._filepath = filepath
-            self.history.clear()
-            self._fit_mode = True
-            self._calculate_fit_zoom()
-            self.queue_draw()
-            return True
-        except GLib.Error as e:
-            print(f"Error loading image: {e.message}")
-            self._pixbuf = None
-            self._filepath = None
-            self.queue_draw()
-            return False
+        if filepath != self._filepath or self._pixbuf is None:
+            return
+        self._pixbuf = pixbuf
+        if self._animation is None:
+            self._pyramid = RenderPyramid(pixbuf)
+        self._reset_effects()
+        self.queue_draw()
+
+    @property
+    def is_reduced(self):
+        """True if the displayed pixbuf is smaller than the source image."""
+        return self._pixbuf is not None and self._pixbuf.get_width() < self._image_w
+
+    def get_image_size(self):
+        """Return the full-resolution (width, height), or None."""
+        if self._pixbuf is None:
+            return None
+        return (self._image_w, self._image_h)
+
+    def show_loading(self, filepath, preview=None):
+        """Show a placeholder for an image that is still being decoded.
+
+        Args:
+            filepath: Path of the image being decoded.
+            preview: Optional low-resolution pixbuf (e.g. the thumbnail)
+                     drawn scaled to fit until the real image arrives.
+        """
+        self._stop_animation()
+        self._pixbuf = None
+        self._pyramid = None
+        self._filepath = filepath
+        self._preview = preview
+        self.history.clear()
+        self._effects = None
+        self.queue_draw()
+
+    def clear_image(self):
+        """Unload the current image."""
+        self._stop_animation()
+        self._pixbuf = None
+        self._pyramid = None
+        self._filepath = None
+        self._preview = None
+        self.history.clear()
+        self._effects = None
+        self.queue_draw()
+
+    def cleanup(self):
+        """Stop background effect rendering and animation loading."""
+        self._stop_animation()
+        self._effect_executor.shutdown(wait=False, cancel_futures=True)
+        self._animation_executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_effect_layer(self):
+        """Return the live blur/pixelate layer, or None.
+
+        Saving passes it to ``compose_edits_onto_pixbuf`` so tiles already
+        rendered for the preview are reused.
+        """
+        return self._effects
 
     def get_pixbuf(self):
-        """Return the current original pixbuf, or None."""
+        """Return the displayed pixbuf (possibly a reduced decode), or None."""
         return self._pixbuf
 
     def get_filepath(self):
@@ -148,6 +265,11 @@ class ImageCanvas(Gtk.DrawingArea):
         """Return True if an image is currently loaded."""
         return self._pixbuf is not None
 
+    @property
+    def is_animating(self):
+        """True while an animated image is shown."""
+        return self._animation is not None
+
     def zoom_in(self):
         """Zoom in by one step, centered on the canvas."""
         self._fit_mode = False
@@ -183,6 +305,13 @@ class ImageCanvas(Gtk.DrawingArea):
                   TOOL_PIXELATE, TOOL_ERASER.
         """
         self._active_tool = tool
+        if tool != TOOL_NONE:
+            if self._animation is not None:
+                # Edits apply to the still frame that gets saved
+                self._stop_animation()
+                self._pyramid = RenderPyramid(self._pixbuf)
+                self.queue_draw()
+            self._request_full_resolution()
         # Update cursor based on tool
         window = self.get_window()
         if window is None:
@@ -235,6 +364,110 @@ class ImageCanvas(Gtk.DrawingArea):
         self._notify_edits_changed()
         self.queue_draw()
 
+    def _reset_effects(self):
+        """Rebuild the effect layer for the current pixbuf."""
+        scale = self._pixbuf.get_width() / self._image_w
+        self._effects = EffectLayer(self._pixbuf, scale, self._effect_executor)
+        self._effects.on_tile_ready = self.queue_draw
+        self._sync_effects()
+
+    def _sync_effects(self):
+        """Tell the effect layer about committed and in-progress strokes."""
+        if self._effects is None:
+            return
+        strokes = self.history.get_pixbuf_strokes()
+        current = self._current_stroke
+        if current is not None and current.type in (TOOL_BLUR, TOOL_PIXELATE):
+            strokes.append(current)
+        self._effects.update(strokes)
+
+    def _request_full_resolution(self):
+        """Ask (once per image) for the full decode of a reduced image."""
+        if not self.is_reduced or self._full_requested or self.on_full_resolution_needed is None:
+            return
+        self._full_requested = True
+        filepath = self._filepath
+
+        def notify():
+            if self._filepath == filepath:
+                self.on_full_resolution_needed(filepath)
+            return False
+
+        GLib.idle_add(notify)
+
+    # ------------------------------------------------------------------
+    # Animation
+    # ------------------------------------------------------------------
+
+    def _load_animation(self, filepath):
+        """Load *filepath* as an animation on the worker."""
+        future = self._animation_executor.submit(load_animation, filepath)
+        self._animation_future = future
+        future.add_done_callback(
+            lambda f: GLib.idle_add(self._on_animation_loaded, filepath, f)
+        )
+
+    def _on_animation_loaded(self, filepath, future):
+        """Start playing a loaded animation if it is still wanted."""
+        if future is not self._animation_future:
+            return False
+        self._animation_future = None
+        animation = future.result()
+        if animation is None or self._active_tool != TOOL_NONE:
+            return False
+        static = animation.get_static_image()
+        if (static.get_width(), static.get_height()) != (self._image_w, self._image_h):
+            return False
+        # Frames are full resolution, so this becomes the displayed pixbuf
+        self._pixbuf = static
+        self._full_requested = True
+        self._reset_effects()
+        self._animation = AnimationPlayer(animation)
+        self._pyramid = self._animation.pyramid
+        self._start_animation_clock()
+        self.queue_draw()
+        return False
+
+    def _stop_animation(self):
+        """Stop playback and forget any pending animation load."""
+        self._stop_animation_clock()
+        self._animation = None
+        self._animation_future = None
+
+    def _start_animation_clock(self):
+        """Advance the animation from the frame clock while mapped."""
+        if (
+            self._animation is None
+            or self._animation.finished
+            or self._animation_tick_id is not None
+            or not self.get_mapped()
+        ):
+            return
+        self._animation_last_us = None
+        self._animation_tick_id = self.add_tick_callback(self._on_animation_tick)
+
+    def _stop_animation_clock(self):
+        if self._animation_tick_id is not None:
+            self.remove_tick_callback(self._animation_tick_id)
+            self._animation_tick_id = None
+
+    def _on_animation_tick(self, widget, frame_clock):
+        """Frame-clock callback: show the next frame when it is due.
+
+        Returns:
+            False once a non-looping animation has ended.
+        """
+        now = frame_clock.get_frame_time()
+        last = self._animation_last_us
+        self._animation_last_us = now
+        if self._animation.advance(0 if last is None else now - last):
+            self._pyramid = self._animation.pyramid
+            self.queue_draw()
+        if self._animation.finished:
+            self._animation_tick_id = None
+            return False
+        return True
+
     # ------------------------------------------------------------------
     # Coordinate conversion
     # ------------------------------------------------------------------
@@ -253,8 +486,8 @@ class ImageCanvas(Gtk.DrawingArea):
         if self._pixbuf is None:
             return (sx, sy)
 
-        img_w = self._pixbuf.get_width()
-        img_h = self._pixbuf.get_height()
+        img_w = self._image_w
+        img_h = self._image_h
 
         # Center of canvas
         cx = alloc.width / 2.0
@@ -282,8 +515,8 @@ class ImageCanvas(Gtk.DrawingArea):
         if self._pixbuf is None:
             return (ix, iy)
 
-        img_w = self._pixbuf.get_width()
-        img_h = self._pixbuf.get_height()
+        img_w = self._image_w
+        img_h = self._image_h
 
         cx = alloc.width / 2.0
         cy = alloc.height / 2.0
@@ -308,8 +541,8 @@ class ImageCanvas(Gtk.DrawingArea):
         if alloc.width < 2 or alloc.height < 2:
             return
 
-        img_w = self._pixbuf.get_width()
-        img_h = self._pixbuf.get_height()
+        img_w = self._image_w
+        img_h = self._image_h
 
         if img_w == 0 or img_h == 0:
             return
@@ -346,8 +579,8 @@ class ImageCanvas(Gtk.DrawingArea):
 
         old_zoom = self._zoom
         alloc = self.get_allocation()
-        img_w = self._pixbuf.get_width()
-        img_h = self._pixbuf.get_height()
+        img_w = self._image_w
+        img_h = self._image_h
 
         # Canvas center
         cx = alloc.width / 2.0
@@ -386,6 +619,10 @@ class ImageCanvas(Gtk.DrawingArea):
         cr.rectangle(0, 0, alloc.width, alloc.height)
         cr.fill()
 
+        if self._pixbuf is None and self._preview is not None:
+            self._draw_loading_preview(cr, alloc)
+            return
+
         if self._pixbuf is None:
             # No image - draw placeholder text
             cr.set_source_rgb(0.30, 0.34, 0.42)  # nord3
@@ -400,8 +637,8 @@ class ImageCanvas(Gtk.DrawingArea):
             cr.show_text(text)
             return
 
-        img_w = self._pixbuf.get_width()
-        img_h = self._pixbuf.get_height()
+        img_w = self._image_w
+        img_h = self._image_h
 
         # Compute drawing position (centered with pan offset)
         draw_w = img_w * self._zoom
@@ -413,31 +650,30 @@ class ImageCanvas(Gtk.DrawingArea):
         if self._pixbuf.get_has_alpha():
             self._draw_checkerboard(cr, draw_x, draw_y, draw_w, draw_h)
 
-        # Draw the image
+        # Draw the image; a reduced decode is stretched to full-res coordinates
+        pixel_scale = self._zoom * img_w / self._pixbuf.get_width()
+        if pixel_scale > 1.0:
+            self._request_full_resolution()
         cr.save()
         cr.translate(draw_x, draw_y)
-        cr.scale(self._zoom, self._zoom)
-        Gdk.cairo_set_source_pixbuf(cr, self._pixbuf, 0, 0)
-        cr.get_source().set_filter(
-            cairo.FILTER_NEAREST if self._zoom > 4.0 else cairo.FILTER_BILINEAR
-        )
-        cr.paint()
+        cr.scale(pixel_scale, pixel_scale)
+        visible = cr.clip_extents()
+        self._pyramid.draw(cr, pixel_scale, *visible)
+
+        # Blur/pixelate results, clipped to the visible tiles
+        if self._effects is not None:
+            self._effects.draw(cr, *visible)
         cr.restore()
 
-        # Draw blur/pixelate previews would require applying to a temp pixbuf;
-        # for performance, we only show them in the final composite.
-        # For blur/pixelate strokes, show a translucent overlay path instead.
-        for stroke in self.history.strokes:
-            if stroke.type in ("blur", "pixelate"):
-                self._draw_effect_preview(cr, stroke, draw_x, draw_y)
+        # Outline the effect stroke being painted
+        if self._current_stroke is not None and self._current_stroke.type in (
+            TOOL_BLUR,
+            TOOL_PIXELATE,
+        ):
+            self._draw_effect_preview(cr, self._current_stroke, draw_x, draw_y)
 
-        # Draw paint/text strokes in canvas coordinates
-        cr.save()
-        cr.translate(draw_x, draw_y)
-        cr.scale(self._zoom, self._zoom)
-        for stroke in self.history.get_paint_strokes():
-            stroke.draw(cr)
-        cr.restore()
+        # Committed paint/text strokes from the cached overlay
+        self._draw_overlay(cr, draw_x, draw_y)
 
         # Draw current in-progress stroke
         if self._current_stroke is not None:
@@ -448,6 +684,133 @@ class ImageCanvas(Gtk.DrawingArea):
                 self._current_stroke.draw(cr)
             cr.restore()
 
+    def _draw_overlay(self, cr, draw_x, draw_y):
+        """Paint the cached raster of committed paint/text strokes.
+
+        Args:
+            cr: Cairo context.
+            draw_x: Image drawing origin X.
+            draw_y: Image drawing origin Y.
+        """
+        overlay = self._get_overlay()
+        if overlay is None:
+            return
+        _, surface, bounds, scale = overlay
+        cr.save()
+        cr.translate(draw_x, draw_y)
+        cr.scale(self._zoom, self._zoom)
+        cr.translate(bounds[0], bounds[1])
+        cr.scale(1.0 / scale, 1.0 / scale)
+        cr.set_source_surface(surface, 0, 0)
+        cr.get_source().set_filter(cairo.FILTER_BILINEAR)
+        cr.paint()
+        cr.restore()
+
+    def _get_overlay(self):
+        """Return the overlay cache entry, rebuilding it if stale.
+
+        The raster is rebuilt when the history changes or the zoom
+        crosses a power of two; panning reuses it as is.
+
+        Returns:
+            ``(version, surface, bounds, scale)`` or None if there is
+            nothing to draw.
+        """
+        strokes = self.history.get_paint_strokes()
+        if not strokes:
+            self._overlay = None
+            return None
+
+        version = self.history.version
+        cached = self._overlay
+        if cached is not None and cached[0] == version:
+            bounds = cached[2]
+        else:
+            cached = None
+            bounds = self._overlay_bounds(strokes)
+        if bounds is None:
+            return None
+
+        x0, y0, x1, y1 = bounds
+        scale = raster_scale(self._zoom, x1 - x0, y1 - y0)
+        if cached is not None and cached[3] == scale:
+            return cached
+
+        surface = cairo.ImageSurface(
+            cairo.FORMAT_ARGB32,
+            max(1, math.ceil((x1 - x0) * scale)),
+            max(1, math.ceil((y1 - y0) * scale)),
+        )
+        cr = cairo.Context(surface)
+        cr.scale(scale, scale)
+        cr.translate(-x0, -y0)
+        for stroke in strokes:
+            cr.save()
+            stroke.draw(cr)
+            cr.restore()
+        self._overlay = (version, surface, bounds, scale)
+        return self._overlay
+
+    def _overlay_bounds(self, strokes):
+        """Return the integer image-space box covering *strokes*, or None.
+
+        Args:
+            strokes: Paint and text strokes.
+        """
+        measure = cairo.Context(cairo.ImageSurface(cairo.FORMAT_A8, 1, 1))
+        measure.select_font_face("Sans", cairo.FONT_SLANT_NORMAL, cairo.FONT_WEIGHT_NORMAL)
+        x0 = y0 = math.inf
+        x1 = y1 = -math.inf
+        for stroke in strokes:
+            if stroke.type == TOOL_TEXT:
+                if not stroke.text:
+                    continue
+                measure.set_font_size(stroke.font_size)
+                ext = measure.text_extents(stroke.text)
+                box = (
+                    stroke.x + ext.x_bearing,
+                    stroke.y + ext.y_bearing,
+                    stroke.x + ext.x_bearing + ext.width,
+                    stroke.y + ext.y_bearing + ext.height,
+                )
+            else:
+                box = stroke_bounds(stroke)
+                if box is None:
+                    continue
+            x0, y0 = min(x0, box[0]), min(y0, box[1])
+            x1, y1 = max(x1, box[2]), max(y1, box[3])
+
+        if x1 < x0:
+            return None
+
+        # Pad for antialiasing and keep to the image area
+        x0 = max(0, math.floor(x0) - 2)
+        y0 = max(0, math.floor(y0) - 2)
+        x1 = min(self._image_w, math.ceil(x1) + 2)
+        y1 = min(self._image_h, math.ceil(y1) + 2)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return (x0, y0, x1, y1)
+
+    def _draw_loading_preview(self, cr, alloc):
+        """Draw the low-resolution preview scaled to fit, dimmed.
+
+        Args:
+            cr: Cairo context.
+            alloc: Widget allocation.
+        """
+        pw = self._preview.get_width()
+        ph = self._preview.get_height()
+        if pw == 0 or ph == 0:
+            return
+        scale = min(alloc.width / pw, alloc.height / ph)
+        cr.save()
+        cr.translate((alloc.width - pw * scale) / 2.0, (alloc.height - ph * scale) / 2.0)
+        cr.scale(scale, scale)
+        Gdk.cairo_set_source_pixbuf(cr, self._preview, 0, 0)
+        cr.paint_with_alpha(0.6)
+        cr.restore()
+
     def _draw_checkerboard(self, cr, x, y, w, h):
         """Draw a checkerboard pattern to indicate transparency.
 
@@ -456,24 +819,35 @@ class ImageCanvas(Gtk.DrawingArea):
             x, y: Top-left position.
             w, h: Width and height.
         """
-        check_size = 12
+        if self._checker is None:
+            self._checker = self._create_checker_pattern()
+        matrix = cairo.Matrix()
+        matrix.translate(-int(x), -int(y))
+        self._checker.set_matrix(matrix)
         cr.save()
         cr.rectangle(x, y, w, h)
-        cr.clip()
-        for row in range(int(y), int(y + h) + check_size, check_size):
-            for col in range(int(x), int(x + w) + check_size, check_size):
-                r_idx = (row - int(y)) // check_size
-                c_idx = (col - int(x)) // check_size
-                if (r_idx + c_idx) % 2 == 0:
-                    cr.set_source_rgb(0.85, 0.85, 0.85)
-                else:
-                    cr.set_source_rgb(0.65, 0.65, 0.65)
-                cr.rectangle(col, row, check_size, check_size)
-                cr.fill()
+        cr.set_source(self._checker)
+        cr.fill()
         cr.restore()
 
+    @staticmethod
+    def _create_checker_pattern():
+        """Build a repeating 2x2-square checkerboard pattern."""
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, CHECK_SIZE * 2, CHECK_SIZE * 2)
+        cr = cairo.Context(surface)
+        cr.set_source_rgb(0.85, 0.85, 0.85)
+        cr.paint()
+        cr.set_source_rgb(0.65, 0.65, 0.65)
+        cr.rectangle(CHECK_SIZE, 0, CHECK_SIZE, CHECK_SIZE)
+        cr.rectangle(0, CHECK_SIZE, CHECK_SIZE, CHECK_SIZE)
+        cr.fill()
+        pattern = cairo.SurfacePattern(surface)
+        pattern.set_extend(cairo.EXTEND_REPEAT)
+        pattern.set_filter(cairo.FILTER_NEAREST)
+        return pattern
+
     def _draw_effect_preview(self, cr, stroke, draw_x, draw_y):
-        """Draw a translucent overlay showing where blur/pixelate was applied.
+        """Draw a translucent overlay showing where blur/pixelate is being painted.
 
         Args:
             cr: Cairo context.
@@ -605,12 +979,14 @@ class ImageCanvas(Gtk.DrawingArea):
                 self._current_stroke = BlurStroke(self._brush_size)
                 self._current_stroke.add_point(ix, iy)
                 self._drawing = True
+                self._sync_effects()
                 self.queue_draw()
             elif self._active_tool == TOOL_PIXELATE:
                 ix, iy = self._screen_to_image(event.x, event.y)
                 self._current_stroke = PixelateStroke(self._brush_size)
                 self._current_stroke.add_point(ix, iy)
                 self._drawing = True
+                self._sync_effects()
                 self.queue_draw()
             elif self._active_tool == TOOL_ERASER:
                 ix, iy = self._screen_to_image(event.x, event.y)
@@ -675,6 +1051,8 @@ class ImageCanvas(Gtk.DrawingArea):
         if self._drawing and self._current_stroke is not None:
             ix, iy = self._screen_to_image(event.x, event.y)
             self._current_stroke.add_point(ix, iy)
+            if self._current_stroke.type in (TOOL_BLUR, TOOL_PIXELATE):
+                self._sync_effects()
             self.queue_draw()
             return True
 
@@ -694,5 +1072,6 @@ class ImageCanvas(Gtk.DrawingArea):
 
     def _notify_edits_changed(self):
         """Call the edits-changed callback if one is registered."""
+        self._sync_effects()
         if self.on_edits_changed:
             self.on_edits_changed()
@@ -0,0 +1,192 @@
+"""
+madOS Photo Viewer - Similar Photos Dialog
+============================================
+
+Shows the groups found by :class:`~.similarity.SimilarityScanner` for the
+current folder.  Every photo in a group except the first is pre-selected,
+and the selected files are moved to the trash in one step, so the user
+can clear a folder of duplicates without opening each photo.
+"""
+
+import os
+
+import gi
+
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gtk
+
+# Response id of the "Move to Trash" button
+RESPONSE_TRASH = 1
+
+# Thumbnail edge inside the dialog
+ITEM_SIZE = 128
+
+
+class SimilarPhotosDialog(Gtk.Dialog):
+    """Lists groups of similar photos and trashes the selected ones.
+
+    Attributes:
+        on_deleted: Called as ``on_deleted(names)`` with the names moved
+                    to the trash.
+
+    Args:
+        parent: The transient-for window.
+        scanner: The :class:`~.similarity.SimilarityScanner` to run.
+        thumb_cache: The :class:`~.thumbnails.ThumbnailCache` for previews.
+        directory: Folder to scan.
+        names: File names in the folder.
+        translate: Callable mapping translation keys to text.
+    """
+
+    def __init__(self, parent, scanner, thumb_cache, directory, names, translate):
+        super().__init__(title=translate("similar_photos"), transient_for=parent)
+        self.set_default_size(760, 540)
+        self.on_deleted = None
+        self._scanner = scanner
+        self._thumb_cache = thumb_cache
+        self._directory = directory
+        self._t = translate
+        self._checks = {}  # filepath -> Gtk.CheckButton
+        self._images = {}  # filepath -> Gtk.Image awaiting a thumbnail
+        self._group_frames = []  # (Gtk.Frame, [filepath, ...])
+
+        box = self.get_content_area()
+        box.set_spacing(6)
+
+        self._progress = Gtk.ProgressBar()
+        self._progress.set_show_text(True)
+        box.pack_start(self._progress, False, False, 0)
+
+        self._status = Gtk.Label(label="")
+        self._status.set_xalign(0)
+        box.pack_start(self._status, False, False, 0)
+
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+        self._groups = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
+        scrolled.add(self._groups)
+        box.pack_start(scrolled, True, True, 0)
+
+        self._trash_button = self.add_button(self._t("move_to_trash"), RESPONSE_TRASH)
+        self._trash_button.get_style_context().add_class("destructive-action")
+        self._trash_button.set_sensitive(False)
+        self.add_button(Gtk.STOCK_CLOSE, Gtk.ResponseType.CLOSE)
+        self.connect("response", self._on_response)
+
+        scanner.scan(directory, names, self._on_progress, self._on_done)
+
+    # ------------------------------------------------------------------
+    # Scan results
+    # ------------------------------------------------------------------
+
+    def _on_progress(self, done, total):
+        """Show hashing progress."""
+        self._progress.set_fraction(done / total if total else 1.0)
+        self._progress.set_text(f"{done} / {total}")
+
+    def _on_done(self, groups):
+        """Build one row of selectable thumbnails per group."""
+        self._progress.set_visible(False)
+        if not groups:
+            self._status.set_text(self._t("no_similar_photos"))
+            return
+        self._status.set_text(f"{self._t('similar_photos')}: {len(groups)}")
+        for group in groups:
+            flow = Gtk.FlowBox()
+            flow.set_selection_mode(Gtk.SelectionMode.NONE)
+            flow.set_max_children_per_line(8)
+            for i, name in enumerate(group):
+                flow.add(self._build_item(name, selected=i > 0))
+            frame = Gtk.Frame()
+            frame.add(flow)
+            self._groups.pack_start(frame, False, False, 0)
+            paths = [os.path.join(self._directory, name) for name in group]
+            self._group_frames.append((frame, paths))
+        self._groups.show_all()
+        self._update_trash_button()
+
+    def _build_item(self, name, selected):
+        """Return a check button showing the thumbnail and name of a photo."""
+        path = os.path.join(self._directory, name)
+        image = Gtk.Image()
+        image.set_size_request(ITEM_SIZE, ITEM_SIZE)
+        # Requested as this dialog's own, so the grid and filmstrip
+        # neither swallow the callback nor cancel the request
+        pixbuf = self._thumb_cache.request(path, self._on_thumbnail_ready, owner=self)
+        if pixbuf is not None:
+            image.set_from_pixbuf(pixbuf)
+        else:
+            self._images[path] = image
+
+        label = Gtk.Label(label=name)
+        label.set_ellipsize(3)  # PANGO_ELLIPSIZE_END
+        label.set_max_width_chars(16)
+
+        inner = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=2)
+        inner.pack_start(image, False, False, 0)
+        inner.pack_start(label, False, False, 0)
+
+        check = Gtk.CheckButton()
+        check.add(inner)
+        check.set_active(selected)
+        check.set_tooltip_text(name)
+        check.connect("toggled", lambda w: self._update_trash_button())
+        self._checks[path] = check
+        return check
+
+    def _on_thumbnail_ready(self, filepath, pixbuf):
+        image = self._images.pop(filepath, None)
+        if image is not None and pixbuf is not None:
+            image.set_from_pixbuf(pixbuf)
+
+    def _update_trash_button(self):
+        self._trash_button.set_sensitive(any(c.get_active() for c in self._checks.values()))
+
+    # ------------------------------------------------------------------
+    # Actions
+    # ------------------------------------------------------------------
+
+    def _on_response(self, dialog, response):
+        if response == RESPONSE_TRASH:
+            self._trash_selected()
+            return
+        self._scanner.cancel()
+        self._thumb_cache.cancel_pending(owner=self)
+        self._images.clear()
+        self.destroy()
+
+    def _trash_selected(self):
+        """Move the selected files to the trash and drop them from the list."""
+        gi.require_version("Gio", "2.0")
+        from gi.repository import Gio
+
+        trashed = []
+        for path, check in list(self._checks.items()):
+            if not check.get_active():
+                continue
+            try:
+                Gio.File.new_for_path(path).trash(None)
+            except Exception as e:
+                print(f"Cannot move {path} to trash: {e}")
+                continue
+            trashed.append(os.path.basename(path))
+            del self._checks[path]
+            check.get_parent().destroy()  # The FlowBoxChild
+
+        # Groups left with one photo are no longer duplicates
+        remaining = []
+        for frame, paths in self._group_frames:
+            paths = [p for p in paths if p in self._checks]
+            if len(paths) < 2:
+                for path in paths:
+                    del self._checks[path]
+                frame.destroy()
+            else:
+                remaining.append((frame, paths))
+        self._group_frames = remaining
+        if not remaining:
+            self._status.set_text(self._t("no_similar_photos"))
+        self._update_trash_button()
+
+        if trashed and self.on_deleted:
+            self.on_deleted(trashed)
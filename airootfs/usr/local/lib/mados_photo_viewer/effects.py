@@ -0,0 +1,764 @@
+"""
+madOS Photo Viewer - Tiled Effect Layer
+=========================================
+
+Renders blur and pixelate strokes as a grid of cached tiles so the
+canvas can show the real result while the user paints.
+
+    - The image is divided into ``TILE_SIZE`` square tiles.
+    - Each effect stroke is rasterized into a coverage mask (the brush
+      path with round caps), and the effect is computed once per tile
+      over the tile plus a small margin of context, then composited
+      through the mask.  Overlapping points of a stroke cost nothing
+      extra, unlike the old per-point sub-pixbuf copies.
+    - A tile is identified by the strokes that touch it; when that set
+      changes (a stroke grows, is undone, or erased) only those tiles are
+      re-rendered.  Rendering runs on a worker pool and finished tiles are
+      delivered on the GTK main loop.
+
+Blur is a true Gaussian approximation: three separable box passes run on
+numpy views of the cairo surface, limited to the stroke's bounding box
+within the tile.  Without numpy a downscale/upscale approximation is
+used instead.
+
+Before a tile is replaced by a new render, its previous result is kept
+as a zlib-compressed checkpoint in a byte-budgeted :class:`TileCheckpoints`
+store.  Undo and redo bring a tile back to an earlier set of strokes, so
+they restore checkpoints instead of re-rendering, and their cost follows
+the edited area rather than the length of the history.
+
+The same rendering code is used by :func:`apply_effect_strokes` when
+saving, so what the canvas previews is exactly what gets written; given
+the canvas layer it reuses the tiles already rendered.
+
+Layer coordinates are pixels of the source pixbuf.  Strokes are stored in
+full-resolution image coordinates and scaled by the layer's ``scale``
+(source width / image width) so a reduced decode can be edited too.
+"""
+
+import itertools
+import math
+import zlib
+from collections import OrderedDict
+
+import cairo
+
+import gi
+
+gi.require_version("Gdk", "3.0")
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import Gdk, GLib
+
+# numpy is optional; blur falls back to cairo resampling without it
+NUMPY_AVAILABLE = False
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    pass
+
+from .tools import TOOL_BLUR, TOOL_PIXELATE
+
+# Edge length of one effect tile (layer pixels)
+TILE_SIZE = 256
+
+# Tile context margins are rounded up to this so that pixelation blocks and
+# the blur sampling grid line up across neighbouring tiles
+MARGIN_ALIGN = 32
+
+# Gaussian sigma as a fraction of the brush width, and its lower bound
+BLUR_SIGMA_PER_WIDTH = 0.25
+BLUR_SIGMA_MIN = 2.0
+
+# Number of box passes approximating the Gaussian
+BLUR_PASSES = 3
+
+# Default memory budget for compressed undo checkpoints (bytes)
+CHECKPOINT_BUDGET = 32 * 1024 * 1024
+
+# Serial numbers identifying strokes in tile signatures
+_stroke_serials = itertools.count(1)
+
+
+class StrokeSnapshot:
+    """Immutable, thread-safe copy of an effect stroke in layer pixels.
+
+    Args:
+        stroke: A BlurStroke or PixelateStroke.
+        scale: Layer pixels per image pixel.
+    """
+
+    __slots__ = ("type", "width", "block", "points")
+
+    def __init__(self, stroke, scale=1.0):
+        self.type = stroke.type
+        self.width = max(1.0, stroke.brush_size * scale)
+        self.block = max(2, round(getattr(stroke, "block_size", 8) * scale))
+        self.points = tuple((x * scale, y * scale) for x, y in stroke.points)
+
+    @property
+    def sigma(self):
+        """Gaussian standard deviation of the blur, in layer pixels."""
+        return max(BLUR_SIGMA_MIN, self.width * BLUR_SIGMA_PER_WIDTH)
+
+    @property
+    def margin(self):
+        """Pixels of context the effect reads around the covered area."""
+        if self.type == TOOL_PIXELATE:
+            needed = self.block
+        else:
+            needed = math.ceil(3 * self.sigma)
+        return math.ceil(needed / MARGIN_ALIGN) * MARGIN_ALIGN
+
+    def bounds(self):
+        """Return the covered rectangle ``(x0, y0, x1, y1)`` in layer pixels."""
+        r = self.width / 2.0 + 1
+        xs = [p[0] for p in self.points]
+        ys = [p[1] for p in self.points]
+        return (
+            math.floor(min(xs) - r),
+            math.floor(min(ys) - r),
+            math.ceil(max(xs) + r),
+            math.ceil(max(ys) + r),
+        )
+
+
+def stroke_signature(stroke):
+    """Return a cheap value that changes whenever *stroke* changes.
+
+    Args:
+        stroke: A BlurStroke or PixelateStroke.
+
+    Returns:
+        A hashable signature.
+    """
+    # A serial rather than id(): ids are reused once a stroke is freed,
+    # which would let a stale checkpoint match a new stroke
+    serial = getattr(stroke, "_effect_serial", None)
+    if serial is None:
+        serial = stroke._effect_serial = next(_stroke_serials)
+    return (serial, len(stroke.points), stroke.brush_size)
+
+
+def tile_range(x0, y0, x1, y1, width, height, tile=TILE_SIZE):
+    """Return the tile coordinates overlapping a rectangle.
+
+    Args:
+        x0, y0, x1, y1: Rectangle in layer pixels (x1/y1 exclusive).
+        width, height: Layer size, used to clamp the range.
+        tile: Tile edge length.
+
+    Returns:
+        List of ``(tx, ty)`` tuples.
+    """
+    x0, y0 = max(0, x0), max(0, y0)
+    x1, y1 = min(width, x1), min(height, y1)
+    if x1 <= x0 or y1 <= y0:
+        return []
+    return [
+        (tx, ty)
+        for ty in range(int(y0) // tile, (math.ceil(y1) - 1) // tile + 1)
+        for tx in range(int(x0) // tile, (math.ceil(x1) - 1) // tile + 1)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Tile rendering (worker-safe: only touches its own cairo surfaces)
+# ---------------------------------------------------------------------------
+
+
+def _surface_format(pixbuf):
+    return cairo.FORMAT_ARGB32 if pixbuf.get_has_alpha() else cairo.FORMAT_RGB24
+
+
+def _surface_from_pixbuf(pixbuf, x, y, w, h):
+    """Convert a region of *pixbuf* to a cairo ImageSurface."""
+    surface = cairo.ImageSurface(_surface_format(pixbuf), w, h)
+    cr = cairo.Context(surface)
+    # A sub-pixbuf shares memory, so only the region is converted
+    Gdk.cairo_set_source_pixbuf(cr, pixbuf.new_subpixbuf(x, y, w, h), 0, 0)
+    cr.set_operator(cairo.OPERATOR_SOURCE)
+    cr.paint()
+    return surface
+
+
+def _resample(surface, w, h, factor, up_filter, ox=0, oy=0):
+    """Downscale *surface* by *factor* on a grid anchored at layer origin, then scale back.
+
+    Args:
+        surface: Source surface.
+        w, h: Surface size.
+        factor: Integer downscale factor.
+        up_filter: cairo filter used for the upscale.
+        ox, oy: Layer position of the surface origin (for grid alignment).
+
+    Returns:
+        A new surface of the same size.
+    """
+    shift_x, shift_y = ox % factor, oy % factor
+    small_w = max(1, math.ceil((w + shift_x) / factor))
+    small_h = max(1, math.ceil((h + shift_y) / factor))
+    fmt = surface.get_format()
+
+    small = cairo.ImageSurface(fmt, small_w, small_h)
+    cr = cairo.Context(small)
+    cr.scale(1.0 / factor, 1.0 / factor)
+    cr.set_source_surface(surface, shift_x, shift_y)
+    cr.get_source().set_filter(cairo.FILTER_GOOD)
+    cr.get_source().set_extend(cairo.EXTEND_PAD)
+    cr.set_operator(cairo.OPERATOR_SOURCE)
+    cr.paint()
+
+    out = cairo.ImageSurface(fmt, w, h)
+    cr = cairo.Context(out)
+    cr.translate(-shift_x, -shift_y)
+    cr.scale(factor, factor)
+    cr.set_source_surface(small, 0, 0)
+    cr.get_source().set_filter(up_filter)
+    cr.get_source().set_extend(cairo.EXTEND_PAD)
+    cr.set_operator(cairo.OPERATOR_SOURCE)
+    cr.paint()
+    return out
+
+
+def box_radii_for_gaussian(sigma, passes=BLUR_PASSES):
+    """Return box radii whose repeated application approximates a Gaussian.
+
+    Args:
+        sigma: Target standard deviation in pixels.
+        passes: Number of box passes.
+
+    Returns:
+        List of *passes* integer radii (box width is ``2 * r + 1``).
+    """
+    ideal = math.sqrt(12 * sigma * sigma / passes + 1)
+    lower = int(ideal)
+    if lower % 2 == 0:
+        lower -= 1
+    upper = lower + 2
+    m = round(
+        (12 * sigma * sigma - passes * lower * lower - 4 * passes * lower - 3 * passes)
+        / (-4 * lower - 4)
+    )
+    return [(lower if i < m else upper) // 2 for i in range(passes)]
+
+
+def _box_blur_axis(data, radius, axis):
+    """One box blur pass along *axis* using a running sum (edge-clamped).
+
+    Args:
+        data: float32 array of shape (h, w, channels).
+        radius: Box radius in pixels.
+        axis: 0 for vertical, 1 for horizontal.
+
+    Returns:
+        A new float32 array of the same shape.
+    """
+    if radius <= 0:
+        return data
+    n = data.shape[axis]
+    pad = [(0, 0)] * data.ndim
+    pad[axis] = (radius + 1, radius)
+    summed = np.cumsum(np.pad(data, pad, mode="edge"), axis=axis, dtype=np.float32)
+    width = 2 * radius + 1
+    hi = [slice(None)] * data.ndim
+    lo = [slice(None)] * data.ndim
+    hi[axis] = slice(width, width + n)
+    lo[axis] = slice(0, n)
+    return (summed[tuple(hi)] - summed[tuple(lo)]) * (1.0 / width)
+
+
+def gaussian_blur_array(pixels, sigma, passes=BLUR_PASSES):
+    """Blur a (h, w, channels) uint8 array with separable box passes.
+
+    Args:
+        pixels: uint8 array (e.g. premultiplied BGRA surface data).
+        sigma: Gaussian standard deviation in pixels.
+        passes: Number of box passes.
+
+    Returns:
+        A new uint8 array of the same shape.
+    """
+    data = pixels.astype(np.float32)
+    for radius in box_radii_for_gaussian(sigma, passes):
+        data = _box_blur_axis(data, radius, 1)
+        data = _box_blur_axis(data, radius, 0)
+    return np.clip(data + 0.5, 0, 255).astype(np.uint8)
+
+
+def _surface_array(surface):
+    """Return a writable (h, w, 4) uint8 view of an ImageSurface's pixels."""
+    surface.flush()
+    h, w, stride = surface.get_height(), surface.get_width(), surface.get_stride()
+    return np.ndarray((h, stride // 4, 4), dtype=np.uint8, buffer=surface.get_data())[:, :w]
+
+
+def _blur_surface(surface, snapshot, ox, oy):
+    """Gaussian-blur the part of *surface* covered by *snapshot*.
+
+    Only the stroke's bounding box (plus the kernel's reach) is
+    processed; the rest of the returned surface is left untouched since
+    the coverage mask hides it anyway.
+    """
+    w, h = surface.get_width(), surface.get_height()
+    if not NUMPY_AVAILABLE:
+        factor = max(2, round(snapshot.sigma))
+        return _resample(surface, w, h, factor, cairo.FILTER_BILINEAR, ox, oy)
+
+    bx0, by0, bx1, by1 = snapshot.bounds()
+    x0, y0 = max(0, bx0 - ox), max(0, by0 - oy)
+    x1, y1 = min(w, bx1 - ox), min(h, by1 - oy)
+    out = cairo.ImageSurface(surface.get_format(), w, h)
+    if x1 <= x0 or y1 <= y0:
+        return out
+
+    reach = math.ceil(3 * snapshot.sigma)
+    cx0, cy0 = max(0, x0 - reach), max(0, y0 - reach)
+    cx1, cy1 = min(w, x1 + reach), min(h, y1 + reach)
+    src = _surface_array(surface)
+    blurred = gaussian_blur_array(src[cy0:cy1, cx0:cx1], snapshot.sigma)
+
+    dst = _surface_array(out)
+    dst[y0:y1, x0:x1] = blurred[y0 - cy0 : y1 - cy0, x0 - cx0 : x1 - cx0]
+    out.mark_dirty()
+    return out
+
+
+def _effect_surface(surface, snapshot, ox, oy):
+    """Return the fully-effected version of *surface* for one stroke."""
+    w, h = surface.get_width(), surface.get_height()
+    if snapshot.type == TOOL_PIXELATE:
+        return _resample(surface, w, h, snapshot.block, cairo.FILTER_NEAREST, ox, oy)
+    return _blur_surface(surface, snapshot, ox, oy)
+
+
+def _coverage_mask(snapshot, ox, oy, w, h):
+    """Rasterize the brush path of *snapshot* into an A8 mask."""
+    mask = cairo.ImageSurface(cairo.FORMAT_A8, w, h)
+    cr = cairo.Context(mask)
+    cr.translate(-ox, -oy)
+    cr.set_source_rgba(0, 0, 0, 1)
+    points = snapshot.points
+    if len(points) == 1:
+        x, y = points[0]
+        cr.arc(x, y, snapshot.width / 2.0, 0, 2 * math.pi)
+        cr.fill()
+    elif points:
+        cr.set_line_width(snapshot.width)
+        cr.set_line_cap(cairo.LINE_CAP_ROUND)
+        cr.set_line_join(cairo.LINE_JOIN_ROUND)
+        cr.move_to(*points[0])
+        for pt in points[1:]:
+            cr.line_to(*pt)
+        cr.stroke()
+    return mask
+
+
+def render_tile(pixbuf, tx, ty, snapshots, tile=TILE_SIZE):
+    """Render one effect tile.
+
+    Args:
+        pixbuf: Source GdkPixbuf (read only).
+        tx, ty: Tile coordinates.
+        snapshots: Ordered :class:`StrokeSnapshot` list touching the tile.
+        tile: Tile edge length.
+
+    Returns:
+        A cairo ImageSurface covering the tile with all effects applied.
+    """
+    width, height = pixbuf.get_width(), pixbuf.get_height()
+    x0, y0 = tx * tile, ty * tile
+    x1, y1 = min(width, x0 + tile), min(height, y0 + tile)
+
+    margin = max((s.margin for s in snapshots), default=0)
+    px0, py0 = max(0, x0 - margin), max(0, y0 - margin)
+    px1, py1 = min(width, x1 + margin), min(height, y1 + margin)
+    pw, ph = px1 - px0, py1 - py0
+
+    work = _surface_from_pixbuf(pixbuf, px0, py0, pw, ph)
+    for snapshot in snapshots:
+        effect = _effect_surface(work, snapshot, px0, py0)
+        mask = _coverage_mask(snapshot, px0, py0, pw, ph)
+        cr = cairo.Context(work)
+        cr.set_source_surface(effect, 0, 0)
+        cr.mask_surface(mask, 0, 0)
+
+    out = cairo.ImageSurface(work.get_format(), x1 - x0, y1 - y0)
+    cr = cairo.Context(out)
+    cr.set_source_surface(work, px0 - x0, py0 - y0)
+    cr.set_operator(cairo.OPERATOR_SOURCE)
+    cr.paint()
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Undo checkpoints
+# ---------------------------------------------------------------------------
+
+
+def _pack_surface(surface):
+    """Compress an ImageSurface into a restorable tuple."""
+    surface.flush()
+    return (
+        surface.get_format(),
+        surface.get_width(),
+        surface.get_height(),
+        surface.get_stride(),
+        zlib.compress(bytes(surface.get_data()), 1),
+    )
+
+
+def _unpack_surface(packed):
+    """Rebuild the ImageSurface compressed by :func:`_pack_surface`."""
+    fmt, width, height, stride, data = packed
+    return cairo.ImageSurface.create_for_data(
+        bytearray(zlib.decompress(data)), fmt, width, height, stride
+    )
+
+
+def _packed_size(packed):
+    """Return the byte size of a packed surface."""
+    return len(packed[-1])
+
+
+class TileCheckpoints:
+    """Byte-budgeted LRU of compressed tile renders.
+
+    Entries are keyed by tile and stroke signature, i.e. by *which*
+    strokes the tile shows, so a checkpoint is valid whenever the history
+    returns to that state.
+
+    Args:
+        budget: Maximum total compressed size in bytes.
+    """
+
+    def __init__(self, budget=CHECKPOINT_BUDGET):
+        self.budget = budget
+        self._entries = OrderedDict()  # (tile, signature) -> packed surface
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def bytes_used(self):
+        """Total compressed size of the stored checkpoints."""
+        return self._bytes
+
+    def store(self, tile, signature, surface):
+        """Checkpoint *surface* as the render of *tile* for *signature*."""
+        key = (tile, signature)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        packed = _pack_surface(surface)
+        size = _packed_size(packed)
+        if size > self.budget:
+            return
+        self._entries[key] = packed
+        self._bytes += size
+        while self._bytes > self.budget:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= _packed_size(evicted)
+
+    def restore(self, tile, signature):
+        """Return the checkpointed surface, or None if it was never stored or evicted."""
+        packed = self._entries.get((tile, signature))
+        if packed is None:
+            return None
+        self._entries.move_to_end((tile, signature))
+        return _unpack_surface(packed)
+
+    def clear(self):
+        """Drop every checkpoint."""
+        self._entries.clear()
+        self._bytes = 0
+
+
+def _is_growth(old, new):
+    """True if *new* only extends the last stroke of signature *old*.
+
+    Intermediate states of a stroke being painted are never undo
+    targets, so they are not worth checkpointing.
+    """
+    return (
+        len(old) == len(new)
+        and len(new) > 0
+        and old[:-1] == new[:-1]
+        and old[-1][0] == new[-1][0]
+    )
+
+
+# ---------------------------------------------------------------------------
+# EffectLayer
+# ---------------------------------------------------------------------------
+
+
+class EffectLayer:
+    """Cache of effect tiles for one source pixbuf.
+
+    Args:
+        pixbuf: The source GdkPixbuf the effects read from.
+        scale: Layer pixels per image pixel (``pixbuf width / image width``).
+        executor: Optional ``concurrent.futures`` executor.  Without one,
+                  :meth:`update` renders dirty tiles synchronously.
+        checkpoint_budget: Bytes of compressed undo checkpoints to keep;
+                           0 disables checkpointing.
+    """
+
+    def __init__(self, pixbuf, scale=1.0, executor=None, checkpoint_budget=CHECKPOINT_BUDGET):
+        self._source = pixbuf
+        self.scale = scale
+        self.width = pixbuf.get_width()
+        self.height = pixbuf.get_height()
+        self._executor = executor
+
+        self._stroke_tiles = {}  # id(stroke) -> [stroke, points_seen, brush, tiles]
+        self._wanted = {}  # (tx, ty) -> (signature, [stroke, ...])
+        self._tiles = {}  # (tx, ty) -> (signature, surface)
+        self._pending = {}  # (tx, ty) -> (signature, Future)
+        self._checkpoints = TileCheckpoints(checkpoint_budget) if checkpoint_budget else None
+
+        # Called on the main loop when a tile finishes rendering
+        self.on_tile_ready = None
+
+    @property
+    def source(self):
+        """The GdkPixbuf the effects read from."""
+        return self._source
+
+    @property
+    def is_idle(self):
+        """True when every wanted tile is rendered and current."""
+        return not self._pending and all(
+            self._tiles.get(t, (None,))[0] == sig for t, (sig, _) in self._wanted.items()
+        )
+
+    def update(self, strokes):
+        """Synchronize the layer with the ordered list of effect strokes.
+
+        Tiles whose set of touching strokes changed are re-rendered;
+        tiles no stroke touches any more are dropped.
+
+        Args:
+            strokes: BlurStroke / PixelateStroke objects in paint order.
+        """
+        wanted = {}
+        live = set()
+        for stroke in strokes:
+            if stroke.type not in (TOOL_BLUR, TOOL_PIXELATE) or not stroke.points:
+                continue
+            live.add(id(stroke))
+            for tile in self._tiles_for(stroke):
+                wanted.setdefault(tile, []).append(stroke)
+
+        for key in list(self._stroke_tiles):
+            if key not in live:
+                del self._stroke_tiles[key]
+
+        self._wanted = {
+            tile: (tuple(stroke_signature(s) for s in tile_strokes), tile_strokes)
+            for tile, tile_strokes in wanted.items()
+        }
+        for tile in list(self._tiles):
+            if tile not in self._wanted:
+                self._checkpoint(tile, *self._tiles.pop(tile))
+        for tile in list(self._pending):
+            if tile not in self._wanted and self._pending[tile][1].cancel():
+                del self._pending[tile]
+
+        for tile in self._wanted:
+            self._schedule(tile)
+
+    def draw(self, cr, x0, y0, x1, y1):
+        """Paint cached tiles intersecting a rectangle of layer pixels.
+
+        Tiles that are being re-rendered keep showing their previous
+        result until the new one arrives.
+
+        Args:
+            cr: Cairo context already transformed to layer pixels.
+            x0, y0, x1, y1: Visible rectangle in layer pixels.
+        """
+        for tile in tile_range(x0, y0, x1, y1, self.width, self.height):
+            entry = self._tiles.get(tile)
+            if entry is None:
+                continue
+            cr.set_source_surface(entry[1], tile[0] * TILE_SIZE, tile[1] * TILE_SIZE)
+            cr.paint()
+
+    def snapshot(self):
+        """Return a synchronous copy of the layer for use on another thread.
+
+        Rendered tile surfaces are never modified once installed, so the
+        copy shares them; tiles rendered later by either layer are not
+        seen by the other.
+
+        Returns:
+            A new EffectLayer without executor or checkpoints.
+        """
+        copy = EffectLayer(self._source, self.scale, checkpoint_budget=0)
+        copy._tiles = dict(self._tiles)
+        return copy
+
+    def render_all(self):
+        """Synchronously render every tile that is not current.
+
+        Returns:
+            Dictionary ``(tx, ty) -> surface`` of all effect tiles.
+        """
+        for tile, (sig, tile_strokes) in self._wanted.items():
+            cached = self._tiles.get(tile)
+            if cached is None or cached[0] != sig:
+                surface = self._restore(tile, sig)
+                if surface is None:
+                    snapshots = [StrokeSnapshot(s, self.scale) for s in tile_strokes]
+                    surface = render_tile(self._source, *tile, snapshots)
+                self._replace(tile, sig, surface)
+        return {tile: entry[1] for tile, entry in self._tiles.items()}
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _tiles_for(self, stroke):
+        """Return the tiles covered by *stroke*, updated incrementally."""
+        entry = self._stroke_tiles.get(id(stroke))
+        points = stroke.points
+        if (
+            entry is None
+            or entry[0] is not stroke
+            or entry[1] > len(points)
+            or entry[2] != stroke.brush_size
+        ):
+            entry = [stroke, 0, stroke.brush_size, set()]
+            self._stroke_tiles[id(stroke)] = entry
+
+        r = stroke.brush_size * self.scale / 2.0 + 1
+        s = self.scale
+        for i in range(max(0, entry[1] - 1), len(points)):
+            ax, ay = points[i - 1] if i > 0 else points[i]
+            bx, by = points[i]
+            entry[3].update(
+                tile_range(
+                    min(ax, bx) * s - r,
+                    min(ay, by) * s - r,
+                    max(ax, bx) * s + r,
+                    max(ay, by) * s + r,
+                    self.width,
+                    self.height,
+                )
+            )
+        entry[1] = len(points)
+        return entry[3]
+
+    def _checkpoint(self, tile, sig, surface):
+        """Keep a render that is about to be replaced or dropped."""
+        if self._checkpoints is not None:
+            self._checkpoints.store(tile, sig, surface)
+
+    def _restore(self, tile, sig):
+        """Return a checkpointed render of *tile* for *sig*, or None."""
+        if self._checkpoints is None:
+            return None
+        return self._checkpoints.restore(tile, sig)
+
+    def _replace(self, tile, sig, surface):
+        """Install a render, checkpointing the one it replaces."""
+        old = self._tiles.get(tile)
+        if old is not None and old[0] != sig and not _is_growth(old[0], sig):
+            self._checkpoint(tile, *old)
+        self._tiles[tile] = (sig, surface)
+
+    def _schedule(self, tile):
+        """Render *tile* if its cached result is missing or stale."""
+        sig, tile_strokes = self._wanted[tile]
+        cached = self._tiles.get(tile)
+        if cached is not None and cached[0] == sig:
+            return
+
+        # Undo/redo: the tile has shown this set of strokes before
+        restored = self._restore(tile, sig)
+        if restored is not None:
+            pending = self._pending.pop(tile, None)
+            if pending is not None:
+                pending[1].cancel()
+            self._replace(tile, sig, restored)
+            return
+
+        pending = self._pending.get(tile)
+        if pending is not None:
+            if pending[0] == sig:
+                return
+            if not pending[1].cancel():
+                return  # Running; _on_rendered reschedules when it lands
+            del self._pending[tile]
+
+        snapshots = [StrokeSnapshot(s, self.scale) for s in tile_strokes]
+        if self._executor is None:
+            self._replace(tile, sig, render_tile(self._source, *tile, snapshots))
+            return
+
+        future = self._executor.submit(render_tile, self._source, tile[0], tile[1], snapshots)
+        self._pending[tile] = (sig, future)
+        future.add_done_callback(
+            lambda fut: GLib.idle_add(self._on_rendered, tile, sig, fut)
+        )
+
+    def _on_rendered(self, tile, sig, future):
+        """Main-loop completion handler for a tile render."""
+        pending = self._pending.get(tile)
+        if pending is not None and pending[1] is future:
+            del self._pending[tile]
+        if future.cancelled():
+            return False
+        try:
+            surface = future.result()
+        except Exception as e:
+            print(f"Effect tile error: {e}")
+            return False
+        if tile in self._wanted:
+            self._replace(tile, sig, surface)
+            self._schedule(tile)  # Strokes may have changed meanwhile
+            if self.on_tile_ready:
+                self.on_tile_ready()
+        return False
+
+
+def apply_effect_strokes(pixbuf, strokes, layer=None, scale=1.0):
+    """Apply blur/pixelate strokes to a pixbuf.
+
+    Uses the same tile renderer as the live canvas preview.
+
+    Args:
+        pixbuf: The source GdkPixbuf.
+        strokes: BlurStroke / PixelateStroke objects in paint order.
+        layer: Optional :class:`EffectLayer` already tracking *pixbuf* at
+               *scale* (the canvas layer); its current tiles are reused
+               and only stale ones are rendered.
+        scale: Pixbuf pixels per image pixel, below 1 for a reduced copy.
+
+    Returns:
+        A new GdkPixbuf with the effects applied (or a copy if none).
+    """
+    if layer is None or layer.source is not pixbuf or layer.scale != scale:
+        layer = EffectLayer(pixbuf, scale, checkpoint_budget=0)
+    layer.update(strokes)
+    tiles = layer.render_all()
+    if not tiles:
+        return pixbuf.copy()
+
+    width, height = pixbuf.get_width(), pixbuf.get_height()
+    surface = cairo.ImageSurface(_surface_format(pixbuf), width, height)
+    cr = cairo.Context(surface)
+    Gdk.cairo_set_source_pixbuf(cr, pixbuf, 0, 0)
+    cr.set_operator(cairo.OPERATOR_SOURCE)
+    cr.paint()
+    for (tx, ty), tile_surface in tiles.items():
+        cr.set_source_surface(tile_surface, tx * TILE_SIZE, ty * TILE_SIZE)
+        cr.rectangle(
+            tx * TILE_SIZE, ty * TILE_SIZE, tile_surface.get_width(), tile_surface.get_height()
+        )
+        cr.fill()
+    return Gdk.pixbuf_get_from_surface(surface, 0, 0, width, height)
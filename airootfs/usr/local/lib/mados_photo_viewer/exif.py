@@ -0,0 +1,396 @@
+"""
+madOS Photo Viewer - EXIF Header Reader
+=========================================
+
+Reads the few metadata fields the viewer needs (date taken, orientation,
+camera, pixel dimensions) straight from the file headers, without
+decoding any pixel data:
+
+    - JPEG: the markers before the first scan are walked; the ``Exif``
+      APP1 segment holds a TIFF structure with the tags, and the SOF
+      marker gives the dimensions.  Segments that are not needed are
+      skipped with ``seek``.
+    - TIFF: the IFDs are read in place, following offsets with ``seek``.
+    - PNG: the dimensions come from the IHDR chunk.
+
+Typically only a few kilobytes are read per file, which keeps indexing a
+folder of thousands of photos cheap enough for a background thread.
+
+The raw ``Exif`` segment of a JPEG can also be copied into a re-encoded
+JPEG (:func:`read_exif_segment`, :func:`insert_exif_segment`), since
+GdkPixbuf's encoders write no metadata.
+"""
+
+import os
+import struct
+
+# TIFF tags (IFD0)
+TAG_IMAGE_WIDTH = 0x0100
+TAG_IMAGE_LENGTH = 0x0101
+TAG_MAKE = 0x010F
+TAG_MODEL = 0x0110
+TAG_ORIENTATION = 0x0112
+TAG_DATETIME = 0x0132
+TAG_EXIF_IFD = 0x8769
+
+# Exif sub-IFD tags
+TAG_DATETIME_ORIGINAL = 0x9003
+TAG_DATETIME_DIGITIZED = 0x9004
+TAG_PIXEL_X_DIMENSION = 0xA002
+TAG_PIXEL_Y_DIMENSION = 0xA003
+
+# TIFF field type -> size of one value in bytes
+_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 6: 1, 7: 1, 8: 2, 9: 4, 10: 8}
+
+# JPEG start-of-frame markers (all except DHT, JPG and DAC)
+_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# JPEG markers without a length field
+_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD9)}
+
+# Largest IFD entry count accepted (guards against corrupt offsets)
+_MAX_IFD_ENTRIES = 1024
+
+# Orientations that swap width and height
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class ImageMetadata:
+    """Header metadata of one image.
+
+    Attributes:
+        date_taken: ``"YYYY-MM-DD HH:MM:SS"`` or None.
+        orientation: EXIF orientation 1-8, or None if absent.
+        make: Camera manufacturer, or None.
+        model: Camera model, or None.
+        width: Stored pixel width, or None.
+        height: Stored pixel height, or None.
+    """
+
+    __slots__ = ("date_taken", "orientation", "make", "model", "width", "height")
+
+    def __init__(
+        self, date_taken=None, orientation=None, make=None, model=None, width=None, height=None
+    ):
+        self.date_taken = date_taken
+        self.orientation = orientation
+        self.make = make
+        self.model = model
+        self.width = width
+        self.height = height
+
+    def __eq__(self, other):
+        if not isinstance(other, ImageMetadata):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"ImageMetadata({fields})"
+
+    def as_tuple(self):
+        """Return the fields in ``__slots__`` order (used for storage)."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    @property
+    def camera(self):
+        """Return "Make Model" without repeating the make, or None."""
+        make, model = self.make or "", self.model or ""
+        if make and model.lower().startswith(make.lower()):
+            make = ""
+        camera = f"{make} {model}".strip()
+        return camera or None
+
+    @property
+    def display_size(self):
+        """Return ``(width, height)`` as displayed after orientation, or None."""
+        if not self.width or not self.height:
+            return None
+        if self.orientation in TRANSPOSED_ORIENTATIONS:
+            return (self.height, self.width)
+        return (self.width, self.height)
+
+
+def normalize_datetime(value):
+    """Convert an EXIF ``"YYYY:MM:DD HH:MM:SS"`` string to ISO-like form.
+
+    Args:
+        value: Raw EXIF date string.
+
+    Returns:
+        ``"YYYY-MM-DD HH:MM:SS"`` (sortable as text), or None if the value
+        is blank or malformed.
+    """
+    value = value.strip()
+    if len(value) < 19 or value[4] != ":" or value[7] != ":":
+        return None
+    date, time = value[:10], value[11:19]
+    digits = date.replace(":", "") + time.replace(":", "")
+    if not digits.isdigit() or int(date[:4]) == 0:
+        return None
+    return f"{date.replace(':', '-')} {time}"
+
+
+def read_metadata(filepath):
+    """Read the header metadata of an image file.
+
+    Files in other formats, or with damaged headers, give an
+    :class:`ImageMetadata` with whatever fields could be read.
+
+    Args:
+        filepath: Path to the image.
+
+    Returns:
+        An :class:`ImageMetadata`.
+
+    Raises:
+        OSError: If the file cannot be opened or read.
+    """
+    meta = ImageMetadata()
+    with open(filepath, "rb") as f:
+        head = f.read(24)
+        try:
+            if head.startswith(b"\xff\xd8"):
+                _read_jpeg(f, meta)
+            elif head[:4] in (b"II*\x00", b"MM\x00*"):
+                _read_tiff(_FileReader(f, 0), meta)
+            elif head.startswith(_PNG_SIGNATURE) and head[12:16] == b"IHDR":
+                meta.width, meta.height = struct.unpack(">II", head[16:24])
+        except (ValueError, struct.error):
+            pass
+    return meta
+
+
+# ----------------------------------------------------------------------
+# JPEG
+# ----------------------------------------------------------------------
+
+
+def _jpeg_segments(f):
+    """Yield ``(marker, size)`` for each segment before the first scan.
+
+    The file is positioned at the segment payload when each item is
+    yielded; the caller may read from it.
+    """
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return
+        if byte != b"\xff":
+            raise ValueError("JPEG marker expected")
+        marker = f.read(1)
+        while marker == b"\xff":  # Fill bytes
+            marker = f.read(1)
+        if not marker:
+            return
+        code = marker[0]
+        if code in _STANDALONE_MARKERS:
+            continue
+        if code in (0xD9, 0xDA):  # EOI, SOS: no more headers
+            return
+        (length,) = struct.unpack(">H", f.read(2))
+        if length < 2:
+            raise ValueError("bad JPEG segment length")
+        start = f.tell()
+        yield code, length - 2
+        f.seek(start + length - 2)
+
+
+def _read_jpeg(f, meta):
+    """Walk the JPEG markers up to the first scan."""
+    found_exif = False
+    for code, size in _jpeg_segments(f):
+        if code == 0xE1 and not found_exif:
+            payload = f.read(size)
+            if payload.startswith(b"Exif\x00\x00"):
+                found_exif = True
+                try:
+                    _read_tiff(_BytesReader(payload[6:]), meta)
+                except (ValueError, struct.error):
+                    pass  # Damaged Exif block; the SOF still gives the size
+        elif code in _SOF_MARKERS:
+            _precision, height, width = struct.unpack(">BHH", f.read(5))
+            meta.width, meta.height = width, height
+            return
+
+
+def read_exif_segment(filepath):
+    """Return the ``Exif`` APP1 payload of a JPEG file.
+
+    Args:
+        filepath: Path to the image.
+
+    Returns:
+        The payload bytes (starting with ``b"Exif\\0\\0"``), or None if the
+        file is not a JPEG or has no Exif segment.
+
+    Raises:
+        OSError: If the file cannot be opened or read.
+    """
+    with open(filepath, "rb") as f:
+        if f.read(2) != b"\xff\xd8":
+            return None
+        try:
+            for code, size in _jpeg_segments(f):
+                if code == 0xE1:
+                    payload = f.read(size)
+                    if payload.startswith(b"Exif\x00\x00"):
+                        return payload
+        except (ValueError, struct.error):
+            pass
+    return None
+
+
+def reset_orientation(payload):
+    """Return an Exif APP1 payload with its orientation set to 1 (upright).
+
+    For pixels that were already rotated according to the original tag.
+    Payloads that cannot be parsed are returned unchanged.
+
+    Args:
+        payload: Bytes from :func:`read_exif_segment`.
+
+    Returns:
+        The patched payload.
+    """
+    data = bytearray(payload)
+    base = 6  # After b"Exif\0\0"
+    order = bytes(data[base : base + 2])
+    if order not in (b"II", b"MM"):
+        return payload
+    endian = "<" if order == b"II" else ">"
+    try:
+        (ifd0,) = struct.unpack_from(endian + "I", data, base + 4)
+        (count,) = struct.unpack_from(endian + "H", data, base + ifd0)
+        for i in range(min(count, _MAX_IFD_ENTRIES)):
+            entry = base + ifd0 + 2 + i * 12
+            tag, kind = struct.unpack_from(endian + "HH", data, entry)
+            if tag == TAG_ORIENTATION and kind == 3:
+                struct.pack_into(endian + "H", data, entry + 8, 1)
+                break
+    except struct.error:
+        return payload
+    return bytes(data)
+
+
+def insert_exif_segment(jpeg, payload):
+    """Return encoded JPEG bytes with an Exif APP1 segment after SOI.
+
+    Args:
+        jpeg: Encoded JPEG without an Exif segment.
+        payload: Bytes from :func:`read_exif_segment`.
+
+    Returns:
+        The new JPEG bytes; *jpeg* unchanged if the payload does not fit
+        in one segment.
+    """
+    if not jpeg.startswith(b"\xff\xd8") or len(payload) + 2 > 0xFFFF:
+        return jpeg
+    return jpeg[:2] + b"\xff\xe1" + struct.pack(">H", len(payload) + 2) + payload + jpeg[2:]
+
+
+# ----------------------------------------------------------------------
+# TIFF structure (Exif APP1 payload or a .tif file)
+# ----------------------------------------------------------------------
+
+
+class _BytesReader:
+    """Random access to an in-memory TIFF structure."""
+
+    def __init__(self, data):
+        self._data = data
+
+    def read_at(self, offset, size):
+        if offset < 0 or offset + size > len(self._data):
+            raise ValueError("offset outside TIFF data")
+        return self._data[offset : offset + size]
+
+
+class _FileReader:
+    """Random access to a TIFF structure inside an open file."""
+
+    def __init__(self, f, base):
+        self._f = f
+        self._base = base
+
+    def read_at(self, offset, size):
+        self._f.seek(self._base + offset)
+        data = self._f.read(size)
+        if len(data) != size:
+            raise ValueError("offset outside TIFF data")
+        return data
+
+
+def _read_tiff(reader, meta):
+    """Fill *meta* from IFD0 and the Exif sub-IFD."""
+    order = reader.read_at(0, 2)
+    if order == b"II":
+        endian = "<"
+    elif order == b"MM":
+        endian = ">"
+    else:
+        raise ValueError("bad TIFF byte order")
+    magic, ifd0 = struct.unpack(endian + "HI", reader.read_at(2, 6))
+    if magic != 42:
+        raise ValueError("bad TIFF magic")
+
+    tags = _read_ifd(reader, endian, ifd0)
+    exif_offset = tags.get(TAG_EXIF_IFD)
+    exif = {}
+    if exif_offset:
+        try:
+            exif = _read_ifd(reader, endian, exif_offset)
+        except (ValueError, struct.error):
+            pass  # Keep what IFD0 gave
+
+    orientation = tags.get(TAG_ORIENTATION)
+    if orientation in range(1, 9):
+        meta.orientation = orientation
+    meta.make = tags.get(TAG_MAKE) or None
+    meta.model = tags.get(TAG_MODEL) or None
+    for tag, source in (
+        (TAG_DATETIME_ORIGINAL, exif),
+        (TAG_DATETIME_DIGITIZED, exif),
+        (TAG_DATETIME, tags),
+    ):
+        value = source.get(tag)
+        if isinstance(value, str):
+            meta.date_taken = normalize_datetime(value)
+            if meta.date_taken:
+                break
+    width = exif.get(TAG_PIXEL_X_DIMENSION) or tags.get(TAG_IMAGE_WIDTH)
+    height = exif.get(TAG_PIXEL_Y_DIMENSION) or tags.get(TAG_IMAGE_LENGTH)
+    if isinstance(width, int) and isinstance(height, int) and width and height:
+        meta.width, meta.height = width, height
+
+
+def _read_ifd(reader, endian, offset):
+    """Return ``{tag: value}`` for the scalar and ASCII entries of an IFD."""
+    (count,) = struct.unpack(endian + "H", reader.read_at(offset, 2))
+    if count > _MAX_IFD_ENTRIES:
+        raise ValueError("implausible IFD entry count")
+    entries = reader.read_at(offset + 2, count * 12)
+    tags = {}
+    for i in range(count):
+        tag, kind, n, raw = struct.unpack(endian + "HHI4s", entries[i * 12 : i * 12 + 12])
+        size = _TYPE_SIZES.get(kind)
+        if size is None or n == 0:
+            continue
+        if kind == 2:  # ASCII
+            if n <= 4:
+                data = raw[:n]
+            else:
+                (value_offset,) = struct.unpack(endian + "I", raw)
+                try:
+                    data = reader.read_at(value_offset, n)
+                except ValueError:
+                    continue
+            tags[tag] = data.split(b"\x00", 1)[0].decode("utf-8", "replace").strip()
+        elif kind == 3:  # SHORT
+            tags[tag] = struct.unpack(endian + "H", raw[:2])[0]
+        elif kind == 4:  # LONG
+            tags[tag] = struct.unpack(endian + "I", raw)[0]
+    return tags
@@ -0,0 +1,278 @@
+"""
+madOS Photo Viewer - Histogram
+================================
+
+Computes the RGB and luma histogram of the displayed image, with a few
+exposure statistics, and draws it in the info panel.
+
+    - The histogram is taken from a sample of about a million pixels:
+      the pixbuf is reduced with nearest-neighbour scaling, which reads
+      only the sampled pixels, instead of visiting every pixel of a
+      24 MP photo.  The distribution is the same for display purposes.
+    - The sample is viewed as a numpy array through ``get_pixels`` and
+      the rowstride, and counted with ``numpy.bincount``; there is no
+      per-pixel Python code.  Without numpy no histogram is shown.
+    - Edits are composed onto the sample at its scale, so the histogram
+      follows painting and blurring without composing the full image.
+    - Work runs on a worker thread and results are handed to the GTK
+      main loop, so showing an image never waits for its histogram.
+"""
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import gi
+
+gi.require_version("Gtk", "3.0")
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import Gtk, GdkPixbuf, GLib
+
+# numpy is optional; the histogram is not shown without it
+NUMPY_AVAILABLE = False
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    pass
+
+from .theme import NORD, hex_to_rgb
+from .tools import compose_edits_onto_pixbuf
+
+# Number of pixels the histogram is computed from
+HISTOGRAM_SAMPLES = 1024 * 1024
+
+# Number of bins per channel
+BINS = 256
+
+# Size of the histogram widget
+HISTOGRAM_WIDTH = 256
+HISTOGRAM_HEIGHT = 100
+
+# Integer Rec. 709 luma weights (sum to 256)
+_LUMA_WEIGHTS = (54, 183, 19)
+
+# Channel colours when drawn, with the fill opacity
+_CHANNEL_COLOURS = (
+    ("red", hex_to_rgb(NORD["nord11"]), 0.5),
+    ("green", hex_to_rgb(NORD["nord14"]), 0.5),
+    ("blue", hex_to_rgb(NORD["nord10"]), 0.5),
+)
+
+
+class Histogram:
+    """Per-channel counts of one image and its exposure statistics.
+
+    Attributes:
+        red, green, blue, luma: Lists of :data:`BINS` counts.
+        samples: Number of pixels counted.
+        mean: Mean luma, 0-255.
+        shadows: Fraction of pixels with luma 0 (clipped blacks).
+        highlights: Fraction of pixels with luma 255 (clipped whites).
+    """
+
+    __slots__ = ("red", "green", "blue", "luma", "samples", "mean", "shadows", "highlights")
+
+    def __init__(self, red, green, blue, luma):
+        self.red = red
+        self.green = green
+        self.blue = blue
+        self.luma = luma
+        self.samples = sum(luma)
+        total = self.samples or 1
+        self.mean = sum(i * n for i, n in enumerate(luma)) / total
+        self.shadows = luma[0] / total
+        self.highlights = luma[-1] / total
+
+    @property
+    def peak(self):
+        """Largest count of any channel, for scaling the plot."""
+        return max(max(self.red), max(self.green), max(self.blue), max(self.luma))
+
+
+def sample_step(width, height, samples=HISTOGRAM_SAMPLES):
+    """Return the pixel step that leaves about *samples* pixels."""
+    return max(1, math.ceil(math.sqrt(width * height / samples)))
+
+
+def sample_pixbuf(pixbuf, samples=HISTOGRAM_SAMPLES):
+    """Return *pixbuf* reduced to about *samples* pixels.
+
+    Returns:
+        ``(sample, scale)``: the reduced pixbuf (*pixbuf* itself if it is
+        small enough) and its size relative to *pixbuf*.
+    """
+    width, height = pixbuf.get_width(), pixbuf.get_height()
+    step = sample_step(width, height, samples)
+    if step == 1:
+        return pixbuf, 1.0
+    sample_w, sample_h = max(1, width // step), max(1, height // step)
+    sample = pixbuf.scale_simple(sample_w, sample_h, GdkPixbuf.InterpType.NEAREST)
+    return sample, sample_w / width
+
+
+def pixel_array(pixbuf):
+    """Return a ``(height, width, 3)`` uint8 numpy view of a pixbuf's RGB.
+
+    Rows are addressed through the rowstride; the last row of a pixbuf
+    may be shorter than the stride, so the buffer is not reshaped.
+    """
+    width, height = pixbuf.get_width(), pixbuf.get_height()
+    channels, stride = pixbuf.get_n_channels(), pixbuf.get_rowstride()
+    data = np.frombuffer(pixbuf.get_pixels(), dtype=np.uint8)
+    view = np.lib.stride_tricks.as_strided(
+        data, shape=(height, width, channels), strides=(stride, channels, 1), writeable=False
+    )
+    return view[:, :, :3]
+
+
+def compute_histogram(pixbuf):
+    """Count the RGB and luma values of every pixel of *pixbuf*.
+
+    Args:
+        pixbuf: An 8-bit RGB(A) GdkPixbuf, normally a sample.
+
+    Returns:
+        A :class:`Histogram`, or None without numpy.
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+    rgb = pixel_array(pixbuf)
+    planes = [rgb[:, :, c].ravel() for c in range(3)]
+    counts = [np.bincount(plane, minlength=BINS) for plane in planes]
+    # uint16 holds 255 * 256, the largest weighted sum
+    luma = sum(plane.astype(np.uint16) * w for plane, w in zip(planes, _LUMA_WEIGHTS)) >> 8
+    counts.append(np.bincount(luma, minlength=BINS))
+    return Histogram(*(c.tolist() for c in counts))
+
+
+def image_histogram(pixbuf, history=None, image_width=None):
+    """Sample *pixbuf*, apply the edits in *history* and count it.
+
+    Args:
+        pixbuf: The displayed pixbuf, possibly a reduced decode.
+        history: Optional EditHistory snapshot to compose onto the sample.
+        image_width: Full-resolution width the edits are expressed in.
+
+    Returns:
+        A :class:`Histogram`, or None without numpy.
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+    sample, scale = sample_pixbuf(pixbuf)
+    if history is not None and history.has_edits:
+        scale *= pixbuf.get_width() / (image_width or pixbuf.get_width())
+        sample = compose_edits_onto_pixbuf(sample, history, scale=scale)
+    return compute_histogram(sample)
+
+
+def trace_channel(cr, counts, peak, width, height):
+    """Add the closed outline of one channel's histogram to *cr*'s path.
+
+    Args:
+        cr: Cairo context.
+        counts: The :data:`BINS` counts.
+        peak: Count drawn at full height.
+        width: Plot width.
+        height: Plot height.
+    """
+    step = width / len(counts)
+    cr.move_to(0, height)
+    for i, count in enumerate(counts):
+        y = height - height * min(count / peak, 1.0) if peak else height
+        cr.line_to(i * step, y)
+        cr.line_to((i + 1) * step, y)
+    cr.line_to(width, height)
+    cr.close_path()
+
+
+class HistogramWorker:
+    """Computes histograms on a worker thread."""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="histogram")
+        self._generation = 0
+        self._future = None
+
+    def request(self, pixbuf, callback, history=None, image_width=None):
+        """Compute the histogram of *pixbuf* in the background.
+
+        A request still queued is dropped, and the result of an older
+        request is not delivered.
+
+        Args:
+            pixbuf: The displayed pixbuf.
+            callback: Called on the main loop as ``callback(histogram)``;
+                      the histogram is None if it could not be computed.
+            history: Optional EditHistory whose edits are included.
+            image_width: Full-resolution width of the image.
+        """
+        self._generation += 1
+        generation = self._generation
+        if self._future is not None:
+            self._future.cancel()
+        if history is not None:
+            history = history.snapshot()
+
+        def work():
+            try:
+                return image_histogram(pixbuf, history, image_width)
+            except Exception as e:
+                print(f"Cannot compute histogram: {e}")
+                return None
+
+        self._future = self._executor.submit(work)
+        self._future.add_done_callback(
+            lambda f: GLib.idle_add(self._deliver, generation, f, callback)
+        )
+
+    def cancel(self):
+        """Drop the pending request."""
+        self._generation += 1
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+    def shutdown(self):
+        """Stop the worker."""
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _deliver(self, generation, future, callback):
+        """Main-loop handler: pass a current result on."""
+        if generation == self._generation and not future.cancelled():
+            callback(future.result())
+        return False
+
+
+class HistogramView(Gtk.DrawingArea):
+    """Plots a :class:`Histogram`: RGB channels filled, luma outlined."""
+
+    def __init__(self):
+        super().__init__()
+        self._histogram = None
+        self.set_size_request(HISTOGRAM_WIDTH, HISTOGRAM_HEIGHT)
+        self.connect("draw", self._on_draw)
+
+    def set_histogram(self, histogram):
+        """Show *histogram*, or an empty plot for None."""
+        self._histogram = histogram
+        self.queue_draw()
+
+    def _on_draw(self, widget, cr):
+        width, height = self.get_allocated_width(), self.get_allocated_height()
+        cr.set_source_rgb(*hex_to_rgb(NORD["nord0"]))
+        cr.paint()
+        histogram = self._histogram
+        if histogram is None:
+            return False
+        peak = histogram.peak
+        for name, (r, g, b), alpha in _CHANNEL_COLOURS:
+            trace_channel(cr, getattr(histogram, name), peak, width, height)
+            cr.set_source_rgba(r, g, b, alpha)
+            cr.fill()
+        trace_channel(cr, histogram.luma, peak, width, height)
+        cr.set_source_rgb(*hex_to_rgb(NORD["nord6"]))
+        cr.set_line_width(1.0)
+        cr.stroke()
+        return False
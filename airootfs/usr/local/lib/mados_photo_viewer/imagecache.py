@@ -0,0 +1,320 @@
+"""
+madOS Photo Viewer - Decoded Image Cache and Prefetcher
+=========================================================
+
+Keeps recently viewed images decoded in memory and decodes upcoming
+ones in the background so that next/prev navigation swaps pixbufs
+instead of waiting on the JPEG decoder.
+
+    - :class:`DecodedImageCache` is an LRU bounded by the total byte size
+      of the pixbufs it holds (not by entry count), so a folder of 50 MP
+      photos and a folder of icons use the same amount of memory.
+    - :class:`ImageLoader` decodes on a small worker pool, stores results
+      in the cache, and delivers them on the GTK main loop.  Queued
+      prefetches that are no longer wanted (the user changed direction or
+      jumped elsewhere) are cancelled before they start.
+
+Images are decoded in two tiers.  The first decode is size-prepared to
+the screen (:func:`decode_image` with *max_size*), which lets the JPEG
+loader use DCT scaling and keeps a 50 MP photo at a few megabytes.  The
+full-resolution decode only happens when the canvas asks for it (zoom
+past the reduced size, editing, saving) and then replaces the reduced
+entry in the cache.
+
+All cache bookkeeping happens on the main thread; workers only decode.
+"""
+
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import gi
+
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import GdkPixbuf, GLib
+
+# Upper bound for the decoded-image cache (bytes)
+MAX_CACHE_BUDGET = 256 * 1024 * 1024
+
+# Fraction of physical RAM the cache may use on small machines
+RAM_FRACTION = 8
+
+# EXIF orientations (as GdkPixbuf option strings) that swap width and height
+TRANSPOSED_OPTIONS = {"5", "6", "7", "8"}
+
+
+def default_cache_budget():
+    """Return the decoded-image budget for this machine.
+
+    Uses 1/8 of physical memory, capped at 256 MB.
+
+    Returns:
+        Budget in bytes.
+    """
+    try:
+        ram = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return MAX_CACHE_BUDGET
+    return min(MAX_CACHE_BUDGET, ram // RAM_FRACTION)
+
+
+class DecodedImage:
+    """A decoded pixbuf together with the dimensions of the source image.
+
+    Attributes:
+        pixbuf: The decoded GdkPixbuf (possibly smaller than the source).
+        width: Full-resolution width of the source image.
+        height: Full-resolution height of the source image.
+    """
+
+    __slots__ = ("pixbuf", "width", "height")
+
+    def __init__(self, pixbuf, width=None, height=None):
+        self.pixbuf = pixbuf
+        self.width = width or pixbuf.get_width()
+        self.height = height or pixbuf.get_height()
+
+    @property
+    def is_reduced(self):
+        """True if the pixbuf is smaller than the source image."""
+        return self.pixbuf.get_width() < self.width or self.pixbuf.get_height() < self.height
+
+    def get_byte_length(self):
+        """Return the size of the pixel data in bytes."""
+        return self.pixbuf.get_byte_length()
+
+
+class DecodedImageCache:
+    """Byte-budgeted LRU of decoded images keyed by file path.
+
+    The most recently inserted entry is always kept, even if it alone
+    exceeds the budget, so the image on screen is never evicted.
+
+    Args:
+        budget: Maximum total ``get_byte_length()`` of cached images.
+                Defaults to :func:`default_cache_budget`.
+    """
+
+    def __init__(self, budget=None):
+        self.budget = budget or default_cache_budget()
+        self._entries = OrderedDict()  # filepath -> DecodedImage
+        self._bytes = 0
+
+    def __contains__(self, filepath):
+        return filepath in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def bytes_used(self):
+        """Total byte size of the cached pixbufs."""
+        return self._bytes
+
+    def get(self, filepath):
+        """Return the cached image for *filepath* and mark it recent, or None."""
+        image = self._entries.get(filepath)
+        if image is not None:
+            self._entries.move_to_end(filepath)
+        return image
+
+    def put(self, filepath, image):
+        """Insert a decoded image, evicting least recently used entries.
+
+        Args:
+            filepath: Source file path.
+            image: The :class:`DecodedImage`.
+        """
+        self.invalidate(filepath)
+        self._entries[filepath] = image
+        self._bytes += image.get_byte_length()
+        while self._bytes > self.budget and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.get_byte_length()
+
+    def invalidate(self, filepath):
+        """Drop the entry for *filepath*, e.g. after the file was overwritten."""
+        image = self._entries.pop(filepath, None)
+        if image is not None:
+            self._bytes -= image.get_byte_length()
+
+    def clear(self):
+        """Drop every cached pixbuf."""
+        self._entries.clear()
+        self._bytes = 0
+
+
+def reduced_size(width, height, max_size):
+    """Return the size of an image scaled down to fit *max_size*.
+
+    Args:
+        width: Source width.
+        height: Source height.
+        max_size: ``(max_width, max_height)`` bounding box.
+
+    Returns:
+        ``(width, height)`` preserving aspect ratio, never larger than
+        the source.
+    """
+    max_w, max_h = max_size
+    scale = min(max_w / width, max_h / height, 1.0)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def orient_pixbuf(pixbuf):
+    """Rotate/flip a freshly decoded pixbuf according to its EXIF orientation.
+
+    GdkPixbuf's loaders attach the EXIF orientation as the
+    ``"orientation"`` option while decoding, so this only transforms the
+    pixels already in memory; the file is not read again.
+
+    Args:
+        pixbuf: A pixbuf straight from a loader.
+
+    Returns:
+        ``(pixbuf, transposed)`` where *transposed* is True if width and
+        height were swapped.
+    """
+    transposed = pixbuf.get_option("orientation") in TRANSPOSED_OPTIONS
+    oriented = pixbuf.apply_embedded_orientation()
+    return (oriented if oriented is not None else pixbuf), transposed
+
+
+def decode_image(filepath, max_size=None):
+    """Decode an image file, optionally at reduced size.
+
+    With *max_size*, images larger than the box are decoded through
+    ``new_from_file_at_scale``, whose size-prepared loader lets the JPEG
+    decoder skip most of the work via DCT scaling.  The EXIF orientation
+    is applied to the result (see :func:`orient_pixbuf`).
+
+    Args:
+        filepath: Path to the image file.
+        max_size: Optional ``(max_width, max_height)``; None decodes at
+                  full resolution.
+
+    Returns:
+        A :class:`DecodedImage`.
+
+    Raises:
+        GLib.Error: If the file cannot be decoded.
+    """
+    if max_size is not None:
+        info, width, height = GdkPixbuf.Pixbuf.get_file_info(filepath)
+        if info is not None and width > 0 and height > 0:
+            target_w, target_h = reduced_size(width, height, max_size)
+            if target_w < width or target_h < height:
+                pixbuf, transposed = orient_pixbuf(
+                    GdkPixbuf.Pixbuf.new_from_file_at_scale(filepath, target_w, target_h, False)
+                )
+                if transposed:
+                    width, height = height, width
+                return DecodedImage(pixbuf, width, height)
+    pixbuf, _transposed = orient_pixbuf(GdkPixbuf.Pixbuf.new_from_file(filepath))
+    return DecodedImage(pixbuf)
+
+
+class ImageLoader:
+    """Decodes images in the background into a :class:`DecodedImageCache`.
+
+    Attributes:
+        preview_size: ``(width, height)`` box for first-tier decodes, or
+                      None to always decode at full resolution.
+
+    Args:
+        cache: The cache to fill; a new one is created if omitted.
+        max_workers: Number of decoder threads.
+        decoder: Callable ``decoder(filepath, max_size) -> DecodedImage``
+                 run on workers.
+    """
+
+    def __init__(self, cache=None, max_workers=2, decoder=decode_image):
+        self.cache = cache if cache is not None else DecodedImageCache()
+        self.preview_size = None
+        self._decoder = decoder
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="image-decode"
+        )
+        self._pending = {}  # (filepath, full) -> Future
+        self._callbacks = {}  # (filepath, full) -> [callback, ...]
+
+    def load(self, filepath, callback, full=False):
+        """Return a decoded image, decoding in the background if needed.
+
+        Args:
+            filepath: Path to the image file.
+            callback: Called on the main loop as ``callback(filepath, image)``
+                      when a background decode finishes; *image* is a
+                      :class:`DecodedImage`, or None if the file could not
+                      be decoded.
+            full: Require full resolution rather than the preview tier.
+
+        Returns:
+            The cached :class:`DecodedImage` if one satisfies the request
+            (callback is not called), else None.
+        """
+        image = self.cache.get(filepath)
+        if image is not None and not (full and image.is_reduced):
+            return image
+        key = (filepath, full or self.preview_size is None)
+        self._callbacks.setdefault(key, []).append(callback)
+        self._submit(key)
+        return None
+
+    def prefetch(self, filepaths):
+        """Decode *filepaths* ahead of time, in order.
+
+        Queued prefetches for other files are cancelled first, unless a
+        caller is waiting on them through :meth:`load`.
+
+        Args:
+            filepaths: Paths to decode, most important first.
+        """
+        wanted = set(filepaths)
+        for key, future in list(self._pending.items()):
+            if key[0] not in wanted and key not in self._callbacks and future.cancel():
+                del self._pending[key]
+        for path in filepaths:
+            if path not in self.cache:
+                self._submit((path, self.preview_size is None))
+
+    def invalidate(self, filepath):
+        """Forget any cached decode of *filepath*."""
+        self.cache.invalidate(filepath)
+
+    def shutdown(self):
+        """Stop the worker pool, discarding queued decodes."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pending.clear()
+        self._callbacks.clear()
+
+    def _submit(self, key):
+        """Queue a decode for ``(filepath, full)`` unless one is in flight."""
+        if key in self._pending:
+            return
+        filepath, full = key
+        max_size = None if full else self.preview_size
+        future = self._executor.submit(self._decoder, filepath, max_size)
+        self._pending[key] = future
+        future.add_done_callback(lambda fut: GLib.idle_add(self._on_decoded, key, fut))
+
+    def _on_decoded(self, key, future):
+        """Main-loop completion handler: cache the result, notify waiters."""
+        if self._pending.get(key) is future:
+            del self._pending[key]
+        if future.cancelled():
+            return False
+        filepath = key[0]
+        try:
+            image = future.result()
+        except Exception as e:
+            print(f"Error loading image: {e}")
+            image = None
+        if image is not None:
+            cached = self.cache.get(filepath)
+            # Never replace a full-resolution entry with a reduced one
+            if cached is None or cached.is_reduced or not image.is_reduced:
+                self.cache.put(filepath, image)
+        for callback in self._callbacks.pop(key, []):
+            callback(filepath, image)
+        return False
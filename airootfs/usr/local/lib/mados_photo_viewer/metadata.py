@@ -0,0 +1,279 @@
+"""
+madOS Photo Viewer - Metadata Cache and Indexer
+=================================================
+
+Keeps the EXIF header fields of every file in the open folder so that
+sorting by date taken and the info panel never wait on disk reads.
+
+    - :class:`MetadataCache` stores the fields in SQLite, keyed by
+      directory and file name together with the file's mtime and size.
+      An entry is only trusted while both still match the file on disk.
+    - :class:`MetadataIndexer` loads a directory's cached entries in one
+      query (so a folder of thousands of photos can be sorted by date
+      immediately), then validates them and reads the headers of new or
+      changed files on a worker thread.  Results arrive on the GTK main
+      loop in batches and are written back to the cache.
+
+Only file headers are read (see :mod:`.exif`); pixels are never decoded.
+"""
+
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from gi.repository import GLib
+
+from .exif import ImageMetadata, read_metadata
+from .navigator import is_image_file
+
+DEFAULT_DB_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "mados-photo-viewer",
+    "metadata.db",
+)
+
+# Schema version — bump when altering tables (the cache is then rebuilt)
+_SCHEMA_VERSION = 1
+
+# Files validated or read per main-loop delivery
+INDEX_BATCH = 256
+
+
+class MetadataCache:
+    """SQLite-backed store of image header metadata.
+
+    Args:
+        db_path: Path to the SQLite database file.
+                 Defaults to ``~/.cache/mados-photo-viewer/metadata.db``.
+    """
+
+    def __init__(self, db_path=None):
+        self._db_path = db_path or DEFAULT_DB_PATH
+        os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
+        self._conn = sqlite3.connect(self._db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_tables()
+
+    @contextmanager
+    def _transaction(self):
+        """Context manager for a database transaction."""
+        try:
+            yield self._conn
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+
+    def _create_tables(self):
+        """Initialize the schema, discarding a cache from another version."""
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        with self._transaction():
+            if version != _SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS metadata")
+            self._conn.executescript(f"""
+                CREATE TABLE IF NOT EXISTS metadata (
+                    directory   TEXT NOT NULL,
+                    name        TEXT NOT NULL,
+                    mtime_ns    INTEGER NOT NULL,
+                    size        INTEGER NOT NULL,
+                    date_taken  TEXT,
+                    orientation INTEGER,
+                    make        TEXT,
+                    model       TEXT,
+                    width       INTEGER,
+                    height      INTEGER,
+                    PRIMARY KEY (directory, name)
+                ) WITHOUT ROWID;
+                PRAGMA user_version = {_SCHEMA_VERSION};
+            """)
+
+    def load_directory(self, directory):
+        """Return every cached entry for *directory*.
+
+        Args:
+            directory: Absolute directory path.
+
+        Returns:
+            Dict ``{name: (mtime_ns, size, ImageMetadata)}``.
+        """
+        rows = self._conn.execute(
+            "SELECT name, mtime_ns, size, date_taken, orientation, make, model, width, height "
+            "FROM metadata WHERE directory = ?",
+            (directory,),
+        )
+        return {row[0]: (row[1], row[2], ImageMetadata(*row[3:])) for row in rows}
+
+    def store(self, directory, entries):
+        """Insert or replace entries in one transaction.
+
+        Args:
+            directory: Absolute directory path.
+            entries: Iterable of ``(name, mtime_ns, size, ImageMetadata)``.
+        """
+        with self._transaction():
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (directory, name, mtime_ns, size, *meta.as_tuple())
+                    for name, mtime_ns, size, meta in entries
+                ),
+            )
+
+    def forget(self, directory, names):
+        """Delete the entries for *names* in *directory*."""
+        with self._transaction():
+            self._conn.executemany(
+                "DELETE FROM metadata WHERE directory = ? AND name = ?",
+                ((directory, name) for name in names),
+            )
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+
+def open_cache(db_path=None):
+    """Open the metadata cache, or return None if the database is unusable.
+
+    Args:
+        db_path: Optional database path (see :class:`MetadataCache`).
+
+    Returns:
+        A :class:`MetadataCache`, or None to index in memory only.
+    """
+    try:
+        return MetadataCache(db_path)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Metadata cache unavailable: {e}")
+        return None
+
+
+class MetadataIndexer:
+    """Metadata of the files in the current directory, kept fresh in the background.
+
+    Attributes:
+        on_updated: Called on the main loop as ``on_updated(names)`` with
+                    the set of names whose metadata changed.
+
+    Args:
+        cache: The :class:`MetadataCache`, or None to keep results in
+               memory only.
+        reader: Callable ``reader(filepath) -> ImageMetadata`` run on the
+                worker.
+    """
+
+    def __init__(self, cache=None, reader=read_metadata):
+        self.on_updated = None
+        self._cache = cache
+        self._reader = reader
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metadata-index")
+        self._directory = None
+        self._generation = 0
+        self._known = {}  # name -> (mtime_ns, size, ImageMetadata)
+
+    @property
+    def directory(self):
+        """The directory being indexed, or None."""
+        return self._directory
+
+    def get(self, name):
+        """Return the :class:`ImageMetadata` of *name*, or None if unknown."""
+        entry = self._known.get(name)
+        return entry[2] if entry is not None else None
+
+    def date_taken(self, name):
+        """Return the date taken of *name*, or None."""
+        meta = self.get(name)
+        return meta.date_taken if meta is not None else None
+
+    def index(self, directory, names):
+        """Start indexing *names* in *directory*.
+
+        Switching to a new directory first loads its cached entries, so
+        :meth:`get` answers immediately from the cache, and drops cached
+        entries of files that no longer exist.  Calling again for the
+        same directory (e.g. with newly created files) only queues those
+        names.
+
+        Args:
+            directory: Absolute directory path.
+            names: File names in the directory; non-images are skipped.
+        """
+        names = [n for n in names if is_image_file(n)]
+        if directory != self._directory:
+            self._generation += 1
+            self._directory = directory
+            self._known = self._load(directory, names)
+        generation = self._generation
+        known = {n: self._known[n] for n in names if n in self._known}
+        self._executor.submit(self._scan, generation, directory, names, known)
+
+    def forget(self, names):
+        """Drop *names* (files deleted from the directory)."""
+        gone = [n for n in names if self._known.pop(n, None) is not None]
+        if gone and self._cache is not None:
+            self._call_cache(self._cache.forget, self._directory, gone)
+
+    def shutdown(self):
+        """Stop indexing and close the cache."""
+        self._generation += 1
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+    def _load(self, directory, names):
+        """Return the cached entries of *names*, pruning stale rows."""
+        if self._cache is None:
+            return {}
+        cached = self._call_cache(self._cache.load_directory, directory) or {}
+        listed = set(names)
+        stale = [n for n in cached if n not in listed]
+        if stale:
+            self._call_cache(self._cache.forget, directory, stale)
+        return {n: entry for n, entry in cached.items() if n in listed}
+
+    def _call_cache(self, method, *args):
+        """Run a cache operation, logging rather than raising database errors."""
+        try:
+            return method(*args)
+        except sqlite3.Error as e:
+            print(f"Metadata cache error: {e}")
+            return None
+
+    def _scan(self, generation, directory, names, known):
+        """Worker: validate cached entries and read changed headers."""
+        batch = []
+        for name in names:
+            if generation != self._generation:
+                return
+            path = os.path.join(directory, name)
+            try:
+                st = os.stat(path)
+                entry = known.get(name)
+                if entry is None or entry[:2] != (st.st_mtime_ns, st.st_size):
+                    batch.append((name, st.st_mtime_ns, st.st_size, self._reader(path)))
+            except OSError:
+                continue
+            if len(batch) >= INDEX_BATCH:
+                GLib.idle_add(self._on_batch, generation, directory, batch)
+                batch = []
+        if batch:
+            GLib.idle_add(self._on_batch, generation, directory, batch)
+
+    def _on_batch(self, generation, directory, batch):
+        """Main-loop handler: record fresh entries and notify."""
+        if generation != self._generation:
+            return False
+        changed = set()
+        for name, mtime_ns, size, meta in batch:
+            old = self.get(name)
+            self._known[name] = (mtime_ns, size, meta)
+            if old != meta:
+                changed.add(name)
+        if self._cache is not None:
+            self._call_cache(self._cache.store, directory, batch)
+        if changed and self.on_updated:
+            self.on_updated(changed)
+        return False
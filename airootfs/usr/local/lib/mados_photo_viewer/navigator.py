@@ -6,11 +6,22 @@ Manages listing and navigating through image and video files within a
 directory. Supports previous/next navigation and reports the current
 index and total count for the status bar.
 
+The listing is read with ``os.scandir`` (whose cached ``d_type`` avoids a
+stat per entry), kept sorted, and searched with ``bisect``.  A
+:class:`DirectoryWatcher` reports files created, deleted or renamed
+later, and :meth:`FileNavigator.apply_changes` merges them into the
+sorted listing without rescanning.
+
+The listing is ordered by name unless another key is installed with
+:meth:`FileNavigator.set_sort_key`, e.g. :func:`date_sort_key` to sort by
+the date taken recorded in the metadata index.
+
 Supported image formats: jpg, jpeg, png, gif, bmp, webp, svg, tiff, tif
 Supported video formats: mp4, mkv, avi, webm, mov, ogv
 """
 
 import os
+from bisect import bisect_left, insort
 
 # Supported file extensions (lowercase)
 IMAGE_EXTENSIONS = {
@@ -27,6 +38,12 @@ IMAGE_EXTENSIONS = {
 VIDEO_EXTENSIONS = {".mp4", ".mkv", ".avi", ".webm", ".mov", ".ogv"}
 ALL_EXTENSIONS = IMAGE_EXTENSIONS | VIDEO_EXTENSIONS
 
+# Above this many changes a batch is merged by re-sorting instead of bisecting
+BULK_CHANGE_THRESHOLD = 64
+
+# Delay used to coalesce bursts of directory events (milliseconds)
+WATCH_COALESCE_MS = 250
+
 
 def is_image_file(filepath):
     """Check if a filepath has a supported image extension.
@@ -67,6 +84,50 @@ def is_media_file(filepath):
     return ext.lower() in ALL_EXTENSIONS
 
 
+def sort_key(filename):
+    """Return the listing sort key: case-insensitive, ties broken by case."""
+    return (filename.lower(), filename)
+
+
+def date_sort_key(date_taken):
+    """Return a sort key ordering files by date taken, then by name.
+
+    Files without a date sort after all dated files.
+
+    Args:
+        date_taken: Callable ``date_taken(filename)`` returning a sortable
+                    date string or None.
+
+    Returns:
+        A key function for :meth:`FileNavigator.set_sort_key`.
+    """
+
+    def key(filename):
+        date = date_taken(filename)
+        return (date is None, date or "", filename.lower(), filename)
+
+    return key
+
+
+def scan_media_files(directory, key=sort_key):
+    """Return the sorted media file names in *directory*.
+
+    Args:
+        directory: Directory to list.
+        key: Sort key for the names.
+
+    Returns:
+        Sorted list of file names.
+
+    Raises:
+        OSError: If the directory cannot be read.
+    """
+    with os.scandir(directory) as entries:
+        names = [e.name for e in entries if is_media_file(e.name) and e.is_file()]
+    names.sort(key=key)
+    return names
+
+
 class FileNavigator:
     """Navigates through media files in a directory.
 
@@ -79,6 +140,7 @@ class FileNavigator:
         self._files = []
         self._index = -1
         self._directory = None
+        self._key = sort_key
 
     @property
     def current_file(self):
@@ -123,6 +185,59 @@ class FileNavigator:
         f = self.current_file
         return f is not None and is_video_file(f)
 
+    @property
+    def directory(self):
+        """Return the directory being navigated, or None."""
+        return self._directory
+
+    @property
+    def filenames(self):
+        """Return the sorted list of media file names (do not modify).
+
+        A new list object is created whenever the listing changes
+        (rescan or :meth:`apply_changes`), so identity comparison detects
+        listing changes.
+        """
+        return self._files
+
+    def index_of(self, filename):
+        """Return the 0-based position of *filename*, or -1 if not listed."""
+        i = bisect_left(self._files, self._key(filename), key=self._key)
+        if i < len(self._files) and self._files[i] == filename:
+            return i
+        return -1
+
+    def peek(self, offset):
+        """Return the path *offset* positions from the current file.
+
+        Wraps around like :meth:`go_next` / :meth:`go_prev` without
+        moving the current position.
+
+        Args:
+            offset: Relative position (e.g. 1 for next, -1 for previous).
+
+        Returns:
+            The full path, or None if the directory is empty.
+        """
+        if not self._files:
+            return None
+        index = (self._index + offset) % len(self._files)
+        return os.path.join(self._directory, self._files[index])
+
+    def go_to_index(self, index):
+        """Move to the file at a 0-based position in the listing.
+
+        Args:
+            index: Position in :attr:`filenames`.
+
+        Returns:
+            The full path of the new current file, or None if out of range.
+        """
+        if not 0 <= index < len(self._files):
+            return None
+        self._index = index
+        return self.current_file
+
     def load_directory(self, filepath):
         """Scan the directory containing filepath and set it as current.
 
@@ -145,27 +260,18 @@ class FileNavigator:
         self._index = -1
 
         try:
-            entries = os.listdir(directory)
+            self._files = scan_media_files(directory, self._key)
         except OSError:
             return False
 
-        # Filter to supported media files and sort case-insensitively
-        media_files = [
-            f for f in entries if os.path.isfile(os.path.join(directory, f)) and is_media_file(f)
-        ]
-        media_files.sort(key=lambda f: f.lower())
-
-        self._files = media_files
-
         # Find the current file in the list
-        try:
-            self._index = self._files.index(filename)
+        self._index = self.index_of(filename)
+        if self._index >= 0:
             return True
-        except ValueError:
-            # File not in list (maybe unsupported); position at start
-            if self._files:
-                self._index = 0
-            return False
+        # File not in list (maybe unsupported); position at start
+        if self._files:
+            self._index = 0
+        return False
 
     def go_next(self):
         """Move to the next file in the directory.
@@ -211,12 +317,11 @@ class FileNavigator:
         if directory != self._directory:
             return self.load_directory(filepath)
 
-        filename = os.path.basename(filepath)
-        try:
-            self._index = self._files.index(filename)
-            return True
-        except ValueError:
+        index = self.index_of(os.path.basename(filepath))
+        if index < 0:
             return False
+        self._index = index
+        return True
 
     def refresh(self):
         """Re-scan the current directory and try to maintain position.
@@ -228,20 +333,81 @@ class FileNavigator:
 
         current = self.current_filename
         try:
-            entries = os.listdir(self._directory)
+            files = scan_media_files(self._directory, self._key)
         except OSError:
             return
+        self._set_files(files, current)
 
-        media_files = [
-            f
-            for f in entries
-            if os.path.isfile(os.path.join(self._directory, f)) and is_media_file(f)
-        ]
-        media_files.sort(key=lambda f: f.lower())
-        self._files = media_files
+    def set_sort_key(self, key):
+        """Change the listing order, keeping the current file selected.
+
+        Args:
+            key: Key function over file names, e.g. :func:`sort_key` or
+                 one from :func:`date_sort_key`.
+        """
+        self._key = key
+        self.resort()
 
-        if current and current in self._files:
-            self._index = self._files.index(current)
+    def resort(self):
+        """Re-sort the listing after the data behind the sort key changed.
+
+        Must be called whenever the key would order files differently,
+        since lookups bisect the listing.
+
+        Returns:
+            True if the order changed (the listing is then a new list).
+        """
+        files = sorted(self._files, key=self._key)
+        if files == self._files:
+            return False
+        self._set_files(files, self.current_filename)
+        return True
+
+    def apply_changes(self, added=(), removed=()):
+        """Merge files created or deleted in the directory into the listing.
+
+        Names that are not media files, already listed (for *added*) or
+        no longer files on disk are ignored.  The current file keeps its
+        position when it is still listed.
+
+        Args:
+            added: Names of files that appeared in the directory.
+            removed: Names of files that disappeared.
+
+        Returns:
+            True if the listing changed.
+        """
+        if self._directory is None:
+            return False
+        removed = {n for n in removed if self.index_of(n) >= 0}
+        added = {
+            n
+            for n in added
+            if is_media_file(n)
+            and self.index_of(n) < 0
+            and os.path.isfile(os.path.join(self._directory, n))
+        }
+        if not added and not removed:
+            return False
+
+        files = list(self._files)
+        if len(added) + len(removed) > BULK_CHANGE_THRESHOLD:
+            files = [f for f in files if f not in removed] + list(added)
+            files.sort(key=self._key)
+        else:
+            for name in removed:
+                del files[bisect_left(files, self._key(name), key=self._key)]
+            for name in added:
+                insort(files, name, key=self._key)
+        self._set_files(files, self.current_filename)
+        return True
+
+    def _set_files(self, files, current):
+        """Install a new listing, keeping *current* selected if present."""
+        self._files = files
+        index = self.index_of(current) if current else -1
+        if index >= 0:
+            self._index = index
         elif self._files:
             self._index = max(0, min(self._index, len(self._files) - 1))
         else:
@@ -282,3 +448,104 @@ class FileNavigator:
             filt.add_pattern(f"*{ext}")
             filt.add_pattern(f"*{ext.upper()}")
         return filt
+
+
+class DirectoryWatcher:
+    """Reports media files appearing in or leaving a directory.
+
+    Wraps a ``Gio.FileMonitor``.  Events are coalesced for
+    ``WATCH_COALESCE_MS`` and delivered on the GTK main loop as
+    ``callback(added, removed)`` with sets of file names; a file created
+    and deleted within one batch is reported only as removed.
+
+    Args:
+        directory: Directory to watch.
+        callback: Called with the ``(added, removed)`` name sets.
+        delay_ms: Coalescing delay in milliseconds.
+    """
+
+    def __init__(self, directory, callback, delay_ms=WATCH_COALESCE_MS):
+        self.directory = directory
+        self._callback = callback
+        self._delay_ms = delay_ms
+        self._added = set()
+        self._removed = set()
+        self._flush_id = None
+        self._monitor = None
+
+    def start(self):
+        """Begin watching.
+
+        Returns:
+            True if the monitor was created.
+        """
+        import gi
+
+        gi.require_version("Gio", "2.0")
+        from gi.repository import Gio
+
+        try:
+            self._monitor = Gio.File.new_for_path(self.directory).monitor_directory(
+                Gio.FileMonitorFlags.WATCH_MOVES, None
+            )
+        except Exception as e:
+            print(f"Cannot watch {self.directory}: {e}")
+            return False
+        self._monitor.connect("changed", self._on_changed)
+        return True
+
+    def stop(self):
+        """Stop watching and drop undelivered events."""
+        from gi.repository import GLib
+
+        if self._monitor is not None:
+            self._monitor.cancel()
+            self._monitor = None
+        if self._flush_id is not None:
+            GLib.source_remove(self._flush_id)
+            self._flush_id = None
+        self._added.clear()
+        self._removed.clear()
+
+    def file_added(self, name):
+        """Record that *name* appeared in the directory."""
+        if is_media_file(name):
+            self._removed.discard(name)
+            self._added.add(name)
+            self._schedule_flush()
+
+    def file_removed(self, name):
+        """Record that *name* left the directory."""
+        if is_media_file(name):
+            self._added.discard(name)
+            self._removed.add(name)
+            self._schedule_flush()
+
+    def flush(self):
+        """Deliver the pending changes now."""
+        self._flush_id = None
+        added, removed = self._added, self._removed
+        self._added, self._removed = set(), set()
+        if added or removed:
+            self._callback(added, removed)
+        return False
+
+    def _schedule_flush(self):
+        from gi.repository import GLib
+
+        if self._flush_id is None:
+            self._flush_id = GLib.timeout_add(self._delay_ms, self.flush)
+
+    def _on_changed(self, monitor, file, other_file, event_type):
+        """Translate Gio monitor events into added/removed names."""
+        from gi.repository import Gio
+
+        events = Gio.FileMonitorEvent
+        if event_type in (events.CREATED, events.MOVED_IN):
+            self.file_added(file.get_basename())
+        elif event_type in (events.DELETED, events.MOVED_OUT):
+            self.file_removed(file.get_basename())
+        elif event_type == events.RENAMED:
+            self.file_removed(file.get_basename())
+            if other_file is not None:
+                self.file_added(other_file.get_basename())
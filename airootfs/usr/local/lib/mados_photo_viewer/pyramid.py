@@ -0,0 +1,197 @@
+"""
+madOS Photo Viewer - Render Pyramid
+=====================================
+
+Keeps the displayed image as cairo surfaces so that pan and zoom only
+composite pixels instead of converting the pixbuf on every frame.
+
+    - Level 0 is the pixbuf converted to a cairo ``ImageSurface`` once,
+      when the image is loaded.
+    - Levels 1, 2, ... are successive half-size copies (a mipmap chain),
+      built lazily the first time the view zooms out far enough to use
+      them.  Zoomed-out frames sample the smallest level that still has
+      at least one source pixel per screen pixel, so the per-frame cost
+      follows the screen size rather than the image size.
+    - Each draw is clipped to the tiles intersecting the visible area, so
+      panning a zoomed-in 40 MP image only touches what is on screen.
+
+Coordinates passed to :meth:`RenderPyramid.draw` are pixels of level 0.
+"""
+
+import math
+
+import cairo
+
+import gi
+
+gi.require_version("Gdk", "3.0")
+from gi.repository import Gdk
+
+# Draw area is aligned to this grid (the same as the effect layer tiles)
+TILE_SIZE = 256
+
+# Stop halving once the longest side of a level is this small
+MIN_LEVEL_SIZE = 64
+
+# Above this magnification pixels are drawn as hard squares
+NEAREST_ABOVE = 4.0
+
+# Largest cached raster (pixels) for overlays drawn at view resolution
+RASTER_MAX_PIXELS = 16 * 1024 * 1024
+
+
+def level_count(width, height, min_size=MIN_LEVEL_SIZE):
+    """Return how many pyramid levels an image of the given size gets.
+
+    Args:
+        width: Level 0 width.
+        height: Level 0 height.
+        min_size: Smallest longest-side a level may be halved from.
+
+    Returns:
+        Number of levels, at least 1.
+    """
+    count = 1
+    longest = max(width, height)
+    while longest > min_size:
+        longest = math.ceil(longest / 2)
+        count += 1
+    return count
+
+
+def level_for_scale(scale, count):
+    """Pick the pyramid level to sample for a given magnification.
+
+    Chooses the smallest level that still has at least one pixel per
+    screen pixel, so the sampled surface is never magnified by the
+    downscale alone.
+
+    Args:
+        scale: Screen pixels per level-0 pixel.
+        count: Number of available levels.
+
+    Returns:
+        Level index in ``[0, count)``.
+    """
+    if scale >= 1.0 or scale <= 0:
+        return 0
+    level = int(math.floor(-math.log2(scale) + 1e-9))
+    return max(0, min(count - 1, level))
+
+
+def raster_scale(zoom, width, height, max_pixels=RASTER_MAX_PIXELS):
+    """Pick the resolution at which to cache a raster of image content.
+
+    The scale is the smallest power of two not below *zoom*, so the cached
+    raster only needs rebuilding when the zoom crosses a power of two, and
+    is reduced if the raster would exceed *max_pixels*.
+
+    Args:
+        zoom: Screen pixels per image pixel.
+        width: Width of the rasterized area in image pixels.
+        height: Height of the rasterized area in image pixels.
+        max_pixels: Pixel budget for the raster.
+
+    Returns:
+        Raster pixels per image pixel.
+    """
+    if zoom <= 0:
+        return 1.0
+    scale = 2.0 ** math.ceil(math.log2(zoom) - 1e-9)
+    return min(scale, math.sqrt(max_pixels / max(1, width * height)))
+
+
+def visible_bounds(x0, y0, x1, y1, width, height, tile=TILE_SIZE):
+    """Return the tile-aligned part of an image intersecting a rectangle.
+
+    Args:
+        x0, y0, x1, y1: Visible rectangle in level-0 pixels.
+        width, height: Level 0 size.
+        tile: Tile edge length.
+
+    Returns:
+        ``(x0, y0, x1, y1)`` clamped to the image, or None if the
+        rectangle misses the image.
+    """
+    x0, y0 = max(0, x0), max(0, y0)
+    x1, y1 = min(width, x1), min(height, y1)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (
+        int(x0) // tile * tile,
+        int(y0) // tile * tile,
+        min(width, math.ceil(x1 / tile) * tile),
+        min(height, math.ceil(y1 / tile) * tile),
+    )
+
+
+class RenderPyramid:
+    """Cairo surfaces of an image at 1/1, 1/2, 1/4, ... resolution.
+
+    Args:
+        pixbuf: The GdkPixbuf to display.
+    """
+
+    def __init__(self, pixbuf):
+        self.width = pixbuf.get_width()
+        self.height = pixbuf.get_height()
+        self.has_alpha = pixbuf.get_has_alpha()
+        self._levels = [Gdk.cairo_surface_create_from_pixbuf(pixbuf, 1, None)]
+        self._count = level_count(self.width, self.height)
+
+    @property
+    def levels_built(self):
+        """Number of levels converted so far."""
+        return len(self._levels)
+
+    def get_level(self, index):
+        """Return the surface for *index*, building missing levels first."""
+        index = max(0, min(self._count - 1, index))
+        while len(self._levels) <= index:
+            self._levels.append(self._halve(self._levels[-1]))
+        return self._levels[index]
+
+    def draw(self, cr, scale, x0, y0, x1, y1):
+        """Paint the visible part of the image.
+
+        Args:
+            cr: Cairo context already transformed to level-0 pixels.
+            scale: Screen pixels per level-0 pixel.
+            x0, y0, x1, y1: Visible rectangle in level-0 pixels.
+        """
+        bounds = visible_bounds(x0, y0, x1, y1, self.width, self.height)
+        if bounds is None:
+            return
+        bx0, by0, bx1, by1 = bounds
+        surface = self.get_level(level_for_scale(scale, self._count))
+        sx = self.width / surface.get_width()
+        sy = self.height / surface.get_height()
+
+        cr.save()
+        cr.rectangle(bx0, by0, bx1 - bx0, by1 - by0)
+        cr.clip()
+        cr.scale(sx, sy)
+        pattern = cairo.SurfacePattern(surface)
+        pattern.set_extend(cairo.EXTEND_PAD)
+        pattern.set_filter(
+            cairo.FILTER_NEAREST if scale * sx > NEAREST_ABOVE else cairo.FILTER_BILINEAR
+        )
+        cr.set_source(pattern)
+        cr.paint()
+        cr.restore()
+
+    @staticmethod
+    def _halve(surface):
+        """Return a half-size copy of *surface* (rounded up)."""
+        w = max(1, math.ceil(surface.get_width() / 2))
+        h = max(1, math.ceil(surface.get_height() / 2))
+        half = cairo.ImageSurface(surface.get_format(), w, h)
+        cr = cairo.Context(half)
+        cr.scale(w / surface.get_width(), h / surface.get_height())
+        pattern = cairo.SurfacePattern(surface)
+        pattern.set_filter(cairo.FILTER_GOOD)
+        pattern.set_extend(cairo.EXTEND_PAD)
+        cr.set_source(pattern)
+        cr.set_operator(cairo.OPERATOR_SOURCE)
+        cr.paint()
+        return half
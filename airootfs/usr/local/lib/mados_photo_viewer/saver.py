@@ -0,0 +1,239 @@
+"""
+madOS Photo Viewer - Background Save Pipeline
+===============================================
+
+Composes edits, encodes and writes images on a worker thread so that
+saving a large PNG does not freeze the window.
+
+    - The caller hands over a snapshot of the edit history (see
+      ``EditHistory.snapshot``) and of the effect layer, so the user can
+      keep editing while the save runs.
+    - When only a reduced decode is displayed, the caller passes the
+      source path instead and the full-resolution image is decoded on
+      the worker, not on the GTK thread.
+    - Saves run one at a time in the order they were requested, so a
+      later save with newer edits always lands last.
+    - The encoded image is written to a temporary file in the target
+      directory, flushed to disk, and renamed over the destination.  A
+      crash or error mid-save leaves the previous file untouched.
+    - Progress is reported on the GTK main loop in three stages:
+      composing edits, encoding, and writing.
+
+GdkPixbuf's encoders do not report progress themselves, so the encode
+stage is reported as a single step and the write stage per chunk.
+"""
+
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import gi
+
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import GdkPixbuf, GLib
+
+from .imagecache import orient_pixbuf
+from .tools import compose_edits_onto_pixbuf
+
+# File extension -> GdkPixbuf saver type
+SAVE_FORMATS = {
+    ".png": "png",
+    ".jpg": "jpeg",
+    ".jpeg": "jpeg",
+    ".bmp": "bmp",
+    ".tiff": "tiff",
+    ".tif": "tiff",
+}
+
+DEFAULT_JPEG_QUALITY = 95
+DEFAULT_PNG_COMPRESSION = 6
+
+# Bytes written per progress step
+WRITE_CHUNK = 1024 * 1024
+
+# Progress stages and the part of the progress bar each one covers
+STAGE_COMPOSE = "compose"
+STAGE_ENCODE = "encode"
+STAGE_WRITE = "write"
+_STAGE_RANGE = {
+    STAGE_COMPOSE: (0.0, 0.3),
+    STAGE_ENCODE: (0.3, 0.8),
+    STAGE_WRITE: (0.8, 1.0),
+}
+
+
+def format_for_path(filepath):
+    """Return the GdkPixbuf saver type for *filepath* (PNG if unknown)."""
+    _, ext = os.path.splitext(filepath)
+    return SAVE_FORMATS.get(ext.lower(), "png")
+
+
+def encoder_options(
+    fmt, jpeg_quality=DEFAULT_JPEG_QUALITY, png_compression=DEFAULT_PNG_COMPRESSION
+):
+    """Return the ``savev`` option keys and values for a format.
+
+    Args:
+        fmt: GdkPixbuf saver type.
+        jpeg_quality: JPEG quality, 0-100.
+        png_compression: zlib compression level for PNG, 0-9.
+
+    Returns:
+        Tuple ``(keys, values)`` of string lists.
+    """
+    if fmt == "jpeg":
+        return ["quality"], [str(max(0, min(100, int(jpeg_quality))))]
+    if fmt == "png":
+        return ["compression"], [str(max(0, min(9, int(png_compression))))]
+    return [], []
+
+
+def write_atomic(filepath, data, progress=None):
+    """Write *data* to *filepath* via a temporary file and rename.
+
+    The temporary file lives in the destination directory so the final
+    ``os.replace`` is atomic.  Permissions of an existing destination are
+    kept.
+
+    Args:
+        filepath: Destination path.
+        data: Bytes to write.
+        progress: Optional ``progress(fraction)`` called after each chunk.
+
+    Raises:
+        OSError: If the file cannot be written; the destination is left
+                 unchanged and the temporary file removed.
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(filepath)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            view = memoryview(data)
+            total = len(view)
+            for start in range(0, total, WRITE_CHUNK):
+                f.write(view[start : start + WRITE_CHUNK])
+                if progress:
+                    progress(min(1.0, (start + WRITE_CHUNK) / total))
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, os.stat(filepath).st_mode & 0o7777)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _read_umask():
+    """Return the process umask (briefly sets it; call from one thread only)."""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Read at import time, before any worker threads exist
+_UMASK = _read_umask()
+
+
+def decode_full(filepath):
+    """Decode *filepath* at full resolution, applying its EXIF orientation."""
+    pixbuf, _transposed = orient_pixbuf(GdkPixbuf.Pixbuf.new_from_file(filepath))
+    return pixbuf
+
+
+class ImageSaver:
+    """Runs save jobs one at a time on a worker thread.
+
+    Args:
+        compose: Callable ``compose(pixbuf, history, effects) -> pixbuf``
+                 run on the worker.
+        decode: Callable ``decode(filepath) -> pixbuf`` run on the worker
+                when a save is given a source path instead of a pixbuf.
+    """
+
+    def __init__(self, compose=compose_edits_onto_pixbuf, decode=decode_full):
+        self._compose = compose
+        self._decode = decode
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-save")
+        self._busy = 0
+
+    @property
+    def busy(self):
+        """True while a save is queued or running."""
+        return self._busy > 0
+
+    def save(
+        self,
+        filepath,
+        pixbuf,
+        history,
+        effects=None,
+        on_progress=None,
+        on_done=None,
+        jpeg_quality=DEFAULT_JPEG_QUALITY,
+        png_compression=DEFAULT_PNG_COMPRESSION,
+        source_path=None,
+    ):
+        """Queue a save, after any saves already queued.
+
+        Args:
+            filepath: Destination path; the format follows its extension.
+            pixbuf: Full-resolution source pixbuf (read only), or None to
+                    decode *source_path* on the worker.
+            history: Snapshot of the edit history.
+            effects: Optional effect layer snapshot for *pixbuf*.
+            on_progress: Called on the main loop as
+                         ``on_progress(stage, fraction)``.
+            on_done: Called on the main loop as ``on_done(filepath, error)``
+                     where *error* is None on success or a message.
+            jpeg_quality: JPEG quality, 0-100.
+            png_compression: PNG compression level, 0-9.
+            source_path: Image decoded at full resolution when *pixbuf*
+                         is None.
+        """
+        self._busy += 1
+        fmt = format_for_path(filepath)
+        keys, values = encoder_options(fmt, jpeg_quality, png_compression)
+
+        def report(stage, fraction=0.0):
+            if on_progress:
+                start, end = _STAGE_RANGE[stage]
+                GLib.idle_add(on_progress, stage, start + (end - start) * fraction)
+
+        def run():
+            report(STAGE_COMPOSE)
+            source = pixbuf if pixbuf is not None else self._decode(source_path)
+            result = self._compose(source, history, effects)
+            report(STAGE_ENCODE)
+            _ok, data = result.save_to_bufferv(fmt, keys, values)
+            report(STAGE_WRITE)
+            write_atomic(filepath, data, lambda f: report(STAGE_WRITE, f))
+
+        future = self._executor.submit(run)
+        future.add_done_callback(
+            lambda fut: GLib.idle_add(self._on_finished, filepath, fut, on_done)
+        )
+
+    def shutdown(self, wait=True):
+        """Stop the worker; by default waits for a running save to finish."""
+        self._executor.shutdown(wait=wait)
+
+    def _on_finished(self, filepath, future, on_done):
+        """Main-loop completion handler."""
+        self._busy -= 1
+        try:
+            future.result()
+            error = None
+        except Exception as e:
+            error = getattr(e, "message", None) or str(e)
+            print(f"Save failed: {error}")
+        if on_done:
+            on_done(filepath, error)
+        return False
@@ -0,0 +1,472 @@
+"""
+madOS Photo Viewer - Similar Photo Finder
+===========================================
+
+Finds duplicate and near-duplicate photos in a folder, such as the
+bursts and re-saved copies that pile up in phone dumps.
+
+    - Each image is reduced to a 64-bit difference hash (dHash): a 9x8
+      grayscale version is compared pixel by pixel with its right
+      neighbour, one bit per comparison.  Re-encoding, resizing and small
+      edits flip only a few bits, so similar photos have hashes a small
+      Hamming distance apart.
+    - The pixels come from the freedesktop thumbnail when a valid one
+      exists, otherwise from a size-prepared decode (the JPEG loader then
+      decodes at 1/8 scale), so the full image is never decoded.
+    - Hashing runs on a process pool with one worker per core; decoding
+      is CPU bound and would serialize on a thread pool.
+    - Hashes are stored in SQLite keyed by directory and file name
+      together with mtime and size, so a re-run only hashes new or
+      changed files.
+    - Neighbours within the distance threshold are found with a BK-tree,
+      and photos linked by any chain of neighbours form one group.
+"""
+
+import multiprocessing
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import gi
+
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import GdkPixbuf, GLib
+
+from .navigator import is_image_file, sort_key
+from .thumbnails import is_thumbnail_valid, thumbnail_path
+
+DEFAULT_DB_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "mados-photo-viewer",
+    "hashes.db",
+)
+
+# Schema version — bump when altering tables or the hash (the index is rebuilt)
+_SCHEMA_VERSION = 1
+
+# dHash grid: HASH_WIDTH - 1 comparisons per row, HASH_HEIGHT rows
+HASH_WIDTH = 9
+HASH_HEIGHT = 8
+
+# Intermediate decode size; orientation is applied at this size
+DECODE_SIZE = 32
+
+# Largest Hamming distance (of 64 bits) still considered the same photo
+DEFAULT_THRESHOLD = 6
+
+# Files per process-pool task (amortizes inter-process overhead)
+HASH_CHUNK = 32
+
+
+def hamming(a, b):
+    """Return the number of differing bits between two hashes."""
+    return (a ^ b).bit_count()
+
+
+def dhash(gray, width=HASH_WIDTH, height=HASH_HEIGHT):
+    """Compute a difference hash from grayscale values.
+
+    Args:
+        gray: Row-major sequence of ``width * height`` brightness values.
+        width: Grid width (one more than the bits per row).
+        height: Grid height.
+
+    Returns:
+        Integer hash with ``(width - 1) * height`` bits.
+    """
+    value = 0
+    for y in range(height):
+        row = y * width
+        for x in range(width - 1):
+            value = (value << 1) | (gray[row + x] > gray[row + x + 1])
+    return value
+
+
+def pixbuf_gray(pixbuf):
+    """Return the row-major luma (0-255) of each pixel of *pixbuf*."""
+    width, height = pixbuf.get_width(), pixbuf.get_height()
+    stride, channels = pixbuf.get_rowstride(), pixbuf.get_n_channels()
+    data = pixbuf.read_pixel_bytes().get_data()
+    gray = []
+    for y in range(height):
+        for x in range(width):
+            i = y * stride + x * channels
+            gray.append((299 * data[i] + 587 * data[i + 1] + 114 * data[i + 2]) // 1000)
+    return gray
+
+
+def hash_image(filepath, thumb_dir=None):
+    """Return the dHash of an image file.
+
+    Args:
+        filepath: Path to the image.
+        thumb_dir: Thumbnail root to look for a valid cached thumbnail in.
+
+    Returns:
+        The 64-bit hash.
+
+    Raises:
+        GLib.Error: If the image cannot be decoded.
+        OSError: If the file cannot be read.
+    """
+    source = filepath
+    thumb = thumbnail_path(filepath, "normal", thumb_dir)
+    if is_thumbnail_valid(thumb, os.stat(filepath).st_mtime):
+        source = thumb
+    pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(source, DECODE_SIZE, DECODE_SIZE, False)
+    pixbuf = pixbuf.apply_embedded_orientation() or pixbuf
+    small = pixbuf.scale_simple(HASH_WIDTH, HASH_HEIGHT, GdkPixbuf.InterpType.BILINEAR)
+    return dhash(pixbuf_gray(small))
+
+
+def hash_files(filepaths, thumb_dir=None):
+    """Process-pool task: hash several files.
+
+    Args:
+        filepaths: Paths to hash.
+        thumb_dir: Thumbnail root (see :func:`hash_image`).
+
+    Returns:
+        List of ``(filepath, hash)``; *hash* is None for unreadable files.
+    """
+    results = []
+    for path in filepaths:
+        try:
+            results.append((path, hash_image(path, thumb_dir)))
+        except Exception:
+            results.append((path, None))
+    return results
+
+
+def _to_signed(value):
+    """Map an unsigned 64-bit hash into SQLite's signed INTEGER range."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _from_signed(value):
+    return value + (1 << 64) if value < 0 else value
+
+
+# ----------------------------------------------------------------------
+# Neighbour search
+# ----------------------------------------------------------------------
+
+
+class BKTree:
+    """Burkhard-Keller tree for nearest-neighbour queries in a metric space.
+
+    Each node's children are keyed by their distance to the node, so the
+    triangle inequality lets a query skip every subtree whose edge
+    distance is outside ``[d - max_distance, d + max_distance]``.
+
+    Args:
+        distance: Metric over keys; Hamming distance by default.
+    """
+
+    def __init__(self, distance=hamming):
+        self._distance = distance
+        self._root = None  # [key, items, {distance: child}]
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, key, item):
+        """Insert *item* under *key*."""
+        self._size += 1
+        if self._root is None:
+            self._root = [key, [item], {}]
+            return
+        node = self._root
+        while True:
+            d = self._distance(key, node[0])
+            if d == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [key, [item], {}]
+                return
+            node = child
+
+    def query(self, key, max_distance):
+        """Return ``(distance, item)`` for every item within *max_distance*."""
+        found = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            d = self._distance(key, node[0])
+            if d <= max_distance:
+                found.extend((d, item) for item in node[1])
+            for edge, child in node[2].items():
+                if d - max_distance <= edge <= d + max_distance:
+                    stack.append(child)
+        return found
+
+
+def group_similar(hashes, threshold=DEFAULT_THRESHOLD):
+    """Group names whose hashes are within *threshold* of each other.
+
+    Grouping is transitive: A and C share a group if both are close to B.
+
+    Args:
+        hashes: Dict ``{name: hash}``.
+        threshold: Largest Hamming distance counted as similar.
+
+    Returns:
+        List of groups with at least two names, each sorted like the
+        navigator listing, ordered by their first name.
+    """
+    tree = BKTree()
+    for name, value in hashes.items():
+        tree.add(value, name)
+
+    parent = {name: name for name in hashes}
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    for name, value in hashes.items():
+        for _d, other in tree.query(value, threshold):
+            a, b = find(name), find(other)
+            if a != b:
+                parent[b] = a
+
+    groups = {}
+    for name in hashes:
+        groups.setdefault(find(name), []).append(name)
+    result = [sorted(g, key=sort_key) for g in groups.values() if len(g) > 1]
+    result.sort(key=lambda g: sort_key(g[0]))
+    return result
+
+
+# ----------------------------------------------------------------------
+# Hash index
+# ----------------------------------------------------------------------
+
+
+class HashIndex:
+    """SQLite-backed store of image hashes.
+
+    Args:
+        db_path: Path to the SQLite database file.
+                 Defaults to ``~/.cache/mados-photo-viewer/hashes.db``.
+    """
+
+    def __init__(self, db_path=None):
+        self._db_path = db_path or DEFAULT_DB_PATH
+        os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
+        self._conn = sqlite3.connect(self._db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_tables()
+
+    @contextmanager
+    def _transaction(self):
+        """Context manager for a database transaction."""
+        try:
+            yield self._conn
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+
+    def _create_tables(self):
+        """Initialize the schema, discarding an index from another version."""
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        with self._transaction():
+            if version != _SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS hashes")
+            self._conn.executescript(f"""
+                CREATE TABLE IF NOT EXISTS hashes (
+                    directory TEXT NOT NULL,
+                    name      TEXT NOT NULL,
+                    mtime_ns  INTEGER NOT NULL,
+                    size      INTEGER NOT NULL,
+                    hash      INTEGER NOT NULL,
+                    PRIMARY KEY (directory, name)
+                ) WITHOUT ROWID;
+                PRAGMA user_version = {_SCHEMA_VERSION};
+            """)
+
+    def load_directory(self, directory):
+        """Return ``{name: (mtime_ns, size, hash)}`` for *directory*."""
+        rows = self._conn.execute(
+            "SELECT name, mtime_ns, size, hash FROM hashes WHERE directory = ?", (directory,)
+        )
+        return {name: (mtime_ns, size, _from_signed(h)) for name, mtime_ns, size, h in rows}
+
+    def store(self, directory, entries):
+        """Insert or replace ``(name, mtime_ns, size, hash)`` entries."""
+        with self._transaction():
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)",
+                (
+                    (directory, name, mtime_ns, size, _to_signed(h))
+                    for name, mtime_ns, size, h in entries
+                ),
+            )
+
+    def forget(self, directory, names):
+        """Delete the entries for *names* in *directory*."""
+        with self._transaction():
+            self._conn.executemany(
+                "DELETE FROM hashes WHERE directory = ? AND name = ?",
+                ((directory, name) for name in names),
+            )
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+
+def open_index(db_path=None):
+    """Open the hash index, or return None if the database is unusable."""
+    try:
+        return HashIndex(db_path)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Hash index unavailable: {e}")
+        return None
+
+
+# ----------------------------------------------------------------------
+# Scanner
+# ----------------------------------------------------------------------
+
+
+def _process_pool(workers):
+    """Create the hashing pool; ``spawn`` avoids forking a GTK process."""
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+class SimilarityScanner:
+    """Hashes a folder in the background and groups similar photos.
+
+    Args:
+        index: The :class:`HashIndex`, or None to hash everything each run.
+        workers: Hashing processes; defaults to the CPU count.
+        pool_factory: Callable ``pool_factory(workers)`` returning the
+                      executor that runs :func:`hash_files`.
+        thumb_dir: Thumbnail root passed to the hashing workers.
+    """
+
+    def __init__(self, index=None, workers=None, pool_factory=_process_pool, thumb_dir=None):
+        self._index = index
+        self._workers = workers or os.cpu_count() or 1
+        self._pool_factory = pool_factory
+        self._thumb_dir = thumb_dir
+        self._driver = ThreadPoolExecutor(max_workers=1, thread_name_prefix="similarity")
+        self._generation = 0
+
+    def scan(self, directory, names, on_progress=None, on_done=None, threshold=DEFAULT_THRESHOLD):
+        """Hash the images among *names* and group similar ones.
+
+        A scan already running is cancelled.
+
+        Args:
+            directory: Absolute directory path.
+            names: File names in the directory; non-images are skipped.
+            on_progress: Called on the main loop as ``on_progress(done, total)``
+                         with counts of files that needed hashing.
+            on_done: Called on the main loop as ``on_done(groups)`` with
+                     the result of :func:`group_similar`.
+            threshold: Largest Hamming distance counted as similar.
+        """
+        self._generation += 1
+        names = [n for n in names if is_image_file(n)]
+        known = {}
+        if self._index is not None:
+            try:
+                known = self._index.load_directory(directory)
+                listed = set(names)
+                stale = [n for n in known if n not in listed]
+                if stale:
+                    self._index.forget(directory, stale)
+            except sqlite3.Error as e:
+                print(f"Hash index error: {e}")
+        self._driver.submit(
+            self._run, self._generation, directory, names, known, on_progress, on_done, threshold
+        )
+
+    def cancel(self):
+        """Stop the running scan; its callbacks will not be called."""
+        self._generation += 1
+
+    def shutdown(self):
+        """Cancel scanning and close the index."""
+        self.cancel()
+        self._driver.shutdown(wait=False, cancel_futures=True)
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+    def _run(self, generation, directory, names, known, on_progress, on_done, threshold):
+        """Driver thread: hash what changed, then group everything."""
+        hashes, stats, todo = {}, {}, []
+        for name in names:
+            try:
+                st = os.stat(os.path.join(directory, name))
+            except OSError:
+                continue
+            stats[name] = (st.st_mtime_ns, st.st_size)
+            entry = known.get(name)
+            if entry is not None and entry[:2] == stats[name]:
+                hashes[name] = entry[2]
+            else:
+                todo.append(name)
+
+        fresh = []
+        if todo:
+            self._report(generation, on_progress, 0, len(todo))
+            done = 0
+            with self._pool_factory(min(self._workers, len(todo))) as pool:
+                futures = [
+                    pool.submit(
+                        hash_files,
+                        [os.path.join(directory, n) for n in todo[i : i + HASH_CHUNK]],
+                        self._thumb_dir,
+                    )
+                    for i in range(0, len(todo), HASH_CHUNK)
+                ]
+                for future in as_completed(futures):
+                    if generation != self._generation:
+                        for f in futures:
+                            f.cancel()
+                        return
+                    for path, value in future.result():
+                        done += 1
+                        if value is not None:
+                            name = os.path.basename(path)
+                            hashes[name] = value
+                            fresh.append((name, *stats[name], value))
+                    self._report(generation, on_progress, done, len(todo))
+
+        groups = group_similar(hashes, threshold)
+        GLib.idle_add(self._on_finished, generation, directory, fresh, groups, on_done)
+
+    def _report(self, generation, on_progress, done, total):
+        """Post a progress update, dropped if the scan is cancelled meanwhile."""
+        if on_progress:
+            GLib.idle_add(self._on_progress, generation, on_progress, done, total)
+
+    def _on_progress(self, generation, on_progress, done, total):
+        """Main-loop handler for :meth:`_report`."""
+        if generation == self._generation:
+            on_progress(done, total)
+        return False
+
+    def _on_finished(self, generation, directory, fresh, groups, on_done):
+        """Main-loop handler: persist new hashes and report the groups."""
+        if self._index is not None and fresh:
+            try:
+                self._index.store(directory, fresh)
+            except sqlite3.Error as e:
+                print(f"Hash index error: {e}")
+        if generation == self._generation and on_done:
+            on_done(groups)
+        return False
@@ -0,0 +1,340 @@
+"""
+madOS Photo Viewer - Slideshow
+================================
+
+Full-window slideshow over the images of the current folder.
+
+    - :class:`FrameQueue` keeps a bounded number of upcoming slides
+      decoded ahead of time.  A single worker decodes them in order,
+      already scaled to the viewport (see :func:`.imagecache.decode_image`),
+      so sequential reads suit slow SD cards and memory stays bounded.
+      Each frame is converted once to a cairo surface on arrival.
+    - :class:`SlideshowView` advances from the GDK frame clock: its tick
+      callback compares the frame time with the moment the current
+      slide appeared, so each slide changes on the frame it is due
+      rather than whenever a timeout happens to fire.  The outgoing
+      slide's surface is kept to crossfade from.
+
+Decode time is logged for every slide, and so is any delay when a slide
+was not ready in time.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import gi
+
+gi.require_version("Gtk", "3.0")
+gi.require_version("Gdk", "3.0")
+from gi.repository import Gtk, Gdk, GLib
+
+from .imagecache import decode_image
+from .navigator import is_image_file
+
+# How long each slide stays on screen (microseconds, as frame-clock time)
+SLIDE_DURATION_US = 5_000_000
+
+# Length of the crossfade between slides (microseconds)
+CROSSFADE_US = 600_000
+
+# Number of slides decoded ahead of the one on screen
+DECODE_AHEAD = 3
+
+# A slide shown more than this after its due time is reported as late
+LATE_TOLERANCE_US = 20_000
+
+
+class SlideFrame:
+    """A decoded slide ready to paint.
+
+    Attributes:
+        path: Source file path.
+        surface: Cairo image surface of the (viewport-sized) image.
+        width: Surface width.
+        height: Surface height.
+        decode_ms: Time spent decoding, in milliseconds.
+    """
+
+    __slots__ = ("path", "surface", "width", "height", "decode_ms")
+
+    def __init__(self, path, surface, width, height, decode_ms=0.0):
+        self.path = path
+        self.surface = surface
+        self.width = width
+        self.height = height
+        self.decode_ms = decode_ms
+
+
+def _timed_decode(decoder, path, size):
+    """Worker: decode *path* and measure how long it took."""
+    start = time.monotonic()
+    image = decoder(path, size)
+    return image, (time.monotonic() - start) * 1000.0
+
+
+class FrameQueue:
+    """Bounded set of upcoming slides, decoded in order on a worker.
+
+    Attributes:
+        viewport: ``(width, height)`` box slides are decoded to.
+        on_ready: Called on the main loop as ``on_ready(path)`` when a
+                  frame becomes available.
+
+    Args:
+        decoder: Callable ``decoder(path, max_size) -> DecodedImage``.
+        depth: Maximum number of frames held or being decoded.
+    """
+
+    def __init__(self, decoder=decode_image, depth=DECODE_AHEAD):
+        self.viewport = None
+        self.on_ready = None
+        self._decoder = decoder
+        self._depth = depth
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slideshow")
+        self._frames = {}  # path -> SlideFrame
+        self._pending = {}  # path -> Future
+        self._failed = set()
+
+    def __len__(self):
+        return len(self._frames)
+
+    def fill(self, paths):
+        """Keep frames for the first *depth* of *paths*, decoding missing ones.
+
+        Frames and queued decodes for other paths are dropped.
+
+        Args:
+            paths: Upcoming slide paths, soonest first.
+        """
+        wanted = [p for p in paths if p not in self._failed][: self._depth]
+        keep = set(wanted)
+        for path in list(self._frames):
+            if path not in keep:
+                del self._frames[path]
+        for path, future in list(self._pending.items()):
+            if path not in keep and future.cancel():
+                del self._pending[path]
+        for path in wanted:
+            if path not in self._frames and path not in self._pending:
+                future = self._executor.submit(
+                    _timed_decode, self._decoder, path, self.viewport
+                )
+                self._pending[path] = future
+                future.add_done_callback(
+                    lambda fut, p=path: GLib.idle_add(self._on_decoded, p, fut)
+                )
+
+    def get(self, path):
+        """Return the frame for *path*, or None if it is not decoded yet."""
+        return self._frames.get(path)
+
+    def has_failed(self, path):
+        """True if *path* could not be decoded."""
+        return path in self._failed
+
+    def clear(self):
+        """Drop all frames and cancel queued decodes."""
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._frames.clear()
+        self._failed.clear()
+
+    def shutdown(self):
+        """Stop the worker."""
+        self.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _on_decoded(self, path, future):
+        """Main-loop handler: convert to a surface and store."""
+        if self._pending.get(path) is not future:
+            return False  # Dropped by fill() or clear() meanwhile
+        del self._pending[path]
+        try:
+            image, decode_ms = future.result()
+        except Exception as e:
+            print(f"Slideshow: cannot decode {os.path.basename(path)}: {e}")
+            self._failed.add(path)
+            if self.on_ready:
+                self.on_ready(path)
+            return False
+        pixbuf = image.pixbuf
+        surface = Gdk.cairo_surface_create_from_pixbuf(pixbuf, 1, None)
+        self._frames[path] = SlideFrame(
+            path, surface, pixbuf.get_width(), pixbuf.get_height(), decode_ms
+        )
+        print(f"Slideshow: decoded {os.path.basename(path)} in {decode_ms:.0f} ms")
+        if self.on_ready:
+            self.on_ready(path)
+        return False
+
+
+class SlideshowView(Gtk.DrawingArea):
+    """Paints the slideshow and advances it from the frame clock.
+
+    Attributes:
+        on_advanced: Called after the navigator moved to a new slide.
+        on_stopped: Called when the user ends the slideshow (click).
+
+    Args:
+        navigator: The :class:`~.navigator.FileNavigator` to step through.
+        queue: The :class:`FrameQueue`; a new one is created if omitted.
+        duration_us: Time each slide is shown.
+        crossfade_us: Crossfade length.
+    """
+
+    def __init__(
+        self, navigator, queue=None, duration_us=SLIDE_DURATION_US, crossfade_us=CROSSFADE_US
+    ):
+        super().__init__()
+        self.on_advanced = None
+        self.on_stopped = None
+        self._navigator = navigator
+        self._queue = queue if queue is not None else FrameQueue()
+        self._queue.on_ready = self._on_frame_ready
+        self._duration_us = duration_us
+        self._crossfade_us = crossfade_us
+        self._current = None  # SlideFrame on screen
+        self._previous = None  # SlideFrame fading out
+        self._shown_at = 0  # Frame time the current slide started to appear
+        self._fade = 1.0
+        self._tick_id = None
+
+        self.get_style_context().add_class("canvas-area")
+        self.add_events(Gdk.EventMask.BUTTON_PRESS_MASK)
+        self.connect("draw", self._on_draw)
+        self.connect("button-press-event", self._on_button_press)
+
+    @property
+    def running(self):
+        """True while the slideshow is playing."""
+        return self._tick_id is not None
+
+    def start(self, viewport):
+        """Start at the navigator's current file.
+
+        Args:
+            viewport: ``(width, height)`` to decode slides for.
+        """
+        self.stop()
+        self._queue.viewport = viewport
+        self._queue.fill(self._upcoming(include_current=True))
+        self._tick_id = self.add_tick_callback(self._on_tick)
+
+    def stop(self):
+        """Stop advancing and release decoded frames."""
+        if self._tick_id is not None:
+            self.remove_tick_callback(self._tick_id)
+            self._tick_id = None
+        self._queue.clear()
+        self._current = None
+        self._previous = None
+
+    def shutdown(self):
+        """Stop and release the decode worker."""
+        self.stop()
+        self._queue.shutdown()
+
+    # ------------------------------------------------------------------
+    # Timing
+    # ------------------------------------------------------------------
+
+    def _upcoming(self, include_current=False):
+        """Return the paths of the next decodable images, soonest first."""
+        paths = []
+        first = 0 if include_current else 1
+        for step in range(first, self._navigator.total_count + first):
+            path = self._navigator.peek(step)
+            if (
+                path
+                and is_image_file(path)
+                and path not in paths
+                and not self._queue.has_failed(path)
+            ):
+                paths.append(path)
+            if len(paths) >= DECODE_AHEAD:
+                break
+        return paths
+
+    def _on_frame_ready(self, path):
+        """Decode finished: after a failure, decode further ahead instead."""
+        if self.running and self._queue.has_failed(path):
+            self._queue.fill(self._upcoming(include_current=self._current is None))
+
+    def _on_tick(self, widget, frame_clock):
+        """Frame-clock callback: fade and advance on the due frame.
+
+        Returns:
+            True to keep ticking.
+        """
+        now = frame_clock.get_frame_time()
+
+        if self._previous is not None:
+            self._fade = min(1.0, (now - self._shown_at) / self._crossfade_us)
+            if self._fade >= 1.0:
+                self._previous = None
+            self.queue_draw()
+
+        due = self._shown_at + self._duration_us if self._current is not None else now
+        if now >= due:
+            upcoming = self._upcoming(include_current=self._current is None)
+            frame = self._queue.get(upcoming[0]) if upcoming else None
+            if frame is not None:
+                self._show(frame, now, due)
+        return True
+
+    def _show(self, frame, now, due):
+        """Make *frame* the current slide at frame time *now*."""
+        late_us = now - due
+        if self._current is not None and late_us > LATE_TOLERANCE_US:
+            print(
+                f"Slideshow: {os.path.basename(frame.path)} shown "
+                f"{late_us / 1000:.0f} ms late (decode {frame.decode_ms:.0f} ms)"
+            )
+        if self._current is not None:
+            self._previous = self._current
+            self._fade = 0.0
+        self._current = frame
+        self._shown_at = now
+        self._navigator.go_to_file(frame.path)
+        self._queue.fill(self._upcoming())
+        self.queue_draw()
+        if self.on_advanced:
+            self.on_advanced()
+
+    # ------------------------------------------------------------------
+    # Drawing
+    # ------------------------------------------------------------------
+
+    def _on_draw(self, widget, cr):
+        import cairo
+
+        width = self.get_allocated_width()
+        height = self.get_allocated_height()
+        cr.set_source_rgb(0, 0, 0)
+        cr.paint()
+        if self._previous is not None:
+            self._paint_frame(cr, self._previous, width, height, 1.0 - self._fade)
+            # Adding the two weighted images gives a linear crossfade
+            cr.set_operator(cairo.OPERATOR_ADD)
+            self._paint_frame(cr, self._current, width, height, self._fade)
+        elif self._current is not None:
+            self._paint_frame(cr, self._current, width, height, 1.0)
+        return True
+
+    @staticmethod
+    def _paint_frame(cr, frame, width, height, alpha):
+        """Paint *frame* centered and fitted in the widget."""
+        scale = min(1.0, width / frame.width, height / frame.height)
+        cr.save()
+        cr.translate((width - frame.width * scale) / 2, (height - frame.height * scale) / 2)
+        cr.scale(scale, scale)
+        cr.set_source_surface(frame.surface, 0, 0)
+        cr.paint_with_alpha(alpha)
+        cr.restore()
+
+    def _on_button_press(self, widget, event):
+        if self.on_stopped:
+            self.on_stopped()
+        return True
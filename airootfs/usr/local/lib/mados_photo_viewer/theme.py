@@ -210,6 +210,18 @@ toolbar > menuitem:hover {
     font-size: 12px;
 }
 
+/* Metadata side panel */
+.info-panel {
+    background-color: """
+    + NORD["nord1"]
+    + """;
+    border-left: 1px solid """
+    + NORD["nord2"]
+    + """;
+    padding: 8px;
+    font-size: 12px;
+}
+
 /* Labels */
 label {
     color: """
@@ -0,0 +1,335 @@
+"""
+madOS Photo Viewer - Thumbnail Cache
+=====================================
+
+Implements the freedesktop.org Thumbnail Managing Standard so that
+thumbnails are shared with file managers and other viewers:
+
+    - Thumbnails live in ``$XDG_CACHE_HOME/thumbnails/{normal,large}/``
+    - The file name is the MD5 hex digest of the source file URI + ``.png``
+    - Each thumbnail carries ``Thumb::URI`` and ``Thumb::MTime`` PNG text
+      chunks; a thumbnail is only reused if ``Thumb::MTime`` matches the
+      source file's modification time
+    - Files that cannot be thumbnailed get an entry under
+      ``fail/mados-photo-viewer/`` so they are not retried on every visit
+
+Validation only parses the PNG chunk headers, never the pixel data.
+Generation uses ``GdkPixbuf.Pixbuf.new_from_file_at_scale`` (which lets
+the JPEG loader decode at a reduced DCT scale) on a small worker pool,
+and results are delivered back on the GTK main loop.
+"""
+
+import hashlib
+import os
+import struct
+import threading
+import urllib.parse
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import gi
+
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import GdkPixbuf, GLib
+
+from .navigator import is_image_file
+
+# Thumbnail flavors from the spec: directory name -> max edge in pixels
+THUMBNAIL_SIZES = {"normal": 128, "large": 256}
+
+DEFAULT_THUMBNAIL_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "thumbnails",
+)
+
+# Sub-directory of fail/ reserved for this application
+FAIL_DIR_NAME = "mados-photo-viewer"
+
+# Characters GLib leaves unescaped in the path part of file:// URIs
+_URI_SAFE = "/!~*'()&=:@+$,"
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# In-memory LRU budget for decoded thumbnails (bytes)
+DEFAULT_MEMORY_BUDGET = 16 * 1024 * 1024
+
+
+def file_uri(filepath):
+    """Return the canonical ``file://`` URI of a local path.
+
+    Matches ``g_filename_to_uri`` escaping so digests agree with
+    thumbnails written by other GLib-based applications.
+
+    Args:
+        filepath: Local file path.
+
+    Returns:
+        The file URI string.
+    """
+    return "file://" + urllib.parse.quote(os.path.abspath(filepath), safe=_URI_SAFE)
+
+
+def thumbnail_path(filepath, flavor="normal", base_dir=None):
+    """Return the spec location of the thumbnail for *filepath*.
+
+    Args:
+        filepath: Source image path.
+        flavor: ``"normal"`` (128 px) or ``"large"`` (256 px).
+        base_dir: Thumbnail root; defaults to ``~/.cache/thumbnails``.
+
+    Returns:
+        Absolute path of the PNG thumbnail (which may not exist yet).
+    """
+    digest = hashlib.md5(file_uri(filepath).encode("utf-8")).hexdigest()
+    return os.path.join(base_dir or DEFAULT_THUMBNAIL_DIR, flavor, digest + ".png")
+
+
+def fail_path(filepath, base_dir=None):
+    """Return the location of the failure marker for *filepath*."""
+    digest = hashlib.md5(file_uri(filepath).encode("utf-8")).hexdigest()
+    return os.path.join(base_dir or DEFAULT_THUMBNAIL_DIR, "fail", FAIL_DIR_NAME, digest + ".png")
+
+
+def read_png_text(path):
+    """Read the ``tEXt`` chunks of a PNG file without decoding pixels.
+
+    Parsing stops at the first ``IDAT`` chunk, which per the spec comes
+    after the thumbnail metadata.
+
+    Args:
+        path: Path to a PNG file.
+
+    Returns:
+        Dictionary of keyword -> text, or an empty dict if the file is
+        missing or not a PNG.
+    """
+    text = {}
+    try:
+        with open(path, "rb") as f:
+            if f.read(8) != _PNG_SIGNATURE:
+                return text
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    break
+                length, chunk_type = struct.unpack(">I4s", header)
+                if chunk_type in (b"IDAT", b"IEND"):
+                    break
+                data = f.read(length)
+                f.seek(4, os.SEEK_CUR)  # CRC
+                if chunk_type == b"tEXt" and b"\x00" in data:
+                    key, _, value = data.partition(b"\x00")
+                    text[key.decode("latin-1")] = value.decode("latin-1")
+                elif chunk_type == b"zTXt" and b"\x00" in data:
+                    key, _, rest = data.partition(b"\x00")
+                    try:
+                        text[key.decode("latin-1")] = zlib.decompress(rest[1:]).decode("latin-1")
+                    except zlib.error:
+                        pass
+    except OSError:
+        pass
+    return text
+
+
+def is_thumbnail_valid(thumb_path, source_mtime):
+    """Check a cached thumbnail against its source modification time.
+
+    Args:
+        thumb_path: Path of the cached thumbnail PNG.
+        source_mtime: ``st_mtime`` of the source file.
+
+    Returns:
+        True if the thumbnail exists and its ``Thumb::MTime`` matches.
+    """
+    return read_png_text(thumb_path).get("Thumb::MTime") == str(int(source_mtime))
+
+
+class ThumbnailCache:
+    """Loads and generates spec-compliant thumbnails on a worker pool.
+
+    Decoded thumbnails are kept in a byte-budgeted in-memory LRU so that
+    scrolling back over a grid does not touch the disk again.
+
+    One cache is shared by several views (grid, filmstrip, dialogs).  Each
+    request names its *owner*; a path requested by several owners is
+    loaded once and every owner's callback is called, and an owner only
+    ever cancels its own requests.
+
+    Args:
+        flavor: ``"normal"`` or ``"large"``.
+        base_dir: Thumbnail root directory (for tests).
+        max_workers: Worker thread count; defaults to min(4, CPU count).
+        memory_budget: Bytes of decoded thumbnails kept in memory.
+    """
+
+    def __init__(self, flavor="normal", base_dir=None, max_workers=None, memory_budget=None):
+        self.flavor = flavor
+        self.size = THUMBNAIL_SIZES[flavor]
+        self._base_dir = base_dir or DEFAULT_THUMBNAIL_DIR
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or min(4, os.cpu_count() or 1),
+            thread_name_prefix="thumbnail",
+        )
+        self._memory = OrderedDict()  # filepath -> GdkPixbuf.Pixbuf
+        self._memory_bytes = 0
+        self._memory_budget = memory_budget or DEFAULT_MEMORY_BUDGET
+        self._pending = {}  # filepath -> (Future, {owner: callback})
+
+    # ------------------------------------------------------------------
+    # Public API (main thread)
+    # ------------------------------------------------------------------
+
+    def lookup(self, filepath):
+        """Return the in-memory thumbnail for *filepath*, or None."""
+        pixbuf = self._memory.get(filepath)
+        if pixbuf is not None:
+            self._memory.move_to_end(filepath)
+        return pixbuf
+
+    def request(self, filepath, callback, owner=None):
+        """Load or generate a thumbnail in the background.
+
+        Args:
+            filepath: Source image path.
+            callback: Called on the main loop as ``callback(filepath, pixbuf)``;
+                      *pixbuf* is None if no thumbnail could be produced.
+            owner: Identifies the requester for :meth:`cancel_pending`,
+                   normally the requesting view.
+
+        Returns:
+            The thumbnail if it was already in memory, else None.
+        """
+        pixbuf = self.lookup(filepath)
+        if pixbuf is not None:
+            return pixbuf
+        if not is_image_file(filepath):
+            return None
+
+        entry = self._pending.get(filepath)
+        if entry is not None:
+            entry[1][owner] = callback
+            return None
+
+        future = self._executor.submit(self._load_or_generate, filepath)
+        self._pending[filepath] = (future, {owner: callback})
+        future.add_done_callback(lambda fut: GLib.idle_add(self._on_loaded, filepath, fut))
+        return None
+
+    def cancel_pending(self, keep=(), owner=None):
+        """Cancel an owner's requests that are no longer needed.
+
+        A queued load is cancelled once no owner wants it any more.  Loads
+        already running are left to finish (their result still lands in
+        the memory cache).
+
+        Args:
+            keep: Collection of file paths whose requests must be kept.
+            owner: The requester whose requests are cancelled.
+        """
+        keep = set(keep)
+        for filepath, (future, callbacks) in list(self._pending.items()):
+            if filepath in keep or owner not in callbacks:
+                continue
+            del callbacks[owner]
+            if not callbacks and future.cancel():
+                del self._pending[filepath]
+
+    def clear_memory(self):
+        """Drop all in-memory thumbnails."""
+        self._memory.clear()
+        self._memory_bytes = 0
+
+    def shutdown(self):
+        """Stop the worker pool, discarding queued work."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pending.clear()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _on_loaded(self, filepath, future):
+        """Main-loop completion handler for a thumbnail request."""
+        entry = self._pending.get(filepath)
+        if entry is None or entry[0] is not future:
+            return False
+        del self._pending[filepath]
+        if future.cancelled():
+            return False
+        try:
+            pixbuf = future.result()
+        except Exception as e:
+            print(f"Thumbnail error for {filepath}: {e}")
+            pixbuf = None
+        if pixbuf is not None:
+            self._remember(filepath, pixbuf)
+        for callback in entry[1].values():
+            callback(filepath, pixbuf)
+        return False
+
+    def _remember(self, filepath, pixbuf):
+        """Insert a thumbnail into the memory LRU, evicting as needed."""
+        old = self._memory.pop(filepath, None)
+        if old is not None:
+            self._memory_bytes -= old.get_byte_length()
+        self._memory[filepath] = pixbuf
+        self._memory_bytes += pixbuf.get_byte_length()
+        while self._memory_bytes > self._memory_budget and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.get_byte_length()
+
+    def _load_or_generate(self, filepath):
+        """Worker: return a valid cached thumbnail or generate a new one."""
+        try:
+            mtime = os.stat(filepath).st_mtime
+        except OSError:
+            return None
+
+        thumb = thumbnail_path(filepath, self.flavor, self._base_dir)
+        if is_thumbnail_valid(thumb, mtime):
+            try:
+                return GdkPixbuf.Pixbuf.new_from_file(thumb)
+            except GLib.Error:
+                pass  # Corrupt thumbnail: regenerate below
+
+        failed = fail_path(filepath, self._base_dir)
+        if is_thumbnail_valid(failed, mtime):
+            return None
+
+        try:
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(filepath, self.size, self.size, True)
+            pixbuf = pixbuf.apply_embedded_orientation() or pixbuf
+        except GLib.Error:
+            self._write_fail_marker(filepath, mtime)
+            return None
+
+        self._write_thumbnail(pixbuf, thumb, filepath, mtime)
+        return pixbuf
+
+    def _write_thumbnail(self, pixbuf, thumb, filepath, mtime):
+        """Atomically save *pixbuf* as a spec thumbnail (0600, temp + rename)."""
+        directory = os.path.dirname(thumb)
+        tmp = f"{thumb}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            pixbuf.savev(
+                tmp,
+                "png",
+                ["tEXt::Thumb::URI", "tEXt::Thumb::MTime", "tEXt::Software"],
+                [file_uri(filepath), str(int(mtime)), "madOS Photo Viewer"],
+            )
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, thumb)
+        except (OSError, GLib.Error) as e:
+            print(f"Could not write thumbnail for {filepath}: {e}")
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+    def _write_fail_marker(self, filepath, mtime):
+        """Record that *filepath* could not be thumbnailed."""
+        marker = GdkPixbuf.Pixbuf.new(GdkPixbuf.Colorspace.RGB, True, 8, 1, 1)
+        marker.fill(0)
+        self._write_thumbnail(marker, fail_path(filepath, self._base_dir), filepath, mtime)
@@ -0,0 +1,331 @@
+"""
+madOS Photo Viewer - Thumbnail Grid and Filmstrip
+===================================================
+
+A virtualized thumbnail browser backed by :class:`ThumbnailCache`.
+
+Only the cells intersecting the viewport are drawn or requested, so a
+directory with thousands of files costs the same to display as one with
+a dozen.  Two layouts are provided:
+
+    - ``"grid"``      - wrapping rows, scrolled vertically
+    - ``"filmstrip"`` - a single row, scrolled horizontally
+
+When the view scrolls, queued thumbnail requests for cells that are no
+longer visible are cancelled so that the worker pool always works on
+what the user is looking at.
+"""
+
+import os
+
+import gi
+
+gi.require_version("Gtk", "3.0")
+gi.require_version("Gdk", "3.0")
+from gi.repository import Gtk, Gdk, GLib
+
+from .navigator import is_video_file
+
+MODE_GRID = "grid"
+MODE_FILMSTRIP = "filmstrip"
+
+# Cell padding around each thumbnail (pixels)
+CELL_PADDING = 6
+
+# Filmstrip thumbnails are drawn smaller than the cache flavor
+FILMSTRIP_CELL = 72
+
+# Pixels scrolled per wheel step
+SCROLL_STEP = 48
+
+
+def grid_columns(viewport_width, cell_size):
+    """Return how many cells fit in one grid row (at least one)."""
+    return max(1, int(viewport_width // cell_size))
+
+
+def visible_range(offset, viewport_extent, cell_size, per_line, count):
+    """Compute the index range of cells intersecting the viewport.
+
+    Args:
+        offset: Scroll offset along the scrolling axis (pixels).
+        viewport_extent: Viewport length along the scrolling axis.
+        cell_size: Cell length along the scrolling axis.
+        per_line: Cells per row (grid) or 1 (filmstrip).
+        count: Total number of cells.
+
+    Returns:
+        Tuple ``(first, last)`` with *last* exclusive.
+    """
+    if count <= 0 or cell_size <= 0:
+        return 0, 0
+    first_line = max(0, int(offset // cell_size))
+    last_line = int((offset + viewport_extent) // cell_size) + 1
+    first = min(count, first_line * per_line)
+    last = min(count, last_line * per_line)
+    return first, last
+
+
+class ThumbnailView(Gtk.Box):
+    """Virtualized thumbnail grid / filmstrip.
+
+    Args:
+        cache: The :class:`ThumbnailCache` used to obtain thumbnails.
+        mode: ``MODE_GRID`` or ``MODE_FILMSTRIP``.
+    """
+
+    def __init__(self, cache, mode=MODE_GRID):
+        orientation = (
+            Gtk.Orientation.VERTICAL if mode == MODE_FILMSTRIP else Gtk.Orientation.HORIZONTAL
+        )
+        super().__init__(orientation=orientation, spacing=0)
+
+        self._cache = cache
+        self._mode = mode
+        self._directory = None
+        self._names = []
+        self._selected = -1
+        self._redraw_pending = False
+
+        # Callback invoked with the activated index
+        self.on_activate = None
+
+        self._adjustment = Gtk.Adjustment(
+            value=0, lower=0, upper=0, step_increment=SCROLL_STEP, page_increment=0, page_size=0
+        )
+        self._adjustment.connect("value-changed", lambda adj: self._area.queue_draw())
+
+        self._area = Gtk.DrawingArea()
+        self._area.add_events(
+            Gdk.EventMask.BUTTON_PRESS_MASK
+            | Gdk.EventMask.SCROLL_MASK
+            | Gdk.EventMask.SMOOTH_SCROLL_MASK
+        )
+        self._area.connect("draw", self._on_draw)
+        self._area.connect("button-press-event", self._on_button_press)
+        self._area.connect("scroll-event", self._on_scroll)
+        self._area.connect("size-allocate", lambda w, a: self._update_adjustment())
+        self._area.get_style_context().add_class("canvas-area")
+
+        scroll_orientation = (
+            Gtk.Orientation.HORIZONTAL if mode == MODE_FILMSTRIP else Gtk.Orientation.VERTICAL
+        )
+        self._scrollbar = Gtk.Scrollbar(
+            orientation=scroll_orientation, adjustment=self._adjustment
+        )
+
+        self.pack_start(self._area, True, True, 0)
+        self.pack_start(self._scrollbar, False, False, 0)
+
+        if mode == MODE_FILMSTRIP:
+            self.set_size_request(-1, self.cell_size + 12)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @property
+    def cell_size(self):
+        """Edge length of one cell including padding."""
+        if self._mode == MODE_FILMSTRIP:
+            return FILMSTRIP_CELL + 2 * CELL_PADDING
+        return self._cache.size + 2 * CELL_PADDING
+
+    def set_files(self, directory, names, selected=-1):
+        """Replace the displayed file list.
+
+        Args:
+            directory: Directory containing the files.
+            names: Sequence of file names, in display order.
+            selected: Index of the highlighted file.
+        """
+        self._directory = directory
+        self._names = list(names)
+        self._selected = selected
+        self._cache.cancel_pending(owner=self)
+        self._adjustment.set_value(0)
+        self._update_adjustment()
+        self.scroll_to(selected)
+        self._area.queue_draw()
+
+    def set_selected(self, index):
+        """Highlight *index* and scroll it into view."""
+        if index == self._selected:
+            return
+        self._selected = index
+        self.scroll_to(index)
+        self._area.queue_draw()
+
+    def scroll_to(self, index):
+        """Scroll so that the cell at *index* is fully visible."""
+        if not 0 <= index < len(self._names):
+            return
+        cell = self.cell_size
+        line = index if self._mode == MODE_FILMSTRIP else index // self._per_line()
+        start = line * cell
+        value = self._adjustment.get_value()
+        page = self._adjustment.get_page_size()
+        if start < value:
+            self._adjustment.set_value(start)
+        elif start + cell > value + page:
+            self._adjustment.set_value(start + cell - page)
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    def _viewport(self):
+        """Return (width, height) of the drawing area."""
+        return self._area.get_allocated_width(), self._area.get_allocated_height()
+
+    def _per_line(self):
+        """Number of cells per row along the non-scrolling axis."""
+        if self._mode == MODE_FILMSTRIP:
+            return 1
+        return grid_columns(self._viewport()[0], self.cell_size)
+
+    def _update_adjustment(self):
+        """Resize the scroll range to match the file count and viewport."""
+        width, height = self._viewport()
+        cell = self.cell_size
+        per_line = self._per_line()
+        lines = (len(self._names) + per_line - 1) // per_line
+        page = width if self._mode == MODE_FILMSTRIP else height
+        self._adjustment.configure(
+            min(self._adjustment.get_value(), max(0, lines * cell - page)),
+            0,
+            max(lines * cell, page),
+            SCROLL_STEP,
+            max(1, page - cell),
+            page,
+        )
+
+    def _cell_origin(self, index, per_line, offset):
+        """Return the top-left screen position of the cell at *index*."""
+        cell = self.cell_size
+        if self._mode == MODE_FILMSTRIP:
+            return index * cell - offset, 0
+        row, col = divmod(index, per_line)
+        return col * cell, row * cell - offset
+
+    def _index_at(self, x, y):
+        """Return the index of the cell under a screen point, or -1."""
+        cell = self.cell_size
+        offset = self._adjustment.get_value()
+        if self._mode == MODE_FILMSTRIP:
+            index = int((x + offset) // cell)
+        else:
+            per_line = self._per_line()
+            col = int(x // cell)
+            if col >= per_line:
+                return -1
+            index = int((y + offset) // cell) * per_line + col
+        return index if 0 <= index < len(self._names) else -1
+
+    # ------------------------------------------------------------------
+    # Drawing
+    # ------------------------------------------------------------------
+
+    def _on_draw(self, widget, cr):
+        """Draw only the cells that intersect the viewport."""
+        width, height = self._viewport()
+        cr.set_source_rgb(0.18, 0.204, 0.251)  # nord0
+        cr.paint()
+
+        if not self._names:
+            return False
+
+        cell = self.cell_size
+        per_line = self._per_line()
+        offset = self._adjustment.get_value()
+        extent = width if self._mode == MODE_FILMSTRIP else height
+        first, last = visible_range(offset, extent, cell, per_line, len(self._names))
+
+        wanted = []
+        for index in range(first, last):
+            x, y = self._cell_origin(index, per_line, offset)
+            path = os.path.join(self._directory, self._names[index])
+            wanted.append(path)
+            self._draw_cell(cr, index, path, x, y, cell)
+
+        # Drop queued work for cells scrolled out of view
+        self._cache.cancel_pending(keep=wanted, owner=self)
+        return False
+
+    def _draw_cell(self, cr, index, path, x, y, cell):
+        """Draw one thumbnail cell, requesting its thumbnail if needed."""
+        if index == self._selected:
+            cr.set_source_rgb(0.533, 0.753, 0.816)  # nord8
+            cr.rectangle(x + 1, y + 1, cell - 2, cell - 2)
+            cr.fill()
+
+        inner = cell - 2 * CELL_PADDING
+        pixbuf = self._cache.request(path, self._on_thumbnail_ready, owner=self)
+        if pixbuf is None:
+            cr.set_source_rgb(0.263, 0.298, 0.369)  # nord2
+            cr.rectangle(x + CELL_PADDING, y + CELL_PADDING, inner, inner)
+            cr.fill()
+            if is_video_file(path):
+                self._draw_play_glyph(cr, x + cell / 2, y + cell / 2, inner / 4)
+            return
+
+        pw, ph = pixbuf.get_width(), pixbuf.get_height()
+        scale = min(1.0, inner / max(pw, ph, 1))
+        dx = x + (cell - pw * scale) / 2
+        dy = y + (cell - ph * scale) / 2
+        cr.save()
+        cr.translate(dx, dy)
+        cr.scale(scale, scale)
+        Gdk.cairo_set_source_pixbuf(cr, pixbuf, 0, 0)
+        cr.paint()
+        cr.restore()
+
+    @staticmethod
+    def _draw_play_glyph(cr, cx, cy, r):
+        """Draw a triangular play symbol for video cells."""
+        cr.set_source_rgb(0.847, 0.871, 0.914)  # nord4
+        cr.move_to(cx - r * 0.6, cy - r)
+        cr.line_to(cx + r, cy)
+        cr.line_to(cx - r * 0.6, cy + r)
+        cr.close_path()
+        cr.fill()
+
+    def _on_thumbnail_ready(self, filepath, pixbuf):
+        """Coalesce redraws when several thumbnails arrive at once."""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            GLib.idle_add(self._redraw)
+
+    def _redraw(self):
+        self._redraw_pending = False
+        self._area.queue_draw()
+        return False
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def _on_button_press(self, widget, event):
+        """Activate the clicked cell."""
+        if event.button != 1:
+            return False
+        index = self._index_at(event.x, event.y)
+        if index >= 0:
+            self.set_selected(index)
+            if self.on_activate:
+                self.on_activate(index)
+        return True
+
+    def _on_scroll(self, widget, event):
+        """Scroll the view with the mouse wheel."""
+        if event.direction == Gdk.ScrollDirection.SMOOTH:
+            _, dx, dy = event.get_scroll_deltas()
+            delta = (dx or dy) if self._mode == MODE_FILMSTRIP else dy
+            delta *= SCROLL_STEP
+        elif event.direction in (Gdk.ScrollDirection.UP, Gdk.ScrollDirection.LEFT):
+            delta = -SCROLL_STEP
+        else:
+            delta = SCROLL_STEP
+        upper = self._adjustment.get_upper() - self._adjustment.get_page_size()
+        self._adjustment.set_value(max(0, min(upper, self._adjustment.get_value() + delta)))
+        return True
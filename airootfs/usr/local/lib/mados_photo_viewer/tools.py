@@ -5,22 +5,20 @@ madOS Photo Viewer - Drawing and Editing Tools
 Provides tool classes for image editing:
     - PaintTool: Freehand drawing with configurable color and brush size
     - TextTool: Click-to-place text with font size and color
-    - BlurTool: Paint-over gaussian-like blur using GdkPixbuf scale trick
-    - PixelateTool: Paint-over pixelation using nearest-neighbor downsampling
+    - BlurTool: Paint-over blur rendered by the tiled effect layer
+    - PixelateTool: Paint-over pixelation rendered by the tiled effect layer
     - EraserTool: Removes drawing strokes by index
 
 All tools store their operations as serializable stroke data so that
-undo/redo and final compositing can replay them.
+undo/redo and final compositing can replay them.  EditHistory keeps a
+uniform-grid index over stroke bounding boxes so that eraser hit-tests
+only look at strokes near the pointer.
 """
 
 import math
-import cairo
-
-import gi
+from collections import defaultdict
 
-gi.require_version("Gtk", "3.0")
-gi.require_version("GdkPixbuf", "2.0")
-from gi.repository import GdkPixbuf, GLib
+import cairo
 
 
 # ---------------------------------------------------------------------------
@@ -117,53 +115,23 @@ class BlurStroke:
         self.points.append((x, y))
 
     def apply_to_pixbuf(self, pixbuf):
-        """Apply a gaussian-like blur along the stroke path on a GdkPixbuf.
+        """Apply the blur along the stroke path on a GdkPixbuf.
 
-        This uses the scale-down-then-scale-up trick: for each point in the
-        stroke, extract a bounding box, scale it down by 4x, then scale back
-        up with bilinear interpolation, producing a blur effect.
+        The brush path is rasterized into a coverage mask and the blur is
+        computed once per affected tile (see :mod:`effects`).
 
         Args:
-            pixbuf: A GdkPixbuf.Pixbuf to modify in place (via composite).
+            pixbuf: A GdkPixbuf.Pixbuf to read from.
 
         Returns:
-            The modified GdkPixbuf.Pixbuf.
+            A new GdkPixbuf.Pixbuf with the blur applied.
         """
         if not self.points or pixbuf is None:
             return pixbuf
 
-        width = pixbuf.get_width()
-        height = pixbuf.get_height()
-        radius = int(self.brush_size)
-        scale_factor = 4  # How much to downsample for blur
-
-        for px, py in self.points:
-            # Compute bounding box for this blur point
-            x0 = max(0, int(px - radius))
-            y0 = max(0, int(py - radius))
-            x1 = min(width, int(px + radius))
-            y1 = min(height, int(py + radius))
-            rw = x1 - x0
-            rh = y1 - y0
-            if rw < 2 or rh < 2:
-                continue
-
-            # Extract sub-region
-            sub = GdkPixbuf.Pixbuf.new(GdkPixbuf.Colorspace.RGB, pixbuf.get_has_alpha(), 8, rw, rh)
-            pixbuf.copy_area(x0, y0, rw, rh, sub, 0, 0)
+        from .effects import apply_effect_strokes
 
-            # Scale down
-            small_w = max(1, rw // scale_factor)
-            small_h = max(1, rh // scale_factor)
-            small = sub.scale_simple(small_w, small_h, GdkPixbuf.InterpType.BILINEAR)
-
-            # Scale back up (this creates the blur)
-            blurred = small.scale_simple(rw, rh, GdkPixbuf.InterpType.BILINEAR)
-
-            # Copy blurred region back
-            blurred.copy_area(0, 0, rw, rh, pixbuf, x0, y0)
-
-        return pixbuf
+        return apply_effect_strokes(pixbuf, [self])
 
 
 class PixelateStroke:
@@ -188,59 +156,134 @@ class PixelateStroke:
     def apply_to_pixbuf(self, pixbuf):
         """Apply pixelation along the stroke path on a GdkPixbuf.
 
-        For each point, extract a region, scale it down with NEAREST
-        interpolation (creating blocky pixels), then scale back up.
+        Blocks are aligned to the image grid, averaged, and composited
+        through the brush coverage mask (see :mod:`effects`).
 
         Args:
-            pixbuf: A GdkPixbuf.Pixbuf to modify.
+            pixbuf: A GdkPixbuf.Pixbuf to read from.
 
         Returns:
-            The modified GdkPixbuf.Pixbuf.
+            A new GdkPixbuf.Pixbuf with the pixelation applied.
         """
         if not self.points or pixbuf is None:
             return pixbuf
 
-        width = pixbuf.get_width()
-        height = pixbuf.get_height()
-        radius = int(self.brush_size)
-        block = max(2, self.block_size)
+        from .effects import apply_effect_strokes
+
+        return apply_effect_strokes(pixbuf, [self])
+
+
+# ---------------------------------------------------------------------------
+# StrokeIndex: spatial lookup for hit-testing
+# ---------------------------------------------------------------------------
+# Edge length of one index cell (image pixels)
+INDEX_CELL_SIZE = 64
+
+
+def stroke_bounds(stroke):
+    """Return the hit-test bounding box ``(x0, y0, x1, y1)`` of a stroke.
+
+    Path strokes extend half a brush around their points; text strokes
+    are hit within one font size of their anchor.
+
+    Args:
+        stroke: Any stroke object.
+
+    Returns:
+        The box in image coordinates, or None for an empty stroke.
+    """
+    if stroke.type == TOOL_TEXT:
+        r = stroke.font_size
+        return (stroke.x - r, stroke.y - r, stroke.x + r, stroke.y + r)
+    if not stroke.points:
+        return None
+    r = stroke.brush_size / 2.0
+    xs = [p[0] for p in stroke.points]
+    ys = [p[1] for p in stroke.points]
+    return (min(xs) - r, min(ys) - r, max(xs) + r, max(ys) + r)
+
 
-        for px, py in self.points:
-            x0 = max(0, int(px - radius))
-            y0 = max(0, int(py - radius))
-            x1 = min(width, int(px + radius))
-            y1 = min(height, int(py + radius))
-            rw = x1 - x0
-            rh = y1 - y0
-            if rw < 2 or rh < 2:
-                continue
+class StrokeIndex:
+    """Uniform grid mapping image cells to the strokes whose bounds touch them.
+
+    Args:
+        cell_size: Edge length of one grid cell in image pixels.
+    """
 
-            sub = GdkPixbuf.Pixbuf.new(GdkPixbuf.Colorspace.RGB, pixbuf.get_has_alpha(), 8, rw, rh)
-            pixbuf.copy_area(x0, y0, rw, rh, sub, 0, 0)
+    def __init__(self, cell_size=INDEX_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells = defaultdict(list)  # (cx, cy) -> [stroke, ...]
+        self._stroke_cells = {}  # id(stroke) -> [(cx, cy), ...]
+
+    def __len__(self):
+        return len(self._stroke_cells)
+
+    def _cell_range(self, x0, y0, x1, y1):
+        size = self.cell_size
+        return [
+            (cx, cy)
+            for cy in range(math.floor(y0 / size), math.floor(y1 / size) + 1)
+            for cx in range(math.floor(x0 / size), math.floor(x1 / size) + 1)
+        ]
+
+    def add(self, stroke):
+        """Index *stroke* under every cell its bounds overlap."""
+        bounds = stroke_bounds(stroke)
+        if bounds is None or id(stroke) in self._stroke_cells:
+            return
+        cells = self._cell_range(*bounds)
+        for cell in cells:
+            self._cells[cell].append(stroke)
+        self._stroke_cells[id(stroke)] = cells
+
+    def remove(self, stroke):
+        """Drop *stroke* from the index (no-op if it is not indexed)."""
+        for cell in self._stroke_cells.pop(id(stroke), ()):
+            bucket = self._cells[cell]
+            bucket[:] = [s for s in bucket if s is not stroke]
+            if not bucket:
+                del self._cells[cell]
 
-            # Scale down to tiny (creates pixelation on scale-up)
-            small_w = max(1, rw // block)
-            small_h = max(1, rh // block)
-            small = sub.scale_simple(small_w, small_h, GdkPixbuf.InterpType.NEAREST)
+    def clear(self):
+        """Remove every stroke."""
+        self._cells.clear()
+        self._stroke_cells.clear()
 
-            # Scale back up with NEAREST to get sharp pixel blocks
-            pixelated = small.scale_simple(rw, rh, GdkPixbuf.InterpType.NEAREST)
+    def query(self, x, y, radius=0):
+        """Return the strokes whose bounds come within *radius* of a point.
 
-            pixelated.copy_area(0, 0, rw, rh, pixbuf, x0, y0)
+        Args:
+            x: X coordinate.
+            y: Y coordinate.
+            radius: Search radius in image pixels.
 
-        return pixbuf
+        Returns:
+            List of candidate strokes (each at most once).
+        """
+        found = {}
+        for cell in self._cell_range(x - radius, y - radius, x + radius, y + radius):
+            for stroke in self._cells.get(cell, ()):
+                found[id(stroke)] = stroke
+        return list(found.values())
 
 
 # ---------------------------------------------------------------------------
 # EditHistory: undo/redo manager
 # ---------------------------------------------------------------------------
 class EditHistory:
-    """Manages undo/redo stacks for editing strokes."""
+    """Manages undo/redo stacks for editing strokes.
+
+    Attributes:
+        version: Incremented on every change to :attr:`strokes`, so that
+                 caches built from the history can tell when to rebuild.
+    """
 
     def __init__(self):
         """Initialize empty history."""
         self.strokes = []  # List of stroke objects
         self.redo_stack = []  # Strokes removed by undo
+        self.version = 0
+        self._index = StrokeIndex()
 
     @property
     def has_edits(self):
@@ -255,6 +298,24 @@ class EditHistory:
         """
         self.strokes.append(stroke)
         self.redo_stack.clear()
+        self._index.add(stroke)
+        self.version += 1
+
+    def snapshot(self):
+        """Return a copy of the committed strokes for background work.
+
+        Committed strokes are never modified, so the copy shares them and
+        only the list is duplicated; later edits to this history do not
+        affect the snapshot.
+
+        Returns:
+            A new EditHistory with the same strokes and an empty redo stack.
+        """
+        copy = EditHistory()
+        for stroke in self.strokes:
+            copy.add_stroke(stroke)
+        copy.version = self.version
+        return copy
 
     def undo(self):
         """Remove the most recent stroke and push it to redo stack.
@@ -265,6 +326,8 @@ class EditHistory:
         if self.strokes:
             stroke = self.strokes.pop()
             self.redo_stack.append(stroke)
+            self._index.remove(stroke)
+            self.version += 1
             return stroke
         return None
 
@@ -277,19 +340,25 @@ class EditHistory:
         if self.redo_stack:
             stroke = self.redo_stack.pop()
             self.strokes.append(stroke)
+            self._index.add(stroke)
+            self.version += 1
             return stroke
         return None
 
     def clear(self):
         """Clear all strokes and redo history."""
+        if self.strokes:
+            self.version += 1
         self.strokes.clear()
         self.redo_stack.clear()
+        self._index.clear()
 
     def erase_at(self, x, y, radius=10):
         """Remove strokes that pass near the given point (eraser tool).
 
-        Checks paint strokes for point proximity, text strokes for
-        bounding box overlap, and blur/pixelate for path proximity.
+        Candidates come from the spatial index; paint and blur/pixelate
+        strokes are then checked for point proximity and text strokes for
+        anchor distance.
 
         Args:
             x: X coordinate to test.
@@ -299,23 +368,25 @@ class EditHistory:
         Returns:
             True if any strokes were removed, False otherwise.
         """
-        to_remove = []
-        for i, stroke in enumerate(self.strokes):
+        hits = set()
+        for stroke in self._index.query(x, y, radius):
             if stroke.type in (TOOL_PAINT, TOOL_BLUR, TOOL_PIXELATE):
-                for px, py in stroke.points:
-                    if math.hypot(px - x, py - y) < radius + stroke.brush_size / 2:
-                        to_remove.append(i)
-                        break
+                reach = radius + stroke.brush_size / 2
+                if any(math.hypot(px - x, py - y) < reach for px, py in stroke.points):
+                    hits.add(id(stroke))
             elif stroke.type == TOOL_TEXT:
                 if math.hypot(stroke.x - x, stroke.y - y) < radius + stroke.font_size:
-                    to_remove.append(i)
-
-        if to_remove:
-            for i in reversed(to_remove):
-                removed = self.strokes.pop(i)
-                self.redo_stack.append(removed)
-            return True
-        return False
+                    hits.add(id(stroke))
+
+        if not hits:
+            return False
+        to_remove = [i for i, stroke in enumerate(self.strokes) if id(stroke) in hits]
+        for i in reversed(to_remove):
+            removed = self.strokes.pop(i)
+            self.redo_stack.append(removed)
+            self._index.remove(removed)
+        self.version += 1
+        return True
 
     def get_paint_strokes(self):
         """Return only PaintStroke and TextStroke objects for cairo overlay.
@@ -334,16 +405,21 @@ class EditHistory:
         return [s for s in self.strokes if s.type in (TOOL_BLUR, TOOL_PIXELATE)]
 
 
-def compose_edits_onto_pixbuf(pixbuf, history):
+def compose_edits_onto_pixbuf(pixbuf, history, effects=None, scale=1.0):
     """Apply all editing strokes onto a pixbuf to produce the final image.
 
-    First applies blur/pixelate strokes directly to the pixbuf data, then
-    renders paint/text strokes via cairo onto a surface and composites
-    everything into the final output.
+    First applies blur/pixelate strokes with the tiled effect renderer
+    (the same one the canvas previews with), then renders paint/text
+    strokes via cairo onto a surface and composites everything into the
+    final output.
 
     Args:
         pixbuf: The original GdkPixbuf.Pixbuf.
         history: An EditHistory instance.
+        effects: Optional EffectLayer of the canvas for *pixbuf*, whose
+                 already rendered tiles are reused.
+        scale: Pixbuf pixels per image pixel; a reduced copy of the image
+               gets the edits scaled down to match.
 
     Returns:
         A new GdkPixbuf.Pixbuf with all edits applied.
@@ -354,12 +430,10 @@ def compose_edits_onto_pixbuf(pixbuf, history):
     width = pixbuf.get_width()
     height = pixbuf.get_height()
 
-    # Work on a copy to apply blur/pixelate
-    result = pixbuf.copy()
+    from .effects import apply_effect_strokes
 
-    # Apply pixbuf-level strokes
-    for stroke in history.get_pixbuf_strokes():
-        result = stroke.apply_to_pixbuf(result)
+    # Apply pixbuf-level strokes (returns a copy)
+    result = apply_effect_strokes(pixbuf, history.get_pixbuf_strokes(), effects, scale)
 
     # Now draw paint/text strokes using cairo
     paint_strokes = history.get_paint_strokes()
@@ -378,6 +452,7 @@ def compose_edits_onto_pixbuf(pixbuf, history):
         cr.paint()
 
         # Draw all paint/text strokes
+        cr.scale(scale, scale)
         for stroke in paint_strokes:
             cr.save()
             stroke.draw(cr)
@@ -48,6 +48,34 @@ TRANSLATIONS = {
         "language": "Language",
         "error": "Error",
         "success": "Success",
+        "thumbnails": "Thumbnails",
+        "saving": "Saving...",
+        "jpeg_quality": "JPEG quality",
+        "png_compression": "PNG compression",
+        "sort_by_date": "Sort by date taken",
+        "date_taken": "Date taken",
+        "camera": "Camera",
+        "dimensions": "Dimensions",
+        "file_size": "File size",
+        "unknown": "Unknown",
+        "similar_photos": "Similar Photos",
+        "no_similar_photos": "No similar photos found.",
+        "move_to_trash": "Move to Trash",
+        "slideshow": "Slideshow",
+        "preparing_wallpaper": "Preparing wallpaper...",
+        "batch_export": "Batch Export",
+        "max_edge": "Longest edge (px)",
+        "max_edge_hint": "0 keeps the original size",
+        "format": "Format",
+        "keep_format": "Keep original",
+        "strip_metadata": "Remove metadata (EXIF)",
+        "output_folder": "Output folder",
+        "export": "Export",
+        "exported": "Exported",
+        "export_failed": "Failed",
+        "mean_luma": "Mean brightness",
+        "clipped_shadows": "Clipped shadows",
+        "clipped_highlights": "Clipped highlights",
     },
     "Español": {
         "title": "Visor de Fotos madOS",
@@ -88,6 +116,34 @@ TRANSLATIONS = {
         "language": "Idioma",
         "error": "Error",
         "success": "Exito",
+        "thumbnails": "Miniaturas",
+        "saving": "Guardando...",
+        "jpeg_quality": "Calidad JPEG",
+        "png_compression": "Compresion PNG",
+        "sort_by_date": "Ordenar por fecha de captura",
+        "date_taken": "Fecha de captura",
+        "camera": "Camara",
+        "dimensions": "Dimensiones",
+        "file_size": "Tamano del archivo",
+        "unknown": "Desconocido",
+        "similar_photos": "Fotos similares",
+        "no_similar_photos": "No se encontraron fotos similares.",
+        "move_to_trash": "Mover a la papelera",
+        "slideshow": "Presentacion",
+        "preparing_wallpaper": "Preparando el fondo de pantalla...",
+        "batch_export": "Exportar en lote",
+        "max_edge": "Lado mayor (px)",
+        "max_edge_hint": "0 mantiene el tamano original",
+        "format": "Formato",
+        "keep_format": "Mantener original",
+        "strip_metadata": "Quitar metadatos (EXIF)",
+        "output_folder": "Carpeta de destino",
+        "export": "Exportar",
+        "exported": "Exportadas",
+        "export_failed": "Fallidas",
+        "mean_luma": "Brillo medio",
+        "clipped_shadows": "Sombras recortadas",
+        "clipped_highlights": "Luces recortadas",
     },
     "Français": {
         "title": "Visionneuse de Photos madOS",
@@ -128,6 +184,34 @@ TRANSLATIONS = {
         "language": "Langue",
         "error": "Erreur",
         "success": "Succes",
+        "thumbnails": "Miniatures",
+        "saving": "Enregistrement...",
+        "jpeg_quality": "Qualite JPEG",
+        "png_compression": "Compression PNG",
+        "sort_by_date": "Trier par date de prise de vue",
+        "date_taken": "Date de prise de vue",
+        "camera": "Appareil",
+        "dimensions": "Dimensions",
+        "file_size": "Taille du fichier",
+        "unknown": "Inconnu",
+        "similar_photos": "Photos similaires",
+        "no_similar_photos": "Aucune photo similaire trouvee.",
+        "move_to_trash": "Mettre a la corbeille",
+        "slideshow": "Diaporama",
+        "preparing_wallpaper": "Preparation du fond d'ecran...",
+        "batch_export": "Export par lot",
+        "max_edge": "Plus grand cote (px)",
+        "max_edge_hint": "0 conserve la taille d'origine",
+        "format": "Format",
+        "keep_format": "Conserver l'original",
+        "strip_metadata": "Supprimer les metadonnees (EXIF)",
+        "output_folder": "Dossier de sortie",
+        "export": "Exporter",
+        "exported": "Exportees",
+        "export_failed": "Echecs",
+        "mean_luma": "Luminosite moyenne",
+        "clipped_shadows": "Ombres ecretees",
+        "clipped_highlights": "Hautes lumieres ecretees",
     },
     "Deutsch": {
         "title": "madOS Fotobetrachter",
@@ -168,6 +252,34 @@ TRANSLATIONS = {
         "language": "Sprache",
         "error": "Fehler",
         "success": "Erfolg",
+        "thumbnails": "Miniaturansicht",
+        "saving": "Speichern...",
+        "jpeg_quality": "JPEG-Qualitat",
+        "png_compression": "PNG-Kompression",
+        "sort_by_date": "Nach Aufnahmedatum sortieren",
+        "date_taken": "Aufnahmedatum",
+        "camera": "Kamera",
+        "dimensions": "Abmessungen",
+        "file_size": "Dateigroesse",
+        "unknown": "Unbekannt",
+        "similar_photos": "Aehnliche Fotos",
+        "no_similar_photos": "Keine aehnlichen Fotos gefunden.",
+        "move_to_trash": "In den Papierkorb",
+        "slideshow": "Diashow",
+        "preparing_wallpaper": "Hintergrundbild wird vorbereitet...",
+        "batch_export": "Stapelexport",
+        "max_edge": "Langste Kante (px)",
+        "max_edge_hint": "0 behalt die Originalgrosse",
+        "format": "Format",
+        "keep_format": "Original beibehalten",
+        "strip_metadata": "Metadaten entfernen (EXIF)",
+        "output_folder": "Zielordner",
+        "export": "Exportieren",
+        "exported": "Exportiert",
+        "export_failed": "Fehlgeschlagen",
+        "mean_luma": "Mittlere Helligkeit",
+        "clipped_shadows": "Abgeschnittene Schatten",
+        "clipped_highlights": "Abgeschnittene Lichter",
     },
     "\u4e2d\u6587": {
         "title": "madOS \u7167\u7247\u67e5\u770b\u5668",
@@ -208,6 +320,34 @@ TRANSLATIONS = {
         "language": "\u8bed\u8a00",
         "error": "\u9519\u8bef",
         "success": "\u6210\u529f",
+        "thumbnails": "\u7f29\u7565\u56fe",
+        "saving": "\u6b63\u5728\u4fdd\u5b58...",
+        "jpeg_quality": "JPEG \u8d28\u91cf",
+        "png_compression": "PNG \u538b\u7f29",
+        "sort_by_date": "\u6309\u62cd\u6444\u65e5\u671f\u6392\u5e8f",
+        "date_taken": "\u62cd\u6444\u65e5\u671f",
+        "camera": "\u76f8\u673a",
+        "dimensions": "\u5c3a\u5bf8",
+        "file_size": "\u6587\u4ef6\u5927\u5c0f",
+        "unknown": "\u672a\u77e5",
+        "similar_photos": "\u76f8\u4f3c\u7167\u7247",
+        "no_similar_photos": "\u672a\u627e\u5230\u76f8\u4f3c\u7167\u7247\u3002",
+        "move_to_trash": "\u79fb\u81f3\u56de\u6536\u7ad9",
+        "slideshow": "\u5e7b\u706f\u7247\u653e\u6620",
+        "preparing_wallpaper": "\u6b63\u5728\u51c6\u5907\u58c1\u7eb8...",
+        "batch_export": "\u6279\u91cf\u5bfc\u51fa",
+        "max_edge": "\u6700\u957f\u8fb9 (\u50cf\u7d20)",
+        "max_edge_hint": "0 \u4fdd\u6301\u539f\u59cb\u5c3a\u5bf8",
+        "format": "\u683c\u5f0f",
+        "keep_format": "\u4fdd\u6301\u539f\u683c\u5f0f",
+        "strip_metadata": "\u79fb\u9664\u5143\u6570\u636e (EXIF)",
+        "output_folder": "\u8f93\u51fa\u6587\u4ef6\u5939",
+        "export": "\u5bfc\u51fa",
+        "exported": "\u5df2\u5bfc\u51fa",
+        "export_failed": "\u5931\u8d25",
+        "mean_luma": "\u5e73\u5747\u4eae\u5ea6",
+        "clipped_shadows": "\u6697\u90e8\u6ea2\u51fa",
+        "clipped_highlights": "\u9ad8\u5149\u6ea2\u51fa",
     },
     "\u65e5\u672c\u8a9e": {
         "title": "madOS \u30d5\u30a9\u30c8\u30d3\u30e5\u30fc\u30a2",
@@ -248,6 +388,34 @@ TRANSLATIONS = {
         "language": "\u8a00\u8a9e",
         "error": "\u30a8\u30e9\u30fc",
         "success": "\u6210\u529f",
+        "thumbnails": "\u30b5\u30e0\u30cd\u30a4\u30eb",
+        "saving": "\u4fdd\u5b58\u4e2d...",
+        "jpeg_quality": "JPEG \u54c1\u8cea",
+        "png_compression": "PNG \u5727\u7e2e",
+        "sort_by_date": "\u64ae\u5f71\u65e5\u3067\u4e26\u3079\u66ff\u3048",
+        "date_taken": "\u64ae\u5f71\u65e5\u6642",
+        "camera": "\u30ab\u30e1\u30e9",
+        "dimensions": "\u30b5\u30a4\u30ba",
+        "file_size": "\u30d5\u30a1\u30a4\u30eb\u30b5\u30a4\u30ba",
+        "unknown": "\u4e0d\u660e",
+        "similar_photos": "\u985e\u4f3c\u5199\u771f",
+        "no_similar_photos": "\u985e\u4f3c\u5199\u771f\u306f\u898b\u3064\u304b\u308a\u307e\u305b\u3093\u3067\u3057\u305f\u3002",
+        "move_to_trash": "\u30b4\u30df\u7bb1\u306b\u79fb\u52d5",
+        "slideshow": "\u30b9\u30e9\u30a4\u30c9\u30b7\u30e7\u30fc",
+        "preparing_wallpaper": "\u58c1\u7d19\u3092\u6e96\u5099\u4e2d...",
+        "batch_export": "\u4e00\u62ec\u30a8\u30af\u30b9\u30dd\u30fc\u30c8",
+        "max_edge": "\u9577\u8fba (px)",
+        "max_edge_hint": "0 \u3067\u5143\u306e\u30b5\u30a4\u30ba\u3092\u7dad\u6301",
+        "format": "\u5f62\u5f0f",
+        "keep_format": "\u5143\u306e\u5f62\u5f0f\u3092\u7dad\u6301",
+        "strip_metadata": "\u30e1\u30bf\u30c7\u30fc\u30bf\u3092\u524a\u9664 (EXIF)",
+        "output_folder": "\u51fa\u529b\u30d5\u30a9\u30eb\u30c0\u30fc",
+        "export": "\u30a8\u30af\u30b9\u30dd\u30fc\u30c8",
+        "exported": "\u30a8\u30af\u30b9\u30dd\u30fc\u30c8\u6e08\u307f",
+        "export_failed": "\u5931\u6557",
+        "mean_luma": "\u5e73\u5747\u8f1d\u5ea6",
+        "clipped_shadows": "\u9ed2\u3064\u3076\u308c",
+        "clipped_highlights": "\u767d\u98db\u3073",
     },
 }
 
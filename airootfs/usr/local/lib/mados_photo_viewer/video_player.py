@@ -8,6 +8,15 @@ DrawingArea using the waylandsink or gtksink depending on availability.
 
 Uses playbin for automatic codec selection and the GstVideo overlay
 interface for embedding.
+
+Most sessions only view photos, so GStreamer costs nothing until the
+first video is opened: ``Gst.init`` (which loads the plugin registry) and
+the playbin are created on the first :meth:`VideoPlayer.load_video`, and
+:meth:`VideoPlayer.stop` returns the pipeline to NULL, releasing decoders
+and sinks, when the viewer goes back to images.  Playback state comes
+from bus messages, and the seek bar is advanced from a frame-clock tick
+callback that only exists while playing; GTK does not run it while the
+player is hidden, so nothing wakes up periodically otherwise.
 """
 
 import gi
@@ -22,13 +31,15 @@ try:
     gi.require_version("GstVideo", "1.0")
     from gi.repository import Gst, GstVideo
 
-    Gst.init(None)
     GST_AVAILABLE = True
 except (ValueError, ImportError):
     pass
 
 from gi.repository import Gtk, Gdk, GLib
 
+# Minimum time between seek bar updates (microseconds of frame time)
+POSITION_UPDATE_US = 250_000
+
 
 def format_time(nanoseconds):
     """Convert GStreamer nanoseconds to a human-readable time string.
@@ -71,7 +82,8 @@ class VideoPlayer(Gtk.Box):
         self._playing = False
         self._duration = -1
         self._seeking = False
-        self._update_id = None
+        self._tick_id = None
+        self._last_update_us = 0
         self._compact_mode = False
 
         # Video display area
@@ -103,14 +115,11 @@ class VideoPlayer(Gtk.Box):
         # Connect to size-allocate to detect compact mode
         self.connect("size-allocate", self._on_size_allocate)
 
-        # GStreamer pipeline
+        # GStreamer pipeline, created by the first load_video()
         self._pipeline = None
         self._bus = None
         self._xid = None
 
-        if GST_AVAILABLE:
-            self._setup_pipeline()
-
     def _build_controls(self):
         """Build the control bar based on current mode."""
         if self._controls_bar is not None:
@@ -285,6 +294,18 @@ class VideoPlayer(Gtk.Box):
         if self._compact_mode != was_compact:
             self._build_controls()
 
+    def _ensure_pipeline(self):
+        """Initialize GStreamer and build the pipeline on first use.
+
+        Returns:
+            True if a pipeline is available.
+        """
+        if self._pipeline is None:
+            if not Gst.is_initialized():
+                Gst.init(None)
+            self._setup_pipeline()
+        return self._pipeline is not None
+
     def _setup_pipeline(self):
         """Create the GStreamer playbin pipeline."""
         self._pipeline = Gst.ElementFactory.make("playbin", "player")
@@ -312,14 +333,17 @@ class VideoPlayer(Gtk.Box):
                 # Re-pack at the beginning
                 self.pack_start(self._video_area, True, True, 0)
                 self.reorder_child(self._video_area, 0)
+                # Built after the window's show_all(), so show it here
+                self._video_area.show()
         else:
             # Fall back to autovideosink
             autosink = Gst.ElementFactory.make("autovideosink", "videosink")
             if autosink:
                 self._pipeline.set_property("video-sink", autosink)
 
-        # Set initial volume
-        self._pipeline.set_property("volume", 0.8)
+        # Set initial volume (the slider may have moved before the first video)
+        volume = self._volume_scale.get_value() / 100.0 if self._volume_scale else 0.8
+        self._pipeline.set_property("volume", volume)
 
         # Bus for messages
         self._bus = self._pipeline.get_bus()
@@ -327,6 +351,7 @@ class VideoPlayer(Gtk.Box):
         self._bus.connect("message::eos", self._on_eos)
         self._bus.connect("message::error", self._on_error)
         self._bus.connect("message::state-changed", self._on_state_changed)
+        self._bus.connect("message::duration-changed", self._on_duration_changed)
 
     def _on_video_realize(self, widget):
         """Handle the video area being realized (for X11 embedding)."""
@@ -355,7 +380,7 @@ class VideoPlayer(Gtk.Box):
         Returns:
             True if loading started, False if GStreamer is unavailable.
         """
-        if not GST_AVAILABLE or self._pipeline is None:
+        if not GST_AVAILABLE or not self._ensure_pipeline():
             return False
 
         self.stop()
@@ -376,7 +401,7 @@ class VideoPlayer(Gtk.Box):
         self._playing = True
         self._play_btn.set_label("\u275a\u275a")  # pause symbol
         self._play_btn.set_tooltip_text("Pause")
-        self._start_update_timer()
+        self._start_position_updates()
 
     def pause(self):
         """Pause playback."""
@@ -386,10 +411,14 @@ class VideoPlayer(Gtk.Box):
         self._playing = False
         self._play_btn.set_label("\u25b6")
         self._play_btn.set_tooltip_text("Play")
-        self._stop_update_timer()
+        self._stop_position_updates()
 
     def stop(self):
-        """Stop playback and reset to the beginning."""
+        """Stop playback, reset to the beginning and release the pipeline.
+
+        The pipeline goes to NULL, which frees decoders and the video sink;
+        the playbin itself is kept for the next video.
+        """
         if not GST_AVAILABLE or self._pipeline is None:
             return
         self._pipeline.set_state(Gst.State.NULL)
@@ -398,11 +427,11 @@ class VideoPlayer(Gtk.Box):
         self._play_btn.set_tooltip_text("Play")
         self._seek_scale.set_value(0)
         self._time_label.set_text("00:00")
-        self._stop_update_timer()
+        self._stop_position_updates()
 
     def cleanup(self):
         """Release GStreamer resources. Call before destroying the widget."""
-        self._stop_update_timer()
+        self._stop_position_updates()
         if self._pipeline:
             self._pipeline.set_state(Gst.State.NULL)
 
@@ -479,51 +508,57 @@ class VideoPlayer(Gtk.Box):
             return
         _, new, _ = message.parse_state_changed()
         if new == Gst.State.PLAYING and self._duration < 0:
-            # Query duration
-            success, duration = self._pipeline.query_duration(Gst.Format.TIME)
-            if success:
-                self._duration = duration
-                self._duration_label.set_text(format_time(duration))
+            self._query_duration()
+
+    def _on_duration_changed(self, bus, message):
+        """Re-query the duration when the stream reports it changed."""
+        self._duration = -1
+        self._query_duration()
+
+    def _query_duration(self):
+        """Read the stream duration into the duration label."""
+        success, duration = self._pipeline.query_duration(Gst.Format.TIME)
+        if success:
+            self._duration = duration
+            self._duration_label.set_text(format_time(duration))
 
     # ------------------------------------------------------------------
-    # Timer for updating seek position
+    # Frame-clock driven seek position
     # ------------------------------------------------------------------
 
-    def _start_update_timer(self):
-        """Start a periodic timer to update the seek slider and time label."""
-        if self._update_id is None:
-            self._update_id = GLib.timeout_add(250, self._update_position)
+    def _start_position_updates(self):
+        """Advance the seek slider from the frame clock while playing."""
+        if self._tick_id is None:
+            self._last_update_us = 0
+            self._tick_id = self.add_tick_callback(self._on_tick)
 
-    def _stop_update_timer(self):
-        """Stop the periodic update timer."""
-        if self._update_id is not None:
-            GLib.source_remove(self._update_id)
-            self._update_id = None
+    def _stop_position_updates(self):
+        """Remove the tick callback."""
+        if self._tick_id is not None:
+            self.remove_tick_callback(self._tick_id)
+            self._tick_id = None
 
-    def _update_position(self):
-        """Periodic callback to update seek slider position.
+    def _on_tick(self, widget, frame_clock):
+        """Frame-clock callback: refresh the position a few times a second.
 
         Returns:
-            True to continue the timer, False to stop.
+            True to keep the callback, False to remove it.
         """
         if not self._playing or self._pipeline is None:
+            self._tick_id = None
             return False
-
-        if self._seeking:
+        now = frame_clock.get_frame_time()
+        if self._seeking or now - self._last_update_us < POSITION_UPDATE_US:
             return True
+        self._last_update_us = now
+        self._update_position()
+        return True
 
+    def _update_position(self):
+        """Show the current playback position on the seek slider."""
         success, position = self._pipeline.query_position(Gst.Format.TIME)
         if success:
             self._time_label.set_text(format_time(position))
             if self._duration > 0:
                 percent = (position / self._duration) * 100.0
                 self._seek_scale.set_value(percent)
-
-        # Re-query duration if we didn't get it yet
-        if self._duration < 0:
-            success, duration = self._pipeline.query_duration(Gst.Format.TIME)
-            if success:
-                self._duration = duration
-                self._duration_label.set_text(format_time(duration))
-
-        return True
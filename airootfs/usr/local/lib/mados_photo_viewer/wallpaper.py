@@ -0,0 +1,362 @@
+"""
+madOS Photo Viewer - Wallpaper Preparation
+============================================
+
+Renders wallpapers at the resolution of each output, so swaybg and the
+workspace wallpaper daemons load a screen-sized file instead of decoding
+the original photo.  A 50 MP photo would otherwise cost the helper
+hundreds of MB per output on every workspace switch.
+
+    - Output sizes come from ``swaymsg -t get_outputs`` or
+      ``hyprctl monitors -j``, in physical pixels, with width and height
+      swapped for rotated outputs.
+    - Each copy is cover-cropped, like the ``fill`` mode: scaled to cover
+      the output and centred.  The source is decoded through
+      :func:`.imagecache.decode_image` at the smallest size that still
+      covers the output, so the JPEG decoder can downscale while reading.
+    - Copies are written to ``~/.cache/mados/wallpapers/``.  Each is named
+      after the SHA-256 of the source file and the output size, so a
+      photo is rendered once per resolution, whatever its path.
+    - An edited image is composed and written as PNG on the same worker
+      first, decoding the full-resolution source there when the window
+      only shows a reduced decode.
+"""
+
+import hashlib
+import json
+import math
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import gi
+
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import GdkPixbuf, GLib
+
+from .imagecache import decode_image
+from .saver import decode_full, encoder_options, write_atomic
+from .tools import compose_edits_onto_pixbuf
+
+_CACHE_HOME = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+
+# Where pre-scaled wallpapers are kept
+WALLPAPER_CACHE_DIR = os.path.join(_CACHE_HOME, "mados", "wallpapers")
+
+# Where an edited image is written before it is used as wallpaper
+EDITED_WALLPAPER_PATH = os.path.join(_CACHE_HOME, "mados-wallpaper.png")
+
+# JPEG quality of the pre-scaled copies
+WALLPAPER_JPEG_QUALITY = 92
+
+# Read size when hashing the source file
+HASH_CHUNK = 1024 * 1024
+
+# Output transforms that swap width and height
+_SWAY_ROTATED = frozenset({"90", "270", "flipped-90", "flipped-270"})
+_HYPRLAND_ROTATED = frozenset({1, 3, 5, 7})
+
+
+class OutputInfo:
+    """A display output and its size in physical pixels.
+
+    Attributes:
+        name: Output name (e.g. ``"eDP-1"``).
+        width: Width in pixels, after rotation.
+        height: Height in pixels, after rotation.
+        focused: True for the output with keyboard focus.
+    """
+
+    __slots__ = ("name", "width", "height", "focused")
+
+    def __init__(self, name, width, height, focused=False):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.focused = focused
+
+    @property
+    def size(self):
+        """``(width, height)`` tuple."""
+        return (self.width, self.height)
+
+
+def parse_sway_outputs(text):
+    """Parse ``swaymsg -t get_outputs`` JSON into active outputs.
+
+    Args:
+        text: The command output.
+
+    Returns:
+        List of :class:`OutputInfo`.
+    """
+    outputs = []
+    for output in json.loads(text):
+        mode = output.get("current_mode") or {}
+        width, height = mode.get("width"), mode.get("height")
+        if not output.get("active", True) or not width or not height:
+            continue
+        if output.get("transform") in _SWAY_ROTATED:
+            width, height = height, width
+        outputs.append(OutputInfo(output["name"], width, height, bool(output.get("focused"))))
+    return outputs
+
+
+def parse_hyprland_monitors(text):
+    """Parse ``hyprctl monitors -j`` JSON into outputs.
+
+    Args:
+        text: The command output.
+
+    Returns:
+        List of :class:`OutputInfo`.
+    """
+    outputs = []
+    for monitor in json.loads(text):
+        width, height = monitor.get("width"), monitor.get("height")
+        if monitor.get("disabled") or not width or not height:
+            continue
+        if monitor.get("transform") in _HYPRLAND_ROTATED:
+            width, height = height, width
+        outputs.append(OutputInfo(monitor["name"], width, height, bool(monitor.get("focused"))))
+    return outputs
+
+
+def query_outputs(compositor):
+    """Ask the compositor for its outputs.
+
+    Args:
+        compositor: ``"sway"`` or ``"hyprland"``.
+
+    Returns:
+        List of :class:`OutputInfo`, empty if the compositor cannot be
+        queried.
+    """
+    if compositor == "hyprland":
+        command, parse = ["hyprctl", "monitors", "-j"], parse_hyprland_monitors
+    else:
+        command, parse = ["swaymsg", "-t", "get_outputs"], parse_sway_outputs
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=3)
+        if result.returncode == 0:
+            return parse(result.stdout)
+    except (OSError, subprocess.TimeoutExpired, ValueError, KeyError, TypeError):
+        pass
+    return []
+
+
+def sway_quote(value):
+    """Return *value* as a double-quoted argument of a sway command.
+
+    Backslashes and double quotes are escaped, so a file name cannot end
+    the argument early and append commands (``"; exec ...``).
+
+    Args:
+        value: Output name or file path.
+
+    Returns:
+        The quoted argument.
+
+    Raises:
+        ValueError: If *value* contains a line break.
+    """
+    if "\n" in value or "\r" in value:
+        raise ValueError(f"line break in sway argument: {value!r}")
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def file_digest(filepath):
+    """Return the hex SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cover_geometry(src_w, src_h, dst_w, dst_h):
+    """Return how to scale and crop an image to cover an output.
+
+    Args:
+        src_w, src_h: Source image size.
+        dst_w, dst_h: Output size.
+
+    Returns:
+        ``(scale, offset_x, offset_y)``: the source is scaled by *scale*
+        and the output shows the scaled image from the offset on.
+    """
+    scale = max(dst_w / src_w, dst_h / src_h)
+    return scale, (src_w * scale - dst_w) / 2, (src_h * scale - dst_h) / 2
+
+
+def cached_path(digest, width, height, cache_dir=WALLPAPER_CACHE_DIR):
+    """Return the cache path of the copy of *digest* for one output size."""
+    return os.path.join(cache_dir, f"{digest}-{width}x{height}.jpg")
+
+
+def render_cover(filepath, width, height):
+    """Decode *filepath* cover-cropped to ``width`` x ``height``.
+
+    Args:
+        filepath: Source image.
+        width: Output width.
+        height: Output height.
+
+    Returns:
+        An opaque GdkPixbuf of exactly the output size.
+
+    Raises:
+        GLib.Error: If the image cannot be decoded.
+    """
+    info, src_w, src_h = GdkPixbuf.Pixbuf.get_file_info(filepath)
+    box = None
+    if info is not None and src_w > 0 and src_h > 0:
+        # Large enough to cover the output whichever way EXIF rotates it
+        side = math.ceil(max(src_w, src_h) * max(width, height) / min(src_w, src_h))
+        box = (side, side)
+    source = decode_image(filepath, box).pixbuf
+    scale, offset_x, offset_y = cover_geometry(
+        source.get_width(), source.get_height(), width, height
+    )
+    cover = GdkPixbuf.Pixbuf.new(GdkPixbuf.Colorspace.RGB, False, 8, width, height)
+    cover.fill(0x000000FF)
+    source.composite(
+        cover,
+        0,
+        0,
+        width,
+        height,
+        -offset_x,
+        -offset_y,
+        scale,
+        scale,
+        GdkPixbuf.InterpType.HYPER if scale < 0.5 else GdkPixbuf.InterpType.BILINEAR,
+        255,
+    )
+    return cover
+
+
+def prepare_wallpapers(filepath, sizes, cache_dir=WALLPAPER_CACHE_DIR, render=render_cover):
+    """Return pre-scaled copies of *filepath*, rendering missing ones.
+
+    Args:
+        filepath: Source image.
+        sizes: Iterable of ``(width, height)`` output sizes.
+        cache_dir: Directory holding the copies.
+        render: Callable ``render(filepath, width, height) -> GdkPixbuf``.
+
+    Returns:
+        Dict mapping each size to the path of its copy.
+
+    Raises:
+        OSError: If the source cannot be read or a copy written.
+        GLib.Error: If the source cannot be decoded.
+    """
+    digest = file_digest(filepath)
+    copies = {}
+    for width, height in set(sizes):
+        path = cached_path(digest, width, height, cache_dir)
+        if not os.path.isfile(path):
+            os.makedirs(cache_dir, exist_ok=True)
+            cover = render(filepath, width, height)
+            keys, values = encoder_options("jpeg", WALLPAPER_JPEG_QUALITY)
+            _ok, data = cover.save_to_bufferv("jpeg", keys, values)
+            write_atomic(path, data)
+        copies[(width, height)] = path
+    return copies
+
+
+def write_edited(
+    filepath,
+    pixbuf,
+    history,
+    effects=None,
+    dest=EDITED_WALLPAPER_PATH,
+    compose=compose_edits_onto_pixbuf,
+    decode=decode_full,
+):
+    """Compose edits onto an image and write the result as PNG.
+
+    Args:
+        filepath: Source image, decoded at full resolution if *pixbuf*
+                  is None.
+        pixbuf: Full-resolution source pixbuf (read only), or None.
+        history: Snapshot of the edit history.
+        effects: Optional effect layer snapshot for *pixbuf*.
+        dest: Path of the PNG written.
+        compose: Callable ``compose(pixbuf, history, effects) -> pixbuf``.
+        decode: Callable ``decode(filepath) -> pixbuf``.
+
+    Returns:
+        *dest*.
+
+    Raises:
+        OSError: If the PNG cannot be written.
+        GLib.Error: If the source cannot be decoded or the PNG encoded.
+    """
+    if pixbuf is None:
+        pixbuf = decode(filepath)
+    result = compose(pixbuf, history, effects)
+    keys, values = encoder_options("png")
+    _ok, data = result.save_to_bufferv("png", keys, values)
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    write_atomic(dest, data)
+    return dest
+
+
+class WallpaperPreparer:
+    """Renders wallpaper copies on a worker thread.
+
+    Args:
+        cache_dir: Directory holding the copies.
+        edited_path: Where edited images are written.
+    """
+
+    def __init__(self, cache_dir=WALLPAPER_CACHE_DIR, edited_path=EDITED_WALLPAPER_PATH):
+        self._cache_dir = cache_dir
+        self._edited_path = edited_path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wallpaper")
+
+    def prepare(self, filepath, outputs, callback, edits=None):
+        """Render copies of *filepath* for *outputs* in the background.
+
+        Args:
+            filepath: Source image.
+            outputs: List of :class:`OutputInfo`.
+            callback: Called on the main loop as ``callback(source, copies)``.
+                      *source* is the image shown: *filepath*, the edited
+                      image, or None if the edits could not be applied.
+                      *copies* maps output names to copy paths; it is
+                      empty if rendering failed.
+            edits: Optional ``(pixbuf, history, effects)`` snapshot passed
+                   to :func:`write_edited` before the copies are rendered.
+        """
+
+        def work():
+            source = filepath
+            if edits is not None:
+                try:
+                    source = write_edited(filepath, *edits, dest=self._edited_path)
+                except Exception as e:
+                    print(f"Cannot apply edits to wallpaper {filepath}: {e}")
+                    return None, {}
+            try:
+                by_size = prepare_wallpapers(source, [o.size for o in outputs], self._cache_dir)
+            except Exception as e:
+                print(f"Cannot prepare wallpaper {source}: {e}")
+                return source, {}
+            return source, {o.name: by_size[o.size] for o in outputs}
+
+        future = self._executor.submit(work)
+        future.add_done_callback(lambda f: GLib.idle_add(self._deliver, f, callback))
+
+    @staticmethod
+    def _deliver(future, callback):
+        """Main-loop handler: pass the finished copies on."""
+        if not future.cancelled():
+            callback(*future.result())
+        return False
+
+    def shutdown(self):
+        """Stop the worker, dropping queued renders."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -714,6 +714,137 @@ class TestDefaultSinkRouting(unittest.TestCase):
         mock_restore.assert_called_once()
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# Per-device profile switching
+# ═══════════════════════════════════════════════════════════════════════════
+class TestOutputDeviceSwitching(unittest.TestCase):
+    """Test live gain updates and default-sink change handling."""
+
+    @patch("mados_equalizer.backend.shutil.which")
+    @patch("mados_equalizer.backend.AudioBackend._detect_output_device")
+    def setUp(self, mock_detect, mock_which):
+        mock_which.return_value = None
+        self.backend = AudioBackend()
+        self.backend.has_pipewire = True
+        self.backend.has_wpctl = True
+
+    @patch("mados_equalizer.backend.AudioBackend._find_eq_sink_node_id")
+    @patch("mados_equalizer.backend.AudioBackend._run_command")
+    def test_set_live_gains_uses_set_param(self, mock_run, mock_find):
+        """_set_live_gains should update band gains via pw-cli set-param."""
+        mock_find.return_value = 42
+        mock_run.return_value = (0, "", "")
+        self.backend.gains = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0]
+
+        self.assertTrue(self.backend._set_live_gains())
+
+        args = mock_run.call_args[0][0]
+        self.assertEqual(args[:4], ["pw-cli", "set-param", "42", "Props"])
+        self.assertIn('"eq_band_1:Gain" 1.0', args[4])
+        self.assertIn('"eq_band_8:Gain" 8.0', args[4])
+
+    @patch("mados_equalizer.backend.AudioBackend._find_eq_sink_node_id")
+    def test_set_live_gains_fails_without_node(self, mock_find):
+        mock_find.return_value = None
+        self.assertFalse(self.backend._set_live_gains())
+
+    @patch("mados_equalizer.backend.AudioBackend._write_config")
+    @patch("mados_equalizer.backend.AudioBackend._set_live_gains")
+    @patch("mados_equalizer.backend.AudioBackend._eq_process_running")
+    def test_apply_eq_updates_running_node_in_place(self, mock_running, mock_live, mock_write):
+        """apply_eq should not rewrite config when the node accepts live params."""
+        self.backend.enabled = True
+        mock_running.return_value = True
+        mock_live.return_value = True
+
+        success, message = self.backend.apply_eq(gains=[1.0] * 8)
+
+        self.assertTrue(success)
+        self.assertEqual(message, "eq_applied")
+        mock_write.assert_not_called()
+
+    @patch("mados_equalizer.backend.AudioBackend._set_default_sink_to_eq")
+    @patch("mados_equalizer.backend.AudioBackend._save_original_default_sink")
+    @patch("mados_equalizer.backend.AudioBackend._start_eq_process")
+    @patch("mados_equalizer.backend.AudioBackend._set_live_gains")
+    @patch("mados_equalizer.backend.AudioBackend._retarget_playback")
+    @patch("mados_equalizer.backend.AudioBackend._eq_process_running")
+    def test_switch_output_device_without_restart(
+        self, mock_running, mock_retarget, mock_live, mock_start, mock_save, mock_set_default
+    ):
+        """switch_output_device should retarget and update gains live."""
+        self.backend.enabled = True
+        mock_running.return_value = True
+        mock_retarget.return_value = True
+        mock_live.return_value = True
+
+        success, _ = self.backend.switch_output_device("headphones", [2.0] * 8)
+
+        self.assertTrue(success)
+        self.assertEqual(self.backend.active_sink, "headphones")
+        self.assertEqual(self.backend.gains, [2.0] * 8)
+        mock_retarget.assert_called_once_with("headphones")
+        mock_start.assert_not_called()
+
+    def test_switch_output_device_when_disabled_only_stores_gains(self):
+        self.backend.enabled = False
+        success, message = self.backend.switch_output_device("usb", [3.0] * 8)
+        self.assertTrue(success)
+        self.assertEqual(message, "eq_disabled")
+        self.assertEqual(self.backend.gains, [3.0] * 8)
+
+    def test_default_change_event_detection(self):
+        """Only server change events may signal a new default sink."""
+        self.assertTrue(self.backend._is_default_change_event("Event 'change' on server #17\n"))
+        self.assertFalse(self.backend._is_default_change_event("Event 'change' on sink #52\n"))
+        self.assertFalse(self.backend._is_default_change_event("Event 'new' on client #80\n"))
+
+    def test_start_sink_monitor_noop_without_pactl(self):
+        self.backend.has_pulseaudio = False
+        self.assertFalse(self.backend.start_sink_monitor(lambda sink, name: None))
+
+    @staticmethod
+    def _inspect(nodes):
+        """Fake _run_command answering ``wpctl inspect`` from *nodes*."""
+
+        def run(args, timeout=5):
+            if args[:2] == ["wpctl", "inspect"] and args[2] in nodes:
+                name, desc = nodes[args[2]]
+                return 0, f'id 1\n  node.name = "{name}"\n  node.description = "{desc}"\n', ""
+            return 1, "", ""
+
+        return run
+
+    def test_detect_reports_hardware_behind_eq(self):
+        """With the EQ as default sink, the saved original sink is reported."""
+        nodes = {
+            "@DEFAULT_AUDIO_SINK@": ("mados-eq-capture", "madOS Equalizer"),
+            "48": ("alsa_output.usb-headset", "USB Headset"),
+        }
+        self.backend._original_default_sink_id = 48
+        with patch.object(self.backend, "_run_command", self._inspect(nodes)):
+            detected = self.backend.detect_output_device()
+        self.assertEqual(detected, ("alsa_output.usb-headset", "USB Headset"))
+
+    def test_detect_falls_back_to_retarget_sink(self):
+        """Without a saved original, the sink the EQ plays to is kept."""
+        nodes = {"@DEFAULT_AUDIO_SINK@": ("mados-eq-capture", "madOS Equalizer")}
+        self.backend.set_output_device("alsa_output.hdmi", "HDMI")
+        with patch.object(self.backend, "_run_command", self._inspect(nodes)):
+            detected = self.backend.detect_output_device()
+        self.assertEqual(detected, ("alsa_output.hdmi", "HDMI"))
+
+    def test_detect_does_not_change_state(self):
+        """detect_output_device runs on worker threads and only returns."""
+        nodes = {"@DEFAULT_AUDIO_SINK@": ("alsa_output.speakers", "Speakers")}
+        self.backend.set_output_device("alsa_output.hdmi", "HDMI")
+        with patch.object(self.backend, "_run_command", self._inspect(nodes)):
+            detected = self.backend.detect_output_device()
+        self.assertEqual(detected, ("alsa_output.speakers", "Speakers"))
+        self.assertEqual(self.backend.active_sink, "alsa_output.hdmi")
+        self.assertEqual(self.backend.active_sink_name, "HDMI")
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # Constants validation
 # ═══════════════════════════════════════════════════════════════════════════
@@ -337,6 +337,143 @@ class TestFullStateRoundTrip(unittest.TestCase):
         self.assertEqual(state["language"], "es")
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# Per-device profiles
+# ═══════════════════════════════════════════════════════════════════════════
+class TestDeviceProfiles(unittest.TestCase):
+    """Test per-output-device EQ profile storage."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "test.db")
+        self.db = EqualizerStateDB(self.db_path)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_device_profiles_table_exists(self):
+        cur = self.db._conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='device_profiles'"
+        )
+        self.assertIsNotNone(cur.fetchone())
+
+    def test_no_profiles_by_default(self):
+        self.assertEqual(self.db.load_device_profiles(), {})
+
+    def test_save_and_load_profiles(self):
+        self.db.save_device_profile("speakers", [1.0] * 8, "rock")
+        self.db.save_device_profile("headphones", [-2.0] * 8)
+        profiles = self.db.load_device_profiles()
+        self.assertEqual(profiles["speakers"], {"gains": [1.0] * 8, "preset": "rock"})
+        self.assertEqual(profiles["headphones"], {"gains": [-2.0] * 8, "preset": None})
+
+    def test_save_profile_overwrites(self):
+        self.db.save_device_profile("speakers", [1.0] * 8, "rock")
+        self.db.save_device_profile("speakers", [4.0] * 8, "bass_boost")
+        profile = self.db.load_device_profiles()["speakers"]
+        self.assertEqual(profile["gains"], [4.0] * 8)
+        self.assertEqual(profile["preset"], "bass_boost")
+
+    def test_invalid_profile_is_noop(self):
+        self.db.save_device_profile("", [1.0] * 8)
+        self.db.save_device_profile("speakers", [1.0, 2.0])
+        self.assertEqual(self.db.load_device_profiles(), {})
+
+    def test_delete_profile(self):
+        self.db.save_device_profile("speakers", [1.0] * 8)
+        self.db.delete_device_profile("speakers")
+        self.assertEqual(self.db.load_device_profiles(), {})
+
+    def test_profiles_persist_across_connections(self):
+        self.db.save_device_profile("usb-dac", [0.5] * 8, "jazz")
+        self.db.close()
+
+        db2 = EqualizerStateDB(self.db_path)
+        profiles = db2.load_device_profiles()
+        db2.close()
+        self.assertEqual(profiles["usb-dac"]["gains"], [0.5] * 8)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Write coalescing
+# ═══════════════════════════════════════════════════════════════════════════
+class TestWriteCoalescing(unittest.TestCase):
+    """Saves are buffered in memory and written by flush() in one transaction."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "test.db")
+        self.db = EqualizerStateDB(self.db_path)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _rows(self, table):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_synchronous_normal(self):
+        mode = self.db._conn.execute("PRAGMA synchronous").fetchone()[0]
+        self.assertEqual(mode, 1)  # NORMAL
+
+    def test_saves_are_pending_until_flush(self):
+        self.db.save_gains([1.0] * 8)
+        self.db.save_enabled(True)
+        self.db.save_device_profile("speakers", [2.0] * 8)
+        self.assertTrue(self.db.has_pending_changes)
+        self.assertEqual(self._rows("band_gains"), 0)
+        self.assertEqual(self._rows("session"), 0)
+
+        self.assertTrue(self.db.flush())
+
+        self.assertFalse(self.db.has_pending_changes)
+        self.assertEqual(self._rows("band_gains"), 8)
+        self.assertEqual(self._rows("session"), 1)
+        self.assertEqual(self._rows("device_profiles"), 1)
+
+    def test_flush_without_changes_is_noop(self):
+        self.assertFalse(self.db.flush())
+
+    def test_unchanged_values_are_not_marked_dirty(self):
+        self.db.save_gains([1.0] * 8)
+        self.db.save_preset("rock")
+        self.db.flush()
+        self.db.save_gains([1.0] * 8)
+        self.db.save_preset("rock")
+        self.assertFalse(self.db.has_pending_changes)
+
+    def test_many_saves_commit_once(self):
+        commits = []
+        self.db._conn.set_trace_callback(
+            lambda sql: commits.append(sql) if sql.strip().upper() == "COMMIT" else None
+        )
+        for i in range(100):
+            self.db.save_gains([float(i % 12)] * 8)
+            self.db.save_preset(f"p{i}")
+        self.db.flush()
+        self.assertEqual(len(commits), 1)
+
+    def test_close_flushes_pending_changes(self):
+        self.db.save_language("es")
+        self.db.close()
+
+        db2 = EqualizerStateDB(self.db_path)
+        self.assertEqual(db2.load_language(), "es")
+        db2.close()
+
+    def test_deleted_profile_is_removed_on_flush(self):
+        self.db.save_device_profile("speakers", [1.0] * 8)
+        self.db.flush()
+        self.db.delete_device_profile("speakers")
+        self.db.flush()
+        self.assertEqual(self._rows("device_profiles"), 0)
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # Edge cases
 # ═══════════════════════════════════════════════════════════════════════════
@@ -415,6 +552,7 @@ class TestDatabaseModuleStructure(unittest.TestCase):
             "load_language",
             "save_state",
             "load_state",
+            "flush",
             "close",
         ]
         for method_name in required:
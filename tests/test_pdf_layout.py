@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS PDF Viewer page layout.
+
+Validates page rectangles and canvas size, and that the binary-search
+lookups (visible pages, page under a point, current page) agree with a
+scan of every page.
+"""
+
+import sys
+import os
+import unittest
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_pdf_viewer.layout import PageLayout
+
+GAP = 12
+A4 = (595.0, 842.0)
+A4_LANDSCAPE = (842.0, 595.0)
+
+
+class TestPageLayout(unittest.TestCase):
+    """Verify geometry and lookups against a linear scan."""
+
+    def setUp(self):
+        self.sizes = [A4, A4_LANDSCAPE, A4, (300.0, 400.0)] * 50
+        self.layout = PageLayout(self.sizes, 1.5, GAP)
+
+    def scan(self, predicate):
+        return [i for i in range(len(self.layout)) if predicate(*self.layout.rect(i))]
+
+    def test_rects_stacked_and_centred(self):
+        layout = PageLayout([A4, A4_LANDSCAPE], 1.0, GAP)
+        self.assertEqual(layout.rect(0), (123, 6, 595, 842))
+        self.assertEqual(layout.rect(1), (0, 6 + 842 + GAP, 842, 595))
+        self.assertEqual((layout.width, layout.height), (842, 842 + 595 + 2 * GAP))
+
+    def test_empty_document(self):
+        layout = PageLayout([], 1.0, GAP)
+        self.assertEqual((len(layout), layout.width, layout.height), (0, 0, 0))
+        self.assertEqual(list(layout.visible(0, 1000)), [])
+        self.assertIsNone(layout.page_at(10, 10))
+        self.assertIsNone(layout.nearest_page(10))
+
+    def test_visible_matches_scan(self):
+        for top in range(-100, self.layout.height + 100, 397):
+            bottom = top + 700
+            expected = self.scan(
+                lambda x, y, w, h, top=top, bottom=bottom: y + h >= top and y <= bottom
+            )
+            self.assertEqual(list(self.layout.visible(top, bottom)), expected, top)
+
+    def test_band_in_gap_shows_nothing(self):
+        _, y, _, h = self.layout.rect(3)
+        self.assertEqual(list(self.layout.visible(y + h + 1, y + h + GAP - 1)), [])
+
+    def test_page_at_matches_scan(self):
+        for cx in (0, 200, 700, 1200):
+            for cy in range(0, self.layout.height, 211):
+                hits = self.scan(
+                    lambda x, y, w, h, cx=cx, cy=cy: x <= cx <= x + w and y <= cy <= y + h
+                )
+                self.assertEqual(self.layout.page_at(cx, cy), hits[0] if hits else None)
+
+    def test_nearest_page_matches_scan(self):
+        for mid in range(-50, self.layout.height + 50, 199):
+            distances = [abs(y + h / 2 - mid) for _, y, _, h in map(self.layout.rect, range(200))]
+            self.assertEqual(self.layout.nearest_page(mid), distances.index(min(distances)))
+
+
+if __name__ == "__main__":
+    unittest.main()
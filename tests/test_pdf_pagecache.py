@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS PDF Viewer page surface cache.
+
+Validates zoom bucketing, LRU eviction within the byte budget, eviction
+of pages far from the viewport, and the choice of a stand-in surface
+rendered at another zoom.
+"""
+
+import sys
+import os
+import unittest
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_pdf_viewer.pagecache import PageSurfaceCache, zoom_bucket
+
+
+class FakeSurface:
+    def __init__(self, nbytes=100, name=""):
+        self._nbytes = nbytes
+        self.name = name
+
+    def get_stride(self):
+        return self._nbytes
+
+    def get_height(self):
+        return 1
+
+
+class TestZoomBucket(unittest.TestCase):
+    def test_close_zooms_share_a_bucket(self):
+        self.assertEqual(zoom_bucket(1.0), zoom_bucket(1.0 + 1e-9))
+        self.assertNotEqual(zoom_bucket(1.0), zoom_bucket(1.15))
+
+
+class TestPageSurfaceCache(unittest.TestCase):
+    """Verify the budget, LRU order and far-page eviction."""
+
+    def test_keyed_by_page_and_zoom(self):
+        cache = PageSurfaceCache()
+        surface = FakeSurface()
+        cache.put(3, 2.0, surface)
+        self.assertIs(cache.get(3, 2.0), surface)
+        self.assertIsNone(cache.get(3, 1.0))
+        self.assertIsNone(cache.get(4, 2.0))
+
+    def test_evicts_least_recently_used(self):
+        cache = PageSurfaceCache(budget=300)
+        for page in range(3):
+            cache.put(page, 1.0, FakeSurface())
+        cache.get(0, 1.0)
+        cache.put(3, 1.0, FakeSurface())
+        self.assertIsNone(cache.get(1, 1.0))
+        self.assertIsNotNone(cache.get(0, 1.0))
+        self.assertEqual((len(cache), cache.bytes_used), (3, 300))
+
+    def test_memory_flat_for_long_documents(self):
+        cache = PageSurfaceCache(budget=1000)
+        for page in range(500):
+            cache.put(page, 2.0, FakeSurface())
+        self.assertEqual(cache.bytes_used, 1000)
+
+    def test_oversized_surface_kept(self):
+        cache = PageSurfaceCache(budget=50)
+        surface = FakeSurface(100)
+        cache.put(0, 1.0, surface)
+        self.assertIs(cache.get(0, 1.0), surface)
+
+    def test_replacing_entry_keeps_byte_count(self):
+        cache = PageSurfaceCache()
+        cache.put(0, 1.0, FakeSurface(100))
+        cache.put(0, 1.0, FakeSurface(40))
+        self.assertEqual(cache.bytes_used, 40)
+
+    def test_retain(self):
+        cache = PageSurfaceCache()
+        for page in range(10):
+            cache.put(page, 1.0, FakeSurface())
+        cache.retain(3, 5)
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.bytes_used, 300)
+        self.assertIsNotNone(cache.get(4, 1.0))
+
+    def test_nearest_zoom(self):
+        cache = PageSurfaceCache()
+        for zoom in (0.5, 1.0, 4.0):
+            cache.put(0, zoom, FakeSurface(name=zoom))
+        cache.put(1, 2.0, FakeSurface(name="other page"))
+        self.assertEqual(cache.nearest(0, 1.2).name, 1.0)
+        self.assertEqual(cache.nearest(0, 3.0).name, 4.0)
+        # Equal ratio either way: the sharper surface wins
+        self.assertEqual(cache.nearest(0, 2.0).name, 4.0)
+        self.assertIsNone(cache.nearest(5, 1.0))
+
+    def test_tiles_keyed_apart_from_whole_page(self):
+        cache = PageSurfaceCache()
+        whole, tile = FakeSurface(name="page"), FakeSurface(name="tile")
+        cache.put(0, 1.0, whole)
+        cache.put(0, 8.0, tile, tile=(3, 1))
+        self.assertIs(cache.get(0, 8.0, tile=(3, 1)), tile)
+        self.assertIsNone(cache.get(0, 8.0))
+        self.assertIsNone(cache.get(0, 8.0, tile=(1, 3)))
+        # Tiles cover part of a page, so they never stand in for it
+        self.assertIs(cache.nearest(0, 8.0), whole)
+        cache.retain(1, 2)
+        self.assertEqual(len(cache), 0)
+
+    def test_nearest_tile_zoom(self):
+        cache = PageSurfaceCache()
+        cache.put(0, 1.0, FakeSurface())
+        self.assertIsNone(cache.nearest_tile_zoom(0, 6.0))
+        cache.put(0, 4.0, FakeSurface(), tile=(0, 0))
+        cache.put(0, 8.0, FakeSurface(), tile=(1, 1))
+        cache.put(1, 6.0, FakeSurface(), tile=(0, 0))
+        self.assertEqual(cache.nearest_tile_zoom(0, 7.0), 8.0)
+        self.assertEqual(cache.nearest_tile_zoom(0, 4.5), 4.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS PDF Viewer background page rendering.
+
+Validates that pages render in priority order off the calling thread,
+that rescheduling drops pages that scrolled away, and that nothing is
+delivered after shutdown.
+"""
+
+import sys
+import os
+import threading
+import types
+import unittest
+from unittest import mock
+
+# ---------------------------------------------------------------------------
+# Mock gi / gi.repository so PDF viewer modules can be imported headlessly.
+# ---------------------------------------------------------------------------
+sys.path.insert(0, os.path.dirname(__file__))
+from test_helpers import install_gtk_mocks
+
+install_gtk_mocks(extra_modules=("Poppler",))
+
+# Mock cairo module if pycairo is not installed
+try:
+    import cairo  # noqa: F401
+except ImportError:
+    sys.modules["cairo"] = types.ModuleType("cairo")
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_pdf_viewer import renderworker
+from mados_pdf_viewer.renderworker import PageRenderWorker
+
+
+class GatedRenderer:
+    """Renders only when the test releases the gate, recording the order."""
+
+    def __init__(self, fail_pages=()):
+        self.gate = threading.Semaphore(0)
+        self.started = threading.Event()
+        self.rendered = []
+        self.fail_pages = set(fail_pages)
+
+    def render_page(self, page, zoom):
+        return self.render_tile(page, zoom, None)
+
+    def render_tile(self, page, zoom, tile):
+        self.started.set()
+        self.gate.acquire()
+        self.rendered.append(page if tile is None else (page, tile))
+        if page in self.fail_pages:
+            raise RuntimeError("broken page")
+        return f"surface-{page}{tile or ''}@{zoom}"
+
+
+def jobs(*pages):
+    return [(page, None) for page in pages]
+
+
+class TestPageRenderWorker(unittest.TestCase):
+    """Verify ordering, cancellation and delivery on the main loop."""
+
+    def setUp(self):
+        self.idle_calls = []
+        glib = mock.MagicMock()
+        glib.idle_add.side_effect = lambda fn, *args: self.idle_calls.append((fn, args))
+        patcher = mock.patch.object(renderworker, "GLib", glib)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.delivered = []
+
+    def start(self, renderer):
+        worker = PageRenderWorker(
+            "doc.pdf",
+            lambda page, tile, zoom, surface: self.delivered.append((page, tile, zoom, surface)),
+            renderer_factory=lambda path: renderer,
+        )
+        self.addCleanup(worker.shutdown)
+        return worker
+
+    def finish(self, worker, renderer, count):
+        for _ in range(count):
+            renderer.gate.release()
+        worker.shutdown()
+        worker._thread.join(timeout=5)
+        self.assertFalse(worker._thread.is_alive())
+
+    def drain(self):
+        for fn, args in self.idle_calls:
+            fn(*args)
+        self.idle_calls.clear()
+
+    def test_renders_in_priority_order(self):
+        renderer = GatedRenderer()
+        worker = self.start(renderer)
+        worker.schedule(jobs(4, 5, 6, 3), 1.5)
+        renderer.started.wait(timeout=5)
+        self.assertEqual(worker.pending(), [(5, None, 1.5), (6, None, 1.5), (3, None, 1.5)])
+        for _ in range(4):
+            renderer.gate.release()
+        while len(renderer.rendered) < 4 or len(self.idle_calls) < 4:
+            threading.Event().wait(0.01)
+        self.drain()
+        self.assertEqual([page for page, _, _, _ in self.delivered], [4, 5, 6, 3])
+        self.assertEqual(self.delivered[0], (4, None, 1.5, "surface-4@1.5"))
+
+    def test_reschedule_drops_pages_scrolled_away(self):
+        renderer = GatedRenderer()
+        worker = self.start(renderer)
+        worker.schedule(jobs(0, 1, 2), 1.0)
+        renderer.started.wait(timeout=5)
+        # Page 0 is being rendered; it is not queued a second time
+        worker.schedule(jobs(0, 9, 10), 1.0)
+        self.assertEqual(worker.pending(), [(9, None, 1.0), (10, None, 1.0)])
+        renderer.gate.release()
+        renderer.gate.release()
+        while len(renderer.rendered) < 2:
+            threading.Event().wait(0.01)
+        self.assertEqual(renderer.rendered, [0, 9])
+        self.finish(worker, renderer, 1)
+
+    def test_nothing_delivered_after_shutdown(self):
+        renderer = GatedRenderer()
+        worker = self.start(renderer)
+        worker.schedule(jobs(0, 1), 1.0)
+        renderer.started.wait(timeout=5)
+        self.finish(worker, renderer, 1)
+        self.assertEqual(renderer.rendered, [0])
+        self.drain()
+        self.assertEqual(self.delivered, [])
+
+    def test_cancel_drops_superseded_zoom(self):
+        renderer = GatedRenderer()
+        worker = self.start(renderer)
+        worker.schedule(jobs(0, 1), 1.0)
+        renderer.started.wait(timeout=5)
+        # The zoom changed while page 0 was rendering at 100%
+        worker.cancel()
+        self.assertEqual(worker.pending(), [])
+        worker.schedule(jobs(0), 1.25)
+        renderer.gate.release()
+        renderer.gate.release()
+        while len(self.idle_calls) < 2:
+            threading.Event().wait(0.01)
+        self.drain()
+        self.assertEqual(renderer.rendered, [0, 0])
+        self.assertEqual(self.delivered, [(0, None, 1.25, "surface-0@1.25")])
+
+    def test_cancelled_page_rendered_again_at_same_zoom(self):
+        renderer = GatedRenderer()
+        worker = self.start(renderer)
+        worker.schedule(jobs(0), 1.0)
+        renderer.started.wait(timeout=5)
+        # Zoomed away and back before the render finished
+        worker.cancel()
+        worker.schedule(jobs(0), 1.0)
+        self.assertEqual(worker.pending(), [(0, None, 1.0)])
+        self.finish(worker, renderer, 1)
+
+    def test_failed_page_not_retried(self):
+        renderer = GatedRenderer(fail_pages={2})
+        with mock.patch("builtins.print") as printed:
+            worker = self.start(renderer)
+            worker.schedule(jobs(2), 1.0)
+            renderer.gate.release()
+            while not worker._failed:
+                threading.Event().wait(0.01)
+        printed.assert_called_once()
+        worker.schedule(jobs(2, 3), 1.0)
+        self.assertNotIn((2, None, 1.0), worker.pending())
+        self.finish(worker, renderer, 1)
+
+    def test_tiles_rendered_as_tiles(self):
+        renderer = GatedRenderer()
+        worker = self.start(renderer)
+        worker.schedule([(0, (1, 2)), (0, None)], 4.0)
+        renderer.gate.release()
+        renderer.gate.release()
+        while len(self.idle_calls) < 2:
+            threading.Event().wait(0.01)
+        self.drain()
+        self.assertEqual(renderer.rendered, [(0, (1, 2)), 0])
+        self.assertEqual(self.delivered[0], (0, (1, 2), 4.0, "surface-0(1, 2)@4.0"))
+
+    def test_open_failure_stops_thread(self):
+        def broken(path):
+            raise RuntimeError("not a PDF")
+
+        with mock.patch("builtins.print") as printed:
+            worker = PageRenderWorker("bad.pdf", lambda *a: None, renderer_factory=broken)
+            worker._thread.join(timeout=5)
+        self.assertFalse(worker._thread.is_alive())
+        printed.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
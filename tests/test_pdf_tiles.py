@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS PDF Viewer page tiles.
+
+Validates when a page is tiled, the rectangles of edge tiles, and the
+choice of the tiles that overlap the viewport.
+"""
+
+import sys
+import os
+import unittest
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_pdf_viewer.tiles import TILE_SIZE, is_tiled, tile_rect, visible_tiles
+
+
+class TestTiles(unittest.TestCase):
+    """Verify the tile geometry."""
+
+    def test_only_large_pages_tiled(self):
+        # A4 at 100% and 200%
+        self.assertFalse(is_tiled(596, 842))
+        self.assertFalse(is_tiled(1191, 1684))
+        # A4 at 800%
+        self.assertTrue(is_tiled(4764, 6736))
+
+    def test_edge_tile_is_cropped(self):
+        self.assertEqual(tile_rect((0, 0), 1000, 700), (0, 0, TILE_SIZE, TILE_SIZE))
+        self.assertEqual(tile_rect((1, 1), 1000, 700), (512, 512, 488, 188))
+
+    def test_visible_tiles_cover_viewport(self):
+        tiles = visible_tiles(4096, 4096, 600, 1000, 600 + 1920, 1000 + 1080)
+        # Columns 1..4 (600..2520), rows 1..4 (1000..2080)
+        self.assertEqual(len(tiles), 16)
+        self.assertEqual(tiles[0], (1, 1))
+        self.assertEqual(tiles[-1], (4, 4))
+
+    def test_tile_count_follows_screen_not_page(self):
+        small = visible_tiles(4000, 5000, 0, 0, 1920, 1080)
+        huge = visible_tiles(40000, 50000, 20000, 20000, 21920, 21080)
+        self.assertLessEqual(len(huge), len(small) + 8)
+
+    def test_viewport_clamped_to_page(self):
+        self.assertEqual(visible_tiles(1000, 700, -200, -100, 300, 200), [(0, 0)])
+        self.assertEqual(visible_tiles(1000, 700, 0, 800, 1000, 900), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS Photo Viewer animated image playback.
+
+Checks that the animation iterator is only advanced once the current
+frame's delay has elapsed on the virtual clock, that each distinct frame
+is converted once while it fits the cache budget (and on demand past
+it), and that non-looping animations stop on their last frame.  The
+GdkPixbuf animation is replaced by a fake that, like the GIF loader,
+composites every frame into the same pixbuf.
+"""
+
+import sys
+import os
+import types
+import unittest
+
+# ---------------------------------------------------------------------------
+# Mock gi / gi.repository so photo viewer modules can be imported headlessly.
+# ---------------------------------------------------------------------------
+sys.path.insert(0, os.path.dirname(__file__))
+from test_helpers import install_gtk_mocks
+
+install_gtk_mocks()
+
+# Mock cairo module if pycairo is not installed
+try:
+    import cairo  # noqa: F401
+except ImportError:
+    sys.modules["cairo"] = types.ModuleType("cairo")
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_photo_viewer.animation import (
+    MAX_STEP_US,
+    AnimationPlayer,
+    FrameCache,
+    is_animation_candidate,
+)
+
+
+class FakeBytes:
+    def __init__(self, data):
+        self._data = data
+
+    def get_data(self):
+        return self._data
+
+
+class SharedPixbuf:
+    """A 2x2 pixbuf whose contents the iterator overwrites per frame."""
+
+    def __init__(self):
+        self.data = b""
+
+    def get_width(self):
+        return 2
+
+    def get_height(self):
+        return 2
+
+    def read_pixel_bytes(self):
+        return FakeBytes(self.data)
+
+
+class FakeIter:
+    def __init__(self, animation):
+        self._animation = animation
+        self._pixbuf = SharedPixbuf()
+        self.advances = 0
+        self._show(0)
+
+    def _show(self, index):
+        self.index = index
+        self._pixbuf.data = self._animation.frames[index][0]
+
+    def _frame_at(self, ms):
+        frames = self._animation.frames
+        total = sum(delay for _, delay in frames)
+        if self._animation.loop:
+            ms %= total
+        elif ms >= total - frames[-1][1]:
+            return len(frames) - 1
+        for index, (_, delay) in enumerate(frames):
+            if ms < delay:
+                return index
+            ms -= delay
+        return len(frames) - 1
+
+    def advance(self, tv):
+        self.advances += 1
+        self._show(self._frame_at(tv.tv_sec * 1000 + tv.tv_usec // 1000))
+        return True
+
+    def get_delay_time(self):
+        if not self._animation.loop and self.index == len(self._animation.frames) - 1:
+            return -1
+        return self._animation.frames[self.index][1]
+
+    def get_pixbuf(self):
+        return self._pixbuf
+
+
+class FakeAnimation:
+    def __init__(self, frames, loop=True):
+        self.frames = frames  # [(pixel data, delay ms)]
+        self.loop = loop
+
+    def get_iter(self, start):
+        self.iter = FakeIter(self)
+        return self.iter
+
+
+class FakePyramid:
+    def __init__(self, pixbuf):
+        self.data = pixbuf.data
+        self.width = pixbuf.get_width()
+        self.height = pixbuf.get_height()
+
+
+class TestAnimationPlayer(unittest.TestCase):
+    """Verify frame timing and frame conversion caching."""
+
+    def setUp(self):
+        self.conversions = []
+
+    def make_pyramid(self, pixbuf):
+        self.conversions.append(pixbuf.data)
+        return FakePyramid(pixbuf)
+
+    def make_player(self, frames, loop=True, budget=1024):
+        self.animation = FakeAnimation(frames, loop)
+        return AnimationPlayer(self.animation, FrameCache(budget), self.make_pyramid)
+
+    def test_advances_when_delay_elapsed(self):
+        player = self.make_player([(b"a", 50), (b"b", 50)])
+        self.assertEqual(player.pyramid.data, b"a")
+        self.assertFalse(player.advance(49_000))
+        self.assertEqual(self.animation.iter.advances, 0)
+        self.assertTrue(player.advance(1_000))
+        self.assertEqual(player.pyramid.data, b"b")
+
+    def test_frames_converted_once(self):
+        player = self.make_player([(b"a", 50), (b"b", 50), (b"c", 50)])
+        for _ in range(12):
+            player.advance(50_000)
+        self.assertEqual(self.conversions, [b"a", b"b", b"c"])
+
+    def test_over_budget_converted_on_demand(self):
+        # Each 2x2 frame takes 16 bytes; only two fit
+        player = self.make_player([(b"a", 50), (b"b", 50), (b"c", 50)], budget=32)
+        for _ in range(6):
+            player.advance(50_000)
+        self.assertEqual(self.conversions, [b"a", b"b", b"c", b"c"])
+
+    def test_repeated_frame_not_redrawn(self):
+        player = self.make_player([(b"a", 50), (b"a", 50), (b"b", 50)])
+        self.assertFalse(player.advance(50_000))
+        self.assertTrue(player.advance(50_000))
+
+    def test_non_looping_finishes(self):
+        player = self.make_player([(b"a", 50), (b"b", 50)], loop=False)
+        self.assertTrue(player.advance(50_000))
+        self.assertTrue(player.finished)
+        self.assertFalse(player.advance(1_000_000))
+
+    def test_clock_step_is_capped(self):
+        player = self.make_player([(b"a", 50), (b"b", 1000), (b"c", 50)])
+        player.advance(10_000_000)  # E.g. after the frame clock stalled
+        self.assertEqual(player.pyramid.data, b"b")
+        self.assertEqual(player._clock_us, MAX_STEP_US)
+
+
+class TestFrameCache(unittest.TestCase):
+    """Verify the admission budget."""
+
+    def test_admits_until_full(self):
+        cache = FrameCache(budget=40)
+        pixbuf = SharedPixbuf()
+        self.assertTrue(cache.put("a", FakePyramid(pixbuf)))
+        self.assertTrue(cache.put("b", FakePyramid(pixbuf)))
+        self.assertFalse(cache.put("c", FakePyramid(pixbuf)))
+        self.assertEqual((len(cache), cache.bytes_used), (2, 32))
+        self.assertIsNone(cache.get("c"))
+
+
+class TestAnimationCandidate(unittest.TestCase):
+    def test_extensions(self):
+        self.assertTrue(is_animation_candidate("/p/a.GIF"))
+        self.assertTrue(is_animation_candidate("/p/a.webp"))
+        self.assertFalse(is_animation_candidate("/p/a.jpg"))
+
+
+if __name__ == "__main__":
+    unittest.main()
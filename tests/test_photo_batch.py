@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS Photo Viewer batch export.
+
+Validates output naming (the source is never overwritten), the per-file
+export step with decoding and encoding replaced by fakes, and the
+exporter's progress, failure and cancellation reporting.  The process
+pool is replaced by a thread pool, so no subprocesses are needed.
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import types
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+# ---------------------------------------------------------------------------
+# Mock gi / gi.repository so photo viewer modules can be imported headlessly.
+# ---------------------------------------------------------------------------
+sys.path.insert(0, os.path.dirname(__file__))
+from test_helpers import install_gtk_mocks
+
+install_gtk_mocks()
+
+# Mock cairo module if pycairo is not installed
+try:
+    import cairo  # noqa: F401
+except ImportError:
+    sys.modules["cairo"] = types.ModuleType("cairo")
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_photo_viewer import batch
+from mados_photo_viewer.batch import BatchExporter, BatchOptions, export_image
+
+
+class FakePixbuf:
+    def __init__(self, alpha=False):
+        self.alpha = alpha
+        self.saved = None
+
+    def get_has_alpha(self):
+        return self.alpha
+
+    def save_to_bufferv(self, fmt, keys, values):
+        self.saved = (fmt, dict(zip(keys, values)))
+        return True, f"{fmt}-data".encode()
+
+
+class TestOutputPath(unittest.TestCase):
+    """Verify where exported files are written."""
+
+    def test_format_and_extension(self):
+        options = BatchOptions("/out", fmt="png")
+        self.assertEqual(options.output_path("/photos/a.jpg"), "/out/a.png")
+
+    def test_keep_format(self):
+        options = BatchOptions("/out")
+        self.assertEqual(options.output_path("/photos/a.JPEG"), "/out/a.jpg")
+        self.assertEqual(options.output_path("/photos/b.png"), "/out/b.png")
+        # Formats that cannot be exported fall back to JPEG
+        self.assertEqual(options.output_path("/photos/c.webp"), "/out/c.jpg")
+
+    def test_never_overwrites_source(self):
+        options = BatchOptions("/photos")
+        self.assertEqual(options.output_path("/photos/a.jpg"), "/photos/a-export.jpg")
+        self.assertEqual(options.output_path("/photos/a.jpeg"), "/photos/a.jpg")
+
+    def test_colliding_outputs_numbered(self):
+        options = BatchOptions("/out", fmt="jpeg")
+        paths = options.output_paths(["/p/photo.png", "/p/photo.jpg", "/q/photo.gif"])
+        self.assertEqual(
+            paths,
+            {
+                "/p/photo.png": "/out/photo.jpg",
+                "/p/photo.jpg": "/out/photo-1.jpg",
+                "/q/photo.gif": "/out/photo-2.jpg",
+            },
+        )
+
+    def test_outputs_never_overwrite_other_sources(self):
+        options = BatchOptions("/photos", fmt="jpeg")
+        # a.png would become a.jpg, which is a source of this export;
+        # A.JPG is the same file on case-insensitive file systems
+        paths = options.output_paths(["/photos/a.png", "/photos/a.jpg", "/photos/A.JPG"])
+        self.assertEqual(paths["/photos/a.png"], "/photos/a-1.jpg")
+        self.assertEqual(paths["/photos/a.jpg"], "/photos/a-export.jpg")
+        self.assertEqual(paths["/photos/A.JPG"], "/photos/A-2.jpg")
+
+
+class TestExportImage(unittest.TestCase):
+    """Verify a single export with decoding and writing faked."""
+
+    def setUp(self):
+        self.decoded = []
+        self.written = {}
+        self.pixbuf = FakePixbuf()
+        for target, replacement in (
+            ("decode_image", self.fake_decode),
+            ("write_atomic", self.written.__setitem__),
+            ("read_exif_segment", lambda path: b"Exif\x00\x00tiff"),
+            ("reset_orientation", lambda payload: payload + b"-upright"),
+            ("insert_exif_segment", lambda data, payload: data + b"+" + payload),
+            ("_flatten", lambda pixbuf: FakePixbuf()),
+        ):
+            patcher = mock.patch.object(batch, target, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def fake_decode(self, filepath, max_size=None):
+        self.decoded.append((filepath, max_size))
+        return mock.Mock(pixbuf=self.pixbuf)
+
+    def test_resizes_and_encodes(self):
+        options = BatchOptions("/out", max_edge=1024, jpeg_quality=70)
+        self.assertEqual(export_image("/p/a.jpg", options), "/out/a.jpg")
+        self.assertEqual(self.decoded, [("/p/a.jpg", (1024, 1024))])
+        self.assertEqual(self.pixbuf.saved, ("jpeg", {"quality": "70"}))
+        self.assertEqual(self.written, {"/out/a.jpg": b"jpeg-data"})
+
+    def test_zero_edge_keeps_size(self):
+        export_image("/p/a.png", BatchOptions("/out", max_edge=0))
+        self.assertEqual(self.decoded, [("/p/a.png", None)])
+        self.assertEqual(self.pixbuf.saved[0], "png")
+
+    def test_keeps_metadata_for_jpeg(self):
+        export_image("/p/a.jpg", BatchOptions("/out", strip_metadata=False))
+        self.assertEqual(self.written["/out/a.jpg"], b"jpeg-data+Exif\x00\x00tiff-upright")
+
+    def test_explicit_destination(self):
+        dest = export_image("/p/a.png", BatchOptions("/out"), "/out/a-1.png")
+        self.assertEqual(dest, "/out/a-1.png")
+        self.assertEqual(list(self.written), ["/out/a-1.png"])
+
+    def test_alpha_flattened_for_jpeg(self):
+        self.pixbuf = FakePixbuf(alpha=True)
+        export_image("/p/a.png", BatchOptions("/out", fmt="jpeg"))
+        self.assertIsNone(self.pixbuf.saved)
+        self.assertEqual(self.written, {"/out/a.jpg": b"jpeg-data"})
+
+
+class TestBatchExporter(unittest.TestCase):
+    """Verify progress, failures and cancellation."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.output = os.path.join(self.tmpdir, "export")
+        self.exported = []
+        self.idle = []
+        for target, replacement in (
+            ("export_image", self.fake_export),
+            ("GLib", mock.MagicMock()),
+        ):
+            patcher = mock.patch.object(batch, target, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        batch.GLib.idle_add.side_effect = lambda fn, *a: self.idle.append((fn, a))
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def fake_export(self, filepath, options, dest):
+        if "broken" in filepath:
+            raise OSError("unreadable")
+        self.exported.append((filepath, dest))
+        return dest
+
+    def make_exporter(self):
+        return BatchExporter(workers=2, pool_factory=lambda workers: ThreadPoolExecutor(workers))
+
+    def drain(self):
+        while self.idle:
+            fn, args = self.idle.pop(0)
+            fn(*args)
+
+    def test_progress_and_result(self):
+        exporter = self.make_exporter()
+        progress, results = [], []
+        paths = ["/p/a.jpg", "/p/clip.mp4", "/p/broken.jpg", "/p/c.png"]
+        exporter.run(
+            paths,
+            BatchOptions(self.output),
+            lambda done, total, path: progress.append((done, total)),
+            lambda exported, failed: results.append((sorted(exported), failed)),
+        )
+        exporter._driver.submit(lambda: None).result()
+        self.drain()
+        self.assertTrue(os.path.isdir(self.output))
+        self.assertEqual([done for done, _ in progress], [1, 2, 3])
+        self.assertEqual({total for _, total in progress}, {3})
+        self.assertEqual(results, [(["/p/a.jpg", "/p/c.png"], ["/p/broken.jpg"])])
+        exporter.shutdown()
+
+    def test_colliding_outputs_submitted_with_unique_names(self):
+        exporter = self.make_exporter()
+        exporter.run(["/p/a.png", "/q/a.jpg"], BatchOptions(self.output, fmt="jpeg"))
+        exporter._driver.submit(lambda: None).result()
+        self.assertEqual(
+            sorted(self.exported),
+            [
+                ("/p/a.png", os.path.join(self.output, "a.jpg")),
+                ("/q/a.jpg", os.path.join(self.output, "a-1.jpg")),
+            ],
+        )
+        exporter.shutdown()
+
+    def test_cancelled_export_not_reported(self):
+        release = threading.Event()
+        exporter = self.make_exporter()
+        results = []
+        with mock.patch.object(batch, "export_image", lambda path, options, dest: release.wait()):
+            exporter.run(["/p/a.jpg"], BatchOptions(self.output), None, results.append)
+            exporter.cancel()
+            release.set()
+            exporter._driver.submit(lambda: None).result()
+        self.drain()
+        self.assertEqual(results, [])
+        exporter.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
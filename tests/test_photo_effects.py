@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS Photo Viewer tiled effect layer.
+
+Validates tile coverage computation, stroke snapshots, the dirty-tile
+bookkeeping of EffectLayer (which tiles are re-rendered when strokes grow,
+are undone, or are unchanged), and the undo checkpoint store.  Actual
+pixel rendering and compression are replaced by stubs so no display is
+required.
+"""
+
+import sys
+import os
+import types
+import unittest
+from unittest import mock
+
+# ---------------------------------------------------------------------------
+# Mock gi / gi.repository so photo viewer modules can be imported headlessly.
+# ---------------------------------------------------------------------------
+sys.path.insert(0, os.path.dirname(__file__))
+from test_helpers import install_gtk_mocks
+
+install_gtk_mocks()
+
+# Mock cairo module if pycairo is not installed
+try:
+    import cairo  # noqa: F401
+except ImportError:
+    sys.modules["cairo"] = types.ModuleType("cairo")
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_photo_viewer import effects
+from mados_photo_viewer.effects import (
+    TILE_SIZE,
+    MARGIN_ALIGN,
+    EffectLayer,
+    StrokeSnapshot,
+    TileCheckpoints,
+    stroke_signature,
+    tile_range,
+)
+from mados_photo_viewer.tools import BlurStroke, PixelateStroke, PaintStroke
+
+
+class FakePixbuf:
+    def __init__(self, width, height):
+        self._width = width
+        self._height = height
+
+    def get_width(self):
+        return self._width
+
+    def get_height(self):
+        return self._height
+
+
+def _fake_pack(surface):
+    return (surface, b"0123456789")
+
+
+def _fake_unpack(packed):
+    return packed[0]
+
+
+def _stroke(cls, points, brush=10):
+    stroke = cls(brush)
+    for x, y in points:
+        stroke.add_point(x, y)
+    return stroke
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Geometry helpers
+# ═══════════════════════════════════════════════════════════════════════════
+class TestTileRange(unittest.TestCase):
+    """Verify rectangle to tile mapping."""
+
+    def test_single_tile(self):
+        self.assertEqual(tile_range(10, 10, 20, 20, 1000, 1000), [(0, 0)])
+
+    def test_spans_tiles(self):
+        tiles = tile_range(250, 250, 260, 260, 1000, 1000)
+        self.assertEqual(sorted(tiles), [(0, 0), (0, 1), (1, 0), (1, 1)])
+
+    def test_exclusive_edge(self):
+        self.assertEqual(tile_range(0, 0, TILE_SIZE, TILE_SIZE, 1000, 1000), [(0, 0)])
+
+    def test_clamped_to_layer(self):
+        self.assertEqual(tile_range(-50, -50, 5, 5, 100, 100), [(0, 0)])
+        self.assertEqual(tile_range(200, 200, 300, 300, 100, 100), [])
+
+
+class TestStrokeSnapshot(unittest.TestCase):
+    """Verify snapshots are scaled, immutable copies."""
+
+    def test_scaled_points_and_width(self):
+        snap = StrokeSnapshot(_stroke(BlurStroke, [(100, 200)], brush=20), scale=0.5)
+        self.assertEqual(snap.points, ((50.0, 100.0),))
+        self.assertEqual(snap.width, 10.0)
+
+    def test_copy_is_detached(self):
+        stroke = _stroke(BlurStroke, [(1, 1)])
+        snap = StrokeSnapshot(stroke)
+        stroke.add_point(2, 2)
+        self.assertEqual(len(snap.points), 1)
+
+    def test_margin_is_aligned(self):
+        snap = StrokeSnapshot(PixelateStroke(10, block_size=40))
+        self.assertEqual(snap.margin % MARGIN_ALIGN, 0)
+        self.assertGreaterEqual(snap.margin, 40)
+
+    def test_blur_margin_covers_kernel(self):
+        snap = StrokeSnapshot(_stroke(BlurStroke, [(0, 0)], brush=200))
+        self.assertEqual(snap.sigma, 50.0)
+        self.assertGreaterEqual(snap.margin, 150)
+        self.assertEqual(snap.margin % MARGIN_ALIGN, 0)
+
+    def test_sigma_has_lower_bound(self):
+        snap = StrokeSnapshot(_stroke(BlurStroke, [(0, 0)], brush=2))
+        self.assertEqual(snap.sigma, effects.BLUR_SIGMA_MIN)
+
+    def test_bounds_enclose_brush(self):
+        snap = StrokeSnapshot(_stroke(BlurStroke, [(10, 20), (50, 30)], brush=10))
+        x0, y0, x1, y1 = snap.bounds()
+        self.assertLessEqual(x0, 5)
+        self.assertLessEqual(y0, 15)
+        self.assertGreaterEqual(x1, 55)
+        self.assertGreaterEqual(y1, 35)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Separable Gaussian approximation
+# ═══════════════════════════════════════════════════════════════════════════
+class TestBoxRadii(unittest.TestCase):
+    """Verify the box widths approximate the requested Gaussian."""
+
+    def test_pass_count(self):
+        self.assertEqual(len(effects.box_radii_for_gaussian(4.0)), 3)
+
+    def test_variance_matches_sigma(self):
+        for sigma in (2.0, 5.0, 12.5, 40.0):
+            radii = effects.box_radii_for_gaussian(sigma)
+            # Variance of a box of width w is (w^2 - 1) / 12
+            variance = sum(((2 * r + 1) ** 2 - 1) / 12 for r in radii)
+            self.assertAlmostEqual(variance**0.5, sigma, delta=sigma * 0.15)
+
+    def test_radii_non_decreasing(self):
+        radii = effects.box_radii_for_gaussian(7.0)
+        self.assertEqual(radii, sorted(radii))
+
+
+@unittest.skipUnless(effects.NUMPY_AVAILABLE, "numpy not installed")
+class TestGaussianBlurArray(unittest.TestCase):
+    """Verify the vectorized blur on small arrays."""
+
+    def test_flat_image_unchanged(self):
+        import numpy as np
+
+        data = np.full((20, 30, 4), 77, dtype=np.uint8)
+        out = effects.gaussian_blur_array(data, 3.0)
+        self.assertEqual(out.shape, data.shape)
+        self.assertTrue((out == 77).all())
+
+    def test_impulse_spreads_and_preserves_mass(self):
+        import numpy as np
+
+        data = np.zeros((41, 41, 4), dtype=np.uint8)
+        data[20, 20] = 255
+        out = effects.gaussian_blur_array(data, 2.0).astype(np.int64)
+        self.assertLess(out[20, 20, 0], 255)
+        self.assertGreater(out[20, 22, 0], 0)
+        self.assertEqual(out[20, 19, 0], out[20, 21, 0])
+        self.assertAlmostEqual(out[..., 0].sum(), 255, delta=80)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# EffectLayer bookkeeping
+# ═══════════════════════════════════════════════════════════════════════════
+class TestEffectLayer(unittest.TestCase):
+    """Verify that only dirty tiles are rendered."""
+
+    def setUp(self):
+        self.rendered = []
+
+        def fake_render(pixbuf, tx, ty, snapshots, tile=TILE_SIZE):
+            self.rendered.append((tx, ty))
+            return object()
+
+        for name, fake in (
+            ("render_tile", fake_render),
+            ("_pack_surface", _fake_pack),
+            ("_unpack_surface", _fake_unpack),
+        ):
+            patcher = mock.patch.object(effects, name, fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.layer = EffectLayer(FakePixbuf(1024, 1024))
+
+    def test_renders_touched_tiles(self):
+        stroke = _stroke(BlurStroke, [(10, 10), (300, 10)])
+        self.layer.update([stroke])
+        self.assertEqual(sorted(self.rendered), [(0, 0), (1, 0)])
+        self.assertTrue(self.layer.is_idle)
+
+    def test_unchanged_strokes_not_rerendered(self):
+        stroke = _stroke(BlurStroke, [(10, 10)])
+        self.layer.update([stroke])
+        self.layer.update([stroke])
+        self.assertEqual(self.rendered, [(0, 0)])
+
+    def test_growing_stroke_rerenders_only_touched_tiles(self):
+        stroke = _stroke(BlurStroke, [(10, 10)])
+        other = _stroke(PixelateStroke, [(600, 600)])
+        self.layer.update([stroke, other])
+        self.rendered.clear()
+        stroke.add_point(20, 20)
+        self.layer.update([stroke, other])
+        self.assertEqual(self.rendered, [(0, 0)])
+
+    def test_removed_stroke_drops_tiles(self):
+        stroke = _stroke(BlurStroke, [(10, 10)])
+        self.layer.update([stroke])
+        self.layer.update([])
+        self.assertEqual(self.layer.render_all(), {})
+
+    def test_ignores_paint_strokes(self):
+        paint = PaintStroke((1, 1, 1, 1), 5)
+        paint.add_point(10, 10)
+        self.layer.update([paint])
+        self.assertEqual(self.rendered, [])
+
+    def test_scaled_layer_uses_layer_pixels(self):
+        layer = EffectLayer(FakePixbuf(512, 512), scale=0.25)
+        layer.update([_stroke(BlurStroke, [(1500, 1500)])])
+        self.assertEqual(self.rendered, [(1, 1)])
+
+    def test_undo_restores_checkpoint(self):
+        first = _stroke(BlurStroke, [(10, 10)])
+        second = _stroke(PixelateStroke, [(20, 20)])
+        self.layer.update([first])
+        before = self.layer.render_all()[(0, 0)]
+        self.layer.update([first, second])
+        self.rendered.clear()
+        self.layer.update([first])
+        self.assertEqual(self.rendered, [])
+        self.assertIs(self.layer.render_all()[(0, 0)], before)
+
+    def test_redo_restores_checkpoint(self):
+        first = _stroke(BlurStroke, [(10, 10)])
+        self.layer.update([first])
+        after = self.layer.render_all()[(0, 0)]
+        self.layer.update([])
+        self.rendered.clear()
+        self.layer.update([first])
+        self.assertEqual(self.rendered, [])
+        self.assertIs(self.layer.render_all()[(0, 0)], after)
+
+    def test_growing_stroke_not_checkpointed(self):
+        stroke = _stroke(BlurStroke, [(10, 10)])
+        self.layer.update([stroke])
+        for i in range(5):
+            stroke.add_point(12 + i, 10)
+            self.layer.update([stroke])
+        self.assertEqual(len(self.layer._checkpoints), 0)
+
+    def test_checkpointing_disabled(self):
+        layer = EffectLayer(FakePixbuf(256, 256), checkpoint_budget=0)
+        stroke = _stroke(BlurStroke, [(10, 10)])
+        layer.update([stroke])
+        layer.update([])
+        self.rendered.clear()
+        layer.update([stroke])
+        self.assertEqual(self.rendered, [(0, 0)])
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TileCheckpoints / signatures
+# ═══════════════════════════════════════════════════════════════════════════
+class TestTileCheckpoints(unittest.TestCase):
+    """Verify the byte-budgeted checkpoint LRU."""
+
+    def setUp(self):
+        for name, fake in (("_pack_surface", _fake_pack), ("_unpack_surface", _fake_unpack)):
+            patcher = mock.patch.object(effects, name, fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_store_and_restore(self):
+        store = TileCheckpoints(budget=100)
+        surface = object()
+        store.store((0, 0), ("sig",), surface)
+        self.assertIs(store.restore((0, 0), ("sig",)), surface)
+        self.assertIsNone(store.restore((0, 0), ("other",)))
+        self.assertEqual(store.bytes_used, 10)
+
+    def test_evicts_least_recent(self):
+        store = TileCheckpoints(budget=25)
+        store.store((0, 0), 1, "a")
+        store.store((1, 0), 1, "b")
+        store.restore((0, 0), 1)
+        store.store((2, 0), 1, "c")
+        self.assertEqual(len(store), 2)
+        self.assertIsNone(store.restore((1, 0), 1))
+        self.assertEqual(store.restore((0, 0), 1), "a")
+        self.assertLessEqual(store.bytes_used, 25)
+
+    def test_oversized_entry_skipped(self):
+        store = TileCheckpoints(budget=5)
+        store.store((0, 0), 1, "a")
+        self.assertEqual(len(store), 0)
+
+    def test_clear(self):
+        store = TileCheckpoints(budget=100)
+        store.store((0, 0), 1, "a")
+        store.clear()
+        self.assertEqual((len(store), store.bytes_used), (0, 0))
+
+
+class TestStrokeSignature(unittest.TestCase):
+    """Verify signatures identify strokes uniquely and track changes."""
+
+    def test_distinct_strokes_differ(self):
+        a = _stroke(BlurStroke, [(1, 1)])
+        b = _stroke(BlurStroke, [(1, 1)])
+        self.assertNotEqual(stroke_signature(a), stroke_signature(b))
+
+    def test_changes_with_points(self):
+        stroke = _stroke(BlurStroke, [(1, 1)])
+        before = stroke_signature(stroke)
+        self.assertEqual(stroke_signature(stroke), before)
+        stroke.add_point(2, 2)
+        self.assertNotEqual(stroke_signature(stroke), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS Photo Viewer EXIF header reader.
+
+Builds small JPEG, TIFF and PNG headers in memory (no pixel data) and
+checks that date taken, orientation, camera and dimensions are read, and
+that damaged headers degrade to partial metadata instead of raising.
+"""
+
+import sys
+import os
+import struct
+import tempfile
+import unittest
+
+# ---------------------------------------------------------------------------
+# Mock gi / gi.repository so photo viewer modules can be imported headlessly.
+# ---------------------------------------------------------------------------
+sys.path.insert(0, os.path.dirname(__file__))
+from test_helpers import install_gtk_mocks
+
+install_gtk_mocks()
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_photo_viewer.exif import (
+    ImageMetadata,
+    insert_exif_segment,
+    normalize_datetime,
+    read_exif_segment,
+    read_metadata,
+    reset_orientation,
+)
+
+SHORT, LONG, ASCII = 3, 4, 2
+
+
+def build_tiff(ifd0, exif=None, endian="<"):
+    """Return a TIFF structure with IFD0 and an optional Exif sub-IFD.
+
+    Entries are ``(tag, type, value)`` with SHORT, LONG or ASCII values.
+    """
+    ifd0 = list(ifd0)
+    if exif:
+        ifd0.append((0x8769, LONG, None))
+    exif_off = 8 + 2 + 12 * len(ifd0) + 4
+    data_off = exif_off + (2 + 12 * len(exif) + 4 if exif else 0)
+    data = bytearray()
+
+    def pack_ifd(entries):
+        out = struct.pack(endian + "H", len(entries))
+        for tag, kind, value in entries:
+            count = 1
+            if tag == 0x8769:
+                value = exif_off
+            if kind == ASCII:
+                raw = value.encode() + b"\x00"
+                count = len(raw)
+                if count <= 4:
+                    field = raw.ljust(4, b"\x00")
+                else:
+                    field = struct.pack(endian + "I", data_off + len(data))
+                    data.extend(raw)
+            elif kind == SHORT:
+                field = struct.pack(endian + "HH", value, 0)
+            else:
+                field = struct.pack(endian + "I", value)
+            out += struct.pack(endian + "HHI", tag, kind, count) + field
+        return out + struct.pack(endian + "I", 0)
+
+    body = pack_ifd(ifd0) + (pack_ifd(exif) if exif else b"")
+    order = b"II" if endian == "<" else b"MM"
+    return order + struct.pack(endian + "HI", 42, 8) + body + bytes(data)
+
+
+def segment(marker, payload):
+    return b"\xff" + bytes([marker]) + struct.pack(">H", len(payload) + 2) + payload
+
+
+def build_jpeg(tiff=None, width=640, height=480):
+    """Return JPEG headers (APP0, optional Exif APP1, SOF0) and a fake scan."""
+    out = b"\xff\xd8" + segment(0xE0, b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00")
+    if tiff is not None:
+        out += segment(0xE1, b"Exif\x00\x00" + tiff)
+    out += segment(0xDB, bytes(65))
+    out += segment(0xC0, struct.pack(">BHHB", 8, height, width, 3) + bytes(9))
+    out += segment(0xDA, bytes(10)) + b"\x12\x34" * 50 + b"\xff\xd9"
+    return out
+
+
+CAMERA_IFD0 = [
+    (0x010F, ASCII, "Canon"),
+    (0x0110, ASCII, "Canon EOS 5D"),
+    (0x0112, SHORT, 6),
+    (0x0132, ASCII, "2020:01:01 00:00:00"),
+]
+CAMERA_EXIF = [
+    (0x9003, ASCII, "2019:07:14 18:30:05"),
+    (0xA002, LONG, 4000),
+    (0xA003, LONG, 3000),
+]
+
+
+class ExifFileTestCase(unittest.TestCase):
+    """Writes header bytes to temporary files."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def read(self, name, data):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, "wb") as fp:
+            fp.write(data)
+        return read_metadata(path)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# JPEG
+# ═══════════════════════════════════════════════════════════════════════════
+class TestReadJpeg(ExifFileTestCase):
+    """Verify metadata from the JPEG APP1 Exif block and SOF marker."""
+
+    def test_full_exif_little_endian(self):
+        meta = self.read("a.jpg", build_jpeg(build_tiff(CAMERA_IFD0, CAMERA_EXIF)))
+        self.assertEqual(meta.date_taken, "2019-07-14 18:30:05")
+        self.assertEqual(meta.orientation, 6)
+        self.assertEqual(meta.make, "Canon")
+        self.assertEqual(meta.model, "Canon EOS 5D")
+        # SOF is authoritative for the stored size
+        self.assertEqual((meta.width, meta.height), (640, 480))
+
+    def test_big_endian(self):
+        tiff = build_tiff(CAMERA_IFD0, CAMERA_EXIF, endian=">")
+        meta = self.read("a.jpg", build_jpeg(tiff))
+        self.assertEqual(meta.date_taken, "2019-07-14 18:30:05")
+        self.assertEqual(meta.orientation, 6)
+
+    def test_falls_back_to_ifd0_datetime(self):
+        meta = self.read("a.jpg", build_jpeg(build_tiff(CAMERA_IFD0)))
+        self.assertEqual(meta.date_taken, "2020-01-01 00:00:00")
+
+    def test_without_exif(self):
+        meta = self.read("a.jpg", build_jpeg(width=32, height=16))
+        self.assertEqual(meta, ImageMetadata(width=32, height=16))
+
+    def test_damaged_exif_keeps_size(self):
+        tiff = build_tiff(CAMERA_IFD0)[:20]  # IFD0 cut short
+        meta = self.read("a.jpg", build_jpeg(tiff, width=32, height=16))
+        self.assertEqual((meta.width, meta.height), (32, 16))
+        self.assertIsNone(meta.date_taken)
+
+    def test_truncated_file(self):
+        meta = self.read("a.jpg", build_jpeg(build_tiff(CAMERA_IFD0))[:30])
+        self.assertIsNone(meta.width)
+
+    def test_invalid_orientation_ignored(self):
+        meta = self.read("a.jpg", build_jpeg(build_tiff([(0x0112, SHORT, 42)])))
+        self.assertIsNone(meta.orientation)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Other formats
+# ═══════════════════════════════════════════════════════════════════════════
+class TestReadOtherFormats(ExifFileTestCase):
+    """Verify TIFF and PNG headers and unknown files."""
+
+    def test_tiff_file(self):
+        ifd0 = CAMERA_IFD0 + [(0x0100, LONG, 800), (0x0101, SHORT, 600)]
+        meta = self.read("a.tif", build_tiff(ifd0, endian=">"))
+        self.assertEqual((meta.width, meta.height), (800, 600))
+        self.assertEqual(meta.date_taken, "2020-01-01 00:00:00")
+        self.assertEqual(meta.camera, "Canon EOS 5D")
+
+    def test_png_size(self):
+        ihdr = struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", 300, 200)
+        meta = self.read("a.png", b"\x89PNG\r\n\x1a\n" + ihdr + bytes(9))
+        self.assertEqual((meta.width, meta.height), (300, 200))
+
+    def test_unknown_format(self):
+        self.assertEqual(self.read("a.gif", b"GIF89a" + bytes(20)), ImageMetadata())
+
+    def test_missing_file_raises(self):
+        with self.assertRaises(OSError):
+            read_metadata(os.path.join(self.tmpdir, "nothere.jpg"))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Copying Exif data
+# ═══════════════════════════════════════════════════════════════════════════
+class TestCopyExif(ExifFileTestCase):
+    """Verify the Exif segment is carried into re-encoded JPEGs."""
+
+    def write(self, name, data):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, "wb") as fp:
+            fp.write(data)
+        return path
+
+    def test_round_trip_with_orientation_reset(self):
+        for endian in ("<", ">"):
+            src = self.write("src.jpg", build_jpeg(build_tiff(CAMERA_IFD0, CAMERA_EXIF, endian)))
+            payload = read_exif_segment(src)
+            self.assertTrue(payload.startswith(b"Exif\x00\x00"))
+            copy = insert_exif_segment(build_jpeg(), reset_orientation(payload))
+            meta = self.read("copy.jpg", copy)
+            self.assertEqual(meta.orientation, 1)
+            self.assertEqual(meta.camera, "Canon EOS 5D")
+            self.assertEqual(meta.date_taken, "2019-07-14 18:30:05")
+            self.assertEqual((meta.width, meta.height), (640, 480))
+
+    def test_no_exif(self):
+        self.assertIsNone(read_exif_segment(self.write("a.jpg", build_jpeg())))
+        self.assertIsNone(read_exif_segment(self.write("a.png", b"\x89PNG\r\n\x1a\n")))
+
+    def test_reset_orientation_leaves_other_payloads(self):
+        self.assertEqual(reset_orientation(b"Exif\x00\x00junk"), b"Exif\x00\x00junk")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Helpers
+# ═══════════════════════════════════════════════════════════════════════════
+class TestNormalizeDatetime(unittest.TestCase):
+    """Verify EXIF date strings become sortable text."""
+
+    def test_valid(self):
+        self.assertEqual(normalize_datetime("2021:12:31 23:59:58"), "2021-12-31 23:59:58")
+
+    def test_blank_and_zero(self):
+        self.assertIsNone(normalize_datetime("    :  :     :  :  "))
+        self.assertIsNone(normalize_datetime("0000:00:00 00:00:00"))
+
+    def test_malformed(self):
+        self.assertIsNone(normalize_datetime("2021-12-31"))
+
+
+class TestImageMetadata(unittest.TestCase):
+    """Verify derived metadata properties."""
+
+    def test_camera_drops_repeated_make(self):
+        self.assertEqual(ImageMetadata(make="NIKON", model="NIKON D750").camera, "NIKON D750")
+        self.assertEqual(ImageMetadata(make="Apple", model="iPhone 12").camera, "Apple iPhone 12")
+        self.assertIsNone(ImageMetadata().camera)
+
+    def test_display_size_swaps_for_rotation(self):
+        self.assertEqual(ImageMetadata(orientation=6, width=40, height=30).display_size, (30, 40))
+        self.assertEqual(ImageMetadata(orientation=3, width=40, height=30).display_size, (40, 30))
+        self.assertIsNone(ImageMetadata(orientation=6).display_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS Photo Viewer histogram.
+
+Validates the sampling step, the counts and exposure statistics taken
+from a pixbuf with a padded rowstride (when numpy is installed), the
+plotted outline, and that the worker only delivers the latest request.
+"""
+
+import sys
+import os
+import types
+import unittest
+from unittest import mock
+
+# ---------------------------------------------------------------------------
+# Mock gi / gi.repository so photo viewer modules can be imported headlessly.
+# ---------------------------------------------------------------------------
+sys.path.insert(0, os.path.dirname(__file__))
+from test_helpers import install_gtk_mocks
+
+install_gtk_mocks()
+
+# Mock cairo module if pycairo is not installed
+try:
+    import cairo  # noqa: F401
+except ImportError:
+    sys.modules["cairo"] = types.ModuleType("cairo")
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_photo_viewer import histogram
+from mados_photo_viewer.histogram import (
+    BINS,
+    HISTOGRAM_SAMPLES,
+    Histogram,
+    HistogramWorker,
+    sample_pixbuf,
+    sample_step,
+    trace_channel,
+)
+
+
+class FakePixbuf:
+    """RGB pixbuf with rows padded to a 4-byte stride, like GdkPixbuf."""
+
+    def __init__(self, pixels):
+        self._pixels = pixels  # rows of (r, g, b)
+        self._stride = (len(pixels[0]) * 3 + 3) // 4 * 4
+        self.scaled = None
+
+    def get_width(self):
+        return len(self._pixels[0])
+
+    def get_height(self):
+        return len(self._pixels)
+
+    def get_n_channels(self):
+        return 3
+
+    def get_rowstride(self):
+        return self._stride
+
+    def get_pixels(self):
+        rows = [bytes(v for px in row for v in px) for row in self._pixels]
+        # The last row is not padded
+        return b"".join(r.ljust(self._stride, b"\xee") for r in rows[:-1]) + rows[-1]
+
+    def scale_simple(self, width, height, interp):
+        self.scaled = (width, height)
+        return FakePixbuf([[(0, 0, 0)] * width for _ in range(height)])
+
+
+class TestSampling(unittest.TestCase):
+    """Verify how many pixels are counted."""
+
+    def test_step(self):
+        self.assertEqual(sample_step(800, 600), 1)
+        self.assertEqual(sample_step(6000, 4000), 5)
+        # The sampled count stays near the target
+        step = sample_step(6000, 4000)
+        self.assertLessEqual((6000 // step) * (4000 // step), HISTOGRAM_SAMPLES)
+
+    def test_small_pixbuf_not_copied(self):
+        pixbuf = FakePixbuf([[(1, 2, 3)] * 4] * 3)
+        self.assertEqual(sample_pixbuf(pixbuf), (pixbuf, 1.0))
+        self.assertIsNone(pixbuf.scaled)
+
+    def test_large_pixbuf_reduced(self):
+        pixbuf = mock.Mock()
+        pixbuf.get_width.return_value = 6000
+        pixbuf.get_height.return_value = 4000
+        sample, scale = sample_pixbuf(pixbuf)
+        self.assertEqual(pixbuf.scale_simple.call_args[0][:2], (1200, 800))
+        self.assertIs(sample, pixbuf.scale_simple.return_value)
+        self.assertEqual(scale, 0.2)
+
+
+class TestHistogramStats(unittest.TestCase):
+    def test_mean_and_clipping(self):
+        luma = [0] * BINS
+        luma[0], luma[100], luma[255] = 1, 2, 1
+        h = Histogram([0] * BINS, [0] * BINS, [0] * BINS, luma)
+        self.assertEqual(h.samples, 4)
+        self.assertAlmostEqual(h.mean, (200 + 255) / 4)
+        self.assertEqual((h.shadows, h.highlights), (0.25, 0.25))
+        self.assertEqual(h.peak, 2)
+
+
+@unittest.skipUnless(histogram.NUMPY_AVAILABLE, "numpy not installed")
+class TestComputeHistogram(unittest.TestCase):
+    """Verify counts from a pixbuf whose rows are padded."""
+
+    def test_counts_skip_row_padding(self):
+        pixbuf = FakePixbuf(
+            [
+                [(255, 0, 0), (0, 255, 0), (0, 0, 255)],
+                [(255, 255, 255), (0, 0, 0), (255, 0, 0)],
+            ]
+        )
+        h = histogram.compute_histogram(pixbuf)
+        self.assertEqual(h.samples, 6)
+        self.assertEqual((h.red[255], h.red[0]), (3, 3))
+        self.assertEqual(h.red[0xEE] + h.green[0xEE] + h.blue[0xEE], 0)
+        self.assertEqual((h.luma[0], h.luma[255]), (1, 1))
+        self.assertEqual(h.luma[(255 * 54) >> 8], 2)
+
+
+class TestTraceChannel(unittest.TestCase):
+    def test_outline(self):
+        cr = mock.Mock()
+        trace_channel(cr, [0, 5, 10, 0], 10, 8, 20)
+        cr.move_to.assert_called_once_with(0, 20)
+        points = [c.args for c in cr.line_to.call_args_list]
+        self.assertEqual(points[2:6], [(2.0, 10.0), (4.0, 10.0), (4.0, 0.0), (6.0, 0.0)])
+        self.assertEqual(points[-1], (8, 20))
+        cr.close_path.assert_called_once()
+
+
+class TestHistogramWorker(unittest.TestCase):
+    """Verify that only the latest request is delivered."""
+
+    def setUp(self):
+        self.idle = []
+        for target, replacement in (
+            ("image_histogram", lambda pixbuf, history, width: ("histogram of", pixbuf)),
+            ("GLib", mock.MagicMock()),
+        ):
+            patcher = mock.patch.object(histogram, target, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        histogram.GLib.idle_add.side_effect = lambda fn, *a: self.idle.append((fn, a))
+
+    def drain(self, worker):
+        worker._executor.submit(lambda: None).result()
+        while self.idle:
+            fn, args = self.idle.pop(0)
+            fn(*args)
+
+    def test_latest_request_delivered(self):
+        worker = HistogramWorker()
+        results = []
+        worker.request("old", results.append)
+        worker.request("new", results.append)
+        self.drain(worker)
+        self.assertEqual(results, [("histogram of", "new")])
+        worker.shutdown()
+
+    def test_cancelled_request_not_delivered(self):
+        worker = HistogramWorker()
+        results = []
+        worker.request("a", results.append)
+        worker.cancel()
+        self.drain(worker)
+        self.assertEqual(results, [])
+        worker.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
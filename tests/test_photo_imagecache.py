@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS Photo Viewer decoded image cache and prefetcher.
+
+Validates the byte-budgeted LRU eviction of DecodedImageCache, the
+two-tier (screen-sized, then full-resolution) decode bookkeeping, and the
+background decode / prefetch behaviour of ImageLoader, using fake pixbufs
+and a fake decoder so no real images or display are required.
+"""
+
+import sys
+import os
+import threading
+import unittest
+from unittest import mock
+
+# ---------------------------------------------------------------------------
+# Mock gi / gi.repository so photo viewer modules can be imported headlessly.
+# ---------------------------------------------------------------------------
+sys.path.insert(0, os.path.dirname(__file__))
+from test_helpers import install_gtk_mocks
+
+install_gtk_mocks()
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_photo_viewer import imagecache
+from mados_photo_viewer.imagecache import (
+    MAX_CACHE_BUDGET,
+    DecodedImage,
+    DecodedImageCache,
+    ImageLoader,
+    default_cache_budget,
+    orient_pixbuf,
+    reduced_size,
+)
+
+
+class FakePixbuf:
+    """Stand-in for GdkPixbuf.Pixbuf exposing size and byte length."""
+
+    def __init__(self, size, width=10, height=10):
+        self._size = size
+        self._width = width
+        self._height = height
+
+    def get_byte_length(self):
+        return self._size
+
+    def get_width(self):
+        return self._width
+
+    def get_height(self):
+        return self._height
+
+
+class OrientedPixbuf(FakePixbuf):
+    """FakePixbuf carrying an EXIF orientation option."""
+
+    def __init__(self, orientation, width=40, height=30):
+        super().__init__(width * height * 4, width, height)
+        self.orientation = orientation
+
+    def get_option(self, key):
+        return self.orientation if key == "orientation" else None
+
+    def apply_embedded_orientation(self):
+        if self.orientation in ("5", "6", "7", "8"):
+            return FakePixbuf(self._size, self._height, self._width)
+        return self
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# EXIF orientation
+# ═══════════════════════════════════════════════════════════════════════════
+class TestOrientPixbuf(unittest.TestCase):
+    """Verify the embedded orientation is applied without re-decoding."""
+
+    def test_rotated(self):
+        pixbuf, transposed = orient_pixbuf(OrientedPixbuf("6"))
+        self.assertTrue(transposed)
+        self.assertEqual((pixbuf.get_width(), pixbuf.get_height()), (30, 40))
+
+    def test_upright_or_missing(self):
+        for orientation in ("1", "3", None):
+            source = OrientedPixbuf(orientation)
+            pixbuf, transposed = orient_pixbuf(source)
+            self.assertFalse(transposed)
+            self.assertIs(pixbuf, source)
+
+    def test_decode_reports_oriented_full_size(self):
+        with mock.patch.object(imagecache, "GdkPixbuf") as gdkpixbuf:
+            gdkpixbuf.Pixbuf.get_file_info.return_value = (object(), 4000, 3000)
+            gdkpixbuf.Pixbuf.new_from_file_at_scale.return_value = OrientedPixbuf("8", 400, 300)
+            image = imagecache.decode_image("/photo.jpg", (800, 800))
+        self.assertEqual((image.width, image.height), (3000, 4000))
+        self.assertEqual(image.pixbuf.get_width(), 300)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Two-tier sizing
+# ═══════════════════════════════════════════════════════════════════════════
+class TestReducedSize(unittest.TestCase):
+    """Verify screen-sized decode targets."""
+
+    def test_scales_to_fit_box(self):
+        self.assertEqual(reduced_size(8000, 6000, (1920, 1080)), (1440, 1080))
+
+    def test_never_upscales(self):
+        self.assertEqual(reduced_size(800, 600, (1920, 1080)), (800, 600))
+
+    def test_minimum_one_pixel(self):
+        self.assertEqual(reduced_size(10000, 1, (100, 100)), (100, 1))
+
+    def test_decoded_image_reduced(self):
+        image = DecodedImage(FakePixbuf(10, 1440, 1080), 8000, 6000)
+        self.assertTrue(image.is_reduced)
+        self.assertEqual((image.width, image.height), (8000, 6000))
+
+    def test_decoded_image_full(self):
+        image = DecodedImage(FakePixbuf(10, 800, 600))
+        self.assertFalse(image.is_reduced)
+        self.assertEqual((image.width, image.height), (800, 600))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# DecodedImageCache
+# ═══════════════════════════════════════════════════════════════════════════
+class TestDecodedImageCache(unittest.TestCase):
+    """Verify byte-budgeted LRU behaviour."""
+
+    def test_default_budget_is_capped(self):
+        self.assertLessEqual(default_cache_budget(), MAX_CACHE_BUDGET)
+        self.assertGreater(default_cache_budget(), 0)
+
+    def test_put_and_get(self):
+        cache = DecodedImageCache(budget=100)
+        pb = FakePixbuf(10)
+        cache.put("/a.jpg", pb)
+        self.assertIs(cache.get("/a.jpg"), pb)
+        self.assertEqual(cache.bytes_used, 10)
+
+    def test_missing(self):
+        self.assertIsNone(DecodedImageCache(budget=100).get("/none.jpg"))
+
+    def test_evicts_least_recently_used(self):
+        cache = DecodedImageCache(budget=100)
+        cache.put("/a.jpg", FakePixbuf(40))
+        cache.put("/b.jpg", FakePixbuf(40))
+        cache.get("/a.jpg")  # a becomes most recent
+        cache.put("/c.jpg", FakePixbuf(40))
+        self.assertIn("/a.jpg", cache)
+        self.assertNotIn("/b.jpg", cache)
+        self.assertIn("/c.jpg", cache)
+        self.assertEqual(cache.bytes_used, 80)
+
+    def test_keeps_oversized_newest_entry(self):
+        cache = DecodedImageCache(budget=100)
+        cache.put("/a.jpg", FakePixbuf(40))
+        cache.put("/huge.jpg", FakePixbuf(500))
+        self.assertEqual(len(cache), 1)
+        self.assertIn("/huge.jpg", cache)
+
+    def test_replace_updates_byte_count(self):
+        cache = DecodedImageCache(budget=100)
+        cache.put("/a.jpg", FakePixbuf(40))
+        cache.put("/a.jpg", FakePixbuf(20))
+        self.assertEqual(cache.bytes_used, 20)
+        self.assertEqual(len(cache), 1)
+
+    def test_invalidate(self):
+        cache = DecodedImageCache(budget=100)
+        cache.put("/a.jpg", FakePixbuf(40))
+        cache.invalidate("/a.jpg")
+        self.assertNotIn("/a.jpg", cache)
+        self.assertEqual(cache.bytes_used, 0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ImageLoader
+# ═══════════════════════════════════════════════════════════════════════════
+def _run_immediately(func, *args):
+    func(*args)
+    return 0
+
+
+class TestImageLoader(unittest.TestCase):
+    """Verify background decode delivery and prefetch bookkeeping."""
+
+    def setUp(self):
+        patcher = mock.patch.object(imagecache.GLib, "idle_add", _run_immediately)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.decoded = []
+        self.loader = ImageLoader(
+            cache=DecodedImageCache(budget=1000), max_workers=1, decoder=self._decode
+        )
+        self.addCleanup(self.loader.shutdown)
+
+    def _decode(self, filepath, max_size):
+        self.decoded.append((filepath, max_size))
+        if max_size is None:
+            return DecodedImage(FakePixbuf(40, 400, 300))
+        return DecodedImage(FakePixbuf(10, 100, 75), 400, 300)
+
+    def _load_and_wait(self, filepath, full=False):
+        done = threading.Event()
+        results = []
+
+        def callback(path, pixbuf):
+            results.append((path, pixbuf))
+            done.set()
+
+        cached = self.loader.load(filepath, callback, full=full)
+        if cached is None:
+            self.assertTrue(done.wait(5))
+        return cached, results
+
+    def test_load_decodes_in_background(self):
+        cached, results = self._load_and_wait("/a.jpg")
+        self.assertIsNone(cached)
+        self.assertEqual(results[0][0], "/a.jpg")
+        self.assertIsNotNone(results[0][1])
+
+    def test_second_load_hits_cache(self):
+        self._load_and_wait("/a.jpg")
+        cached, results = self._load_and_wait("/a.jpg")
+        self.assertIsNotNone(cached)
+        self.assertEqual(results, [])
+        self.assertEqual(self.decoded, [("/a.jpg", None)])
+
+    def test_prefetch_fills_cache(self):
+        self.loader.prefetch(["/b.jpg"])
+        self.loader._executor.submit(lambda: None).result(timeout=5)
+        self.assertIn("/b.jpg", self.loader.cache)
+
+    def test_decode_failure_reports_none(self):
+        def failing(filepath, max_size):
+            raise RuntimeError("corrupt")
+
+        self.loader._decoder = failing
+        cached, results = self._load_and_wait("/bad.jpg")
+        self.assertIsNone(results[0][1])
+        self.assertNotIn("/bad.jpg", self.loader.cache)
+
+    def test_first_tier_is_screen_sized(self):
+        self.loader.preview_size = (100, 100)
+        _, results = self._load_and_wait("/a.jpg")
+        self.assertTrue(results[0][1].is_reduced)
+        self.assertEqual(self.decoded, [("/a.jpg", (100, 100))])
+
+    def test_full_load_replaces_reduced_entry(self):
+        self.loader.preview_size = (100, 100)
+        self._load_and_wait("/a.jpg")
+        cached, results = self._load_and_wait("/a.jpg", full=True)
+        self.assertIsNone(cached)
+        self.assertFalse(results[0][1].is_reduced)
+        self.assertFalse(self.loader.cache.get("/a.jpg").is_reduced)
+
+    def test_reduced_does_not_replace_full_entry(self):
+        self._load_and_wait("/a.jpg", full=True)
+        self.loader.preview_size = (100, 100)
+        cached, _ = self._load_and_wait("/a.jpg")
+        self.assertFalse(cached.is_reduced)
+
+    def test_invalidate(self):
+        self._load_and_wait("/a.jpg")
+        self.loader.invalidate("/a.jpg")
+        self.assertNotIn("/a.jpg", self.loader.cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS Photo Viewer metadata cache and indexer.
+
+Validates the SQLite MetadataCache (round trip, replacement, deletion,
+schema reset) and the MetadataIndexer's use of it: cached entries are
+served immediately, reused while mtime and size match, and re-read when
+a file changes.  A fake header reader counts reads so no images are
+needed.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+# ---------------------------------------------------------------------------
+# Mock gi / gi.repository so photo viewer modules can be imported headlessly.
+# ---------------------------------------------------------------------------
+sys.path.insert(0, os.path.dirname(__file__))
+from test_helpers import install_gtk_mocks
+
+install_gtk_mocks()
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_photo_viewer import metadata
+from mados_photo_viewer.exif import ImageMetadata
+from mados_photo_viewer.metadata import MetadataCache, MetadataIndexer, open_cache
+
+
+class TempDirTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "cache", "metadata.db")
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MetadataCache
+# ═══════════════════════════════════════════════════════════════════════════
+class TestMetadataCache(TempDirTestCase):
+    """Verify SQLite persistence of header metadata."""
+
+    def setUp(self):
+        super().setUp()
+        self.cache = MetadataCache(self.db_path)
+
+    def tearDown(self):
+        self.cache.close()
+        super().tearDown()
+
+    def test_round_trip(self):
+        meta = ImageMetadata("2020-05-01 10:00:00", 6, "Canon", "EOS", 4000, 3000)
+        self.cache.store("/photos", [("a.jpg", 123, 456, meta)])
+        self.assertEqual(self.cache.load_directory("/photos"), {"a.jpg": (123, 456, meta)})
+        self.assertEqual(self.cache.load_directory("/other"), {})
+
+    def test_store_replaces(self):
+        self.cache.store("/photos", [("a.jpg", 1, 1, ImageMetadata())])
+        self.cache.store("/photos", [("a.jpg", 2, 2, ImageMetadata(orientation=3))])
+        self.assertEqual(
+            self.cache.load_directory("/photos"), {"a.jpg": (2, 2, ImageMetadata(orientation=3))}
+        )
+
+    def test_forget(self):
+        entries = [(n, 1, 1, ImageMetadata()) for n in ("a.jpg", "b.jpg")]
+        self.cache.store("/photos", entries)
+        self.cache.forget("/photos", ["a.jpg"])
+        self.assertEqual(list(self.cache.load_directory("/photos")), ["b.jpg"])
+
+    def test_persists_across_connections(self):
+        self.cache.store("/photos", [("a.jpg", 1, 1, ImageMetadata(width=5, height=6))])
+        self.cache.close()
+        self.cache = MetadataCache(self.db_path)
+        self.assertIn("a.jpg", self.cache.load_directory("/photos"))
+
+    def test_old_schema_discarded(self):
+        self.cache.store("/photos", [("a.jpg", 1, 1, ImageMetadata())])
+        self.cache.close()
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA user_version = 0")
+        conn.commit()
+        conn.close()
+        self.cache = MetadataCache(self.db_path)
+        self.assertEqual(self.cache.load_directory("/photos"), {})
+
+    def test_open_cache_failure_returns_none(self):
+        blocker = os.path.join(self.tmpdir, "file")
+        open(blocker, "w").close()
+        self.assertIsNone(open_cache(os.path.join(blocker, "metadata.db")))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MetadataIndexer
+# ═══════════════════════════════════════════════════════════════════════════
+class TestMetadataIndexer(TempDirTestCase):
+    """Verify background indexing on top of the cache."""
+
+    def setUp(self):
+        super().setUp()
+        self.photos = os.path.join(self.tmpdir, "photos")
+        os.makedirs(self.photos)
+        self.reads = []
+        self.dates = {}
+        self.updates = []
+        self.idle = []
+        # Main-loop callbacks are queued here and run by wait()
+        patcher = mock.patch.object(
+            metadata.GLib, "idle_add", side_effect=lambda fn, *args: self.idle.append((fn, args))
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def reader(self, path):
+        name = os.path.basename(path)
+        self.reads.append(name)
+        return ImageMetadata(date_taken=self.dates.get(name))
+
+    def make_indexer(self):
+        indexer = MetadataIndexer(MetadataCache(self.db_path), reader=self.reader)
+        indexer.on_updated = self.updates.append
+        return indexer
+
+    def wait(self, indexer):
+        """Run queued worker jobs, then their main-loop callbacks."""
+        indexer._executor.submit(lambda: None).result()
+        while self.idle:
+            fn, args = self.idle.pop(0)
+            fn(*args)
+
+    def write(self, name, data=b"x"):
+        with open(os.path.join(self.photos, name), "wb") as fp:
+            fp.write(data)
+
+    def test_reads_new_files_and_notifies(self):
+        self.write("a.jpg")
+        self.write("b.jpg")
+        self.dates["a.jpg"] = "2020-01-01 00:00:00"
+        indexer = self.make_indexer()
+        indexer.index(self.photos, ["a.jpg", "b.jpg", "clip.mp4"])
+        self.wait(indexer)
+        self.assertEqual(sorted(self.reads), ["a.jpg", "b.jpg"])
+        self.assertEqual(indexer.date_taken("a.jpg"), "2020-01-01 00:00:00")
+        self.assertIsNone(indexer.date_taken("b.jpg"))
+        self.assertEqual(self.updates, [{"a.jpg", "b.jpg"}])
+        indexer.shutdown()
+
+    def test_cached_entries_available_before_scan(self):
+        self.write("a.jpg")
+        self.dates["a.jpg"] = "2020-01-01 00:00:00"
+        first = self.make_indexer()
+        first.index(self.photos, ["a.jpg"])
+        self.wait(first)
+        first.shutdown()
+
+        second = self.make_indexer()
+        with mock.patch.object(second._executor, "submit"):
+            second.index(self.photos, ["a.jpg"])
+        self.assertEqual(second.date_taken("a.jpg"), "2020-01-01 00:00:00")
+        second.shutdown()
+
+    def test_unchanged_files_not_reread(self):
+        self.write("a.jpg")
+        first = self.make_indexer()
+        first.index(self.photos, ["a.jpg"])
+        self.wait(first)
+        first.shutdown()
+        self.reads.clear()
+
+        second = self.make_indexer()
+        second.index(self.photos, ["a.jpg"])
+        self.wait(second)
+        self.assertEqual(self.reads, [])
+        second.shutdown()
+
+    def test_changed_file_reread(self):
+        self.write("a.jpg")
+        first = self.make_indexer()
+        first.index(self.photos, ["a.jpg"])
+        self.wait(first)
+        first.shutdown()
+        self.reads.clear()
+
+        self.write("a.jpg", b"longer content")
+        self.dates["a.jpg"] = "2021-06-01 12:00:00"
+        second = self.make_indexer()
+        second.index(self.photos, ["a.jpg"])
+        self.wait(second)
+        self.assertEqual(self.reads, ["a.jpg"])
+        self.assertEqual(second.date_taken("a.jpg"), "2021-06-01 12:00:00")
+        second.shutdown()
+
+    def test_stale_rows_pruned(self):
+        self.write("a.jpg")
+        self.write("b.jpg")
+        indexer = self.make_indexer()
+        indexer.index(self.photos, ["a.jpg", "b.jpg"])
+        self.wait(indexer)
+        indexer.shutdown()
+
+        indexer = self.make_indexer()
+        indexer.index(self.photos, ["a.jpg"])
+        self.wait(indexer)
+        self.assertEqual(list(indexer._cache.load_directory(self.photos)), ["a.jpg"])
+        indexer.shutdown()
+
+    def test_forget(self):
+        self.write("a.jpg")
+        indexer = self.make_indexer()
+        indexer.index(self.photos, ["a.jpg"])
+        self.wait(indexer)
+        indexer.forget(["a.jpg"])
+        self.assertIsNone(indexer.get("a.jpg"))
+        self.assertEqual(indexer._cache.load_directory(self.photos), {})
+        indexer.shutdown()
+
+    def test_directory_switch_drops_old_results(self):
+        self.write("a.jpg")
+        indexer = self.make_indexer()
+        indexer.index(self.photos, ["a.jpg"])
+        self.wait(indexer)
+        other = os.path.join(self.tmpdir, "other")
+        os.makedirs(other)
+        indexer.index(other, [])
+        self.assertIsNone(indexer.get("a.jpg"))
+        self.assertEqual(indexer.directory, other)
+        indexer.shutdown()
+
+    def test_works_without_cache(self):
+        self.write("a.jpg")
+        indexer = MetadataIndexer(None, reader=self.reader)
+        indexer.index(self.photos, ["a.jpg"])
+        self.wait(indexer)
+        self.assertIsNotNone(indexer.get("a.jpg"))
+        indexer.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -37,7 +37,10 @@ from mados_photo_viewer.navigator import (
     is_image_file,
     is_video_file,
     is_media_file,
+    DirectoryWatcher,
     FileNavigator,
+    date_sort_key,
+    sort_key,
 )
 
 
@@ -330,6 +333,54 @@ class TestFileNavigatorGoToFile(unittest.TestCase):
         shutil.rmtree(otherdir, ignore_errors=True)
 
 
+class TestFileNavigatorListing(unittest.TestCase):
+    """Verify listing accessors used by the thumbnail views."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        for f in ["a.jpg", "b.png", "c.mp4"]:
+            with open(os.path.join(self.tmpdir, f), "w") as fp:
+                fp.write("test")
+        self.nav = FileNavigator()
+        self.nav.load_directory(os.path.join(self.tmpdir, "a.jpg"))
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_directory(self):
+        self.assertEqual(self.nav.directory, os.path.abspath(self.tmpdir))
+
+    def test_filenames(self):
+        self.assertEqual(self.nav.filenames, ["a.jpg", "b.png", "c.mp4"])
+
+    def test_go_to_index(self):
+        path = self.nav.go_to_index(2)
+        self.assertEqual(path, os.path.join(os.path.abspath(self.tmpdir), "c.mp4"))
+        self.assertEqual(self.nav.current_index, 3)
+
+    def test_go_to_index_out_of_range(self):
+        self.assertIsNone(self.nav.go_to_index(5))
+        self.assertEqual(self.nav.current_filename, "a.jpg")
+
+    def test_peek_does_not_move(self):
+        self.assertTrue(self.nav.peek(1).endswith("b.png"))
+        self.assertEqual(self.nav.current_filename, "a.jpg")
+
+    def test_peek_wraps_around(self):
+        self.assertTrue(self.nav.peek(-1).endswith("c.mp4"))
+        self.assertTrue(self.nav.peek(4).endswith("b.png"))
+
+    def test_peek_empty(self):
+        self.assertIsNone(FileNavigator().peek(1))
+
+    def test_rescan_creates_new_listing(self):
+        before = self.nav.filenames
+        self.nav.refresh()
+        self.assertIsNot(self.nav.filenames, before)
+
+
 class TestFileNavigatorRefresh(unittest.TestCase):
     """Verify refresh() rescans directory while maintaining position."""
 
@@ -377,6 +428,162 @@ class TestFileNavigatorRefresh(unittest.TestCase):
         nav.refresh()  # Should not raise
 
 
+class TestFileNavigatorApplyChanges(unittest.TestCase):
+    """Verify incremental listing updates from directory events."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        for f in ["b.jpg", "d.png", "f.mp4"]:
+            self._touch(f)
+        self.nav = FileNavigator()
+        self.nav.load_directory(os.path.join(self.tmpdir, "d.png"))
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _touch(self, name):
+        with open(os.path.join(self.tmpdir, name), "w") as fp:
+            fp.write("test")
+
+    def test_index_of(self):
+        self.assertEqual(self.nav.index_of("f.mp4"), 2)
+        self.assertEqual(self.nav.index_of("zzz.jpg"), -1)
+        self.assertEqual(self.nav.index_of("D.png"), -1)
+
+    def test_added_file_inserted_in_order(self):
+        self._touch("C.gif")
+        self.assertTrue(self.nav.apply_changes(added={"C.gif"}))
+        self.assertEqual(self.nav.filenames, ["b.jpg", "C.gif", "d.png", "f.mp4"])
+        self.assertEqual(self.nav.current_filename, "d.png")
+
+    def test_removed_file(self):
+        os.unlink(os.path.join(self.tmpdir, "b.jpg"))
+        self.assertTrue(self.nav.apply_changes(removed={"b.jpg"}))
+        self.assertEqual(self.nav.filenames, ["d.png", "f.mp4"])
+        self.assertEqual(self.nav.current_filename, "d.png")
+
+    def test_removed_current_file_clamps(self):
+        self.assertTrue(self.nav.apply_changes(removed={"d.png", "f.mp4"}))
+        self.assertEqual(self.nav.current_filename, "b.jpg")
+
+    def test_ignores_non_media_missing_and_duplicates(self):
+        self._touch("notes.txt")
+        changed = self.nav.apply_changes(
+            added={"notes.txt", "ghost.jpg", "b.jpg"}, removed={"nothere.png"}
+        )
+        self.assertFalse(changed)
+        self.assertEqual(self.nav.total_count, 3)
+
+    def test_change_creates_new_listing(self):
+        before = self.nav.filenames
+        self._touch("a.jpg")
+        self.nav.apply_changes(added={"a.jpg"})
+        self.assertIsNot(self.nav.filenames, before)
+        self.assertEqual(before, ["b.jpg", "d.png", "f.mp4"])
+
+    def test_bulk_changes_match_rescan(self):
+        names = {f"img{i:03d}.jpg" for i in range(100)}
+        for name in names:
+            self._touch(name)
+        os.unlink(os.path.join(self.tmpdir, "f.mp4"))
+        self.nav.apply_changes(added=names, removed={"f.mp4"})
+        listed = self.nav.filenames
+        self.nav.refresh()
+        self.assertEqual(listed, self.nav.filenames)
+        self.assertEqual(self.nav.current_filename, "d.png")
+
+    def test_no_directory(self):
+        self.assertFalse(FileNavigator().apply_changes(added={"a.jpg"}))
+
+
+class TestFileNavigatorSortKey(unittest.TestCase):
+    """Verify date-taken ordering through a replaceable sort key."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        for f in ["a.jpg", "b.jpg", "c.jpg", "d.jpg"]:
+            with open(os.path.join(self.tmpdir, f), "w") as fp:
+                fp.write("test")
+        self.dates = {"c.jpg": "2019-01-01 00:00:00", "a.jpg": "2021-01-01 00:00:00"}
+        self.nav = FileNavigator()
+        self.nav.load_directory(os.path.join(self.tmpdir, "b.jpg"))
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_date_key_orders_undated_last(self):
+        names = sorted(["b.jpg", "a.jpg", "c.jpg"], key=date_sort_key(self.dates.get))
+        self.assertEqual(names, ["c.jpg", "a.jpg", "b.jpg"])
+
+    def test_set_sort_key_keeps_current(self):
+        self.nav.set_sort_key(date_sort_key(self.dates.get))
+        self.assertEqual(self.nav.filenames, ["c.jpg", "a.jpg", "b.jpg", "d.jpg"])
+        self.assertEqual(self.nav.current_filename, "b.jpg")
+        self.assertEqual(self.nav.index_of("a.jpg"), 1)
+        self.nav.set_sort_key(sort_key)
+        self.assertEqual(self.nav.filenames, ["a.jpg", "b.jpg", "c.jpg", "d.jpg"])
+
+    def test_resort_after_dates_change(self):
+        self.nav.set_sort_key(date_sort_key(self.dates.get))
+        before = self.nav.filenames
+        self.assertFalse(self.nav.resort())
+        self.assertIs(self.nav.filenames, before)
+        self.dates["d.jpg"] = "2018-01-01 00:00:00"
+        self.assertTrue(self.nav.resort())
+        self.assertEqual(self.nav.filenames[0], "d.jpg")
+        self.assertEqual(self.nav.current_filename, "b.jpg")
+
+    def test_apply_changes_uses_key(self):
+        self.nav.set_sort_key(date_sort_key(self.dates.get))
+        with open(os.path.join(self.tmpdir, "e.jpg"), "w") as fp:
+            fp.write("test")
+        self.dates["e.jpg"] = "2020-01-01 00:00:00"
+        self.nav.apply_changes(added={"e.jpg"}, removed={"c.jpg"})
+        self.assertEqual(self.nav.filenames, ["e.jpg", "a.jpg", "b.jpg", "d.jpg"])
+
+    def test_rescan_keeps_key(self):
+        self.nav.set_sort_key(date_sort_key(self.dates.get))
+        self.nav.refresh()
+        self.assertEqual(self.nav.filenames, ["c.jpg", "a.jpg", "b.jpg", "d.jpg"])
+
+
+class TestDirectoryWatcher(unittest.TestCase):
+    """Verify event coalescing before delivery."""
+
+    def setUp(self):
+        self.batches = []
+        self.watcher = DirectoryWatcher("/tmp", lambda a, r: self.batches.append((a, r)))
+
+    def test_batches_events(self):
+        self.watcher.file_added("a.jpg")
+        self.watcher.file_added("b.png")
+        self.watcher.file_removed("c.gif")
+        self.assertEqual(self.batches, [])
+        self.watcher.flush()
+        self.assertEqual(self.batches, [({"a.jpg", "b.png"}, {"c.gif"})])
+
+    def test_ignores_non_media(self):
+        self.watcher.file_added("download.part")
+        self.watcher.flush()
+        self.assertEqual(self.batches, [])
+
+    def test_created_then_deleted_reports_removed(self):
+        self.watcher.file_added("a.jpg")
+        self.watcher.file_removed("a.jpg")
+        self.watcher.flush()
+        self.assertEqual(self.batches, [(set(), {"a.jpg"})])
+
+    def test_deleted_then_recreated_reports_added(self):
+        self.watcher.file_removed("a.jpg")
+        self.watcher.file_added("a.jpg")
+        self.watcher.flush()
+        self.assertEqual(self.batches, [({"a.jpg"}, set())])
+
+
 class TestFileNavigatorSingleFile(unittest.TestCase):
     """Verify navigation with only one file in the directory."""
 
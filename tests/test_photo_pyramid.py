@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS Photo Viewer render pyramid.
+
+Validates the pure layout helpers used by RenderPyramid: how many mipmap
+levels an image gets, which level is sampled at a given zoom, and the
+tile-aligned visible area.  Surface conversion itself needs a display
+and is not exercised here.
+"""
+
+import sys
+import os
+import types
+import unittest
+
+# ---------------------------------------------------------------------------
+# Mock gi / gi.repository so photo viewer modules can be imported headlessly.
+# ---------------------------------------------------------------------------
+sys.path.insert(0, os.path.dirname(__file__))
+from test_helpers import install_gtk_mocks
+
+install_gtk_mocks()
+
+# Mock cairo module if pycairo is not installed
+try:
+    import cairo  # noqa: F401
+except ImportError:
+    sys.modules["cairo"] = types.ModuleType("cairo")
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_photo_viewer.pyramid import (
+    TILE_SIZE,
+    MIN_LEVEL_SIZE,
+    level_count,
+    level_for_scale,
+    raster_scale,
+    visible_bounds,
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# level_count
+# ═══════════════════════════════════════════════════════════════════════════
+class TestLevelCount(unittest.TestCase):
+    """Verify the mipmap chain length."""
+
+    def test_small_image_single_level(self):
+        self.assertEqual(level_count(MIN_LEVEL_SIZE, 10), 1)
+
+    def test_halves_until_minimum(self):
+        # 1024 -> 512 -> 256 -> 128 -> 64
+        self.assertEqual(level_count(1024, 768), 5)
+
+    def test_odd_sizes_round_up(self):
+        self.assertEqual(level_count(65, 65), 2)
+
+    def test_large_image(self):
+        self.assertEqual(level_count(7728, 5152), 8)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# level_for_scale
+# ═══════════════════════════════════════════════════════════════════════════
+class TestLevelForScale(unittest.TestCase):
+    """Verify the sampled level never needs magnifying."""
+
+    def test_magnified_uses_full_resolution(self):
+        self.assertEqual(level_for_scale(1.0, 6), 0)
+        self.assertEqual(level_for_scale(3.0, 6), 0)
+
+    def test_exact_powers_of_two(self):
+        self.assertEqual(level_for_scale(0.5, 6), 1)
+        self.assertEqual(level_for_scale(0.25, 6), 2)
+
+    def test_between_levels_picks_larger(self):
+        self.assertEqual(level_for_scale(0.3, 6), 1)
+        self.assertEqual(level_for_scale(0.2, 6), 2)
+
+    def test_clamped_to_available_levels(self):
+        self.assertEqual(level_for_scale(0.001, 3), 2)
+
+    def test_non_positive_scale(self):
+        self.assertEqual(level_for_scale(0, 4), 0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# raster_scale
+# ═══════════════════════════════════════════════════════════════════════════
+class TestRasterScale(unittest.TestCase):
+    """Verify overlay raster resolution steps with the zoom."""
+
+    def test_power_of_two_at_or_above_zoom(self):
+        self.assertEqual(raster_scale(0.3, 100, 100), 0.5)
+        self.assertEqual(raster_scale(1.0, 100, 100), 1.0)
+        self.assertEqual(raster_scale(2.5, 100, 100), 4.0)
+
+    def test_stable_within_band(self):
+        self.assertEqual(raster_scale(0.6, 100, 100), raster_scale(0.9, 100, 100))
+
+    def test_capped_by_budget(self):
+        scale = raster_scale(4.0, 1000, 1000, max_pixels=1000 * 1000)
+        self.assertAlmostEqual(scale, 1.0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# visible_bounds
+# ═══════════════════════════════════════════════════════════════════════════
+class TestVisibleBounds(unittest.TestCase):
+    """Verify clipping to tile-aligned visible areas."""
+
+    def test_aligned_to_tiles(self):
+        bounds = visible_bounds(300, 10, 700, 20, 4000, 3000)
+        self.assertEqual(bounds, (TILE_SIZE, 0, 3 * TILE_SIZE, TILE_SIZE))
+
+    def test_clamped_to_image(self):
+        self.assertEqual(visible_bounds(-100, -100, 5000, 5000, 1000, 600), (0, 0, 1000, 600))
+
+    def test_outside_image(self):
+        self.assertIsNone(visible_bounds(1200, 0, 1300, 100, 1000, 600))
+        self.assertIsNone(visible_bounds(-300, -300, -10, -10, 1000, 600))
+
+
+if __name__ == "__main__":
+    unittest.main()
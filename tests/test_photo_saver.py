@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS Photo Viewer background save pipeline.
+
+Validates format detection, encoder options, atomic writes (including
+failure mid-write), and the ImageSaver job flow with composition and
+encoding replaced by stubs.
+"""
+
+import sys
+import os
+import stat
+import types
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# ---------------------------------------------------------------------------
+# Mock gi / gi.repository so photo viewer modules can be imported headlessly.
+# ---------------------------------------------------------------------------
+sys.path.insert(0, os.path.dirname(__file__))
+from test_helpers import install_gtk_mocks
+
+install_gtk_mocks()
+
+# Mock cairo module if pycairo is not installed
+try:
+    import cairo  # noqa: F401
+except ImportError:
+    sys.modules["cairo"] = types.ModuleType("cairo")
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_photo_viewer import saver
+from mados_photo_viewer.saver import (
+    ImageSaver,
+    encoder_options,
+    format_for_path,
+    write_atomic,
+)
+from mados_photo_viewer.tools import EditHistory, PaintStroke
+
+
+def _run_immediately(func, *args):
+    func(*args)
+    return 0
+
+
+class FakeResult:
+    """Composed pixbuf stand-in whose encoder returns fixed bytes."""
+
+    def __init__(self, data):
+        self.data = data
+        self.calls = []
+
+    def save_to_bufferv(self, fmt, keys, values):
+        self.calls.append((fmt, keys, values))
+        return True, self.data
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Formats and options
+# ═══════════════════════════════════════════════════════════════════════════
+class TestFormats(unittest.TestCase):
+    """Verify extension mapping and encoder options."""
+
+    def test_known_extensions(self):
+        self.assertEqual(format_for_path("/a/b.JPG"), "jpeg")
+        self.assertEqual(format_for_path("x.tif"), "tiff")
+        self.assertEqual(format_for_path("x.png"), "png")
+
+    def test_unknown_extension_defaults_to_png(self):
+        self.assertEqual(format_for_path("x.webp"), "png")
+        self.assertEqual(format_for_path("noext"), "png")
+
+    def test_jpeg_quality(self):
+        self.assertEqual(encoder_options("jpeg", jpeg_quality=80), (["quality"], ["80"]))
+
+    def test_png_compression_clamped(self):
+        self.assertEqual(encoder_options("png", png_compression=12), (["compression"], ["9"]))
+
+    def test_other_formats_have_no_options(self):
+        self.assertEqual(encoder_options("bmp"), ([], []))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# write_atomic
+# ═══════════════════════════════════════════════════════════════════════════
+class TestWriteAtomic(unittest.TestCase):
+    """Verify temp-file-and-rename writes."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "photo.png")
+
+    def test_writes_new_file(self):
+        write_atomic(self.path, b"hello")
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"hello")
+        self.assertEqual(os.listdir(self.tmpdir.name), ["photo.png"])
+
+    def test_replaces_and_keeps_mode(self):
+        with open(self.path, "wb") as f:
+            f.write(b"old")
+        os.chmod(self.path, 0o640)
+        write_atomic(self.path, b"new")
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"new")
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o640)
+
+    def test_reports_progress_per_chunk(self):
+        seen = []
+        with mock.patch.object(saver, "WRITE_CHUNK", 4):
+            write_atomic(self.path, b"0123456789", seen.append)
+        self.assertEqual(len(seen), 3)
+        self.assertEqual(seen[-1], 1.0)
+
+    def test_failure_leaves_original_untouched(self):
+        with open(self.path, "wb") as f:
+            f.write(b"original")
+
+        def fail(fraction):
+            raise OSError("disk full")
+
+        with mock.patch.object(saver, "WRITE_CHUNK", 2):
+            with self.assertRaises(OSError):
+                write_atomic(self.path, b"0123456789", fail)
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"original")
+        self.assertEqual(os.listdir(self.tmpdir.name), ["photo.png"])
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ImageSaver
+# ═══════════════════════════════════════════════════════════════════════════
+class TestImageSaver(unittest.TestCase):
+    """Verify the background job flow."""
+
+    def setUp(self):
+        patcher = mock.patch.object(saver.GLib, "idle_add", _run_immediately)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_save_composes_encodes_and_writes(self):
+        result = FakeResult(b"encoded")
+        composed = []
+
+        def compose(pixbuf, history, effects):
+            composed.append((pixbuf, history, effects))
+            return result
+
+        job = ImageSaver(compose=compose)
+        path = os.path.join(self.tmpdir.name, "out.jpg")
+        progress, done = [], []
+        job.save(
+            path,
+            "pixbuf",
+            "history",
+            on_progress=lambda stage, f: progress.append((stage, f)),
+            on_done=lambda p, err: done.append((p, err)),
+            jpeg_quality=70,
+        )
+        job.shutdown(wait=True)
+
+        self.assertEqual(composed, [("pixbuf", "history", None)])
+        self.assertEqual(result.calls, [("jpeg", ["quality"], ["70"])])
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"encoded")
+        self.assertEqual(done, [(path, None)])
+        stages = [stage for stage, _ in progress]
+        self.assertEqual(stages[:3], ["compose", "encode", "write"])
+        fractions = [f for _, f in progress]
+        self.assertEqual(fractions, sorted(fractions))
+        self.assertEqual(fractions[-1], 1.0)
+        self.assertFalse(job.busy)
+
+    def test_reduced_image_decoded_on_worker(self):
+        decoded, composed = [], []
+
+        def decode(path):
+            decoded.append((path, threading.current_thread().name))
+            return "full-pixbuf"
+
+        def compose(pixbuf, history, effects):
+            composed.append(pixbuf)
+            return FakeResult(b"encoded")
+
+        job = ImageSaver(compose=compose, decode=decode)
+        job.save(os.path.join(self.tmpdir.name, "out.png"), None, "history", source_path="src.jpg")
+        job.shutdown(wait=True)
+        self.assertEqual(decoded[0][0], "src.jpg")
+        self.assertTrue(decoded[0][1].startswith("image-save"))
+        self.assertEqual(composed, ["full-pixbuf"])
+
+    def test_saves_queue_in_order(self):
+        done = []
+        job = ImageSaver(compose=lambda pixbuf, history, effects: FakeResult(history))
+        path = os.path.join(self.tmpdir.name, "out.png")
+        job.save(path, "pixbuf", b"first", on_done=lambda p, err: done.append(err))
+        job.save(path, "pixbuf", b"second", on_done=lambda p, err: done.append(err))
+        job.shutdown(wait=True)
+        self.assertEqual(done, [None, None])
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"second")
+
+    def test_error_reported(self):
+        def compose(pixbuf, history, effects):
+            raise RuntimeError("boom")
+
+        job = ImageSaver(compose=compose)
+        done = []
+        with mock.patch("builtins.print"):
+            job.save(
+                os.path.join(self.tmpdir.name, "out.png"),
+                "pixbuf",
+                "history",
+                on_done=lambda p, err: done.append(err),
+            )
+            job.shutdown(wait=True)
+        self.assertEqual(done, ["boom"])
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+
+class TestHistorySnapshot(unittest.TestCase):
+    """Verify the history snapshot is detached from later edits."""
+
+    def test_snapshot_detached(self):
+        history = EditHistory()
+        stroke = PaintStroke((1, 1, 1, 1), 3)
+        stroke.add_point(5, 5)
+        history.add_stroke(stroke)
+        snap = history.snapshot()
+        history.undo()
+        history.add_stroke(PaintStroke((0, 0, 0, 1), 3))
+        self.assertEqual(snap.strokes, [stroke])
+        self.assertTrue(snap.erase_at(5, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
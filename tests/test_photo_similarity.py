@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS Photo Viewer similar photo finder.
+
+Validates the difference hash, the BK-tree neighbour search against a
+brute-force scan, grouping, the SQLite hash index, and the scanner's
+incremental behaviour (only new or changed files are hashed).  Hashing
+is replaced by a fake and the process pool by a thread pool, so no
+images or subprocesses are needed.
+"""
+
+import sys
+import os
+import random
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+# ---------------------------------------------------------------------------
+# Mock gi / gi.repository so photo viewer modules can be imported headlessly.
+# ---------------------------------------------------------------------------
+sys.path.insert(0, os.path.dirname(__file__))
+from test_helpers import install_gtk_mocks
+
+install_gtk_mocks()
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_photo_viewer import similarity
+from mados_photo_viewer.similarity import (
+    BKTree,
+    HashIndex,
+    SimilarityScanner,
+    dhash,
+    group_similar,
+    hamming,
+    pixbuf_gray,
+)
+
+
+class FakeBytes:
+    def __init__(self, data):
+        self._data = data
+
+    def get_data(self):
+        return self._data
+
+
+class FakePixbuf:
+    """RGB pixbuf stand-in with a padded rowstride."""
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def get_width(self):
+        return len(self._rows[0])
+
+    def get_height(self):
+        return len(self._rows)
+
+    def get_rowstride(self):
+        return self.get_width() * 3 + 2
+
+    def get_n_channels(self):
+        return 3
+
+    def read_pixel_bytes(self):
+        data = b"".join(bytes(c for px in row for c in px) + b"\x00\x00" for row in self._rows)
+        return FakeBytes(data)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Hashing
+# ═══════════════════════════════════════════════════════════════════════════
+class TestDhash(unittest.TestCase):
+    """Verify the difference hash bits."""
+
+    def test_gradient(self):
+        falling = list(range(9, 0, -1)) * 8
+        self.assertEqual(dhash(falling), (1 << 64) - 1)
+        self.assertEqual(dhash(list(range(9)) * 8), 0)
+
+    def test_bit_order(self):
+        gray = [0] * 72
+        gray[0] = 1  # First comparison of the first row
+        self.assertEqual(dhash(gray), 1 << 63)
+
+    def test_hamming(self):
+        self.assertEqual(hamming(0b1011, 0b0001), 2)
+        self.assertEqual(hamming(5, 5), 0)
+
+    def test_pixbuf_gray_uses_rowstride(self):
+        pixbuf = FakePixbuf([[(255, 255, 255), (0, 0, 0)], [(255, 0, 0), (0, 0, 255)]])
+        self.assertEqual(pixbuf_gray(pixbuf), [255, 0, 76, 29])
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Neighbour search
+# ═══════════════════════════════════════════════════════════════════════════
+class TestBKTree(unittest.TestCase):
+    """Verify BK-tree queries match a brute-force scan."""
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        keys = [rng.getrandbits(64) for _ in range(300)]
+        # Add some near copies
+        keys += [k ^ (1 << rng.randrange(64)) for k in keys[:50]]
+        tree = BKTree()
+        for i, key in enumerate(keys):
+            tree.add(key, i)
+        self.assertEqual(len(tree), len(keys))
+        for probe in keys[:40]:
+            expected = sorted(
+                (hamming(probe, k), i) for i, k in enumerate(keys) if hamming(probe, k) <= 4
+            )
+            self.assertEqual(sorted(tree.query(probe, 4)), expected)
+
+    def test_identical_keys(self):
+        tree = BKTree()
+        tree.add(42, "a")
+        tree.add(42, "b")
+        self.assertEqual(sorted(tree.query(42, 0)), [(0, "a"), (0, "b")])
+
+    def test_empty(self):
+        self.assertEqual(BKTree().query(0, 10), [])
+
+
+class TestGroupSimilar(unittest.TestCase):
+    """Verify transitive grouping of near hashes."""
+
+    def test_groups(self):
+        hashes = {
+            "b.jpg": 0b0000,
+            "A.jpg": 0b0001,
+            "c.jpg": 0b0011,  # Within 1 of A, 2 of b
+            "far.jpg": (1 << 64) - 1,
+            "dup.jpg": (1 << 64) - 1,
+            "alone.jpg": 0xFFFF0000,
+        }
+        groups = group_similar(hashes, threshold=1)
+        self.assertEqual(groups, [["A.jpg", "b.jpg", "c.jpg"], ["dup.jpg", "far.jpg"]])
+
+    def test_no_groups(self):
+        self.assertEqual(group_similar({"a.jpg": 0, "b.jpg": (1 << 64) - 1}), [])
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Hash index and scanner
+# ═══════════════════════════════════════════════════════════════════════════
+class TestHashIndex(unittest.TestCase):
+    """Verify hashes survive SQLite's signed 64-bit integers."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.index = HashIndex(os.path.join(self.tmpdir, "hashes.db"))
+
+    def tearDown(self):
+        import shutil
+
+        self.index.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_round_trip_high_bit(self):
+        entries = [("a.jpg", 1, 2, (1 << 64) - 1), ("b.jpg", 3, 4, 12345)]
+        self.index.store("/photos", entries)
+        self.assertEqual(
+            self.index.load_directory("/photos"),
+            {"a.jpg": (1, 2, (1 << 64) - 1), "b.jpg": (3, 4, 12345)},
+        )
+
+    def test_forget(self):
+        self.index.store("/photos", [("a.jpg", 1, 2, 3)])
+        self.index.forget("/photos", ["a.jpg"])
+        self.assertEqual(self.index.load_directory("/photos"), {})
+
+
+class TestSimilarityScanner(unittest.TestCase):
+    """Verify incremental hashing and result delivery."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.photos = os.path.join(self.tmpdir, "photos")
+        os.makedirs(self.photos)
+        self.hashed = []
+        self.values = {}
+        self.idle = []
+        for target, replacement in (
+            ("hash_files", self.fake_hash_files),
+            ("GLib", mock.MagicMock()),
+        ):
+            patcher = mock.patch.object(similarity, target, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        similarity.GLib.idle_add.side_effect = lambda fn, *a: self.idle.append((fn, a))
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def fake_hash_files(self, paths, thumb_dir=None):
+        self.hashed.extend(os.path.basename(p) for p in paths)
+        return [(p, self.values.get(os.path.basename(p))) for p in paths]
+
+    def write(self, name, data=b"x"):
+        with open(os.path.join(self.photos, name), "wb") as fp:
+            fp.write(data)
+
+    def make_scanner(self):
+        return SimilarityScanner(
+            HashIndex(os.path.join(self.tmpdir, "hashes.db")),
+            workers=2,
+            pool_factory=lambda workers: ThreadPoolExecutor(workers),
+        )
+
+    def run_scan(self, scanner, names):
+        results, progress = [], []
+        scanner.scan(self.photos, names, lambda d, t: progress.append((d, t)), results.append)
+        scanner._driver.submit(lambda: None).result()
+        while self.idle:
+            fn, args = self.idle.pop(0)
+            fn(*args)
+        return results, progress
+
+    def test_groups_and_progress(self):
+        for name in ("a.jpg", "b.jpg", "c.jpg", "broken.jpg"):
+            self.write(name)
+        self.values = {"a.jpg": 0, "b.jpg": 1, "c.jpg": (1 << 64) - 1}
+        scanner = self.make_scanner()
+        results, progress = self.run_scan(scanner, ["a.jpg", "b.jpg", "c.jpg", "broken.jpg"])
+        self.assertEqual(results, [[["a.jpg", "b.jpg"]]])
+        self.assertEqual(progress[0], (0, 4))
+        self.assertEqual(progress[-1], (4, 4))
+        scanner.shutdown()
+
+    def test_rerun_hashes_only_new_or_changed(self):
+        self.write("a.jpg")
+        self.write("b.jpg")
+        self.values = {"a.jpg": 0, "b.jpg": 0, "c.jpg": 0}
+        scanner = self.make_scanner()
+        self.run_scan(scanner, ["a.jpg", "b.jpg"])
+        self.hashed.clear()
+
+        self.write("b.jpg", b"changed")
+        self.write("c.jpg")
+        results, _ = self.run_scan(scanner, ["a.jpg", "b.jpg", "c.jpg", "clip.mp4"])
+        self.assertEqual(sorted(self.hashed), ["b.jpg", "c.jpg"])
+        self.assertEqual(results, [[["a.jpg", "b.jpg", "c.jpg"]]])
+        scanner.shutdown()
+
+    def test_cancelled_scan_not_reported(self):
+        self.write("a.jpg")
+        scanner = self.make_scanner()
+        results = []
+        scanner.scan(self.photos, ["a.jpg"], None, results.append)
+        scanner._driver.submit(lambda: None).result()
+        scanner.cancel()
+        while self.idle:
+            fn, args = self.idle.pop(0)
+            fn(*args)
+        self.assertEqual(results, [])
+        scanner.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
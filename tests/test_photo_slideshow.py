@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS Photo Viewer slideshow.
+
+Checks that the frame queue stays bounded and decodes in order, that
+slides advance from frame-clock time (not before they are due, and as
+soon as a late frame arrives), that the crossfade runs for its
+configured length, and that videos and undecodable files are skipped.
+Decoding is replaced by a fake and the GLib main loop by a queue.
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# ---------------------------------------------------------------------------
+# Mock gi / gi.repository so photo viewer modules can be imported headlessly.
+# ---------------------------------------------------------------------------
+sys.path.insert(0, os.path.dirname(__file__))
+from test_helpers import install_gtk_mocks
+
+install_gtk_mocks()
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_photo_viewer import slideshow
+from mados_photo_viewer.navigator import FileNavigator
+from mados_photo_viewer.slideshow import FrameQueue, SlideshowView
+
+DURATION = 1_000_000
+CROSSFADE = 200_000
+
+
+class FakePixbuf:
+    def __init__(self, width, height):
+        self._size = (width, height)
+
+    def get_width(self):
+        return self._size[0]
+
+    def get_height(self):
+        return self._size[1]
+
+
+class FakeImage:
+    def __init__(self, pixbuf):
+        self.pixbuf = pixbuf
+
+
+class FakeFrameClock:
+    def __init__(self):
+        self.time = 0
+
+    def get_frame_time(self):
+        return self.time
+
+
+class SlideshowTestCase(unittest.TestCase):
+    """Fake decoder, surfaces and main loop shared by the tests."""
+
+    def setUp(self):
+        self.idle = []
+        self.decoded = []
+        self.broken = set()
+        self.gate = threading.Event()
+        self.gate.set()
+        glib = mock.MagicMock()
+        glib.idle_add.side_effect = lambda fn, *a: self.idle.append((fn, a))
+        for target, replacement, kwargs in (
+            (slideshow, "GLib", {"new": glib}),
+            (slideshow.Gdk, "cairo_surface_create_from_pixbuf", {"create": True}),
+        ):
+            patcher = mock.patch.object(target, replacement, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch("builtins.print")
+        self.print = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def decode(self, path, size):
+        self.gate.wait(5)
+        self.decoded.append(os.path.basename(path))
+        if os.path.basename(path) in self.broken:
+            raise ValueError("corrupt")
+        return FakeImage(FakePixbuf(*size))
+
+    def make_queue(self, depth=3):
+        queue = FrameQueue(self.decode, depth)
+        self.addCleanup(queue.shutdown)
+        return queue
+
+    def drain(self, queue):
+        """Wait for queued decodes, then run their main-loop handlers."""
+        queue._executor.submit(lambda: None).result()
+        while self.idle:
+            fn, args = self.idle.pop(0)
+            fn(*args)
+
+
+class TestFrameQueue(SlideshowTestCase):
+    """Verify the bounded decode-ahead queue."""
+
+    def test_decodes_in_order_up_to_depth(self):
+        queue = self.make_queue(depth=2)
+        queue.viewport = (800, 600)
+        queue.fill(["/p/a.jpg", "/p/b.jpg", "/p/c.jpg"])
+        self.drain(queue)
+        self.assertEqual(self.decoded, ["a.jpg", "b.jpg"])
+        self.assertEqual(len(queue), 2)
+        frame = queue.get("/p/a.jpg")
+        self.assertEqual((frame.width, frame.height), (800, 600))
+        self.assertIsNone(queue.get("/p/c.jpg"))
+
+    def test_fill_drops_passed_frames(self):
+        queue = self.make_queue(depth=2)
+        queue.viewport = (10, 10)
+        queue.fill(["/p/a.jpg", "/p/b.jpg"])
+        self.drain(queue)
+        queue.fill(["/p/b.jpg", "/p/c.jpg"])
+        self.drain(queue)
+        self.assertIsNone(queue.get("/p/a.jpg"))
+        self.assertEqual(self.decoded, ["a.jpg", "b.jpg", "c.jpg"])
+        self.assertEqual(len(queue), 2)
+
+    def test_dropped_decode_is_discarded(self):
+        queue = self.make_queue(depth=1)
+        queue.viewport = (10, 10)
+        self.gate.clear()
+        queue.fill(["/p/a.jpg"])
+        queue.clear()
+        self.gate.set()
+        self.drain(queue)
+        self.assertEqual(len(queue), 0)
+
+    def test_decode_time_logged(self):
+        queue = self.make_queue()
+        queue.viewport = (10, 10)
+        queue.fill(["/p/a.jpg"])
+        self.drain(queue)
+        self.assertIn("a.jpg", self.print.call_args[0][0])
+        self.assertGreaterEqual(queue.get("/p/a.jpg").decode_ms, 0)
+
+    def test_failure_recorded(self):
+        self.broken = {"a.jpg"}
+        queue = self.make_queue()
+        queue.viewport = (10, 10)
+        queue.fill(["/p/a.jpg"])
+        self.drain(queue)
+        self.assertTrue(queue.has_failed("/p/a.jpg"))
+        self.assertIsNone(queue.get("/p/a.jpg"))
+
+
+class TestSlideshowView(SlideshowTestCase):
+    """Verify frame-clock driven advancing and crossfades."""
+
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        for name in ("a.jpg", "b.jpg", "c.mp4", "d.jpg"):
+            open(os.path.join(self.tmpdir, name), "wb").close()
+        self.navigator = FileNavigator()
+        self.navigator.load_directory(os.path.join(self.tmpdir, "a.jpg"))
+        self.queue = self.make_queue()
+        self.view = SlideshowView(self.navigator, self.queue, DURATION, CROSSFADE)
+        self.view.add_tick_callback = mock.Mock(return_value=3)
+        self.view.remove_tick_callback = mock.Mock()
+        self.view.queue_draw = mock.Mock()
+        self.clock = FakeFrameClock()
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def tick(self, time):
+        self.clock.time = time
+        self.assertTrue(self.view._on_tick(self.view, self.clock))
+
+    def current(self):
+        return os.path.basename(self.navigator.current_file)
+
+    def test_advances_when_due(self):
+        self.view.start((100, 100))
+        self.drain(self.queue)
+        self.tick(1_000)
+        self.assertEqual(os.path.basename(self.view._current.path), "a.jpg")
+        self.drain(self.queue)
+
+        self.tick(1_000 + DURATION - 1)
+        self.assertEqual(self.current(), "a.jpg")
+        self.tick(1_000 + DURATION)
+        self.assertEqual(self.current(), "b.jpg")
+        self.drain(self.queue)
+
+        # The video is skipped
+        self.tick(1_000 + 2 * DURATION)
+        self.assertEqual(self.current(), "d.jpg")
+
+    def test_late_frame_shown_on_arrival(self):
+        self.view.start((100, 100))
+        self.drain(self.queue)
+        self.tick(0)
+        self.gate.clear()  # Hold the next decodes
+        self.view._queue.clear()
+        self.view._queue.fill(self.view._upcoming())
+        self.tick(DURATION + 50_000)
+        self.assertEqual(self.current(), "a.jpg")
+        self.gate.set()
+        self.drain(self.queue)
+        self.tick(DURATION + 80_000)
+        self.assertEqual(self.current(), "b.jpg")
+        self.assertEqual(self.view._shown_at, DURATION + 80_000)
+        self.assertIn("late", self.print.call_args[0][0])
+
+    def test_crossfade(self):
+        self.view.start((100, 100))
+        self.drain(self.queue)
+        self.tick(0)
+        self.drain(self.queue)
+        self.tick(DURATION)
+        self.assertIsNotNone(self.view._previous)
+        self.tick(DURATION + CROSSFADE // 2)
+        self.assertAlmostEqual(self.view._fade, 0.5)
+        self.tick(DURATION + CROSSFADE)
+        self.assertIsNone(self.view._previous)
+
+    def test_broken_file_skipped(self):
+        self.broken = {"b.jpg"}
+        self.view.start((100, 100))
+        self.drain(self.queue)
+        self.drain(self.queue)  # Decodes queued after the failure
+        self.tick(0)
+        self.tick(DURATION)
+        self.assertEqual(self.current(), "d.jpg")
+
+    def test_stop_removes_tick_callback(self):
+        self.view.start((100, 100))
+        self.assertTrue(self.view.running)
+        self.view.stop()
+        self.view.remove_tick_callback.assert_called_once_with(3)
+        self.assertFalse(self.view.running)
+        self.assertEqual(len(self.queue), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS Photo Viewer thumbnail cache and thumbnail view layout.
+
+Validates freedesktop thumbnail paths (URI + MD5 naming), PNG text chunk
+parsing used for ``Thumb::MTime`` validation, request sharing between
+views, and the pure layout helpers of the virtualized thumbnail grid.
+
+These tests do not require GTK or a display server.
+"""
+
+import sys
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+from concurrent.futures import Future
+from unittest import mock
+
+# ---------------------------------------------------------------------------
+# Mock gi / gi.repository so photo viewer modules can be imported headlessly.
+# ---------------------------------------------------------------------------
+sys.path.insert(0, os.path.dirname(__file__))
+from test_helpers import install_gtk_mocks
+
+install_gtk_mocks()
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_photo_viewer import thumbnails
+from mados_photo_viewer.thumbnails import (
+    THUMBNAIL_SIZES,
+    ThumbnailCache,
+    file_uri,
+    thumbnail_path,
+    fail_path,
+    read_png_text,
+    is_thumbnail_valid,
+)
+from mados_photo_viewer.thumbview import grid_columns, visible_range
+
+
+def _chunk(chunk_type, data):
+    crc = zlib.crc32(chunk_type + data) & 0xFFFFFFFF
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", crc)
+
+
+def _write_png(path, text):
+    """Write a minimal 1x1 PNG carrying the given tEXt chunks."""
+    ihdr = struct.pack(">IIBBBBB", 1, 1, 8, 6, 0, 0, 0)
+    body = b"\x89PNG\r\n\x1a\n" + _chunk(b"IHDR", ihdr)
+    for key, value in text.items():
+        body += _chunk(b"tEXt", key.encode("latin-1") + b"\x00" + value.encode("latin-1"))
+    body += _chunk(b"IDAT", zlib.compress(b"\x00\x00\x00\x00\x00"))
+    body += _chunk(b"IEND", b"")
+    with open(path, "wb") as f:
+        f.write(body)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Spec paths
+# ═══════════════════════════════════════════════════════════════════════════
+class TestThumbnailPaths(unittest.TestCase):
+    """Verify thumbnail naming follows the freedesktop spec."""
+
+    def test_file_uri(self):
+        self.assertEqual(file_uri("/home/jens/photos/me.png"), "file:///home/jens/photos/me.png")
+
+    def test_file_uri_escapes_spaces(self):
+        self.assertEqual(file_uri("/tmp/my photo.jpg"), "file:///tmp/my%20photo.jpg")
+
+    def test_spec_example_digest(self):
+        path = thumbnail_path("/home/jens/photos/me.png", "normal", "/cache")
+        self.assertEqual(path, "/cache/normal/c6ee772d9e49320e97ec29a7eb5b1697.png")
+
+    def test_large_flavor_directory(self):
+        path = thumbnail_path("/a.jpg", "large", "/cache")
+        self.assertTrue(path.startswith("/cache/large/"))
+
+    def test_fail_path_is_app_specific(self):
+        path = fail_path("/a.jpg", "/cache")
+        self.assertTrue(path.startswith("/cache/fail/mados-photo-viewer/"))
+
+    def test_sizes(self):
+        self.assertEqual(THUMBNAIL_SIZES["normal"], 128)
+        self.assertEqual(THUMBNAIL_SIZES["large"], 256)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PNG text validation
+# ═══════════════════════════════════════════════════════════════════════════
+class TestPngText(unittest.TestCase):
+    """Verify Thumb::MTime is read from PNG text chunks."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.thumb = os.path.join(self.tmpdir, "t.png")
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_reads_text_chunks(self):
+        _write_png(self.thumb, {"Thumb::URI": "file:///a.jpg", "Thumb::MTime": "1700000000"})
+        text = read_png_text(self.thumb)
+        self.assertEqual(text["Thumb::URI"], "file:///a.jpg")
+        self.assertEqual(text["Thumb::MTime"], "1700000000")
+
+    def test_missing_file(self):
+        self.assertEqual(read_png_text(os.path.join(self.tmpdir, "none.png")), {})
+
+    def test_not_a_png(self):
+        with open(self.thumb, "wb") as f:
+            f.write(b"GIF89a")
+        self.assertEqual(read_png_text(self.thumb), {})
+
+    def test_valid_when_mtime_matches(self):
+        _write_png(self.thumb, {"Thumb::MTime": "1700000000"})
+        self.assertTrue(is_thumbnail_valid(self.thumb, 1700000000.75))
+
+    def test_invalid_when_source_changed(self):
+        _write_png(self.thumb, {"Thumb::MTime": "1700000000"})
+        self.assertFalse(is_thumbnail_valid(self.thumb, 1700000001))
+
+    def test_invalid_without_mtime(self):
+        _write_png(self.thumb, {})
+        self.assertFalse(is_thumbnail_valid(self.thumb, 1700000000))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Virtualized layout
+# ═══════════════════════════════════════════════════════════════════════════
+class TestVisibleRange(unittest.TestCase):
+    """Verify only cells intersecting the viewport are selected."""
+
+    def test_grid_columns(self):
+        self.assertEqual(grid_columns(700, 140), 5)
+        self.assertEqual(grid_columns(50, 140), 1)
+
+    def test_top_of_grid(self):
+        self.assertEqual(visible_range(0, 300, 140, 5, 2000), (0, 15))
+
+    def test_scrolled_grid(self):
+        first, last = visible_range(140 * 100, 300, 140, 5, 2000)
+        self.assertEqual(first, 500)
+        self.assertEqual(last, 515)
+
+    def test_clamped_to_count(self):
+        self.assertEqual(visible_range(0, 10000, 140, 5, 12), (0, 12))
+
+    def test_filmstrip(self):
+        self.assertEqual(visible_range(84 * 10, 400, 84, 1, 2000), (10, 15))
+
+    def test_empty(self):
+        self.assertEqual(visible_range(0, 300, 140, 5, 0), (0, 0))
+
+    def test_work_is_bounded_for_large_folders(self):
+        first, last = visible_range(0, 1080, 140, 13, 2000)
+        self.assertLess(last - first, 120)
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Requests shared between views
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+class _ManualExecutor:
+    """Executor whose futures stay queued until the test completes them."""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+class TestThumbnailRequests(unittest.TestCase):
+    """Verify callbacks and cancellation per requesting view."""
+
+    def setUp(self):
+        self.idle_calls = []
+        glib = mock.MagicMock()
+        glib.idle_add.side_effect = lambda fn, *args: self.idle_calls.append((fn, args))
+        patcher = mock.patch.object(thumbnails, "GLib", glib)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ThumbnailCache(max_workers=1)
+        self.addCleanup(self.cache.shutdown)
+        self.executor = _ManualExecutor()
+        self.cache._executor = self.executor
+        self.received = []
+
+    def callback(self, name):
+        return lambda path, pixbuf: self.received.append((name, path, pixbuf))
+
+    def complete(self, future, pixbuf):
+        future.set_result(pixbuf)
+        for fn, args in self.idle_calls:
+            fn(*args)
+        self.idle_calls.clear()
+
+    def test_both_owners_called_for_shared_path(self):
+        pixbuf = mock.MagicMock()
+        pixbuf.get_byte_length.return_value = 100
+        self.cache.request("/p/a.jpg", self.callback("grid"), owner="grid")
+        self.cache.request("/p/a.jpg", self.callback("dialog"), owner="dialog")
+        self.assertEqual(len(self.executor.futures), 1)
+        self.complete(self.executor.futures[0], pixbuf)
+        self.assertEqual(
+            sorted(self.received), [("dialog", "/p/a.jpg", pixbuf), ("grid", "/p/a.jpg", pixbuf)]
+        )
+
+    def test_owner_cannot_cancel_other_owners_requests(self):
+        self.cache.request("/p/a.jpg", self.callback("dialog"), owner="dialog")
+        self.cache.request("/p/b.jpg", self.callback("grid"), owner="grid")
+        self.cache.cancel_pending(keep=["/p/c.jpg"], owner="grid")
+        dialog_future, grid_future = self.executor.futures
+        self.assertFalse(dialog_future.cancelled())
+        self.assertTrue(grid_future.cancelled())
+        self.complete(dialog_future, None)
+        self.assertEqual(self.received, [("dialog", "/p/a.jpg", None)])
+
+    def test_shared_load_kept_while_one_owner_wants_it(self):
+        self.cache.request("/p/a.jpg", self.callback("grid"), owner="grid")
+        self.cache.request("/p/a.jpg", self.callback("filmstrip"), owner="filmstrip")
+        self.cache.cancel_pending(owner="grid")
+        future = self.executor.futures[0]
+        self.assertFalse(future.cancelled())
+        self.complete(future, None)
+        self.assertEqual(self.received, [("filmstrip", "/p/a.jpg", None)])
+        # A new request after completion starts a new load
+        self.cache.request("/p/a.jpg", self.callback("grid"), owner="grid")
+        self.assertEqual(len(self.executor.futures), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS Photo Viewer editing tools.
+
+Validates EditHistory undo/redo bookkeeping, its version counter, and
+eraser hit-testing through the StrokeIndex spatial grid.
+"""
+
+import sys
+import os
+import types
+import unittest
+
+# ---------------------------------------------------------------------------
+# Mock gi / gi.repository so photo viewer modules can be imported headlessly.
+# ---------------------------------------------------------------------------
+sys.path.insert(0, os.path.dirname(__file__))
+from test_helpers import install_gtk_mocks
+
+install_gtk_mocks()
+
+# Mock cairo module if pycairo is not installed
+try:
+    import cairo  # noqa: F401
+except ImportError:
+    sys.modules["cairo"] = types.ModuleType("cairo")
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_photo_viewer.tools import (
+    EditHistory,
+    PaintStroke,
+    TextStroke,
+    BlurStroke,
+    StrokeIndex,
+    stroke_bounds,
+)
+
+
+def _paint(points, brush=4):
+    stroke = PaintStroke((1, 0, 0, 1), brush)
+    for x, y in points:
+        stroke.add_point(x, y)
+    return stroke
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# stroke_bounds / StrokeIndex
+# ═══════════════════════════════════════════════════════════════════════════
+class TestStrokeBounds(unittest.TestCase):
+    """Verify hit-test bounding boxes."""
+
+    def test_path_stroke_includes_brush(self):
+        self.assertEqual(stroke_bounds(_paint([(10, 20), (30, 5)], brush=4)), (8, 3, 32, 22))
+
+    def test_text_stroke_uses_font_size(self):
+        text = TextStroke(100, 50, "hi", (1, 1, 1, 1), 10)
+        self.assertEqual(stroke_bounds(text), (90, 40, 110, 60))
+
+    def test_empty_stroke(self):
+        self.assertIsNone(stroke_bounds(BlurStroke(10)))
+
+
+class TestStrokeIndex(unittest.TestCase):
+    """Verify grid lookups return only nearby strokes."""
+
+    def setUp(self):
+        self.index = StrokeIndex(cell_size=64)
+        self.near = _paint([(10, 10)])
+        self.far = _paint([(1000, 1000)])
+        self.index.add(self.near)
+        self.index.add(self.far)
+
+    def test_query_finds_nearby(self):
+        self.assertEqual(self.index.query(12, 12, 5), [self.near])
+
+    def test_query_empty_area(self):
+        self.assertEqual(self.index.query(500, 500, 5), [])
+
+    def test_spanning_stroke_returned_once(self):
+        long = _paint([(0, 300), (400, 300)])
+        self.index.add(long)
+        found = self.index.query(200, 300, 200)
+        self.assertEqual(found.count(long), 1)
+
+    def test_remove(self):
+        self.index.remove(self.near)
+        self.assertEqual(self.index.query(12, 12, 5), [])
+        self.assertEqual(len(self.index), 1)
+
+    def test_negative_coordinates(self):
+        stroke = _paint([(-50, -50)])
+        self.index.add(stroke)
+        self.assertEqual(self.index.query(-48, -48, 1), [stroke])
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# EditHistory
+# ═══════════════════════════════════════════════════════════════════════════
+class TestEditHistory(unittest.TestCase):
+    """Verify undo/redo, erasing, and the version counter."""
+
+    def setUp(self):
+        self.history = EditHistory()
+
+    def test_version_changes_on_edits(self):
+        versions = [self.history.version]
+        self.history.add_stroke(_paint([(1, 1)]))
+        versions.append(self.history.version)
+        self.history.undo()
+        versions.append(self.history.version)
+        self.history.redo()
+        versions.append(self.history.version)
+        self.assertEqual(len(set(versions)), 4)
+
+    def test_noop_undo_keeps_version(self):
+        version = self.history.version
+        self.assertIsNone(self.history.undo())
+        self.assertEqual(self.history.version, version)
+
+    def test_erase_removes_touched_strokes_only(self):
+        a = _paint([(10, 10)])
+        b = _paint([(500, 500)])
+        self.history.add_stroke(a)
+        self.history.add_stroke(b)
+        self.assertTrue(self.history.erase_at(12, 12, radius=3))
+        self.assertEqual(self.history.strokes, [b])
+        self.assertEqual(self.history.redo_stack, [a])
+
+    def test_erase_miss(self):
+        self.history.add_stroke(_paint([(10, 10)]))
+        version = self.history.version
+        self.assertFalse(self.history.erase_at(200, 200))
+        self.assertEqual(self.history.version, version)
+
+    def test_erase_text(self):
+        text = TextStroke(100, 100, "label", (1, 1, 1, 1), 20)
+        self.history.add_stroke(text)
+        self.assertTrue(self.history.erase_at(110, 105, radius=1))
+        self.assertFalse(self.history.has_edits)
+
+    def test_erase_keeps_stack_order(self):
+        strokes = [_paint([(10 + i, 10)]) for i in range(3)]
+        for stroke in strokes:
+            self.history.add_stroke(stroke)
+        self.history.erase_at(11, 10, radius=5)
+        self.assertEqual(self.history.redo_stack, list(reversed(strokes)))
+
+    def test_undone_stroke_not_erasable(self):
+        self.history.add_stroke(_paint([(10, 10)]))
+        self.history.undo()
+        self.assertFalse(self.history.erase_at(10, 10))
+
+    def test_redone_stroke_erasable(self):
+        self.history.add_stroke(_paint([(10, 10)]))
+        self.history.undo()
+        self.history.redo()
+        self.assertTrue(self.history.erase_at(10, 10))
+
+    def test_clear_resets_index(self):
+        self.history.add_stroke(_paint([(10, 10)]))
+        self.history.clear()
+        self.assertFalse(self.history.erase_at(10, 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
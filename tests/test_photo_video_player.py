@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests for madOS Photo Viewer video player lifecycle.
+
+Checks that GStreamer is only initialized and the playbin only built
+when the first video is opened, that the gtksink widget swapped in is
+shown, that stopping returns the pipeline to NULL, and that seek-bar
+updates come from a tick callback present only while playing.
+GStreamer is replaced by a mock.
+"""
+
+import sys
+import os
+import unittest
+from unittest import mock
+
+# ---------------------------------------------------------------------------
+# Mock gi / gi.repository so photo viewer modules can be imported headlessly.
+# ---------------------------------------------------------------------------
+sys.path.insert(0, os.path.dirname(__file__))
+from test_helpers import install_gtk_mocks
+
+install_gtk_mocks()
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
+sys.path.insert(0, LIB_DIR)
+
+from mados_photo_viewer import video_player
+from mados_photo_viewer.video_player import POSITION_UPDATE_US, VideoPlayer
+
+
+class FakeFrameClock:
+    def __init__(self):
+        self.time = 0
+
+    def get_frame_time(self):
+        return self.time
+
+
+class TestVideoPlayerLifecycle(unittest.TestCase):
+    """Verify lazy pipeline creation and tick-driven position updates."""
+
+    def setUp(self):
+        self.gst = mock.MagicMock()
+        self.gst.is_initialized.return_value = False
+        for target, value in (("Gst", self.gst), ("GST_AVAILABLE", True)):
+            patcher = mock.patch.object(video_player, target, value, create=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.player = VideoPlayer()
+        self.player._volume_scale = None
+        self.player.add_tick_callback = mock.Mock(return_value=7)
+        self.player.remove_tick_callback = mock.Mock()
+
+    def test_no_gstreamer_until_first_video(self):
+        self.assertIsNone(self.player._pipeline)
+        self.gst.init.assert_not_called()
+        self.gst.ElementFactory.make.assert_not_called()
+
+    def test_first_video_initializes_once(self):
+        self.assertTrue(self.player.load_video("/videos/a.mp4"))
+        self.gst.init.assert_called_once_with(None)
+        pipeline = self.player._pipeline
+        self.gst.is_initialized.return_value = True
+        self.player.load_video("/videos/b.mp4")
+        self.gst.init.assert_called_once_with(None)
+        self.assertIs(self.player._pipeline, pipeline)
+
+    def test_gtksink_widget_shown(self):
+        sink_widget = mock.MagicMock()
+        gtksink = mock.MagicMock()
+        gtksink.get_property.return_value = sink_widget
+        self.gst.ElementFactory.make.side_effect = lambda kind, name: (
+            gtksink if kind == "gtksink" else mock.MagicMock()
+        )
+        self.player.load_video("/videos/a.mp4")
+        # The pipeline is built after show_all(), so the sink widget
+        # must be shown explicitly or video plays into a hidden widget
+        self.assertIs(self.player._video_area, sink_widget)
+        sink_widget.show.assert_called_once_with()
+
+    def test_stop_sets_null(self):
+        self.player.load_video("/videos/a.mp4")
+        self.player.play()
+        self.player.stop()
+        self.player._pipeline.set_state.assert_called_with(self.gst.State.NULL)
+
+    def test_tick_callback_only_while_playing(self):
+        self.player.load_video("/videos/a.mp4")
+        self.player.add_tick_callback.assert_not_called()
+        self.player.play()
+        self.player.add_tick_callback.assert_called_once()
+        self.player.pause()
+        self.player.remove_tick_callback.assert_called_once_with(7)
+        self.assertIsNone(self.player._tick_id)
+
+    def test_tick_throttles_position_queries(self):
+        self.player.load_video("/videos/a.mp4")
+        self.player.play()
+        pipeline = self.player._pipeline
+        pipeline.query_position.return_value = (True, 0)
+        clock = FakeFrameClock()
+        clock.time = POSITION_UPDATE_US
+        self.assertTrue(self.player._on_tick(self.player, clock))
+        clock.time += POSITION_UPDATE_US // 4
+        self.assertTrue(self.player._on_tick(self.player, clock))
+        self.assertEqual(pipeline.query_position.call_count, 1)
+        clock.time += POSITION_UPDATE_US
+        self.player._on_tick(self.player, clock)
+        self.assertEqual(pipeline.query_position.call_count, 2)
+
+    def test_tick_removes_itself_when_not_playing(self):
+        self.player.load_video("/videos/a.mp4")
+        self.player.play()
+        self.player._playing = False
+        self.assertFalse(self.player._on_tick(self.player, FakeFrameClock()))
+        self.assertIsNone(self.player._tick_id)
+
+    def test_unavailable(self):
+        with mock.patch.object(video_player, "GST_AVAILABLE", False):
+            self.assertFalse(VideoPlayer().load_video("/videos/a.mp4"))
+        self.gst.init.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,16 +3,20 @@
 Tests for madOS Photo Viewer wallpaper functionality.
 
 Validates compositor detection and config file updating for both Sway and
-Hyprland desktop environments when setting wallpapers.
+Hyprland desktop environments when setting wallpapers, and the per-output
+pre-scaled copies: output parsing, cover-crop geometry, content-keyed
+caching, edits composed on the worker, and the swaymsg/swaybg commands
+that apply them.
 
 These tests use temporary config files and mock GTK dependencies.
 """
 
 import sys
 import os
+import json
 import tempfile
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 # ---------------------------------------------------------------------------
 # Mock gi / gi.repository so photo viewer modules can be imported headlessly.
@@ -37,7 +41,18 @@ sys.modules["cairo"] = cairo_mock
 LIB_DIR = os.path.join(REPO_DIR, "airootfs", "usr", "local", "lib")
 sys.path.insert(0, LIB_DIR)
 
+from mados_photo_viewer import wallpaper
 from mados_photo_viewer.app import PhotoViewerApp
+from mados_photo_viewer.wallpaper import (
+    OutputInfo,
+    WallpaperPreparer,
+    cover_geometry,
+    parse_hyprland_monitors,
+    parse_sway_outputs,
+    prepare_wallpapers,
+    sway_quote,
+    write_edited,
+)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -430,5 +445,251 @@ exec-once = swaybg -i /old/wallpaper.jpg -m fill
         self.assertNotIn("bash -c", content)
 
 
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Pre-scaled Copies
+# ═══════════════════════════════════════════════════════════════════════════
+class TestOutputParsing(unittest.TestCase):
+    """Verify output sizes are read in physical, rotated pixels."""
+
+    def test_sway_outputs(self):
+        text = json.dumps(
+            [
+                {
+                    "name": "eDP-1",
+                    "active": True,
+                    "focused": True,
+                    "transform": "normal",
+                    "current_mode": {"width": 2880, "height": 1800},
+                },
+                {
+                    "name": "DP-1",
+                    "active": True,
+                    "transform": "90",
+                    "current_mode": {"width": 2560, "height": 1440},
+                },
+                {"name": "HDMI-A-1", "active": False, "current_mode": None},
+            ]
+        )
+        outputs = parse_sway_outputs(text)
+        self.assertEqual(
+            [(o.name, o.size, o.focused) for o in outputs],
+            [("eDP-1", (2880, 1800), True), ("DP-1", (1440, 2560), False)],
+        )
+
+    def test_hyprland_monitors(self):
+        text = json.dumps(
+            [
+                {"name": "eDP-1", "width": 1920, "height": 1080, "transform": 0},
+                {"name": "DP-2", "width": 1920, "height": 1080, "transform": 3, "focused": True},
+                {"name": "DP-3", "width": 1920, "height": 1080, "disabled": True},
+            ]
+        )
+        outputs = parse_hyprland_monitors(text)
+        self.assertEqual(
+            [(o.name, o.size, o.focused) for o in outputs],
+            [("eDP-1", (1920, 1080), False), ("DP-2", (1080, 1920), True)],
+        )
+
+
+class TestCoverGeometry(unittest.TestCase):
+    """Verify the cover crop fills the output and is centred."""
+
+    def test_wide_source(self):
+        scale, ox, oy = cover_geometry(4000, 2000, 1000, 1000)
+        self.assertEqual((scale, ox, oy), (0.5, 500.0, 0.0))
+
+    def test_tall_source(self):
+        scale, ox, oy = cover_geometry(1000, 3000, 1920, 1080)
+        self.assertAlmostEqual(scale, 1.92)
+        self.assertEqual(ox, 0.0)
+        self.assertAlmostEqual(oy, (3000 * 1.92 - 1080) / 2)
+
+
+class TestPrepareWallpapers(unittest.TestCase):
+    """Verify copies are keyed by content and size and rendered once."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmpdir, "cache")
+        self.rendered = []
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def render(self, filepath, width, height):
+        self.rendered.append((os.path.basename(filepath), width, height))
+        pixbuf = MagicMock()
+        pixbuf.save_to_bufferv.return_value = (True, b"jpeg")
+        return pixbuf
+
+    def write(self, name, data):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_rendered_once_per_size(self):
+        photo = self.write("photo.jpg", b"pixels")
+        copies = prepare_wallpapers(
+            photo, [(1920, 1080), (1920, 1080), (1080, 1920)], self.cache_dir, self.render
+        )
+        self.assertEqual(
+            sorted(self.rendered), [("photo.jpg", 1080, 1920), ("photo.jpg", 1920, 1080)]
+        )
+        for (width, height), path in copies.items():
+            self.assertTrue(path.endswith(f"-{width}x{height}.jpg"))
+            self.assertTrue(os.path.isfile(path))
+
+    def test_same_content_reused(self):
+        first = prepare_wallpapers(
+            self.write("a.jpg", b"same"), [(800, 600)], self.cache_dir, self.render
+        )
+        second = prepare_wallpapers(
+            self.write("b.jpg", b"same"), [(800, 600)], self.cache_dir, self.render
+        )
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.rendered), 1)
+        prepare_wallpapers(self.write("c.jpg", b"other"), [(800, 600)], self.cache_dir, self.render)
+        self.assertEqual(len(self.rendered), 2)
+
+
+class TestEditedWallpaper(unittest.TestCase):
+    """Verify edits are composed on the worker, from a full decode if needed."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.dest = os.path.join(self.tmpdir, "edited", "wallpaper.png")
+        self.calls = []
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def compose(self, pixbuf, history, effects):
+        self.calls.append(("compose", pixbuf, history, effects))
+        result = MagicMock()
+        result.save_to_bufferv.return_value = (True, b"png")
+        return result
+
+    def decode(self, filepath):
+        self.calls.append(("decode", filepath))
+        return "full"
+
+    def test_reduced_image_decoded_before_composing(self):
+        path = write_edited(
+            "/photos/a.jpg", None, "history", None, self.dest, self.compose, self.decode
+        )
+        self.assertEqual(path, self.dest)
+        self.assertEqual(
+            self.calls, [("decode", "/photos/a.jpg"), ("compose", "full", "history", None)]
+        )
+        with open(self.dest, "rb") as f:
+            self.assertEqual(f.read(), b"png")
+
+    def test_displayed_pixbuf_used_as_is(self):
+        write_edited(
+            "/photos/a.jpg", "shown", "history", "fx", self.dest, self.compose, self.decode
+        )
+        self.assertEqual(self.calls, [("compose", "shown", "history", "fx")])
+
+    def run_preparer(self, edits):
+        delivered = []
+        preparer = WallpaperPreparer(os.path.join(self.tmpdir, "cache"), self.dest)
+        glib = MagicMock()
+        glib.idle_add.side_effect = lambda fn, *args: fn(*args)
+        with patch.object(wallpaper, "GLib", glib), patch.object(
+            wallpaper, "prepare_wallpapers", lambda source, sizes, cache: {(800, 600): "copy.jpg"}
+        ):
+            preparer.prepare(
+                "/photos/a.jpg",
+                [OutputInfo("eDP-1", 800, 600)],
+                lambda source, copies: delivered.append((source, copies)),
+                edits,
+            )
+            preparer._executor.shutdown(wait=True)
+        return delivered
+
+    def test_preparer_renders_copies_of_edited_image(self):
+        with patch.object(wallpaper, "write_edited", lambda path, *edits, dest: dest):
+            delivered = self.run_preparer(("shown", "history", None))
+        self.assertEqual(delivered, [(self.dest, {"eDP-1": "copy.jpg"})])
+
+    def test_preparer_reports_failed_edits(self):
+        def broken(path, *edits, dest):
+            raise OSError("disk full")
+
+        with patch.object(wallpaper, "write_edited", broken), patch("builtins.print"):
+            delivered = self.run_preparer((None, "history", None))
+        self.assertEqual(delivered, [(None, {})])
+
+
+class TestApplyWallpaperCopies(unittest.TestCase):
+    """Verify each output gets its own copy and the focused one is recorded."""
+
+    def setUp(self):
+        self.app = object.__new__(PhotoViewerApp)
+        self.app._status_filename = MagicMock()
+        self.app._language = "English"
+        self.app._update_sway_config = MagicMock()
+        self.app._update_hyprland_config = MagicMock()
+        self.app._update_wallpaper_db = MagicMock()
+        self.copies = {"eDP-1": "/cache/a-2880x1800.jpg", "DP-1": "/cache/a-1440x2560.jpg"}
+
+    def test_sway(self):
+        with patch("subprocess.run") as run:
+            run.return_value.returncode = 0
+            self.app._set_wallpaper_sway("/photos/a.jpg", self.copies, "DP-1")
+        command = run.call_args[0][0]
+        self.assertEqual(command[0], "swaymsg")
+        self.assertIn('output "eDP-1" bg "/cache/a-2880x1800.jpg" fill', command[1])
+        self.assertIn('output "DP-1" bg "/cache/a-1440x2560.jpg" fill', command[1])
+        self.app._update_sway_config.assert_called_once_with("/photos/a.jpg")
+        self.app._update_wallpaper_db.assert_called_once_with("/cache/a-1440x2560.jpg")
+
+    def test_hyprland(self):
+        with patch("subprocess.run"), patch("subprocess.Popen") as popen:
+            self.app._set_wallpaper_hyprland("/photos/a.jpg", self.copies, "eDP-1")
+        args = popen.call_args[0][0]
+        self.assertEqual(args[0], "swaybg")
+        self.assertEqual(args[1:7], ["-o", "eDP-1", "-i", "/cache/a-2880x1800.jpg", "-m", "fill"])
+        self.app._update_wallpaper_db.assert_called_once_with("/cache/a-2880x1800.jpg")
+
+    def test_failed_preparation_reported(self):
+        self.app._show_error = MagicMock()
+        with patch("subprocess.run") as run:
+            self.app._apply_wallpaper("sway", None, {}, "eDP-1")
+        run.assert_not_called()
+        self.app._show_error.assert_called_once()
+
+    def test_without_copies_uses_original(self):
+        with patch("subprocess.run") as run:
+            run.return_value.returncode = 0
+            self.app._set_wallpaper_sway("/photos/a.jpg")
+        self.assertEqual(run.call_args[0][0], ["swaymsg", 'output * bg "/photos/a.jpg" fill'])
+        self.app._update_wallpaper_db.assert_called_once_with("/photos/a.jpg")
+
+    def test_quote_in_file_name_cannot_inject_commands(self):
+        path = '/photos/a"; exec rm -rf ~; output * bg "b\\.jpg'
+        with patch("subprocess.run") as run:
+            run.return_value.returncode = 0
+            self.app._set_wallpaper_sway(path)
+        command = run.call_args[0][0][1]
+        self.assertEqual(
+            command, 'output * bg "/photos/a\\"; exec rm -rf ~; output * bg \\"b\\\\.jpg" fill'
+        )
+        self.assertEqual(sway_quote('a"b'), '"a\\"b"')
+
+    def test_line_break_in_file_name_rejected(self):
+        self.app._show_error = MagicMock()
+        with patch("subprocess.run") as run:
+            self.app._set_wallpaper_sway("/photos/a\nexec b.jpg")
+        run.assert_not_called()
+        self.app._show_error.assert_called_once()
+
+
 if __name__ == "__main__":
     unittest.main()